@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING
 import gevent
 from more_itertools import peekable
 
+from rotkehlchen.accounting.checkpoints import AccountingCheckpoints
 from rotkehlchen.accounting.constants import FREE_PNL_EVENTS_LIMIT
 from rotkehlchen.accounting.export.csv import CSVExporter
 from rotkehlchen.accounting.pot import AccountingPot
@@ -25,6 +26,7 @@ from rotkehlchen.utils.data_structures import DefaultLRUCache, LRUCacheWithRemov
 
 if TYPE_CHECKING:
     from rotkehlchen.accounting.mixins.event import AccountingEventMixin
+    from rotkehlchen.assets.asset import Asset
     from rotkehlchen.chain.aggregator import ChainsAggregator
     from rotkehlchen.db.dbhandler import DBHandler
 
@@ -109,6 +111,30 @@ class Accountant:
         )
         return count + 1
 
+    def _get_price_queries(
+            self,
+            events: Sequence['AccountingEventMixin'],
+            end_ts: Timestamp,
+    ) -> set[tuple['Asset', Timestamp]]:
+        """Collect the assets and timestamps for which processing the given sorted
+        events is going to need a price"""
+        queries: set[tuple[Asset, Timestamp]] = set()
+        for event in events:
+            if (timestamp := event.get_timestamp()) > end_ts:
+                break
+
+            try:
+                assets = event.get_assets()
+            except (UnknownAsset, UnsupportedAsset, UnprocessableTradePair):
+                continue  # will be reported when processing the event
+
+            queries.update(
+                (asset, timestamp) for asset in assets
+                if asset.identifier not in self.ignored_asset_ids
+            )
+
+        return queries
+
     def process_history(
             self,
             start_ts: Timestamp,
@@ -151,79 +177,109 @@ class Accountant:
             )
             self.pots[0].reset(settings=db_settings, start_ts=start_ts, end_ts=end_ts, report_id=report_id)  # noqa: E501
             self.end_ts = end_ts
-            self.csvexporter.reset(start_ts=start_ts, end_ts=end_ts)
 
             # The first ts is the ts of the first action we have in history or 0 for empty history
             self.currently_processing_timestamp = first_ts
             self.first_processed_timestamp = first_ts
 
-            count = 0
             actions_length = len(events)
             prev_time = last_event_ts = Timestamp(0)
             ignored_ids_mapping = self.db.get_ignored_action_ids(cursor=cursor, action_type=None)
+            checkpoints = AccountingCheckpoints(
+                database=self.db,
+                cursor=cursor,
+                settings=db_settings,
+                ignored_asset_ids=self.ignored_asset_ids,
+                ignored_ids_mapping=ignored_ids_mapping,
+                events=events,
+            )
 
-        events_iter = peekable(events)
-        while True:
-            try:
-                (
-                    processed_events_num,
-                    prev_time,
-                ) = self._process_event(
-                    events_iterator=events_iter,
-                    start_ts=start_ts,
-                    end_ts=end_ts,
-                    prev_time=prev_time,
-                    db_settings=db_settings,
-                    ignored_ids_mapping=ignored_ids_mapping,
-                )
-            except PriceQueryUnsupportedAsset as e:
-                count = self._process_skipping_exception(
-                    exception=e,
-                    events=events,
-                    count=count,
-                    reason='not being able to find price for an unsupported asset',
-                )
-                continue
-            except NoPriceForGivenTimestamp as e:
-                self.pots[0].cost_basis.missing_prices.add(
-                    MissingPrice(
-                        from_asset=e.from_asset,
-                        to_asset=e.to_asset,
-                        time=e.time,
-                        rate_limited=e.rate_limited,
-                    ),
-                )
-                continue
-            except RemoteError as e:
-                count = self._process_skipping_exception(
-                    exception=e,
-                    events=events,
-                    count=count,
-                    reason='inability to reach an external service at that point in time',
-                )
-                continue
-            except AccountingError as e:
-                log.error(f'Found critical error {e} when processing history. Stopping.')
-                e.report_id = report_id
-                raise
-
-            if processed_events_num == 0:
-                break  # we reached the period end
-
-            last_event_ts = prev_time
-            if count % 500 == 0:
-                # This loop can take a very long time depending on the amount of events
-                # to process. We need to yield to other greenlets or else calls to the
-                # API may time out
-                gevent.sleep(0.5)
-            count += processed_events_num
-            if not active_premium and count >= FREE_PNL_EVENTS_LIMIT:
-                log.debug(
-                    f'PnL reports event processing has hit the event limit of {events_limit}. '
-                    f'Processing stopped and the results will not '
-                    f'take into account subsequent events. Total events were {len(events)}',
-                )
-                break
+        # Skip the events whose state is restored from a checkpoint of an earlier report
+        count = checkpoints.resume(pot=self.pots[0], start_ts=start_ts, end_ts=end_ts)
+        self.csvexporter.reset(
+            start_ts=start_ts,
+            end_ts=end_ts,
+            first_index=self.pots[0].first_event_index,
+        )
+        remaining_events = events[count:]
+        # Resolve in one go all the prices that the global DB already has cached
+        self.pots[0].prefetch_prices(self._get_price_queries(events=remaining_events, end_ts=end_ts))  # noqa: E501
+        events_iter = peekable(remaining_events)
+        try:
+            while True:
+                if (next_event := events_iter.peek(None)) is not None:
+                    checkpoints.maybe_save(
+                        pot=self.pots[0],
+                        processed_num=count,
+                        next_ts=next_event.get_timestamp(),
+                    )
+                try:
+                    (
+                        processed_events_num,
+                        prev_time,
+                    ) = self._process_event(
+                        events_iterator=events_iter,
+                        start_ts=start_ts,
+                        end_ts=end_ts,
+                        prev_time=prev_time,
+                        db_settings=db_settings,
+                        ignored_ids_mapping=ignored_ids_mapping,
+                    )
+                except PriceQueryUnsupportedAsset as e:
+                    checkpoints.disable()
+                    count = self._process_skipping_exception(
+                        exception=e,
+                        events=events,
+                        count=count,
+                        reason='not being able to find price for an unsupported asset',
+                    )
+                    continue
+                except NoPriceForGivenTimestamp as e:
+                    checkpoints.disable()
+                    self.pots[0].cost_basis.missing_prices.add(
+                        MissingPrice(
+                            from_asset=e.from_asset,
+                            to_asset=e.to_asset,
+                            time=e.time,
+                            rate_limited=e.rate_limited,
+                        ),
+                    )
+                    continue
+                except RemoteError as e:
+                    checkpoints.disable()
+                    count = self._process_skipping_exception(
+                        exception=e,
+                        events=events,
+                        count=count,
+                        reason='inability to reach an external service at that point in time',
+                    )
+                    continue
+                except AccountingError as e:
+                    log.error(f'Found critical error {e} when processing history. Stopping.')
+                    e.report_id = report_id
+                    raise
+
+                if processed_events_num == 0:
+                    # we reached the period end so the events before it were all processed
+                    checkpoints.maybe_save(pot=self.pots[0], processed_num=count, next_ts=end_ts)
+                    break
+
+                last_event_ts = prev_time
+                if count % 500 == 0:
+                    # This loop can take a very long time depending on the amount of events
+                    # to process. We need to yield to other greenlets or else calls to the
+                    # API may time out
+                    gevent.sleep(0.5)
+                count += processed_events_num
+                if not active_premium and count >= FREE_PNL_EVENTS_LIMIT:
+                    log.debug(
+                        f'PnL reports event processing has hit the event limit of {events_limit}. '
+                        f'Processing stopped and the results will not '
+                        f'take into account subsequent events. Total events were {len(events)}',
+                    )
+                    break
+        finally:  # keep the events processed until now, also if processing failed
+            self.pots[0].flush_report_data()
 
         dbpnl.add_report_overview(
             report_id=report_id,
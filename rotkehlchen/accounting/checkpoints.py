@@ -0,0 +1,234 @@
+"""Checkpoints of the accounting state so that PnL reports can resume processing from them
+
+At the start of every month in the year before the end of a report, the state of the
+cost basis and of the EVM accountants is saved along with hashes of everything it was
+computed from: the events processed until then, the accounting settings, the ignored
+assets and actions and the accounting rules. A later report that starts at or after a
+checkpoint restores that state and only processes the events that follow it. Any
+checkpoint whose hashes no longer match is deleted, so editing anything in the past
+invalidates the checkpoints after it without having to track every write.
+"""
+import hashlib
+import json
+import logging
+from bisect import bisect_left
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from rotkehlchen.db.accounting_checkpoints import AccountingCheckpoint, DBAccountingCheckpoints
+from rotkehlchen.errors.serialization import DeserializationError
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+from rotkehlchen.types import Timestamp
+from rotkehlchen.utils.misc import ts_now
+from rotkehlchen.utils.version_check import get_current_version
+
+if TYPE_CHECKING:
+    from rotkehlchen.accounting.mixins.event import AccountingEventMixin
+    from rotkehlchen.accounting.pot import AccountingPot
+    from rotkehlchen.accounting.structures.types import ActionType
+    from rotkehlchen.db.dbhandler import DBHandler
+    from rotkehlchen.db.drivers.gevent import DBCursor
+    from rotkehlchen.db.settings import DBSettings
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+# Bump when the serialized state changes or when processing the same events starts
+# giving different results, so that older checkpoints are not used anymore
+CHECKPOINTS_FORMAT_VERSION = 1
+# Number of month starts before the end of a report at which checkpoints are saved
+CHECKPOINT_MONTHS = 12
+# Settings that processing the events depends on
+ACCOUNTING_SETTINGS = (
+    'main_currency',
+    'taxfree_after_period',
+    'include_crypto2crypto',
+    'calculate_past_cost_basis',
+    'include_gas_costs',
+    'cost_basis_method',
+    'eth_staking_taxable_after_withdrawal_enabled',
+    'include_fees_in_cost_basis',
+    'treat_eth2_as_eth',
+    'historical_price_oracles',
+)
+
+
+def _hash(data: Any) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def accounting_settings_hash(settings: 'DBSettings') -> str:
+    serialized = settings.serialize()
+    return _hash([
+        CHECKPOINTS_FORMAT_VERSION,
+        str(get_current_version().our_version),
+        [serialized[name] for name in ACCOUNTING_SETTINGS],
+    ])
+
+
+def ignored_hash(
+        ignored_asset_ids: set[str],
+        ignored_ids_mapping: dict['ActionType', set[str]],
+) -> str:
+    return _hash([
+        sorted(ignored_asset_ids),
+        sorted((action_type.serialize(), sorted(ids)) for action_type, ids in ignored_ids_mapping.items()),  # noqa: E501
+    ])
+
+
+def accounting_rules_hash(cursor: 'DBCursor') -> str:
+    return _hash([
+        cursor.execute('SELECT * FROM accounting_rules ORDER BY identifier').fetchall(),
+        cursor.execute('SELECT * FROM linked_rules_properties ORDER BY identifier').fetchall(),
+    ])
+
+
+def events_hashes(
+        events: Sequence['AccountingEventMixin'],
+        positions: set[int],
+) -> dict[int, str]:
+    """Hash the first N events for each N in positions with a single pass over them"""
+    hasher, result = hashlib.sha256(), {}
+    for idx in range(max(positions, default=0) + 1):
+        if idx in positions:
+            result[idx] = hasher.hexdigest()
+        if idx < len(events):
+            hasher.update(json.dumps(events[idx].serialize_for_debug_import(), sort_keys=True).encode())  # noqa: E501
+
+    return result
+
+
+def month_starts(end_ts: Timestamp, months: int) -> list[Timestamp]:
+    """The given number of UTC month starts up to end_ts in ascending order"""
+    end = datetime.fromtimestamp(end_ts, tz=UTC)
+    year, month, result = end.year, end.month, []
+    for _ in range(months):
+        result.append(Timestamp(int(datetime(year, month, 1, tzinfo=UTC).timestamp())))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+
+    return result[::-1]
+
+
+class AccountingCheckpoints:
+    """Restores the state of a PnL report from a checkpoint and saves new ones while
+    the report's events are processed"""
+
+    def __init__(
+            self,
+            database: 'DBHandler',
+            cursor: 'DBCursor',
+            settings: 'DBSettings',
+            ignored_asset_ids: set[str],
+            ignored_ids_mapping: dict['ActionType', set[str]],
+            events: Sequence['AccountingEventMixin'],
+    ) -> None:
+        self.dbcheckpoints = DBAccountingCheckpoints(database)
+        self.events = events
+        # without past cost basis the state at a point in time depends on the report start
+        self.enabled = settings.calculate_past_cost_basis
+        self.settings_hash = accounting_settings_hash(settings)
+        self.ignored_hash = ignored_hash(ignored_asset_ids, ignored_ids_mapping)
+        self.rules_hash = accounting_rules_hash(cursor)
+        self.pending: list[AccountingCheckpoint] = []  # to save, in ascending timestamp order
+
+    def _is_current(self, checkpoint: AccountingCheckpoint, events_hash: str | None) -> bool:
+        return (
+            checkpoint.events_num <= len(self.events) and
+            checkpoint.events_hash == events_hash and
+            checkpoint.settings_hash == self.settings_hash and
+            checkpoint.ignored_hash == self.ignored_hash and
+            checkpoint.rules_hash == self.rules_hash
+        )
+
+    def resume(self, pot: 'AccountingPot', start_ts: Timestamp, end_ts: Timestamp) -> int:
+        """Restore the freshly reset pot from the latest checkpoint at or before start_ts
+        and prepare the checkpoints to save while processing the rest of the events.
+        Checkpoints that are not current anymore are deleted.
+
+        Returns the number of events covered by the restored state, which processing
+        should skip.
+        """
+        if self.enabled is False:
+            return 0
+
+        with self.dbcheckpoints.db.conn.read_ctx() as cursor:
+            checkpoints = self.dbcheckpoints.get_checkpoints(cursor)
+
+        timestamps = [event.get_timestamp() for event in self.events]
+        boundaries = {  # the number of events before each month start
+            boundary: bisect_left(timestamps, boundary)
+            for boundary in month_starts(min(end_ts, ts_now()), CHECKPOINT_MONTHS)
+        }
+        hashes = events_hashes(
+            events=self.events,
+            positions={x.events_num for x in checkpoints} | set(boundaries.values()),
+        )
+        current, stale = {}, []
+        for checkpoint in checkpoints:
+            if self._is_current(checkpoint, hashes.get(checkpoint.events_num)):
+                current[checkpoint.timestamp] = checkpoint
+            else:
+                stale.append(checkpoint.timestamp)
+
+        events_num, resume_ts = 0, Timestamp(-1)
+        if len(candidates := [x for x in current.values() if x.timestamp <= start_ts]) != 0:
+            checkpoint = candidates[-1]
+            with self.dbcheckpoints.db.conn.read_ctx() as cursor:
+                state = self.dbcheckpoints.get_checkpoint_state(cursor, checkpoint.timestamp)
+            try:
+                pot.restore_state(json.loads(state))  # type: ignore[arg-type]  # exists since just queried
+            except (DeserializationError, json.JSONDecodeError, TypeError) as e:
+                log.error(f'Could not restore the accounting checkpoint at {checkpoint.timestamp} due to {e!s}. Processing all events')  # noqa: E501
+                pot.reset(
+                    settings=pot.settings,
+                    start_ts=pot.query_start_ts,
+                    end_ts=pot.query_end_ts,
+                    report_id=pot.report_id,  # type: ignore[arg-type]  # set by the reset
+                )
+                stale.append(checkpoint.timestamp)
+                del current[checkpoint.timestamp]
+            else:
+                events_num, resume_ts = checkpoint.events_num, checkpoint.timestamp
+                log.debug(f'Resuming PnL report from the checkpoint at {resume_ts} skipping {events_num} events')  # noqa: E501
+
+        if len(stale) != 0:
+            with self.dbcheckpoints.db.user_write() as write_cursor:
+                self.dbcheckpoints.delete_checkpoints(write_cursor, stale)
+
+        self.pending = [
+            AccountingCheckpoint(
+                timestamp=boundary,
+                events_num=boundary_events_num,
+                events_hash=hashes[boundary_events_num],
+                settings_hash=self.settings_hash,
+                ignored_hash=self.ignored_hash,
+                rules_hash=self.rules_hash,
+            ) for boundary, boundary_events_num in boundaries.items()
+            if boundary > resume_ts and boundary not in current
+        ]
+        return events_num
+
+    def disable(self) -> None:
+        """Stop saving checkpoints since the state of the rest of the report is not
+        reproducible, for example due to a skipped event or a missing price"""
+        self.pending = []
+
+    def maybe_save(self, pot: 'AccountingPot', processed_num: int, next_ts: Timestamp) -> None:
+        """Save the checkpoints before next_ts, once processed_num events were processed
+
+        Nothing is saved once a price lookup of the report failed, since the state may
+        then depend on a fallback price that a later report would not use."""
+        if pot.missing_price_found is True:
+            self.disable()
+
+        if len(self.pending) == 0 or self.pending[0].timestamp > next_ts:
+            return
+
+        reached = []
+        while len(self.pending) != 0 and self.pending[0].timestamp <= next_ts:
+            if (checkpoint := self.pending.pop(0)).events_num == processed_num:
+                reached.append(checkpoint)
+
+        if len(reached) != 0:
+            self.dbcheckpoints.add_checkpoints(reached, state=json.dumps(pot.serialize_state()))
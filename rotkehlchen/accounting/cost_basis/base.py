@@ -15,7 +15,7 @@ from rotkehlchen.errors.misc import AccountingError
 from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.fval import FVal
 from rotkehlchen.logging import RotkehlchenLogsAdapter
-from rotkehlchen.serialization.deserialize import deserialize_fval
+from rotkehlchen.serialization.deserialize import deserialize_fval, deserialize_timestamp
 from rotkehlchen.types import CostBasisMethod, Location, Price, Timestamp
 from rotkehlchen.user_messages import MessagesAggregator
 from rotkehlchen.utils.mixins.customizable_date import CustomizableDateMixin
@@ -27,8 +27,11 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+# how many consumed acquisitions FIFO keeps around before dropping them from its list
+CONSUMED_ACQUISITIONS_TO_DROP = 1024
 
-@dataclass(init=True, repr=True, eq=True, order=False, unsafe_hash=False, frozen=False)
+
+@dataclass(init=True, repr=True, eq=True, order=False, unsafe_hash=False, frozen=False, slots=True)
 class AssetAcquisitionEvent:
     amount: FVal
     remaining_amount: FVal = field(init=False)  # Same as amount but reduced during processing
@@ -74,6 +77,32 @@ class AssetAcquisitionEvent:
             'index': self.index,
         }
 
+    @classmethod
+    def deserialize_state(cls: type['AssetAcquisitionEvent'], data: dict[str, Any]) -> 'AssetAcquisitionEvent':  # noqa: E501
+        """Deserialize an acquisition from serialize_state(), with what remains of it
+
+        May raise DeserializationError"""
+        try:
+            acquisition = cls(
+                amount=deserialize_fval(value=data['full_amount'], name='full_amount', location='acquisition'),  # noqa: E501
+                timestamp=deserialize_timestamp(data['timestamp']),
+                rate=Price(deserialize_fval(value=data['rate'], name='rate', location='acquisition')),  # noqa: E501
+                index=data['index'],
+            )
+            acquisition.remaining_amount = deserialize_fval(
+                value=data['remaining_amount'],
+                name='remaining_amount',
+                location='acquisition',
+            )
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s}') from e
+
+        return acquisition
+
+    def serialize_state(self) -> dict[str, Any]:
+        """Same as serialize but also keeps what remains of the acquisition"""
+        return self.serialize() | {'remaining_amount': str(self.remaining_amount)}
+
     def __gt__(self, other: Any) -> bool:
         if not isinstance(other, AssetAcquisitionEvent):
             raise NotImplementedError
@@ -105,16 +134,13 @@ class AssetAcquisitionHeapElement(NamedTuple):
     """
     https://docs.python.org/3/library/heapq.html#basic-examples
 
-    This represents a heap element for the asset acquisition heap.
+    This represents a heap element for the HIFO asset acquisition heap.
     It is a tuple to also carry a priority which is used by the heap algorithm to
     preserve the heap invariant.
 
     Note:`heapq` uses a min heap implementation i.e. the smallest item comes out first.
-
-    For FIFO, a counter is used as the priority so the first acquisition comes out first.
-    For LIFO, a counter is used but negated, so the acquisition added last comes first.
-    For HIFO, the amount of the acquisition is used although negated so the
-    acquisition with the highest amount comes first.
+    So the rate of the acquisition is used negated as the priority so that the
+    acquisition with the highest rate comes first.
     """
     priority: FVal  # This is only used by heapq algorithm and not accessed from our code
     acquisition_event: AssetAcquisitionEvent
@@ -125,8 +151,6 @@ class AssetAcquisitionHeapElement(NamedTuple):
 
 class BaseCostBasisMethod(ABC):
     """The base class in which every other cost basis method inherits from."""
-    def __init__(self) -> None:
-        self._acquisitions_heap: list[AssetAcquisitionHeapElement] = []
 
     @abstractmethod
     def add_in_event(self, acquisition: AssetAcquisitionEvent) -> None:
@@ -136,18 +160,53 @@ class BaseCostBasisMethod(ABC):
         and thus determines the PnL order.
         """
 
+    @abstractmethod
+    def _next_acquisition(self) -> AssetAcquisitionEvent:
+        """The acquisition that is to be consumed next.
+
+        May raise:
+        - IndexError if there are no acquisitions
+        """
+
+    @abstractmethod
+    def _remove_next_acquisition(self) -> None:
+        """Remove the acquisition returned by _next_acquisition after it's fully consumed"""
+
+    @abstractmethod
+    def get_acquisitions(self) -> tuple[AssetAcquisitionEvent, ...]:
+        """Returns read-only _acquisitions"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """The number of acquisitions that are not fully consumed"""
+
+    def serialize_state(self) -> dict[str, Any]:
+        """Serialize the acquisitions that are not fully consumed, in the order that
+        restore_state() needs to add them back"""
+        return {'acquisitions': [x.serialize_state() for x in self.get_acquisitions()]}
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        """Add back the acquisitions of serialize_state()
+
+        May raise:
+        - DeserializationError
+        """
+        try:
+            acquisitions = [AssetAcquisitionEvent.deserialize_state(x) for x in data['acquisitions']]  # noqa: E501
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s}') from e
+
+        for acquisition in acquisitions:
+            self.add_in_event(acquisition)
+
     def processing_iterator(self) -> Iterator[AssetAcquisitionEvent]:
         """
         Iteration method over acquisition events.
         We can't return here Tuple of AssetAcquisitionEvents as we need to return
         the first event each time but _acquisitions may be not modified between iterations.
         """
-        while len(self._acquisitions_heap) > 0:
-            yield self._acquisitions_heap[0].acquisition_event
-
-    def get_acquisitions(self) -> tuple[AssetAcquisitionEvent, ...]:
-        """Returns read-only _acquisitions"""
-        return tuple(entry.acquisition_event for entry in self._acquisitions_heap)
+        while len(self) != 0:
+            yield self._next_acquisition()
 
     def consume_result(self, used_amount: FVal, asset: Asset) -> None:
         """
@@ -158,13 +217,19 @@ class BaseCostBasisMethod(ABC):
         May raise:
         - IndexError if the method was called when acquisitions were empty
         """
-        # this is a temporary assertion to test that new accounting tools work properly.
-        # Written on 06.06.2022 and can be removed after a couple of months if everything goes well
-        assert ZERO <= used_amount <= self._acquisitions_heap[0].acquisition_event.remaining_amount, f'Used amount must be in the interval [0, {self._acquisitions_heap[0].acquisition_event.remaining_amount}] but it was {used_amount} for {asset}'  # noqa: E501
-
-        self._acquisitions_heap[0].acquisition_event.remaining_amount -= used_amount
-        if self._acquisitions_heap[0].acquisition_event.remaining_amount == ZERO:
-            heapq.heappop(self._acquisitions_heap)
+        acquisition_event = self._next_acquisition()
+        acquisition_event.remaining_amount -= used_amount
+        if acquisition_event.remaining_amount == ZERO:
+            self._remove_next_acquisition()
+
+    def consume_whole_result(self, asset: Asset) -> None:
+        """Same as consume_result for the entire remaining amount of the currently
+        processed event, but without any arithmetic on it.
+        May raise:
+        - IndexError if the method was called when acquisitions were empty
+        """
+        self._next_acquisition().remaining_amount = ZERO
+        self._remove_next_acquisition()
 
     def calculate_spend_cost_basis(
             self,
@@ -259,12 +324,8 @@ class BaseCostBasisMethod(ABC):
                 taxable=taxable,
             ))
             used_acquisitions.append(acquisition_event)
-            self.consume_result(
-                used_amount=acquisition_event.remaining_amount,
-                asset=spending_asset,
-            )
-            # and since this event is going to be removed, reduce its remaining to zero
-            acquisition_event.remaining_amount = ZERO
+            # this also reduces the remaining amount of the removed event to zero
+            self.consume_whole_result(asset=spending_asset)
 
         is_complete = True
         if remaining_sold_amount != ZERO:
@@ -291,9 +352,6 @@ class BaseCostBasisMethod(ABC):
             is_complete=is_complete,
         )
 
-    def __len__(self) -> int:
-        return len(self._acquisitions_heap)
-
 
 class FIFOCostBasisMethod(BaseCostBasisMethod):
     """
@@ -302,12 +360,30 @@ class FIFOCostBasisMethod(BaseCostBasisMethod):
     """
     def __init__(self) -> None:
         super().__init__()
-        self._count = ZERO
+        # The acquisitions in the order they were added. The ones before _head have been
+        # consumed and are only dropped from the list once in a while, so that consuming
+        # the next acquisition doesn't have to move all the rest.
+        self._acquisitions: list[AssetAcquisitionEvent] = []
+        self._head = 0
 
     def add_in_event(self, acquisition: AssetAcquisitionEvent) -> None:
-        """Adds an acquisition to the `_acquisitions_heap` using a counter to achieve the FIFO order."""  # noqa: E501
-        heapq.heappush(self._acquisitions_heap, AssetAcquisitionHeapElement(self._count, acquisition))  # noqa: E501
-        self._count += 1
+        """Appends an acquisition at the end of the `_acquisitions` to achieve the FIFO order."""
+        self._acquisitions.append(acquisition)
+
+    def _next_acquisition(self) -> AssetAcquisitionEvent:
+        return self._acquisitions[self._head]
+
+    def _remove_next_acquisition(self) -> None:
+        self._head += 1
+        if self._head >= CONSUMED_ACQUISITIONS_TO_DROP and self._head * 2 >= len(self._acquisitions):  # noqa: E501
+            del self._acquisitions[:self._head]
+            self._head = 0
+
+    def get_acquisitions(self) -> tuple[AssetAcquisitionEvent, ...]:
+        return tuple(self._acquisitions[self._head:])
+
+    def __len__(self) -> int:
+        return len(self._acquisitions) - self._head
 
 
 class LIFOCostBasisMethod(BaseCostBasisMethod):
@@ -317,12 +393,26 @@ class LIFOCostBasisMethod(BaseCostBasisMethod):
     """
     def __init__(self) -> None:
         super().__init__()
-        self._count = ZERO
+        self._acquisitions: list[AssetAcquisitionEvent] = []  # used as a stack
 
     def add_in_event(self, acquisition: AssetAcquisitionEvent) -> None:
-        """Adds an acquisition to the `_acquisitions_heap` using a negated counter to achieve the LIFO order."""  # noqa: E501
-        heapq.heappush(self._acquisitions_heap, AssetAcquisitionHeapElement(-self._count, acquisition))  # noqa: E501
-        self._count += 1
+        """Pushes an acquisition on top of the `_acquisitions` stack to achieve the LIFO order."""
+        self._acquisitions.append(acquisition)
+
+    def _next_acquisition(self) -> AssetAcquisitionEvent:
+        return self._acquisitions[-1]
+
+    def _remove_next_acquisition(self) -> None:
+        self._acquisitions.pop()
+
+    def get_acquisitions(self) -> tuple[AssetAcquisitionEvent, ...]:
+        return tuple(reversed(self._acquisitions))
+
+    def serialize_state(self) -> dict[str, Any]:
+        return {'acquisitions': [x.serialize_state() for x in self._acquisitions]}
+
+    def __len__(self) -> int:
+        return len(self._acquisitions)
 
 
 class HIFOCostBasisMethod(BaseCostBasisMethod):
@@ -330,6 +420,10 @@ class HIFOCostBasisMethod(BaseCostBasisMethod):
     Accounting in HIFO (highest-in-first-out) method.
     https://www.investopedia.com/terms/h/hifo.asp
     """
+    def __init__(self) -> None:
+        super().__init__()
+        self._acquisitions_heap: list[AssetAcquisitionHeapElement] = []
+
     def add_in_event(self, acquisition: AssetAcquisitionEvent) -> None:
         """
         Adds an acquisition to the `_acquisitions_heap` using the negated rate
@@ -337,8 +431,20 @@ class HIFOCostBasisMethod(BaseCostBasisMethod):
         """
         heapq.heappush(self._acquisitions_heap, AssetAcquisitionHeapElement(-acquisition.rate, acquisition))  # noqa: E501
 
+    def _next_acquisition(self) -> AssetAcquisitionEvent:
+        return self._acquisitions_heap[0].acquisition_event
+
+    def _remove_next_acquisition(self) -> None:
+        heapq.heappop(self._acquisitions_heap)
+
+    def get_acquisitions(self) -> tuple[AssetAcquisitionEvent, ...]:
+        return tuple(entry.acquisition_event for entry in self._acquisitions_heap)
 
-class AverageCostBasisMethod(BaseCostBasisMethod):
+    def __len__(self) -> int:
+        return len(self._acquisitions_heap)
+
+
+class AverageCostBasisMethod(FIFOCostBasisMethod):
     """
     Accounting in Average Cost Basis(ACB) method.
 
@@ -354,7 +460,6 @@ class AverageCostBasisMethod(BaseCostBasisMethod):
     """  # noqa: E501
     def __init__(self) -> None:
         super().__init__()
-        self._count = ZERO
         # keeps track of the amount of the asset remaining after every acquisition or spend
         self.current_amount = ZERO
         # the current total cost basis of the asset
@@ -362,7 +467,7 @@ class AverageCostBasisMethod(BaseCostBasisMethod):
 
     def add_in_event(self, acquisition: AssetAcquisitionEvent) -> None:
         """
-        Adds an acquisition to the `_acquisitions_heap` in order of time seen.
+        Adds an acquisition to the `_acquisitions` in order of time seen.
 
         It also calculates the average cost basis of that acquisition with respect to the
         previous average cost basis.
@@ -370,13 +475,29 @@ class AverageCostBasisMethod(BaseCostBasisMethod):
         The formula used to calculate the average cost basis of an acquisition is:
         [Previous Total ACB] + [Cost of New Shares] + [Transaction Costs]
         """
-        heapq.heappush(
-            self._acquisitions_heap,
-            AssetAcquisitionHeapElement(self._count, acquisition),
-        )
+        super().add_in_event(acquisition)
         self.current_total_acb += acquisition.amount * acquisition.rate
         self.current_amount += acquisition.amount
-        self._count += 1
+
+    def serialize_state(self) -> dict[str, Any]:
+        return super().serialize_state() | {
+            'current_amount': str(self.current_amount),
+            'current_total_acb': str(self.current_total_acb),
+        }
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        """Same as its parent function but also restores the current amount and total ACB
+        since adding back acquisitions that were partially spent does not reproduce them.
+
+        May raise:
+        - DeserializationError
+        """
+        super().restore_state(data)
+        try:
+            self.current_amount = deserialize_fval(value=data['current_amount'], name='current_amount', location='ACB')  # noqa: E501
+            self.current_total_acb = deserialize_fval(value=data['current_total_acb'], name='current_total_acb', location='ACB')  # noqa: E501
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s}') from e
 
     def consume_result(self, used_amount: FVal, asset: Asset) -> None:
         """
@@ -384,11 +505,20 @@ class AverageCostBasisMethod(BaseCostBasisMethod):
         `current_amount` is guaranteed to be greater than zero since `consume_result` is
         supposed to be called under `processing_iterator`.
         """
+        self._deduct_used_amount(used_amount=used_amount, asset=asset)
+        super().consume_result(used_amount=used_amount, asset=asset)
+
+    def consume_whole_result(self, asset: Asset) -> None:
+        """Same as its parent function but also deducts the used amount from `current_amount`"""
+        self._deduct_used_amount(used_amount=self._next_acquisition().remaining_amount, asset=asset)  # noqa: E501
+        super().consume_whole_result(asset=asset)
+
+    def _deduct_used_amount(self, used_amount: FVal, asset: Asset) -> None:
         if self.current_amount == ZERO:
             # this shouldn't happen but a user reported it in
             # https://github.com/rotki/rotki/issues/7273. We couldn't find the reason for it so we
             # decided to protect against it by raising an error shown in the frontend
-            log.error(f'Division by zero error when processing report using ACB. {self._acquisitions_heap}')  # noqa: E501
+            log.error(f'Division by zero error when processing report using ACB. {self.get_acquisitions()}')  # noqa: E501
             raise AccountingError(
                 f'Remaining amount error during ACB calculation for {asset}. Contact support and '
                 'provide the log file for more information',
@@ -396,7 +526,6 @@ class AverageCostBasisMethod(BaseCostBasisMethod):
 
         self.current_total_acb *= (self.current_amount - used_amount) / self.current_amount
         self.current_amount -= used_amount
-        super().consume_result(used_amount=used_amount, asset=asset)
 
     def calculate_spend_cost_basis(
             self,
@@ -598,6 +727,38 @@ class CostBasisCalculator(CustomizableDateMixin):
 
         return self._events[asset]
 
+    def serialize_state(self) -> dict[str, Any]:
+        """Serialize the remaining acquisitions of all assets and the missing acquisitions
+        found so far so that processing can resume from here in a later run"""
+        return {
+            'assets': {
+                asset.identifier: asset_events.acquisitions_manager.serialize_state()
+                for asset, asset_events in self._events.items()
+            },
+            'missing_acquisitions': [x.serialize() for x in self.missing_acquisitions],
+        }
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        """Restore the state of serialize_state() on top of a freshly reset calculator
+
+        May raise:
+        - DeserializationError
+        """
+        try:
+            for asset_identifier, asset_state in data['assets'].items():
+                self._events[Asset(asset_identifier)].acquisitions_manager.restore_state(asset_state)
+
+            for entry in data['missing_acquisitions']:
+                self.missing_acquisitions.append(MissingAcquisition(
+                    originating_event_id=entry.get('originating_event_id'),
+                    asset=Asset(entry['asset']),
+                    time=deserialize_timestamp(entry['time']),
+                    found_amount=deserialize_fval(value=entry['found_amount'], name='found_amount', location='missing acquisition'),  # noqa: E501
+                    missing_amount=deserialize_fval(value=entry['missing_amount'], name='missing_amount', location='missing acquisition'),  # noqa: E501
+                ))
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s}') from e
+
     def reduce_asset_amount(
             self,
             originating_event_id: int | None,
@@ -629,10 +790,7 @@ class CostBasisCalculator(CustomizableDateMixin):
                 break
 
             remaining_amount -= acquisition_event.remaining_amount
-            asset_events.acquisitions_manager.consume_result(
-                used_amount=acquisition_event.remaining_amount,
-                asset=asset,
-            )
+            asset_events.acquisitions_manager.consume_whole_result(asset=asset)
 
         if remaining_amount != ZERO:
             if not asset.is_fiat():
@@ -89,9 +89,12 @@ class CSVExporter(CustomizableDateMixin):
         super().__init__(database=database)
         self.reset(start_ts=Timestamp(0), end_ts=Timestamp(0))
 
-    def reset(self, start_ts: Timestamp, end_ts: Timestamp) -> None:
+    def reset(self, start_ts: Timestamp, end_ts: Timestamp, first_index: int = 0) -> None:
+        """first_index is the index of the first exported event. It's not zero when the
+        processing resumed from a checkpoint and the events before it are not exported"""
         self.start_ts = start_ts
         self.end_ts = end_ts
+        self.first_index = first_index
         self.transaction_explorers: dict[SUPPORTED_EVM_EVMLIKE_CHAINS_TYPE, str] = {
             SupportedBlockchain.ETHEREUM: ETHERSCAN_EXPLORER_TX_URL.format(base_url='etherscan.io'),  # noqa: E501
             SupportedBlockchain.OPTIMISM: ETHERSCAN_EXPLORER_TX_URL.format(base_url='optimistic.etherscan.io'),  # noqa: E501
@@ -150,7 +153,7 @@ class CSVExporter(CustomizableDateMixin):
         if getattr(event.pnl, name, ZERO) == ZERO:
             return
 
-        index = event.index + CSV_INDEX_OFFSET
+        index = event.index - self.first_index + CSV_INDEX_OFFSET
         value_formula = f'{amount_column}{index}*H{index}'
         total_value_formula = f'(F{index}*H{index}+G{index}*H{index})'  # formula of both free and taxable  # noqa: E501
         cost_basis_column = 'K' if name == 'taxable' else 'L'
@@ -188,13 +191,17 @@ class CSVExporter(CustomizableDateMixin):
                     if name == 'free' and acquisition.taxable is True:
                         continue
 
-                    index = acquisition.event.index + CSV_INDEX_OFFSET
                     if cost_basis == '':
                         cost_basis = '='
                     else:
                         cost_basis += '+'
 
-                    cost_basis += f'{acquisition.amount!s}*H{index}'
+                    if acquisition.event.index < self.first_index:
+                        # acquired before the checkpoint so the price is not in the export
+                        cost_basis += f'{acquisition.amount!s}*{acquisition.event.rate!s}'
+                    else:
+                        index = acquisition.event.index - self.first_index + CSV_INDEX_OFFSET
+                        cost_basis += f'{acquisition.amount!s}*H{index}'
 
         dict_event[f'cost_basis_{name}'] = cost_basis
 
@@ -1,5 +1,6 @@
 import contextlib
 import logging
+from collections.abc import Collection
 from typing import TYPE_CHECKING, Any, Literal
 
 from rotkehlchen.accounting.cost_basis import CostBasisCalculator
@@ -35,6 +36,9 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+# Number of processed events that are written to the report's DB data at once
+PNL_EVENTS_WRITE_BATCH = 5000
+
 
 class AccountingPot(CustomizableDateMixin):
     """
@@ -70,29 +74,58 @@ class AccountingPot(CustomizableDateMixin):
         )
         self.pnls = PnlTotals()
         self.processed_events: list[ProcessedAccountingEvent] = []
+        # processed events serialized for the DB that are not yet written to the report
+        self.report_data: list[tuple[Timestamp, str]] = []
+        # index of the first processed event. Not zero when resuming from a checkpoint
+        self.first_event_index = 0
         self.events_accountant = EventsAccountant(
             evm_accounting_aggregators=evm_accounting_aggregators,
             pot=self,
         )
         self.query_start_ts = self.query_end_ts = Timestamp(0)
         self.report_id: int | None = None
+        # prices in profit currency per asset and timestamp already known for this report
+        self.cached_prices: dict[tuple[Asset, Timestamp], Price] = {}
+        # whether a price lookup of this report failed
+        self.missing_price_found = False
 
     def _add_processed_event(self, event: ProcessedAccountingEvent) -> None:
-        dbpnl = DBAccountingReports(self.database)
         self.processed_events.append(event)
         try:
-            dbpnl.add_report_data(
-                report_id=self.report_id,  # type: ignore # report id is initialized by now
-                time=event.timestamp,
-                ts_converter=self.timestamp_to_date,
-                event=event,
-            )
-        except (DeserializationError, InputError) as e:
+            self.report_data.append((event.timestamp, event.serialize_for_db(self.timestamp_to_date)))  # noqa: E501
+        except DeserializationError as e:
             log.error(str(e))
             return
 
+        if len(self.report_data) >= PNL_EVENTS_WRITE_BATCH:
+            self.flush_report_data()
         log.debug(event.to_string(self.timestamp_to_date))
 
+    def flush_report_data(self) -> None:
+        """Write the processed events that are not yet in the report's DB data. If writing
+        them all at once fails they are written one by one so that only the events that
+        can't be written are lost."""
+        if len(self.report_data) == 0:
+            return
+
+        dbreports = DBAccountingReports(self.database)
+        try:
+            dbreports.add_report_data(
+                report_id=self.report_id,  # type: ignore # report id is initialized by now
+                events_data=self.report_data,
+            )
+        except InputError as e:
+            log.error(f'{e!s}. Writing the events one by one')
+            for event_data in self.report_data:
+                try:
+                    dbreports.add_report_data(
+                        report_id=self.report_id,  # type: ignore # report id is initialized by now
+                        events_data=[event_data],
+                    )
+                except InputError as single_e:
+                    log.error(str(single_e))
+        self.report_data = []
+
     def get_rate_in_profit_currency(self, asset: Asset, timestamp: Timestamp) -> Price:
         """Get the profit_currency price of asset in the given timestamp
 
@@ -104,15 +137,32 @@ class AccountingPot(CustomizableDateMixin):
         or with reading the response returned by the server
         """
         if asset == self.profit_currency:
-            rate = Price(ONE)
-        else:
-            rate = PriceHistorian().query_historical_price(
-                from_asset=asset,
-                to_asset=self.profit_currency,
-                timestamp=timestamp,
-            )
+            return Price(ONE)
+
+        if (rate := self.cached_prices.get((asset, timestamp))) is None:
+            try:
+                rate = PriceHistorian().query_historical_price(
+                    from_asset=asset,
+                    to_asset=self.profit_currency,
+                    timestamp=timestamp,
+                )
+            except (PriceQueryUnsupportedAsset, NoPriceForGivenTimestamp, RemoteError):
+                # callers may continue with a fallback price, so the state is not reproducible
+                self.missing_price_found = True
+                raise
+            if self.is_dummy_pot is False:  # only reports reset the cache
+                self.cached_prices[asset, timestamp] = rate
+
         return rate
 
+    def prefetch_prices(self, queries: Collection[tuple[Asset, Timestamp]]) -> None:
+        """Resolve in bulk all the given asset prices that are already cached in the
+        global DB so that processing the events does not need a query per price"""
+        self.cached_prices.update(PriceHistorian.query_cached_historical_prices(
+            queries=queries,
+            to_asset=self.profit_currency,
+        ))
+
     def reset(
             self,
             settings: DBSettings,
@@ -131,6 +181,32 @@ class AccountingPot(CustomizableDateMixin):
         self.cost_basis.reset(settings)
         self.events_accountant.reset()
         self.processed_events = []
+        self.report_data = []
+        self.first_event_index = 0
+        self.cached_prices = {}
+        self.missing_price_found = False
+
+    def serialize_state(self) -> dict[str, Any]:
+        """Serialize everything that processing the events that follow depends on, so
+        that a later run can resume processing from this point"""
+        return {
+            'processed_events_num': self.first_event_index + len(self.processed_events),
+            'cost_basis': self.cost_basis.serialize_state(),
+            'accountants': self.events_accountant.evm_accounting_aggregators.serialize_state(),
+        }
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        """Restore the state of serialize_state() after a reset
+
+        May raise:
+        - DeserializationError
+        """
+        try:
+            self.cost_basis.restore_state(data['cost_basis'])
+            self.events_accountant.evm_accounting_aggregators.restore_state(data['accountants'])
+            self.first_event_index = data['processed_events_num']
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s}') from e
 
     def add_in_event(
             self,  # pylint: disable=unused-argument
@@ -174,7 +250,7 @@ class AccountingPot(CustomizableDateMixin):
             amount=amount,
             price=price,
             ignored_asset_ids=self.ignored_asset_ids,
-            starting_index=len(self.processed_events),
+            starting_index=self.first_event_index + len(self.processed_events),
         )
         for prefork_event in prefork_events:
             self._add_processed_event(prefork_event)
@@ -196,7 +272,7 @@ class AccountingPot(CustomizableDateMixin):
             price=price,
             pnl=PNL(),  # filled out later
             cost_basis=None,
-            index=len(self.processed_events),
+            index=self.first_event_index + len(self.processed_events),
         )
         if extra_data:
             event.extra_data = extra_data
@@ -300,7 +376,7 @@ class AccountingPot(CustomizableDateMixin):
             price=price,
             pnl=PNL(),  # filled out later
             cost_basis=spend_cost,
-            index=len(self.processed_events),
+            index=self.first_event_index + len(self.processed_events),
         )
         if extra_data:
             spend_event.extra_data = extra_data
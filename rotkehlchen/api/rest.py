@@ -6,8 +6,9 @@ import sys
 import tempfile
 import traceback
 from collections import defaultdict
-from collections.abc import Callable, Sequence
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from http import HTTPStatus
+from itertools import islice
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal, Optional, cast, get_args, overload
 from zipfile import BadZipFile, ZipFile
@@ -112,6 +113,7 @@ from rotkehlchen.constants.prices import ZERO_PRICE
 from rotkehlchen.constants.resolver import ChainID
 from rotkehlchen.constants.timing import ENS_AVATARS_REFRESH
 from rotkehlchen.data_import.manager import DataImportSource
+from rotkehlchen.db.accounting_checkpoints import DBAccountingCheckpoints
 from rotkehlchen.db.accounting_rules import DBAccountingRules, query_missing_accounting_rules
 from rotkehlchen.db.addressbook import DBAddressbook
 from rotkehlchen.db.calendar import CalendarEntry, CalendarFilterQuery, DBCalendar, ReminderEntry
@@ -148,6 +150,7 @@ from rotkehlchen.db.reports import DBAccountingReports
 from rotkehlchen.db.search_assets import search_assets_levenshtein
 from rotkehlchen.db.settings import ModifiableDBSettings
 from rotkehlchen.db.snapshots import DBSnapshot
+from rotkehlchen.db.timed_balances import serialize_timed_balances
 from rotkehlchen.db.unresolved_conflicts import DBRemoteConflicts
 from rotkehlchen.db.utils import DBAssetBalance, LocationData
 from rotkehlchen.errors.api import (
@@ -189,6 +192,7 @@ from rotkehlchen.globaldb.cache import (
     globaldb_set_general_cache_values,
 )
 from rotkehlchen.globaldb.handler import GlobalDBHandler
+from rotkehlchen.globaldb.manual_price_oracles import ManualPriceOracle
 from rotkehlchen.globaldb.utils import set_token_spam_protocol
 from rotkehlchen.history.events.structures.base import (
     HistoryBaseEntryType,
@@ -213,7 +217,12 @@ from rotkehlchen.inquirer import CurrentPriceOracle, Inquirer
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.premium.premium import PremiumCredentials, has_premium_check
 from rotkehlchen.rotkehlchen import Rotkehlchen
-from rotkehlchen.serialization.serialize import process_result, process_result_list
+from rotkehlchen.serialization.serialize import (
+    json_default,
+    process_result,
+    process_result_for_json,
+    process_result_list,
+)
 from rotkehlchen.tasks.utils import query_missing_prices_of_base_entries
 from rotkehlchen.types import (
     AVAILABLE_MODULES_MAP,
@@ -281,6 +290,8 @@ logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
 OK_RESULT = {'result': True, 'message': ''}
+# Size in characters of the chunks that streamed responses are sent in
+STREAMED_RESPONSE_CHUNK_SIZE = 65536
 
 
 def _wrap_in_ok_result(result: Any, status_code: HTTPStatus | None = None) -> dict[str, Any]:
@@ -311,7 +322,7 @@ def api_response(
         assert not result, 'Provided 204 response with non-zero length response'
         data = ''
     else:
-        data = json.dumps(result)
+        data = json.dumps(result, default=json_default)
 
     return make_response(
         (
@@ -330,11 +341,69 @@ def make_response_from_dict(response_data: dict[str, Any]) -> Response:
     message = response_data.get('message', '')
     status_code = response_data.get('status_code', HTTPStatus.OK)
     return api_response(
-        result=process_result(_wrap_in_result(result=result, message=message)),
+        result=process_result_for_json(_wrap_in_result(result=result, message=message)),
         status_code=status_code,
     )
 
 
+def api_streaming_response(
+        entries: Iterable[Any],
+        extra_fields: Callable[[], dict[str, Any]],
+) -> Response:
+    """Respond with a result containing the given entries and extra fields. The entries
+    are encoded one by one while the response is sent so that neither the entries nor
+    the whole response are ever held in memory.
+
+    extra_fields is called once all the entries have been sent, so it can use data
+    gathered while iterating them. The first chunk of entries is read and encoded before
+    responding so that errors at the start raise here. Since the status code is already
+    sent, an error after that ends the entries there and the response gets an error key
+    with the error message. The response body is not logged.
+    """
+    entries_iterator, chunk, sent = iter(entries), ['{"result": {"entries": ['], 0
+
+    def encode_chunk() -> bool:
+        """Encode the next entries in the chunk until it is big enough to be sent.
+        Returns whether there are no more entries to encode"""
+        nonlocal sent
+        chunk_size = 0
+        for entry in entries_iterator:
+            data = json.dumps(process_result_for_json(entry), default=json_default)
+            chunk.append(data if sent == 0 else f', {data}')
+            sent += 1
+            if (chunk_size := chunk_size + len(data)) >= STREAMED_RESPONSE_CHUNK_SIZE:
+                return False
+
+        return True
+
+    done = encode_chunk()
+
+    def generate() -> Iterator[str]:
+        nonlocal done
+        try:
+            while done is False:
+                yield ''.join(chunk)
+                chunk.clear()
+                done = encode_chunk()
+
+            chunk.append(']' + ''.join(
+                f', {json.dumps(key)}: {json.dumps(value, default=json_default)}'
+                for key, value in process_result_for_json(extra_fields()).items()
+            ) + '}, "message": ""}')
+        except Exception as e:  # pylint: disable=broad-except  # the status code is already sent
+            log.error(f'Failed to stream the response entries due to {e!s}')
+            message = json.dumps(f'Failed to send all the entries due to {e!s}')
+            chunk.append(f']}}, "message": {message}, "error": {message}}}')
+
+        yield ''.join(chunk)
+
+    return Response(
+        generate(),
+        status=HTTPStatus.OK,
+        mimetype='application/json',
+    )
+
+
 def async_api_call() -> Callable:
     """
     This is a decorator that should be used with endpoints that can be called asynchronously.
@@ -528,7 +597,7 @@ class RestAPI:
                         ret = {'result': result, 'message': message}
                         returned_task_result = {
                             'status': 'completed',
-                            'outcome': process_result(ret),
+                            'outcome': process_result_for_json(ret),
                         }
                         if status_code:
                             returned_task_result['status_code'] = status_code
@@ -952,6 +1021,11 @@ class RestAPI:
                 ),
                 'entries_limit': FREE_TRADES_LIMIT if self.rotkehlchen.premium is None else -1,
             }
+            if filter_query.keyset_filter is not None:
+                result['next_page_token'] = filter_query.next_page_token(
+                    rows_num=len(trades),
+                    last_key=(trades[-1].timestamp, trades[-1].identifier) if len(trades) != 0 else None,  # noqa: E501
+                )
 
         return {'result': result, 'message': '', 'status_code': HTTPStatus.OK}
 
@@ -1606,7 +1680,7 @@ class RestAPI:
         with self.rotkehlchen.data.db.conn.read_ctx() as cursor:
             if asset is not None:
                 # TODO: Think about this, but for now this is only balances, not liabilities
-                data = self.rotkehlchen.data.db.query_timed_balances(
+                data = self.rotkehlchen.data.db.query_timed_balances_frame(
                     cursor=cursor,
                     from_ts=from_timestamp,
                     to_ts=to_timestamp,
@@ -1614,14 +1688,14 @@ class RestAPI:
                     balance_type=BalanceType.ASSET,
                 )
             else:  # marshmallow check guarantees collection_id exists
-                data = self.rotkehlchen.data.db.query_collection_timed_balances(
+                data = self.rotkehlchen.data.db.query_collection_timed_balances_frame(
                     cursor=cursor,
                     collection_id=collection_id,  # type: ignore  # collection_id exists here
                     from_ts=from_timestamp,
                     to_ts=to_timestamp,
                 )
 
-        result = process_result_list(data)
+        result = serialize_timed_balances(data)
         return api_response(
             result=_wrap_in_ok_result(result),
             status_code=HTTPStatus.OK,
@@ -2491,6 +2565,11 @@ class RestAPI:
         result_dict = _wrap_in_ok_result(process_result_list(list(nodes)))
         return api_response(result_dict, status_code=HTTPStatus.OK)
 
+    def get_rpc_nodes_health(self, blockchain: SUPPORTED_EVM_CHAINS_TYPE) -> Response:
+        manager = self.rotkehlchen.chains_aggregator.get_chain_manager(blockchain)
+        result_dict = _wrap_in_ok_result(manager.node_inquirer.get_nodes_health())
+        return api_response(result_dict, status_code=HTTPStatus.OK)
+
     def add_rpc_node(self, node: WeightedNode) -> Response:
         try:
             self.rotkehlchen.data.db.add_rpc_node(node)
@@ -3517,6 +3596,17 @@ class RestAPI:
             status_code=HTTPStatus.OK,
         )
 
+    def _invalidate_accounting_checkpoints(self, price_timestamp: Timestamp) -> None:
+        """Delete the accounting checkpoints that may have used a modified manual price"""
+        if not self.rotkehlchen.user_is_logged_in:
+            return
+
+        with self.rotkehlchen.data.db.user_write() as write_cursor:
+            DBAccountingCheckpoints(self.rotkehlchen.data.db).delete_checkpoints_after(
+                write_cursor=write_cursor,
+                timestamp=Timestamp(price_timestamp - ManualPriceOracle.cached_price_max_seconds_distance),  # noqa: E501
+            )
+
     def add_manual_price(
             self,
             from_asset: Asset,
@@ -3537,6 +3627,7 @@ class RestAPI:
         )
         added = GlobalDBHandler.add_single_historical_price(historical_price)
         if added:
+            self._invalidate_accounting_checkpoints(timestamp)
             return api_response(OK_RESULT, status_code=HTTPStatus.OK)
         return api_response(
             result={'result': False, 'message': 'Failed to store manual price'},
@@ -3559,6 +3650,7 @@ class RestAPI:
         )
         edited = GlobalDBHandler.edit_manual_price(historical_price)
         if edited:
+            self._invalidate_accounting_checkpoints(timestamp)
             return api_response(OK_RESULT, status_code=HTTPStatus.OK)
         return api_response(
             result={'result': False, 'message': 'Failed to edit manual price'},
@@ -3583,6 +3675,7 @@ class RestAPI:
     ) -> Response:
         deleted = GlobalDBHandler.delete_manual_price(from_asset, to_asset, timestamp)
         if deleted:
+            self._invalidate_accounting_checkpoints(timestamp)
             return api_response(OK_RESULT, status_code=HTTPStatus.OK)
         return api_response(
             result={'result': False, 'message': 'Failed to delete manual price'},
@@ -3796,13 +3889,33 @@ class RestAPI:
         })
         return api_response(process_result(result_dict), status_code=HTTPStatus.OK)
 
-    def get_report_data(self, filter_query: ReportDataFilterQuery) -> Response:
+    def get_report_data(self, filter_query: ReportDataFilterQuery, stream: bool) -> Response:
         with_limit = False
         entries_limit = -1
         if self.rotkehlchen.premium is None:
             with_limit = True
             entries_limit = FREE_PNL_EVENTS_LIMIT
         dbreports = DBAccountingReports(self.rotkehlchen.data.db)
+        ts_converter = self.rotkehlchen.accountant.pots[0].timestamp_to_date
+        if stream is True:
+            try:
+                events = dbreports.iterate_report_data(filter_=filter_query)
+            except InputError as e:
+                return api_response(wrap_in_fail_result(str(e)), status_code=HTTPStatus.BAD_REQUEST)  # noqa: E501
+
+            if with_limit is True:
+                events = islice(events, FREE_PNL_EVENTS_LIMIT)
+            return api_streaming_response(
+                entries=(x.to_exported_dict(
+                    ts_converter=ts_converter,
+                    export_type=AccountingEventExportType.API,
+                ) for x in events),
+                extra_fields=lambda: {
+                    'entries_found': dbreports.count_report_data(filter_query),
+                    'entries_limit': entries_limit,
+                },
+            )
+
         try:
             report_data, entries_found = dbreports.get_report_data(
                 filter_=filter_query,
@@ -3813,7 +3926,7 @@ class RestAPI:
 
         result = {
             'entries': [x.to_exported_dict(
-                ts_converter=self.rotkehlchen.accountant.pots[0].timestamp_to_date,
+                ts_converter=ts_converter,
                 export_type=AccountingEventExportType.API,
             ) for x in report_data],
             'entries_found': entries_found,
@@ -3944,6 +4057,15 @@ class RestAPI:
         }
         if has_premium is False:
             result['entries_found_total'] = entries_found
+        if filter_query.keyset_filter is not None:  # keyset pagination is not used with groups
+            last_key = None
+            if len(events_result) != 0:
+                last_event: HistoryBaseEntry = events_result[-1]  # type: ignore[assignment]
+                last_key = (last_event.timestamp, last_event.sequence_index, last_event.identifier)
+            result['next_page_token'] = filter_query.next_page_token(
+                rows_num=len(events_result),
+                last_key=last_key,
+            )
 
         return api_response(_wrap_in_ok_result(result), status_code=HTTPStatus.OK)
 
@@ -134,6 +134,7 @@ from rotkehlchen.api.v1.resources import (
     QueriedAddressesResource,
     RefreshGeneralCacheResource,
     ReverseEnsResource,
+    RpcNodesHealthResource,
     RpcNodesResource,
     SettingsResource,
     SpamEvmTokenResource,
@@ -284,6 +285,7 @@ URLS_V1: URLS = [
     ('/blockchains/type/<string:chain_type>/accounts', ChainTypeAccountResource),
     ('/blockchains/<string:blockchain>/accounts', BlockchainsAccountsResource),
     ('/blockchains/<string:blockchain>/nodes', RpcNodesResource),
+    ('/blockchains/<string:blockchain>/nodes/health', RpcNodesHealthResource),
     ('/blockchains/<string:blockchain>/tokens/detect', DetectTokensResource),
     ('/blockchains/<string:blockchain>/xpub', BTCXpubResource),
     ('/blockchains/evm/transactions/add-hash', EvmTransactionsHashResource),
@@ -338,6 +340,9 @@ URLS_V1: URLS = [
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+# Max number of characters of a response body that are logged
+MAX_LOGGED_RESPONSE_SIZE = 10_000
+
 
 def setup_urls(
         rest_api: RestAPI,
@@ -451,12 +456,18 @@ class APIServer:
         """Function that runs after each completed request
 
         Logs the response if required. This is determined by the
-        fake header rotki-log-result passed to all responses.
+        fake header rotki-log-result passed to all responses. Streamed responses
+        are never read and big ones are truncated to MAX_LOGGED_RESPONSE_SIZE.
         """
-        if response.headers.pop('rotki-log-result', 'True') == 'True':
-            result = response.json
-        else:
+        result: Any
+        if response.headers.pop('rotki-log-result', 'True') != 'True':
             result = 'redacted'
+        elif response.is_streamed:
+            result = 'streamed'
+        elif len(data := response.get_data(as_text=True)) > MAX_LOGGED_RESPONSE_SIZE:
+            result = f'{data[:MAX_LOGGED_RESPONSE_SIZE]}... ({len(data)} characters in total)'
+        else:
+            result = response.json
 
         log.debug(
             f'end rotki api {request.method} {request.path}',
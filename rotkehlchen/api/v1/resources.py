@@ -143,6 +143,7 @@ from rotkehlchen.api.v1.schemas import (
     RpcNodeEditSchema,
     RpcNodeListDeleteSchema,
     RpcNodeSchema,
+    RpcNodesHealthSchema,
     SingleAssetIdentifierSchema,
     SingleAssetWithOraclesIdentifierSchema,
     SingleFileSchema,
@@ -816,6 +817,16 @@ class RpcNodesResource(BaseMethodView):
         return self.rest_api.delete_rpc_node(identifier=identifier, blockchain=blockchain)
 
 
+class RpcNodesHealthResource(BaseMethodView):
+
+    get_schema = RpcNodesHealthSchema()
+
+    @require_loggedin_user()
+    @use_kwargs(get_schema, location='view_args')
+    def get(self, blockchain: SUPPORTED_EVM_CHAINS_TYPE) -> Response:
+        return self.rest_api.get_rpc_nodes_health(blockchain=blockchain)
+
+
 class ExternalServicesResource(BaseMethodView):
 
     put_schema = ExternalServicesResourceAddSchema()
@@ -1635,8 +1646,8 @@ class AccountingReportDataResource(BaseMethodView):
 
     @require_loggedin_user()
     @ignore_kwarg_parser.use_kwargs(post_schema, location='json_and_query_and_view_args')
-    def post(self, filter_query: ReportDataFilterQuery) -> Response:
-        return self.rest_api.get_report_data(filter_query=filter_query)
+    def post(self, filter_query: ReportDataFilterQuery, stream: bool) -> Response:
+        return self.rest_api.get_report_data(filter_query=filter_query, stream=stream)
 
 
 class HistoryExportingResource(BaseMethodView):
@@ -65,6 +65,7 @@ from rotkehlchen.db.filtering import (
     EthStakingEventFilterQuery,
     EvmEventFilterQuery,
     EvmTransactionsFilterQuery,
+    HistoryBaseEntryFilterQuery,
     HistoryEventFilterQuery,
     LevenshteinFilterQuery,
     LocationAssetMappingsFilterQuery,
@@ -73,6 +74,7 @@ from rotkehlchen.db.filtering import (
     ReportDataFilterQuery,
     TradesFilterQuery,
     UserNotesFilterQuery,
+    deserialize_keyset_token,
 )
 from rotkehlchen.db.settings import ModifiableDBSettings
 from rotkehlchen.db.utils import DBAssetBalance, LocationData
@@ -242,6 +244,66 @@ class DBPaginationSchema(Schema):
     offset = fields.Integer(load_default=None)
 
 
+class DBKeysetPaginationSchema(DBPaginationSchema):
+    """Pagination that can be by keyset instead of offset, so that deep pages are as fast
+    as the first one. keyset_pagination asks for the first page and the next_page_token
+    returned with each page asks for the following one. Needs a DBOrderBySchema."""
+    keyset_pagination = fields.Boolean(load_default=False)
+    page_token = fields.String(load_default=None)
+
+    @validates_schema
+    def validate_keyset_pagination_schema(
+            self,
+            data: dict[str, Any],
+            **_kwargs: Any,
+    ) -> None:
+        if data['keyset_pagination'] is False and data['page_token'] is None:
+            return
+
+        if data['limit'] is None:
+            raise ValidationError(
+                message='limit is required for keyset pagination',
+                field_name='limit',
+            )
+        if data['offset'] not in (None, 0):
+            raise ValidationError(
+                message='offset can not be used with keyset pagination',
+                field_name='offset',
+            )
+        if data['order_by_attributes'] not in (None, ['timestamp']):
+            raise ValidationError(
+                message='keyset pagination can only order by timestamp',
+                field_name='order_by_attributes',
+            )
+
+    def paginate_by_keyset(
+            self,
+            filter_query: HistoryBaseEntryFilterQuery | TradesFilterQuery,
+            data: dict[str, Any],
+    ) -> None:
+        """Switch the filter query to keyset pagination if it was asked for"""
+        if data['keyset_pagination'] is False and data['page_token'] is None:
+            return
+
+        columns = filter_query.keyset_columns(
+            ascending=data['ascending'][0] if data['ascending'] is not None else False,
+        )
+        after = None
+        if data['page_token'] is not None:
+            try:
+                after = deserialize_keyset_token(data['page_token'])
+            except DeserializationError as e:
+                raise ValidationError(message=str(e), field_name='page_token') from e
+
+            if len(after) != len(columns):
+                raise ValidationError(
+                    message=f'Invalid page token {data["page_token"]}',
+                    field_name='page_token',
+                )
+
+        filter_query.paginate_by_keyset(columns=columns, limit=data['limit'], after=after)
+
+
 class DBOrderBySchema(Schema):
     order_by_attributes = DelimitedOrNormalList(fields.String(), load_default=None)
     ascending = DelimitedOrNormalList(fields.Boolean(), load_default=None)  # most recent first by default  # noqa: E501
@@ -457,7 +519,7 @@ class TradesQuerySchema(
         AsyncQueryArgumentSchema,
         TimestampRangeSchema,
         OnlyCacheQuerySchema,
-        DBPaginationSchema,
+        DBKeysetPaginationSchema,
         DBOrderBySchema,
 ):
     base_asset = AssetField(expected_type=Asset, load_default=None)
@@ -541,6 +603,7 @@ class TradesQuerySchema(
             trades_idx_to_ignore=trades_idx_to_ignore,
             exclude_ignored_assets=data['exclude_ignored_assets'],
         )
+        self.paginate_by_keyset(filter_query=filter_query, data=data)
 
         return {
             'async_query': data['async_query'],
@@ -682,7 +745,7 @@ class TypesAndCounterpatiesFiltersSchema(Schema):
 class HistoryEventSchema(
     TypesAndCounterpatiesFiltersSchema,
     TimestampRangeSchema,
-    DBPaginationSchema,
+    DBKeysetPaginationSchema,
     DBOrderBySchema,
 ):
     """Schema for querying history events"""
@@ -733,6 +796,11 @@ class HistoryEventSchema(
                 message=error_msg,
                 field_name='order_by_attributes',
             )
+        if data['group_by_event_ids'] is True and (data['keyset_pagination'] is True or data['page_token'] is not None):  # noqa: E501
+            raise ValidationError(
+                message='keyset pagination can not be used when grouping events',
+                field_name='group_by_event_ids',
+            )
 
     @post_load
     def make_history_event_filter(
@@ -812,6 +880,7 @@ class HistoryEventSchema(
         else:
             filter_query = HistoryEventFilterQuery.make(**common_arguments)
 
+        self.paginate_by_keyset(filter_query=filter_query, data=data)
         return self.generate_fields_post_validation(data) | {
             'filter_query': filter_query,
         }
@@ -1367,6 +1436,7 @@ class ModifiableSettingsSchema(Schema):
     ask_user_upon_size_discrepancy = fields.Boolean(load_default=None)
     auto_detect_tokens = fields.Boolean(load_default=None)
     csv_export_delimiter = fields.String(load_default=None)
+    hedge_slow_rpc_queries = fields.Boolean(load_default=None)
 
     @validates_schema
     def validate_settings_schema(
@@ -1429,6 +1499,7 @@ class ModifiableSettingsSchema(Schema):
             ask_user_upon_size_discrepancy=data['ask_user_upon_size_discrepancy'],
             auto_detect_tokens=data['auto_detect_tokens'],
             csv_export_delimiter=data['csv_export_delimiter'],
+            hedge_slow_rpc_queries=data['hedge_slow_rpc_queries'],
         )
 
 
@@ -1700,6 +1771,7 @@ class AccountingReportsSchema(Schema):
 class AccountingReportDataSchema(TimestampRangeSchema, DBPaginationSchema, DBOrderBySchema):
     report_id = fields.Integer(load_default=None)
     event_type = SerializableEnumField(enum_class=SchemaEventType, load_default=None)
+    stream = fields.Boolean(load_default=False)
 
     @validates_schema
     def validate_report_schema(
@@ -1744,6 +1816,7 @@ class AccountingReportDataSchema(TimestampRangeSchema, DBPaginationSchema, DBOrd
         )
         return {
             'filter_query': filter_query,
+            'stream': data['stream'],
         }
 
 
@@ -3091,6 +3164,13 @@ class RpcNodeSchema(Schema):
     blockchain = BlockchainField(required=True, exclude_types=(SupportedBlockchain.ETHEREUM_BEACONCHAIN,))  # noqa: E501
 
 
+class RpcNodesHealthSchema(Schema):
+    blockchain = BlockchainField(
+        required=True,
+        exclude_types=[x for x in SupportedBlockchain if x.is_evm() is False],
+    )
+
+
 class RpcAddNodeSchema(Schema):
     blockchain = BlockchainField(required=True, exclude_types=(SupportedBlockchain.ETHEREUM_BEACONCHAIN,))  # noqa: E501
     name = fields.String(
@@ -3443,6 +3523,13 @@ class ExportHistoryEventSchema(HistoryEventSchema, AsyncQueryArgumentSchema):
     def make_extra_filtering_arguments(self, data: dict[str, Any]) -> dict[str, Any]:
         return {}
 
+    def paginate_by_keyset(
+            self,
+            filter_query: HistoryBaseEntryFilterQuery | TradesFilterQuery,
+            data: dict[str, Any],
+    ) -> None:
+        """All the events are exported so they are never paginated"""
+
     def generate_fields_post_validation(self, data: dict[str, Any]) -> dict[str, Any]:
         extra_fields = {}
         if (directory_path := data.get('directory_path')) is not None:
@@ -5,6 +5,12 @@ from rotkehlchen.types import (
 )
 
 DEFAULT_EVM_RPC_TIMEOUT = 10
+# Max number of calls sent to an EVM node in a single JSON-RPC batch request
+DEFAULT_RPC_BATCH_SIZE = 50
+# Max number of queries sent concurrently to a single EVM node
+MAX_CONCURRENT_NODE_QUERIES = 4
+# Max number of multicall chunks queried concurrently
+MULTICALL_CONCURRENCY = 4
 NON_BITCOIN_CHAINS = [
     SupportedBlockchain.AVALANCHE,
     SupportedBlockchain.POLKADOT,
@@ -11,6 +11,7 @@ from rotkehlchen.chain.evm.decoding.structures import (
     DEFAULT_DECODING_OUTPUT,
     ActionItem,
     DecodingOutput,
+    event_rule_for,
 )
 from rotkehlchen.chain.evm.decoding.types import CounterpartyDetails
 from rotkehlchen.chain.evm.structures import EvmTxReceiptLog
@@ -64,6 +65,10 @@ class EthereumTransactionDecoder(EVMTransactionDecoderWithDSProxy):
             ),
         )
 
+    @event_rule_for(
+        (string_to_evm_address('0xDE3e5a990bCE7fC60a6f017e7c4a95fc4939299E'), GTC_CLAIM),
+        (string_to_evm_address('0xE295aD71242373C37C5FdA7B57F26f9eA1088AFe'), MERKLE_CLAIM),
+    )
     def _maybe_enrich_transfers(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
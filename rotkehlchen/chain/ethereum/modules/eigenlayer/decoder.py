@@ -90,6 +90,7 @@ class EigenlayerDecoder(CliqueAirdropDecoderInterface, ReloadableDecoderMixin):
 
     That event is in DelegationManager.
     """
+    reads_decoded_events = True  # completed withdrawals are matched to the queued ones
 
     def __init__(
             self,
@@ -1,15 +1,17 @@
 from collections import defaultdict
 from collections.abc import Iterator
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from rotkehlchen.accounting.mixins.event import AccountingEventType
 from rotkehlchen.chain.evm.accounting.interfaces import ModuleAccountantInterface
 from rotkehlchen.chain.evm.accounting.structures import EventsAccountantCallback
 from rotkehlchen.constants import ZERO
 from rotkehlchen.constants.assets import A_DAI
+from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.fval import FVal
 from rotkehlchen.history.events.structures.base import get_event_type_identifier
 from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
+from rotkehlchen.serialization.deserialize import deserialize_fval
 
 from .constants import CPT_DSR, CPT_VAULT
 
@@ -25,6 +27,22 @@ class MakerdaoAccountant(ModuleAccountantInterface):
         self.vault_balances: dict[str, FVal] = defaultdict(FVal)
         self.dsr_balances: dict[ChecksumEvmAddress, FVal] = defaultdict(FVal)
 
+    def serialize_state(self) -> dict[str, Any]:
+        # as lists of pairs since the cdp ids are not always strings
+        return {
+            'vault_balances': [[cdp_id, str(amount)] for cdp_id, amount in self.vault_balances.items()],  # noqa: E501
+            'dsr_balances': [[address, str(amount)] for address, amount in self.dsr_balances.items()],  # noqa: E501
+        }
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        try:
+            for cdp_id, amount in data['vault_balances']:
+                self.vault_balances[cdp_id] = deserialize_fval(value=amount, name='vault balance', location='makerdao accountant')  # noqa: E501
+            for address, amount in data['dsr_balances']:
+                self.dsr_balances[address] = deserialize_fval(value=amount, name='dsr balance', location='makerdao accountant')  # noqa: E501
+        except (KeyError, ValueError, TypeError) as e:
+            raise DeserializationError(f'Could not restore makerdao accountant state due to {e!s}') from e  # noqa: E501
+
     def _process_vault_dai_generation(
             self,
             pot: 'AccountingPot',  # pylint: disable=unused-argument
@@ -16,6 +16,7 @@ from rotkehlchen.chain.evm.decoding.structures import (
     DecodingOutput,
     EnricherContext,
     TransferEnrichmentOutput,
+    event_rule_for,
 )
 from rotkehlchen.chain.evm.decoding.types import CounterpartyDetails
 from rotkehlchen.chain.evm.decoding.utils import maybe_reshuffle_events
@@ -452,6 +453,7 @@ class MakerdaosaiDecoder(DecoderInterface):
 
         return DEFAULT_DECODING_OUTPUT
 
+    @event_rule_for(SAI_CDP_MIGRATION_TOPIC)
     def _decode_sai_cdp_migration(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
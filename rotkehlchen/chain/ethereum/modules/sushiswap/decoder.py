@@ -14,6 +14,7 @@ from rotkehlchen.chain.evm.decoding.structures import (
     DEFAULT_DECODING_OUTPUT,
     ActionItem,
     DecodingOutput,
+    event_rule_for,
 )
 from rotkehlchen.chain.evm.decoding.types import CounterpartyDetails
 from rotkehlchen.chain.evm.structures import EvmTxReceiptLog
@@ -33,6 +34,7 @@ SUSHISWAP_V2_INIT_CODE_HASH = '0xe18a34eb0e04b04f7a0ac29a6e80748dca96319b42c54d6
 
 class SushiswapDecoder(DecoderInterface):
 
+    @event_rule_for(SWAP_SIGNATURE)
     def _maybe_decode_v2_swap(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
@@ -54,6 +56,7 @@ class SushiswapDecoder(DecoderInterface):
             )
         return DEFAULT_DECODING_OUTPUT
 
+    @event_rule_for(MINT_SIGNATURE, BURN_SIGNATURE)
     def _maybe_decode_v2_liquidity_addition_and_removal(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
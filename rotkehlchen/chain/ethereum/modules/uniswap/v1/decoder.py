@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING
 from rotkehlchen.assets.asset import EvmToken
 from rotkehlchen.chain.ethereum.modules.aave.v1.decoder import DEFAULT_DECODING_OUTPUT
 from rotkehlchen.chain.evm.decoding.interfaces import DecoderInterface
-from rotkehlchen.chain.evm.decoding.structures import ActionItem, DecodingOutput
+from rotkehlchen.chain.evm.decoding.structures import ActionItem, DecodingOutput, event_rule_for
 from rotkehlchen.chain.evm.decoding.types import CounterpartyDetails
 from rotkehlchen.chain.evm.decoding.uniswap.constants import CPT_UNISWAP_V1, UNISWAP_ICON
 from rotkehlchen.chain.evm.decoding.utils import maybe_reshuffle_events
@@ -31,6 +31,7 @@ ETH_PURCHASE = b'\x7f@\x91\xb4l3\xe9\x18\xa0\xf3\xaaB0vA\xd1{\xb6p)BzSi\xe5K59\x
 
 class Uniswapv1Decoder(DecoderInterface):
 
+    @event_rule_for(TOKEN_PURCHASE, ETH_PURCHASE)
     def _maybe_decode_swap(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
@@ -13,6 +13,7 @@ from rotkehlchen.chain.evm.decoding.structures import (
     DEFAULT_DECODING_OUTPUT,
     ActionItem,
     DecodingOutput,
+    event_rule_for,
 )
 from rotkehlchen.chain.evm.decoding.types import CounterpartyDetails
 from rotkehlchen.chain.evm.decoding.uniswap.constants import CPT_UNISWAP_V2, UNISWAP_ICON
@@ -65,6 +66,7 @@ class Uniswapv2Decoder(DecoderInterface):
             native_currency=self.evm_inquirer.native_token,
         )
 
+    @event_rule_for(SWAP_SIGNATURE)
     def _maybe_decode_v2_swap(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
@@ -95,6 +97,7 @@ class Uniswapv2Decoder(DecoderInterface):
 
         return DEFAULT_DECODING_OUTPUT
 
+    @event_rule_for(MINT_SIGNATURE, BURN_SIGNATURE)
     def _maybe_decode_v2_liquidity_addition_and_removal(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
@@ -3,9 +3,10 @@ import logging
 import pkgutil
 from contextlib import suppress
 from types import ModuleType
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from rotkehlchen.errors.misc import ModuleLoadingError
+from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.user_messages import MessagesAggregator
 
@@ -94,6 +95,25 @@ class EVMAccountingAggregator:
         for accountant in self.accountants.values():
             accountant.reset()
 
+    def serialize_state(self) -> dict[str, dict[str, Any]]:
+        """Serialize the state of the submodule accountants that keep any"""
+        return {
+            name: state for name, accountant in self.accountants.items()
+            if len(state := accountant.serialize_state()) != 0
+        }
+
+    def restore_state(self, data: dict[str, dict[str, Any]]) -> None:
+        """Restore the state of serialize_state() after a reset
+
+        May raise:
+        - DeserializationError
+        """
+        for name, state in data.items():
+            if (accountant := self.accountants.get(name)) is None:
+                raise DeserializationError(f'Unknown accountant {name} in serialized state')
+
+            accountant.restore_state(state)
+
 
 class EVMAccountingAggregators:
     """
@@ -120,3 +140,23 @@ class EVMAccountingAggregators:
         """Reset the state of all initialized submodule accountants"""
         for aggregator in self.aggregators:
             aggregator.reset()
+
+    def serialize_state(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Serialize the state of the submodule accountants of all chains"""
+        return {
+            aggregator.node_inquirer.chain_name: state for aggregator in self.aggregators
+            if len(state := aggregator.serialize_state()) != 0
+        }
+
+    def restore_state(self, data: dict[str, dict[str, dict[str, Any]]]) -> None:
+        """Restore the state of serialize_state() after a reset
+
+        May raise:
+        - DeserializationError
+        """
+        aggregators = {x.node_inquirer.chain_name: x for x in self.aggregators}
+        for chain_name, state in data.items():
+            if (aggregator := aggregators.get(chain_name)) is None:
+                raise DeserializationError(f'Unknown chain {chain_name} in serialized accountants state')  # noqa: E501
+
+            aggregator.restore_state(state)
@@ -1,7 +1,7 @@
 import logging
 from abc import ABC, abstractmethod
 from collections.abc import Iterator
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from rotkehlchen.accounting.mixins.event import AccountingEventType
 from rotkehlchen.constants import ZERO
@@ -49,7 +49,22 @@ class ModuleAccountantInterface(ABC):
         """
 
     def reset(self) -> None:
-        """Subclasses may implement this to reset state between accounting runs"""
+        """Subclasses may implement this to reset state between accounting runs
+
+        If they keep any state they also need to implement serialize_state and
+        restore_state so that the state can be stored in accounting checkpoints."""
+        return None
+
+    def serialize_state(self) -> dict[str, Any]:
+        """Serialize the state kept between the processed events"""
+        return {}
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        """Restore the state of serialize_state() after a reset
+
+        May raise:
+        - DeserializationError
+        """
         return None
 
 
@@ -4,6 +4,7 @@ import operator
 import pkgutil
 import traceback
 from abc import ABC, abstractmethod
+from collections import Counter
 from collections.abc import Callable, Sequence
 from contextlib import suppress
 from dataclasses import dataclass
@@ -69,7 +70,9 @@ from .structures import (
     DecoderContext,
     DecodingOutput,
     EnricherContext,
+    EventRuleKey,
     TransferEnrichmentOutput,
+    event_rule_for,
 )
 from .utils import maybe_reshuffle_events
 
@@ -86,9 +89,12 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 MIN_LOGS_PROCESSED_TO_SLEEP = 1000
+# Number of transactions whose data is read and whose events are saved together when decoding
+DECODING_CHUNK_SIZE = 100
 
 
 class EventDecoderFunction(Protocol):
+    __qualname__: str
 
     def __call__(
             self,
@@ -180,7 +186,7 @@ class EVMTransactionDecoder(ABC):
         self.dbevmtx = dbevmtx_class(self.database)
         self.dbevents = DBHistoryEvents(self.database)
         self.base = base_tools
-        self.rules = DecodingRules(
+        self.rules: DecodingRules = DecodingRules(
             address_mappings={},
             event_rules=[
                 self._maybe_decode_erc20_approve,
@@ -197,11 +203,14 @@ class EVMTransactionDecoder(ABC):
         self.decoders: dict[str, DecoderInterface] = {}
         self.addresses_exceptions = addresses_exceptions or {}
         self.exceptions_mappings = exceptions_mappings or {}
+        # addresses handled by decoders that read previously decoded events from the DB
+        self.addresses_reading_decoded_events: set[ChecksumEvmAddress] = set()
 
         # Add the built-in decoders
         self._add_builtin_decoders(self.rules)
         # Recursively check all submodules to get all decoder address mappings and rules
         self.rules += self._recursively_initialize_decoders(self.chain_modules_root)
+        self._compile_event_rules()
         self.undecoded_tx_query_lock = Semaphore()
 
     def _add_builtin_decoders(self, rules: DecodingRules) -> None:
@@ -268,6 +277,8 @@ class EVMTransactionDecoder(ABC):
                 self.assert_keys_are_unique(new_struct=new_struct, main_struct=main_struct, class_name=class_name, type_name=type_name)  # noqa: E501
 
         rules.address_mappings.update(new_address_to_decoders)
+        if self.decoders[class_name].reads_decoded_events:
+            self.addresses_reading_decoded_events.update(new_address_to_decoders)
         rules.event_rules.extend(self.decoders[class_name].decoding_rules())
         rules.input_data_rules.update(new_input_data_rules)
         rules.token_enricher_rules.extend(self.decoders[class_name].enricher_rules())
@@ -334,6 +345,8 @@ class EVMTransactionDecoder(ABC):
             new_mappings = decoder.reload_data()
             if new_mappings is not None:
                 self.rules.address_mappings.update(new_mappings)
+                if decoder.reads_decoded_events:
+                    self.addresses_reading_decoded_events.update(new_mappings)
                 self.rules.addresses_to_counterparties.update(decoder.addresses_to_counterparties())
 
     def reload_data(self, cursor: 'DBCursor') -> None:
@@ -356,6 +369,44 @@ class EVMTransactionDecoder(ABC):
 
             self._reload_single_decoder(cursor, decoder)
 
+    def _compile_event_rules(self) -> None:
+        """Index the event rules by the topic0 and (address, topic0) they declared with
+        event_rule_for. Each index entry keeps the rules that can match it along with the
+        undeclared rules, in their original order, so that the order rules are tried in
+        does not change."""
+        rules_keys: list[tuple[EventDecoderFunction, frozenset[EventRuleKey] | None]] = [
+            (rule, getattr(rule, 'event_rule_keys', None)) for rule in self.rules.event_rules
+        ]
+        self.generic_event_rules = [rule for rule, keys in rules_keys if keys is None]
+        self.event_rules_index: dict[EventRuleKey, list[EventDecoderFunction]] = {}
+        for key in set().union(*(keys for _, keys in rules_keys if keys is not None)):
+            topic = key[1] if isinstance(key, tuple) else key
+            self.event_rules_index[key] = [
+                rule for rule, keys in rules_keys
+                if keys is None or key in keys or topic in keys
+            ]
+
+        # how many times each event rule was tried and returned something or not
+        self.event_rules_hits: Counter[str] = Counter()
+        self.event_rules_misses: Counter[str] = Counter()
+
+    def event_rules_for(self, tx_log: EvmTxReceiptLog) -> list[EventDecoderFunction]:
+        """The event rules that can decode the given log, in the order to try them"""
+        if len(tx_log.topics) == 0:
+            return []  # ignore anonymous events
+
+        if (rules := self.event_rules_index.get((tx_log.address, tx_log.topics[0]))) is not None:
+            return rules
+
+        return self.event_rules_index.get(tx_log.topics[0], self.generic_event_rules)
+
+    def get_event_rules_stats(self) -> dict[str, tuple[int, int]]:
+        """Hits and misses of each event rule since the decoder was created. For profiling"""
+        return {
+            name: (self.event_rules_hits[name], self.event_rules_misses[name])
+            for name in self.event_rules_hits | self.event_rules_misses
+        }
+
     def try_all_rules(
             self,
             token: 'EvmToken | None',
@@ -364,24 +415,28 @@ class EVMTransactionDecoder(ABC):
             decoded_events: list['EvmEvent'],
             action_items: list[ActionItem],
             all_logs: list[EvmTxReceiptLog],
+            rules: list[EventDecoderFunction] | None = None,
     ) -> DecodingOutput | None:
         """
         Execute event rules for the current tx log. Returns None when no
         new event or actions need to be propagated.
-        """
-        for rule in self.rules.event_rules:
-            if len(tx_log.topics) == 0:
-                continue  # ignore anonymous events
 
+        `rules` are the rules to try, if already looked up with event_rules_for.
+        """
+        for rule in (self.event_rules_for(tx_log) if rules is None else rules):
             try:
                 decoding_output = rule(token=token, tx_log=tx_log, transaction=transaction, decoded_events=decoded_events, action_items=action_items, all_logs=all_logs)  # noqa: E501
             except (DeserializationError, IndexError) as e:
+                self.event_rules_misses[rule.__qualname__] += 1
                 self.msg_aggregator.add_error(f'Decoding tx log with index {tx_log.log_index} of {transaction.tx_hash.hex()} through {rule} failed due to {e!s}. Skipping rule.')  # noqa: E501
                 continue
 
             if decoding_output.event is not None or len(decoding_output.action_items) > 0:
+                self.event_rules_hits[rule.__qualname__] += 1
                 return decoding_output
 
+            self.event_rules_misses[rule.__qualname__] += 1
+
         return None
 
     def decode_by_address_rules(self, context: DecoderContext) -> DecodingOutput:
@@ -462,10 +517,63 @@ class EVMTransactionDecoder(ABC):
         - a flag which is True if balances refresh is needed
         - A list of decoders to reload or None if no need
         """
-        log.debug(f'Starting decoding of transaction {transaction.tx_hash.hex()} logs at {self.evm_inquirer.chain_name}')  # noqa: E501
         with self.database.conn.read_ctx() as read_cursor:
             tx_id = transaction.get_or_query_db_id(read_cursor)
 
+        events, refresh_balances, reload_decoders = self._decode_transaction_events(
+            transaction=transaction,
+            tx_receipt=tx_receipt,
+        )
+        with self.database.user_write() as write_cursor:
+            self._save_decoded_transactions(
+                write_cursor=write_cursor,
+                decoded=[(tx_id, transaction, events)],
+            )
+
+        events = sorted(events, key=lambda x: x.sequence_index, reverse=False)
+        return events, refresh_balances, reload_decoders  # Propagate for post processing in the caller  # noqa: E501
+
+    def _save_decoded_transactions(
+            self,
+            write_cursor: 'DBCursor',
+            decoded: Sequence[tuple[int, EvmTransaction, list['EvmEvent']]],
+    ) -> None:
+        """Save the events of the given decoded transactions and mark them as decoded"""
+        for _, transaction, events in decoded:
+            if len(events) > 0:
+                self.dbevents.add_history_events(
+                    write_cursor=write_cursor,
+                    history=events,
+                )
+            else:
+                # This is probably a phishing zero value token transfer tx.
+                # Details here: https://github.com/rotki/rotki/issues/5749
+                with suppress(InputError):  # We don't care if it's already in the DB
+                    self.database.add_to_ignored_action_ids(
+                        write_cursor=write_cursor,
+                        action_type=ActionType.HISTORY_EVENT,
+                        identifiers=[transaction.identifier],
+                    )
+
+        write_cursor.executemany(
+            'INSERT OR IGNORE INTO evm_tx_mappings(tx_id, value) VALUES(?, ?)',
+            [(tx_id, EVMTX_DECODED) for tx_id, _, _ in decoded],
+        )
+
+    def _decode_transaction_events(
+            self,
+            transaction: EvmTransaction,
+            tx_receipt: EvmTxReceipt,
+    ) -> tuple[list['EvmEvent'], bool, set[str] | None]:
+        """
+        Decodes an evm transaction and its receipt without saving anything in the DB.
+
+        Returns
+        - the list of decoded events
+        - a flag which is True if balances refresh is needed
+        - A list of decoders to reload or None if no need
+        """
+        log.debug(f'Starting decoding of transaction {transaction.tx_hash.hex()} logs at {self.evm_inquirer.chain_name}')  # noqa: E501
         self.base.reset_sequence_counter()
         # check if any eth transfer happened in the transaction, including in internal transactions
         events = self._maybe_decode_simple_transactions(transaction, tx_receipt)
@@ -527,6 +635,9 @@ class EVMTransactionDecoder(ABC):
                 events.append(decoding_output.event)
                 continue
 
+            if len(rules := self.event_rules_for(tx_log)) == 0:
+                continue  # no need to look up the token if no rule can decode the log
+
             rules_decoding_output = self.try_all_rules(
                 token=get_token(evm_address=tx_log.address, chain_id=self.evm_inquirer.chain_id),
                 tx_log=tx_log,
@@ -534,6 +645,7 @@ class EVMTransactionDecoder(ABC):
                 decoded_events=events,
                 action_items=action_items,
                 all_logs=tx_receipt.logs,
+                rules=rules,
             )
             if rules_decoding_output is not None:
                 if rules_decoding_output.refresh_balances is True:
@@ -572,29 +684,7 @@ class EVMTransactionDecoder(ABC):
         if len(events) == 0 and (eth_event := self._get_eth_transfer_event(transaction)) is not None:  # noqa: E501
             events = [eth_event]
 
-        with self.database.user_write() as write_cursor:
-            if len(events) > 0:
-                self.dbevents.add_history_events(
-                    write_cursor=write_cursor,
-                    history=events,
-                )
-            else:
-                # This is probably a phishing zero value token transfer tx.
-                # Details here: https://github.com/rotki/rotki/issues/5749
-                with suppress(InputError):  # We don't care if it's already in the DB
-                    self.database.add_to_ignored_action_ids(
-                        write_cursor=write_cursor,
-                        action_type=ActionType.HISTORY_EVENT,
-                        identifiers=[transaction.identifier],
-                    )
-
-            write_cursor.execute(
-                'INSERT OR IGNORE INTO evm_tx_mappings(tx_id, value) VALUES(?, ?)',
-                (tx_id, EVMTX_DECODED),
-            )
-
-        events = sorted(events, key=lambda x: x.sequence_index, reverse=False)
-        return events, refresh_balances, reload_decoders  # Propagate for post processing in the caller  # noqa: E501
+        return events, refresh_balances, reload_decoders
 
     def get_and_decode_undecoded_transactions(
             self,
@@ -676,10 +766,14 @@ class EVMTransactionDecoder(ABC):
             events: list['EvmEvent'] | None = None,
             send_ws_notifications: bool = False,
             delete_customized: bool = False,
+            chunk_size: int = DECODING_CHUNK_SIZE,
     ) -> None:
         """Make sure that receipts are pulled + events decoded for the given transaction hashes.
         If delete_customized is True then also customized events are deleted before redecoding.
 
+        The transactions are decoded in chunks of chunk_size. The data of each chunk is read
+        from the DB at once and all of its decoded events are saved in one write transaction.
+
         The transaction hashes must exist in the DB at the time of the call.
         This logic modifies the `events` argument if it isn't none.
 
@@ -694,47 +788,30 @@ class EVMTransactionDecoder(ABC):
         refresh_balances = False
         total_transactions = len(tx_hashes)
         log.debug(f'Started logic to decode {total_transactions} transactions from {self.evm_inquirer.chain_id}')  # noqa: E501
-        for tx_index, tx_hash in enumerate(tx_hashes):
-            log.debug(f'Decoding logic started for {tx_hash.hex()} ({self.evm_inquirer.chain_name})')  # noqa: E501
-            if send_ws_notifications and tx_index % 10 == 0:
-                log.debug(f'Processed {tx_index} out of {total_transactions} transactions from {self.evm_inquirer.chain_id}')  # noqa: E501
+        for chunk_start in range(0, total_transactions, chunk_size):
+            if send_ws_notifications:
+                log.debug(f'Processed {chunk_start} out of {total_transactions} transactions from {self.evm_inquirer.chain_id}')  # noqa: E501
                 self.msg_aggregator.add_message(
                     message_type=WSMessageType.EVM_UNDECODED_TRANSACTIONS,
                     data={
                         'chain': self.evm_inquirer.chain_name,
                         'total': total_transactions,
-                        'processed': tx_index,
+                        'processed': chunk_start,
                     },
                 )
 
-            # TODO: Change this if transaction filter query can accept multiple hashes
-            with self.database.conn.read_ctx() as cursor:
-                try:
-                    tx, receipt = self.transactions.get_or_create_transaction(
-                        cursor=cursor,
-                        tx_hash=tx_hash,
-                        relevant_address=None,
-                    )
-                except RemoteError as e:
-                    raise InputError(f'{self.evm_inquirer.chain_name} hash {tx_hash.hex()} does not correspond to a transaction. {e}') from e  # noqa: E501
-
-            new_events, new_refresh_balances, reload_decoders = self._get_or_decode_transaction_events(  # noqa: E501
-                transaction=tx,
-                tx_receipt=receipt,
+            new_events, new_refresh_balances = self._decode_transactions_chunk(
+                tx_hashes=tx_hashes[chunk_start:chunk_start + chunk_size],
                 ignore_cache=ignore_cache,
                 delete_customized=delete_customized,
+                with_events=events is not None,
             )
-
             if events is not None:
                 events.extend(new_events)
 
             if new_refresh_balances is True:
                 refresh_balances = True
 
-            if reload_decoders is not None:
-                with self.database.conn.read_ctx() as cursor:
-                    self.reload_specific_decoders(cursor, decoders=reload_decoders)
-
         if send_ws_notifications:
             self.msg_aggregator.add_message(
                 message_type=WSMessageType.EVM_UNDECODED_TRANSACTIONS,
@@ -748,6 +825,126 @@ class EVMTransactionDecoder(ABC):
         self._post_process(refresh_balances=refresh_balances)
         maybe_detect_new_tokens(self.database)
 
+    def _decode_transactions_chunk(
+            self,
+            tx_hashes: list[EVMTxHash],
+            ignore_cache: bool,
+            delete_customized: bool,
+            with_events: bool,
+    ) -> tuple[list['EvmEvent'], bool]:
+        """Decode the given transactions, reusing the events of the already decoded ones
+        unless ignore_cache is True, and save all the new events in one write transaction.
+        With ignore_cache the old events of a transaction are deleted in the write that
+        saves its new ones, so a failure while decoding the chunk keeps them.
+
+        Returns:
+        - the events of all the transactions in their order, if with_events is True
+        - a flag which is True if balances refresh is needed
+
+        May raise:
+        - DeserializationError if there is a problem with contacting a remote to get receipts
+        - RemoteError if there is a problem with contacting a remote to get receipts
+        - InputError if the transaction hash is not found in the DB
+        """
+        with self.database.conn.read_ctx() as cursor:
+            transactions = self.transactions.get_transactions_and_receipts(
+                cursor=cursor,
+                tx_hashes=tx_hashes,
+            )
+            for tx_hash in tx_hashes:  # pull the data that is not in the DB yet
+                if tx_hash in transactions:
+                    continue
+
+                try:
+                    transactions[tx_hash] = self.transactions.get_or_create_transaction(
+                        cursor=cursor,
+                        tx_hash=tx_hash,
+                        relevant_address=None,
+                    )
+                except RemoteError as e:
+                    raise InputError(f'{self.evm_inquirer.chain_name} hash {tx_hash.hex()} does not correspond to a transaction. {e}') from e  # noqa: E501
+
+            transactions = {x: transactions[x] for x in tx_hashes}  # keep the given order
+            tx_ids = {x: tx.get_or_query_db_id(cursor) for x, (tx, _) in transactions.items()}
+
+        def save_decoded(
+                decoded: list[tuple[int, EvmTransaction, list['EvmEvent']]],
+                redecoded_hashes: list[EVMTxHash],
+        ) -> None:
+            """Save the decoded transactions. If ignoring the cache, the old events of the
+            given hashes are deleted in the same write so that they are only lost once
+            the new ones are saved."""
+            with self.database.user_write() as write_cursor:
+                if ignore_cache is True and len(redecoded_hashes) != 0:
+                    self.dbevents.delete_events_by_tx_hash(
+                        write_cursor=write_cursor,
+                        tx_hashes=redecoded_hashes,
+                        location=Location.from_chain_id(self.evm_inquirer.chain_id),
+                        delete_customized=delete_customized,
+                    )
+                    write_cursor.executemany(
+                        'DELETE from evm_tx_mappings WHERE tx_id=? AND value IN (?, ?)',
+                        [(tx_ids[x], EVMTX_DECODED, EVMTX_SPAM) for x in redecoded_hashes],
+                    )
+                self._save_decoded_transactions(write_cursor=write_cursor, decoded=decoded)
+
+        decoded_events: dict[EVMTxHash, list[EvmEvent]] = {}
+        if ignore_cache is False:  # see which transactions are decoded and get their events
+            with self.database.conn.read_ctx() as cursor:
+                cursor.execute(
+                    f'SELECT tx_id from evm_tx_mappings WHERE value=? AND '
+                    f'tx_id IN ({",".join(["?"] * len(tx_ids))})',
+                    (EVMTX_DECODED, *tx_ids.values()),
+                )
+                decoded_ids = {x[0] for x in cursor}
+                decoded_events = {x: [] for x, tx_id in tx_ids.items() if tx_id in decoded_ids}
+                if with_events and len(decoded_events) != 0:
+                    for event in self.dbevents.get_history_events(
+                        cursor=cursor,
+                        filter_query=EvmEventFilterQuery.make(tx_hashes=list(decoded_events)),
+                        has_premium=True,  # for this function we don't limit anything
+                    ):
+                        decoded_events[event.tx_hash].append(event)
+
+        refresh_balances = False
+        pending: list[tuple[int, EvmTransaction, list[EvmEvent]]] = []
+        for tx_hash, (transaction, tx_receipt) in transactions.items():
+            if tx_hash in decoded_events:
+                continue
+
+            if (
+                (len(pending) != 0 or ignore_cache is True) and
+                any(x.address in self.addresses_reading_decoded_events for x in tx_receipt.logs)
+            ):
+                # save the pending events first and drop the old events of this transaction,
+                # since decoding it may look them up
+                save_decoded(
+                    decoded=pending,
+                    redecoded_hashes=[x[1].tx_hash for x in pending] + [tx_hash],
+                )
+                pending = []
+
+            new_events, new_refresh_balances, reload_decoders = self._decode_transaction_events(
+                transaction=transaction,
+                tx_receipt=tx_receipt,
+            )
+            pending.append((tx_ids[tx_hash], transaction, new_events))
+            decoded_events[tx_hash] = sorted(new_events, key=lambda x: x.sequence_index)
+            if new_refresh_balances is True:
+                refresh_balances = True
+
+            if reload_decoders is not None:
+                with self.database.conn.read_ctx() as cursor:
+                    self.reload_specific_decoders(cursor, decoders=reload_decoders)
+
+        if len(pending) != 0:
+            save_decoded(decoded=pending, redecoded_hashes=[x[1].tx_hash for x in pending])
+
+        if with_events is False:
+            return [], refresh_balances
+
+        return [event for x in transactions for event in decoded_events[x]], refresh_balances
+
     def _get_or_decode_transaction_events(
             self,
             transaction: EvmTransaction,
@@ -867,6 +1064,7 @@ class EVMTransactionDecoder(ABC):
             counterparty=counterparty,
         )
 
+    @event_rule_for(ERC20_APPROVE)
     def _maybe_decode_erc20_approve(
             self,
             token: 'EvmToken | None',
@@ -1002,6 +1200,7 @@ class EVMTransactionDecoder(ABC):
             events.append(eth_event)
         return events
 
+    @event_rule_for(ERC20_OR_ERC721_TRANSFER)
     def _maybe_decode_erc20_721_transfer(
             self,
             token: 'EvmToken | None',
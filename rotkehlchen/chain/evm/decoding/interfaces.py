@@ -70,6 +70,9 @@ CACHE_QUERY_METHOD_TYPE = (
 
 
 class DecoderInterface(ABC):
+    # Set by decoders that look up in the DB the events of previously decoded transactions.
+    # Batched decoding saves the pending events before decoding transactions they handle.
+    reads_decoded_events: bool = False
 
     def __init__(
             self,
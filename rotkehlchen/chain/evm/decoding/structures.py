@@ -1,6 +1,6 @@
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Final, Literal, NamedTuple, Optional
+from typing import TYPE_CHECKING, Final, Literal, NamedTuple, Optional, TypeVar
 
 from rotkehlchen.types import ChecksumEvmAddress
 
@@ -103,3 +103,17 @@ class TransferEnrichmentOutput(NamedTuple):
 
 DEFAULT_DECODING_OUTPUT: Final = DecodingOutput()
 FAILED_ENRICHMENT_OUTPUT: Final = TransferEnrichmentOutput()
+
+# What an event rule can decode. Either a topic0 or an (address, topic0) pair
+EventRuleKey = bytes | tuple[ChecksumEvmAddress, bytes]
+T = TypeVar('T', bound=Callable)
+
+
+def event_rule_for(*keys: EventRuleKey) -> Callable[[T], T]:
+    """Declare the logs an event rule can decode so that the decoder only tries it for them.
+    Rules without this declaration are tried for every log."""
+    def decorator(rule: T) -> T:
+        rule.event_rule_keys = frozenset(keys)  # type: ignore[attr-defined]
+        return rule
+
+    return decorator
@@ -22,6 +22,7 @@ from rotkehlchen.chain.evm.decoding.structures import (
     DecodingOutput,
     EnricherContext,
     TransferEnrichmentOutput,
+    event_rule_for,
 )
 from rotkehlchen.chain.evm.decoding.types import CounterpartyDetails
 from rotkehlchen.chain.evm.decoding.uniswap.utils import decode_basic_uniswap_info
@@ -176,6 +177,7 @@ class Uniswapv3CommonDecoder(DecoderInterface):
 
         return DEFAULT_DECODING_OUTPUT
 
+    @event_rule_for(SWAP_SIGNATURE)
     def _maybe_decode_v3_swap(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
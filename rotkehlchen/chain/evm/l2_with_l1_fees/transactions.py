@@ -1,5 +1,6 @@
 import logging
 from abc import ABC
+from collections.abc import Sequence
 from typing import TYPE_CHECKING, Any, Optional, cast
 
 from rotkehlchen.chain.evm.l2_with_l1_fees.node_inquirer import L2WithL1FeesInquirer
@@ -13,7 +14,7 @@ if TYPE_CHECKING:
     from rotkehlchen.chain.evm.structures import EvmTxReceipt
     from rotkehlchen.db.dbhandler import DBHandler
     from rotkehlchen.db.drivers.gevent import DBCursor
-    from rotkehlchen.types import ChecksumEvmAddress, EVMTxHash
+    from rotkehlchen.types import ChecksumEvmAddress, EvmTransaction, EVMTxHash
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
@@ -75,3 +76,20 @@ class L2WithL1FeesTransactions(EvmTransactions, ABC):
         query, bindings = self.dbevmtx._form_evm_transaction_dbquery(query=query, bindings=bindings, has_premium=True)  # noqa: E501
         tx_data = cursor.execute(query, bindings).fetchone()
         return tx_data, tx_receipt
+
+    def get_transactions_and_receipts(
+            self,
+            cursor: 'DBCursor',
+            tx_hashes: Sequence['EVMTxHash'],
+    ) -> dict['EVMTxHash', tuple['EvmTransaction', 'EvmTxReceipt']]:
+        """In addition to the base class logic, leaves out the transactions that have
+        no l1_fee value in the database so that it gets pulled for them"""
+        result = super().get_transactions_and_receipts(cursor=cursor, tx_hashes=tx_hashes)
+        cursor.execute(
+            f'SELECT txs.tx_hash FROM evm_transactions AS txs '
+            f'INNER JOIN optimism_transactions AS op_txs ON txs.identifier = op_txs.tx_id '
+            f'WHERE txs.chain_id=? AND txs.tx_hash IN ({",".join(["?"] * len(result))})',
+            [self.evm_inquirer.chain_id.serialize_for_db(), *result],
+        )
+        with_l1_fee = {x[0] for x in cursor}
+        return {k: v for k, v in result.items() if k in with_l1_fee}
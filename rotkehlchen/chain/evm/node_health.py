@@ -0,0 +1,104 @@
+"""Live health statistics of the nodes used to query an EVM chain
+
+For each node the latency and outcome of its latest queries are kept. They are used
+to order the nodes so that fast and reliable ones are queried first and to decide
+when a query takes long enough to also send it to another node.
+"""
+import math
+import operator
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from rotkehlchen.chain.evm.types import WeightedNode
+
+# Number of latest queries of each node that its statistics are computed from
+NODE_HEALTH_WINDOW = 100
+# Number of queries a node needs before its statistics are used
+MIN_NODE_HEALTH_SAMPLES = 5
+# Nodes that failed more than this ratio of their latest queries are queried last
+MAX_HEALTHY_ERROR_RATE = 0.5
+
+
+class NodeHealth:
+    """Latency in seconds and outcome of the latest queries of a node"""
+
+    def __init__(self) -> None:
+        self.latencies: deque[float] = deque(maxlen=NODE_HEALTH_WINDOW)
+        self.failures: deque[bool] = deque(maxlen=NODE_HEALTH_WINDOW)
+
+    def record(self, latency: float, failed: bool) -> None:
+        self.latencies.append(latency)
+        self.failures.append(failed)
+
+    @property
+    def samples(self) -> int:
+        return len(self.latencies)
+
+    def error_rate(self) -> float:
+        return sum(self.failures) / self.samples if self.samples != 0 else 0.0
+
+    def latency_percentile(self, percentile: int) -> float | None:
+        """Nearest rank percentile of the latencies or None if there are none"""
+        if self.samples == 0:
+            return None
+
+        ordered = sorted(self.latencies)
+        return ordered[max(math.ceil(percentile / 100 * len(ordered)) - 1, 0)]
+
+    def score(self) -> float:
+        """Ratio of successful queries divided by the typical latency. Higher is better"""
+        return (1 - self.error_rate()) / (1 + (self.latency_percentile(50) or 0))
+
+    def serialize(self) -> dict[str, Any]:
+        p50, p95 = self.latency_percentile(50), self.latency_percentile(95)
+        return {
+            'samples': self.samples,
+            'error_rate': round(self.error_rate(), 4),
+            'latency_p50': round(p50, 4) if p50 is not None else None,
+            'latency_p95': round(p95, 4) if p95 is not None else None,
+            'score': round(self.score(), 4),
+        }
+
+
+class NodesHealth:
+    """Health statistics of the nodes of a chain, by node name"""
+
+    def __init__(self) -> None:
+        self.nodes: dict[str, NodeHealth] = {}
+
+    def record(self, node_name: str, latency: float, failed: bool) -> None:
+        if (health := self.nodes.get(node_name)) is None:
+            health = self.nodes[node_name] = NodeHealth()
+
+        health.record(latency=latency, failed=failed)
+
+    def measured(self, node_name: str) -> NodeHealth | None:
+        """The statistics of the node if there are enough of them to be used"""
+        if (health := self.nodes.get(node_name)) is None or health.samples < MIN_NODE_HEALTH_SAMPLES:  # noqa: E501
+            return None
+
+        return health
+
+    def hedge_after(self, node_name: str) -> float | None:
+        """Seconds after which a query to the node is slower than 95% of its latest ones"""
+        return health.latency_percentile(95) if (health := self.measured(node_name)) else None
+
+    def order(self, nodes: list['WeightedNode']) -> list['WeightedNode']:
+        """Order the nodes by their health. Healthy nodes go first with the best score
+        first, then the nodes without enough statistics in their given order and
+        then the unhealthy ones"""
+        healthy, unmeasured, unhealthy = [], [], []
+        for node in nodes:
+            if (health := self.measured(node.node_info.name)) is None:
+                unmeasured.append(node)
+            elif health.error_rate() > MAX_HEALTHY_ERROR_RATE:
+                unhealthy.append((health.score(), node))
+            else:
+                healthy.append((health.score(), node))
+
+        return (
+            [node for _, node in sorted(healthy, key=operator.itemgetter(0), reverse=True)] +
+            unmeasured +
+            [node for _, node in sorted(unhealthy, key=operator.itemgetter(0), reverse=True)]
+        )
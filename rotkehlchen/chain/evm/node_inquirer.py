@@ -1,29 +1,40 @@
 import json
 import logging
 import random
+import time
 from abc import ABC, abstractmethod
+from collections import defaultdict
 from collections.abc import Callable, Sequence
 from contextlib import suppress
+from http import HTTPStatus
 from itertools import zip_longest
 from typing import TYPE_CHECKING, Any, Literal
 from urllib.parse import urlparse
 
+import gevent
 import requests
 from ens import ENS
 from eth_abi.exceptions import DecodingError
 from eth_typing.abi import ABI
 from eth_utils.abi import get_abi_output_types
-from requests import RequestException
+from gevent.lock import BoundedSemaphore
+from gevent.pool import Pool
+from requests import HTTPError, RequestException
 from web3 import HTTPProvider, Web3
 from web3._utils.contracts import find_matching_event_abi
 from web3._utils.filters import construct_event_filter_params
 from web3.datastructures import MutableAttributeDict
 from web3.exceptions import InvalidAddress, TransactionNotFound, Web3Exception
 from web3.middleware import ExtraDataToPOAMiddleware
-from web3.types import BlockIdentifier, FilterParams
+from web3.types import BlockIdentifier, FilterParams, RPCEndpoint
 
 from rotkehlchen.assets.asset import CryptoAsset
-from rotkehlchen.chain.constants import DEFAULT_EVM_RPC_TIMEOUT
+from rotkehlchen.chain.constants import (
+    DEFAULT_EVM_RPC_TIMEOUT,
+    DEFAULT_RPC_BATCH_SIZE,
+    MAX_CONCURRENT_NODE_QUERIES,
+    MULTICALL_CONCURRENCY,
+)
 from rotkehlchen.chain.ethereum.types import LogIterationCallback
 from rotkehlchen.chain.ethereum.utils import MULTICALL_CHUNKS, should_update_protocol_cache
 from rotkehlchen.chain.evm.constants import (
@@ -35,11 +46,15 @@ from rotkehlchen.chain.evm.constants import (
     GENESIS_HASH,
 )
 from rotkehlchen.chain.evm.contracts import EvmContract, EvmContracts
+from rotkehlchen.chain.evm.node_health import NodeHealth, NodesHealth
 from rotkehlchen.chain.evm.proxies_inquirer import EvmProxiesInquirer
+from rotkehlchen.chain.evm.rpc_cache import EvmRpcCache, RpcCacheMiddleware
 from rotkehlchen.chain.evm.types import NodeName, Web3Node, WeightedNode
 from rotkehlchen.constants import ONE
+from rotkehlchen.db.settings import CachedSettings
 from rotkehlchen.errors.misc import (
     BlockchainQueryError,
+    CallTooLargeError,
     EventNotInABI,
     NotERC721Conformant,
     RemoteError,
@@ -84,6 +99,33 @@ def _connect_task_prefix(chain_name: str) -> str:
     return f'Attempt connection to {chain_name} node'
 
 
+# Parts of the errors of nodes that reject a call for needing too much gas or for
+# returning a too big response, in lowercase
+CALL_TOO_LARGE_ERRORS = (
+    'out of gas',
+    'gas required exceeds',
+    'exceeds block gas limit',
+    'response size',
+    'response is too big',
+    'response too large',
+    'entity too large',
+    'payload too large',
+)
+
+
+def _is_call_too_large(error: Exception) -> bool:
+    """Whether the error means that the node rejected the call for its size"""
+    if (
+        isinstance(error, requests.exceptions.HTTPError) and
+        error.response is not None and
+        error.response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    ):
+        return True
+
+    message = str(error).lower()
+    return any(x in message for x in CALL_TOO_LARGE_ERRORS)
+
+
 WEB3_LOGQUERY_BLOCK_RANGE = 250000
 MAX_NODE_LOG_QUERY_CALLS = 500  # max queries for a node that can query logs from up to 1000/10_000 blocks  # noqa: E501
 
@@ -196,7 +238,22 @@ class EvmNodeInquirer(ABC, LockableQueryMixIn):
         '_get_transaction_receipt',
         '_get_transaction_by_hash',
         '_get_logs',
+        '_query_rpc_batch',
     )
+    # methods that make a single query to the node, without querying anything else
+    # through _query, so they can wait for a free slot of the node without deadlocking
+    methods_limited_per_node = (
+        '_call_contract',
+        '_get_block_by_number',
+        '_get_code',
+        '_get_latest_block_number',
+        '_get_transaction_by_hash',
+        '_get_transaction_receipt',
+        '_query_rpc_batch',
+    )
+    # methods whose latency depends on how much they query, so it can't be compared with
+    # the single queries. They are not recorded in the nodes health and not hedged.
+    methods_without_health_samples = ('_query_rpc_batch',)
 
     def __init__(
             self,
@@ -239,6 +296,15 @@ class EvmNodeInquirer(ABC, LockableQueryMixIn):
         # moment of writing this we don't remove entries from the set after some time.
         # To force the app to retry a node a restart is needed.
         self.failed_to_connect_nodes: set[str] = set()
+        # endpoints of the nodes that do not accept JSON-RPC batch requests
+        self.nodes_without_rpc_batches: set[str] = set()
+        self.nodes_health = NodesHealth()
+        # limits the queries sent concurrently to each node, by node name
+        self.nodes_query_slots: defaultdict[str, BoundedSemaphore] = defaultdict(
+            lambda: BoundedSemaphore(MAX_CONCURRENT_NODE_QUERIES),
+        )
+        # raw results of the node queries that can't change, like calls at a past block
+        self.rpc_cache = EvmRpcCache(database=database, chain_id=self.chain_id)
         LockableQueryMixIn.__init__(self)
 
     def maybe_connect_to_nodes(self, when_tracked_accounts: bool) -> None:
@@ -282,6 +348,22 @@ class EvmNodeInquirer(ABC, LockableQueryMixIn):
     def get_connected_nodes(self) -> list[NodeName]:
         return list(self.web3_mapping.keys())
 
+    def get_nodes_health(self) -> list[dict[str, Any]]:
+        """Live health statistics of the connected and already queried nodes"""
+        connected = {node.name: web3node for node, web3node in self.web3_mapping.items()}
+        result = []
+        for name in sorted(connected.keys() | self.nodes_health.nodes.keys()):
+            web3node = connected.get(name)
+            result.append({
+                'name': name,
+                'connected': web3node is not None,
+                'is_pruned': web3node.is_pruned if web3node is not None else None,
+                'is_archive': web3node.is_archive if web3node is not None else None,
+                **self.nodes_health.nodes.get(name, NodeHealth()).serialize(),
+            })
+
+        return result
+
     def default_call_order(self, skip_etherscan: bool = False) -> list[WeightedNode]:
         """Default call order for evm nodes
 
@@ -299,6 +381,10 @@ class EvmNodeInquirer(ABC, LockableQueryMixIn):
         - Without weights
         ===> Runs: 66, 82, 72, 58, 72 seconds
         ---> Average: 70 seconds
+
+        Once enough queries to a node have been made its live health statistics are used
+        instead of its weight. Healthy nodes go first with the fastest and most reliable
+        first, then the nodes that were not queried enough and last the unhealthy ones.
         """
         open_nodes = self.database.get_rpc_nodes(blockchain=self.blockchain, only_active=True)
         if skip_etherscan:
@@ -313,6 +399,7 @@ class EvmNodeInquirer(ABC, LockableQueryMixIn):
             ordered_list.append(node[0])
             selection.remove(node[0])
 
+        ordered_list = self.nodes_health.order(ordered_list)
         owned_nodes = [node.node_info for node in open_nodes if node.node_info.owned]
         if len(owned_nodes) != 0:
             # Assigning one is just a default since we always use it.
@@ -411,6 +498,12 @@ class EvmNodeInquirer(ABC, LockableQueryMixIn):
             # https://web3py.readthedocs.io/en/stable/middleware.html#why-is-geth-poa-middleware-necessary
             web3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
 
+        # innermost so that the raw responses are cached and the other middlewares still apply
+        web3.middleware_onion.inject(
+            RpcCacheMiddleware.for_cache(self.rpc_cache),  # type: ignore[arg-type]  # web3 only calls it with the Web3 object
+            name='rpc_cache',
+            layer=0,
+        )
         return web3, rpc_endpoint
 
     def attempt_connect(
@@ -519,13 +612,114 @@ class EvmNodeInquirer(ABC, LockableQueryMixIn):
                 connectivity_check=True,
             )
 
+    def _timed_call(
+            self,
+            method: Callable,
+            node_name: str,
+            web3: Web3 | None,
+            kwargs: dict[str, Any],
+    ) -> Any:
+        """Call the method for the node and record its latency and whether it failed, unless
+        the call was cancelled or its latency is not comparable. Waits for a free query slot
+        of the node first if the method is limited per node."""
+        if method.__name__ not in self.methods_limited_per_node:
+            return self._measured_call(method=method, node_name=node_name, web3=web3, kwargs=kwargs)  # noqa: E501
+
+        with self.nodes_query_slots[node_name]:
+            return self._measured_call(method=method, node_name=node_name, web3=web3, kwargs=kwargs)  # noqa: E501
+
+    def _measured_call(
+            self,
+            method: Callable,
+            node_name: str,
+            web3: Web3 | None,
+            kwargs: dict[str, Any],
+    ) -> Any:
+        if method.__name__ in self.methods_without_health_samples:
+            return method(web3, **kwargs)
+
+        start, failed, cancelled = time.monotonic(), True, False
+        try:
+            result = method(web3, **kwargs)
+            failed = False
+        except (TransactionNotFound, InvalidAddress):
+            failed = False  # the node answered
+            raise
+        except gevent.GreenletExit:
+            cancelled = True  # another node answered first so this one has no outcome
+            raise
+        finally:
+            if cancelled is False:
+                self.nodes_health.record(node_name, latency=time.monotonic() - start, failed=failed)  # noqa: E501
+
+        return result
+
+    def _hedge_node(
+            self,
+            method: Callable,
+            next_nodes: Sequence[WeightedNode],
+    ) -> tuple[str, Web3] | None:
+        """The first connected node of the rest of the call order that can answer the method"""
+        for weighted_node in next_nodes:
+            if (
+                (web3node := self.web3_mapping.get(weighted_node.node_info)) is not None and
+                not (method.__name__ in self.methods_that_query_past_data and web3node.is_pruned)
+            ):
+                return weighted_node.node_info.name, web3node.web3_instance
+
+        return None
+
+    def _call_node(
+            self,
+            method: Callable,
+            node_name: str,
+            web3: Web3 | None,
+            kwargs: dict[str, Any],
+            hedge_node: tuple[str, Web3] | None = None,
+    ) -> Any:
+        """Call the method for the node. If a hedge node is given and the call takes longer
+        than the 95th percentile latency of the node, the call is also sent to the hedge
+        node. The first successful result is returned and the other call is cancelled.
+        If both fail the error of the first node is raised."""
+        if hedge_node is None or (hedge_after := self.nodes_health.hedge_after(node_name)) is None:
+            return self._timed_call(method=method, node_name=node_name, web3=web3, kwargs=kwargs)
+
+        def capture(name: str, node_web3: Web3 | None) -> tuple[Any, Exception | None]:
+            try:  # return the error so that gevent does not report the greenlet as failed
+                return self._timed_call(method=method, node_name=name, web3=node_web3, kwargs=kwargs), None  # noqa: E501
+            except Exception as e:  # pylint: disable=broad-except  # raised in the caller
+                return None, e
+
+        first = gevent.spawn(capture, node_name, web3)
+        first.join(timeout=hedge_after)
+        if not first.ready():
+            log.debug(f'Query of {method.__name__} to {node_name} took longer than {hedge_after:.2f} seconds. Also querying {hedge_node[0]}')  # noqa: E501
+            greenlets = [first, gevent.spawn(capture, *hedge_node)]
+            for greenlet in gevent.iwait(greenlets):
+                if greenlet.value[1] is None:
+                    first = greenlet
+                    break
+
+            gevent.killall([x for x in greenlets if x is not first], block=False)
+
+        result, error = first.get()
+        if error is not None:
+            raise error
+
+        return result
+
     def _query(self, method: Callable, call_order: Sequence[WeightedNode], **kwargs: Any) -> Any:
         """Queries evm related data by performing a query of the provided method to all given nodes
 
         The first node in the call order that gets a successful response returns.
-        If none get a result then RemoteError is raised
+        If none get a result then RemoteError is raised. It is a CallTooLargeError if
+        a node rejected the call for its size.
         """
-        for weighted_node in call_order:
+        call_too_large, hedge = False, (
+            CachedSettings().get_settings().hedge_slow_rpc_queries is True and
+            method.__name__ not in self.methods_without_health_samples
+        )
+        for idx, weighted_node in enumerate(call_order):
             node_info = weighted_node.node_info
             web3node = self.web3_mapping.get(node_info, None)
             if (
@@ -551,7 +745,13 @@ class EvmNodeInquirer(ABC, LockableQueryMixIn):
 
             try:
                 web3 = web3node.web3_instance if web3node is not None else None
-                result = method(web3, **kwargs)
+                result = self._call_node(
+                    method=method,
+                    node_name=node_info.name,
+                    web3=web3,
+                    kwargs=kwargs,
+                    hedge_node=self._hedge_node(method, call_order[idx + 1:]) if hedge else None,
+                )
             except TransactionNotFound:
                 if kwargs.get('must_exist', False) is True:
                     continue  # try other nodes, as transaction has to exist
@@ -571,6 +771,7 @@ class EvmNodeInquirer(ABC, LockableQueryMixIn):
             ) as e:
                 log.warning(f'Failed to query {node_info.name} for {method!s} due to {e!s}')
                 # Catch all possible errors here and just try next node call
+                call_too_large = call_too_large or _is_call_too_large(e)
                 continue
 
             return result
@@ -580,6 +781,12 @@ class EvmNodeInquirer(ABC, LockableQueryMixIn):
             f'Failed to query {method!s} after trying the following '
             f'nodes: {[x.node_info.name for x in call_order]}',
         )
+        if call_too_large is True:
+            raise CallTooLargeError(
+                f'The {self.blockchain!s} nodes rejected {method!s} for needing too much '
+                f'gas or for returning a too big response',
+            )
+
         raise RemoteError(
             f'Please check your network and confirm sufficient nodes are connected for {self.blockchain!s}.',  # noqa: E501
         )
@@ -592,10 +799,12 @@ class EvmNodeInquirer(ABC, LockableQueryMixIn):
         return self.etherscan.get_latest_block_number()
 
     def get_latest_block_number(self, call_order: Sequence[WeightedNode] | None = None) -> int:
-        return self._query(
+        block_number = self._query(
             method=self._get_latest_block_number,
             call_order=call_order if call_order is not None else self.default_call_order(),
         )
+        self.rpc_cache.update_latest_block(block_number)
+        return block_number
 
     def get_block_by_number(
             self,
@@ -742,6 +951,42 @@ class EvmNodeInquirer(ABC, LockableQueryMixIn):
             ) from e
         return result
 
+    def _deserialize_raw_receipt(self, tx_receipt: dict[str, Any], source: str) -> None:
+        """Turn the hex numbers of a receipt as returned by the JSON-RPC API to ints, in place
+
+        May raise:
+        - RemoteError if the receipt can't be deserialized
+        """
+        try:
+            block_number = int(tx_receipt['blockNumber'], 16)
+            tx_receipt['blockNumber'] = block_number
+            tx_receipt['cumulativeGasUsed'] = int(tx_receipt['cumulativeGasUsed'], 16)
+            tx_receipt['gasUsed'] = int(tx_receipt['gasUsed'], 16)
+            tx_receipt['status'] = int(tx_receipt.get('status', '0x1'), 16)
+            tx_index = int(tx_receipt['transactionIndex'], 16)
+            tx_receipt['transactionIndex'] = tx_index
+            for receipt_log in tx_receipt['logs']:
+                receipt_log['blockNumber'] = block_number
+                receipt_log['logIndex'] = deserialize_int_from_hex(
+                    symbol=receipt_log['logIndex'],
+                    location=f'{source} tx receipt',
+                )
+                receipt_log['transactionIndex'] = tx_index
+            # This is only implemented for some evm chains
+            self._additional_receipt_processing(tx_receipt)
+        except (DeserializationError, Web3Exception, ValueError, KeyError, TypeError) as e:
+            msg = str(e)
+            if isinstance(e, KeyError):
+                msg = f'missing key {msg}'
+            log.error(
+                f'Couldnt deserialize transaction receipt {tx_receipt} data from '
+                f'{source} due to {msg}',
+            )
+            raise RemoteError(
+                f'Couldnt deserialize transaction receipt data from {source} '
+                f'due to {msg}. Check logs for details',
+            ) from e
+
     def _get_transaction_receipt(
             self,
             web3: Web3 | None,
@@ -758,37 +1003,7 @@ class EvmNodeInquirer(ABC, LockableQueryMixIn):
 
                 return None  # else it does not exist
 
-            try:
-                # Turn hex numbers to int
-                block_number = int(tx_receipt['blockNumber'], 16)
-                tx_receipt['blockNumber'] = block_number
-                tx_receipt['cumulativeGasUsed'] = int(tx_receipt['cumulativeGasUsed'], 16)
-                tx_receipt['gasUsed'] = int(tx_receipt['gasUsed'], 16)
-                tx_receipt['status'] = int(tx_receipt.get('status', '0x1'), 16)
-                tx_index = int(tx_receipt['transactionIndex'], 16)
-                tx_receipt['transactionIndex'] = tx_index
-                for receipt_log in tx_receipt['logs']:
-                    receipt_log['blockNumber'] = block_number
-                    receipt_log['logIndex'] = deserialize_int_from_hex(
-                        symbol=receipt_log['logIndex'],
-                        location='etherscan tx receipt',
-                    )
-                    receipt_log['transactionIndex'] = tx_index
-                # This is only implemented for some evm chains
-                self._additional_receipt_processing(tx_receipt)
-            except (DeserializationError, Web3Exception, ValueError, KeyError) as e:
-                msg = str(e)
-                if isinstance(e, KeyError):
-                    msg = f'missing key {msg}'
-                log.error(
-                    f'Couldnt deserialize transaction receipt {tx_receipt} data from '
-                    f'etherscan due to {msg}',
-                )
-                raise RemoteError(
-                    f'Couldnt deserialize transaction receipt data from etherscan '
-                    f'due to {msg}. Check logs for details',
-                ) from e
-
+            self._deserialize_raw_receipt(tx_receipt=tx_receipt, source='etherscan')
             if must_exist and tx_receipt is None:  # fail, so other nodes can be tried
                 raise RemoteError(f'Querying for {self.chain_name} receipt {tx_hash.hex()} returned None')  # noqa: E501
 
@@ -837,6 +1052,134 @@ class EvmNodeInquirer(ABC, LockableQueryMixIn):
             raise RemoteError(f'{self.chain_name} tx_receipt should exist for {tx_hash.hex()}')
         return tx_receipt
 
+    def _query_rpc_batch(
+            self,
+            web3: Web3 | None,
+            calls: Sequence[tuple[str, Sequence[Any]]],
+            batch_size: int = DEFAULT_RPC_BATCH_SIZE,
+    ) -> list[Any]:
+        """Send the given (method, params) JSON-RPC calls to the node in batches of batch_size
+        and return their raw results in the same order. Calls that return an error give None.
+
+        If a batch fails, its calls are sent one by one. If the node rejected or mishandled
+        the batch and the single calls succeed, then the node does not accept batches and
+        the rest of the calls to it are also sent one by one. Failures that may be transient,
+        like a timeout or a server error, only make this batch be sent one by one.
+
+        The calls that are in the rpc cache are not sent and the results of the rest are
+        cached if they can't change.
+
+        May raise:
+        - RemoteError if etherscan is given since it has no JSON-RPC batch API
+        - RequestException if the node can't be reached
+        """
+        if web3 is None:
+            raise RemoteError('Etherscan does not support JSON-RPC batch requests')
+
+        provider: HTTPProvider = web3.provider  # type: ignore[assignment]  # we only use HTTPProvider
+        results = self.rpc_cache.get_many(calls)
+        uncached = [idx for idx, result in enumerate(results) if result is None]
+        for chunk_indices in get_chunks(uncached, n=batch_size):
+            chunk = [calls[idx] for idx in chunk_indices]
+            responses, rejected = None, False
+            if provider.endpoint_uri not in self.nodes_without_rpc_batches:
+                try:
+                    responses = provider.make_batch_request([(RPCEndpoint(method), params) for method, params in chunk])  # noqa: E501
+                except RequestException as e:
+                    log.debug(f'JSON-RPC batch request to {provider.endpoint_uri} failed due to {e!s}')  # noqa: E501
+                    # a client error other than rate limiting means the payload was refused
+                    rejected = (
+                        isinstance(e, HTTPError) and e.response is not None and
+                        400 <= e.response.status_code < 500 and
+                        e.response.status_code != HTTPStatus.TOO_MANY_REQUESTS
+                    )
+                except (Web3Exception, ValueError, TypeError, AttributeError) as e:
+                    log.debug(f'JSON-RPC batch request to {provider.endpoint_uri} failed due to {e!s}')  # noqa: E501
+                    rejected = True
+                else:
+                    if not isinstance(responses, list) or len(responses) != len(chunk):
+                        responses, rejected = None, True
+
+            if responses is None:
+                responses = [provider.make_request(RPCEndpoint(method), params) for method, params in chunk]  # noqa: E501
+                if rejected is True:
+                    log.debug(f'{self.chain_name} node {provider.endpoint_uri} does not accept JSON-RPC batch requests')  # noqa: E501
+                    self.nodes_without_rpc_batches.add(provider.endpoint_uri)  # type: ignore[arg-type]  # always set for HTTPProvider
+
+            for idx, response in zip(chunk_indices, responses, strict=True):
+                if isinstance(response, dict) and 'error' not in response:
+                    results[idx] = response.get('result')
+
+            self.rpc_cache.add_many([
+                (calls[idx][0], calls[idx][1], results[idx]) for idx in chunk_indices
+            ])
+
+        return results
+
+    def query_rpc_batch(
+            self,
+            calls: Sequence[tuple[str, Sequence[Any]]],
+            batch_size: int = DEFAULT_RPC_BATCH_SIZE,
+            call_order: Sequence[WeightedNode] | None = None,
+    ) -> list[Any]:
+        """Send independent JSON-RPC calls, such as eth_getTransactionReceipt,
+        eth_getBlockByNumber, eth_getCode or eth_call, with as few requests as possible to
+        the first node that can be reached. Returns the raw result of each call, or None if
+        it failed, in the given order.
+
+        May raise:
+        - RemoteError if no node could be queried
+        """
+        return self._query(
+            method=self._query_rpc_batch,
+            call_order=call_order if call_order is not None else self.default_call_order(skip_etherscan=True),  # noqa: E501
+            calls=calls,
+            batch_size=batch_size,
+        )
+
+    def get_transaction_receipts(
+            self,
+            tx_hashes: Sequence[EVMTxHash],
+            batch_size: int = DEFAULT_RPC_BATCH_SIZE,
+    ) -> dict[EVMTxHash, dict[str, Any]]:
+        """Get the receipts of many transactions, which are assumed to exist on-chain,
+        with JSON-RPC batch requests. The receipts that can't be queried this way are
+        queried one by one with get_transaction_receipt. Transactions whose receipt
+        can't be queried at all are left out of the result.
+        """
+        batch_hashes = [x for x in tx_hashes if x != GENESIS_HASH]
+        try:
+            raw_receipts = self.query_rpc_batch(
+                calls=[('eth_getTransactionReceipt', [x.hex()]) for x in batch_hashes],
+                batch_size=batch_size,
+            )
+        except RemoteError as e:
+            log.warning(f'Failed to query {self.chain_name} receipts with JSON-RPC batches due to {e!s}')  # noqa: E501
+            raw_receipts = [None] * len(batch_hashes)
+
+        receipts = {}
+        for tx_hash, raw_receipt in zip(batch_hashes, raw_receipts, strict=True):
+            if raw_receipt is None:
+                continue
+
+            try:
+                self._deserialize_raw_receipt(tx_receipt=raw_receipt, source='JSON-RPC batch')
+            except RemoteError:
+                continue  # will be queried on its own
+
+            receipts[tx_hash] = raw_receipt
+
+        for tx_hash in tx_hashes:
+            if tx_hash in receipts:
+                continue
+
+            try:
+                receipts[tx_hash] = self.get_transaction_receipt(tx_hash=tx_hash)
+            except RemoteError as e:
+                log.warning(f'Failed to query information for {self.chain_name} transaction {tx_hash.hex()} due to {e!s}. Skipping...')  # noqa: E501
+
+        return receipts
+
     def _get_transaction_by_hash(
             self,
             web3: Web3 | None,
@@ -1121,20 +1464,30 @@ class EvmNodeInquirer(ABC, LockableQueryMixIn):
     ) -> Any:
         """Uses MULTICALL contract. Failure of one call is a failure of the entire multicall.
         source: https://etherscan.io/address/0xeefBa1e63905eF1D7ACbA5a8513c70307C1cE441#code
+        The chunks of calls_chunk_size calls are queried concurrently.
         Can raise:
         - RemoteError
         """
-        calls_chunked = list(get_chunks(calls, n=calls_chunk_size))
-        output = []
-        for call_chunk in calls_chunked:
-            multicall_result = self.contract_multicall.call(
-                node_inquirer=self,
-                method_name='aggregate',
-                arguments=[call_chunk],
-                call_order=call_order,
-                block_identifier=block_identifier,
-            )
-            _, chunk_output = multicall_result
+        def query_chunk(call_chunk: list[tuple[ChecksumEvmAddress, str]]) -> tuple[list[Any], Exception | None]:  # noqa: E501
+            try:  # return the error so that gevent does not report the greenlet as failed
+                _, chunk_output = self.contract_multicall.call(
+                    node_inquirer=self,
+                    method_name='aggregate',
+                    arguments=[call_chunk],
+                    call_order=call_order,
+                    block_identifier=block_identifier,
+                )
+            except Exception as e:  # pylint: disable=broad-except  # raised in the caller
+                return [], e
+
+            return chunk_output, None
+
+        pool, output = Pool(MULTICALL_CONCURRENCY), []
+        for chunk_output, error in pool.imap(query_chunk, get_chunks(calls, n=calls_chunk_size)):
+            if error is not None:
+                pool.kill(block=False)
+                raise error
+
             output += chunk_output
         return output
 
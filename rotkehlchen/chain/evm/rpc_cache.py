@@ -0,0 +1,209 @@
+"""Persistent cache of the JSON-RPC responses that can never change
+
+Calls pinned to a specific block, such as an eth_call at a given block number, and the
+receipts of mined transactions always return the same result once their block can no
+longer be reorged. Their raw results are kept in the transient DB, keyed by a hash of
+the chain, method and params, so that the same query is not sent to a node again, even
+after a restart.
+"""
+import hashlib
+import json
+import logging
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING, Any
+
+from web3._utils.encoding import Web3JsonEncoder
+from web3.middleware.base import Web3Middleware
+
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+from rotkehlchen.utils.misc import get_chunks
+
+if TYPE_CHECKING:
+    from web3 import Web3
+    from web3.types import MakeRequestFn, RPCEndpoint, RPCResponse
+
+    from rotkehlchen.db.dbhandler import DBHandler
+    from rotkehlchen.types import ChainID
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+# Max number of responses kept in the cache for all chains. The oldest are deleted first.
+MAX_RPC_CACHE_ENTRIES = 100_000
+# Number of responses added between two checks of the cache size
+RPC_CACHE_EVICTION_INTERVAL = 1_000
+# Methods whose result only depends on the block given as their last param
+BLOCK_PINNED_METHODS = {'eth_call', 'eth_getBalance', 'eth_getCode', 'eth_getStorageAt'}
+# Methods whose result never changes once it has a block number
+MINED_TX_METHODS = {'eth_getTransactionReceipt', 'eth_getTransactionByHash'}
+# Results at blocks with fewer confirmations than this can still be changed by a reorg
+RPC_CACHE_MIN_CONFIRMATIONS = 64
+
+
+def _is_pinned_block(block: Any) -> bool:
+    """Whether the block identifier is a block number or hash and not a tag like latest"""
+    if isinstance(block, dict):  # EIP-1898 block identifier
+        block = block.get('blockHash', block.get('blockNumber'))
+
+    return isinstance(block, str) and block.startswith('0x')
+
+
+def is_cacheable_request(method: str, params: Sequence[Any]) -> bool:
+    """Whether the call only depends on data that can't change. Its result is only
+    cached if is_cacheable_result also agrees."""
+    if method in BLOCK_PINNED_METHODS:
+        return len(params) != 0 and _is_pinned_block(params[-1])
+    if method == 'eth_getBlockByNumber':
+        return len(params) != 0 and _is_pinned_block(params[0])
+    return method in MINED_TX_METHODS or method == 'eth_getBlockByHash'
+
+
+def _result_block_number(method: str, params: Sequence[Any], result: Any) -> int | None:
+    """The number of the block the result of the call depends on, or None if the call
+    is pinned to a block hash, which always identifies the same block"""
+    if method in MINED_TX_METHODS:
+        return int(result['blockNumber'], 16)
+    if method == 'eth_getBlockByHash':
+        return None
+
+    block = params[0] if method == 'eth_getBlockByNumber' else params[-1]
+    if isinstance(block, dict):
+        if 'blockHash' in block:
+            return None
+        block = block['blockNumber']
+
+    return int(block, 16)
+
+
+def is_cacheable_result(
+        method: str,
+        params: Sequence[Any],
+        result: Any,
+        latest_block: int | None,
+) -> bool:
+    """Whether the result of a cacheable request can't change anymore. That is the case if
+    it exists and its block has at least RPC_CACHE_MIN_CONFIRMATIONS confirmations on
+    top of the latest known block. Without a known latest block only the results pinned
+    to a block hash are cached."""
+    if result is None:
+        return False
+    if method in MINED_TX_METHODS and (  # pending transactions have no block number
+        not isinstance(result, dict) or result.get('blockNumber') is None
+    ):
+        return False
+
+    if (block_number := _result_block_number(method, params, result)) is None:
+        return True
+
+    return latest_block is not None and block_number <= latest_block - RPC_CACHE_MIN_CONFIRMATIONS
+
+
+class EvmRpcCache:
+    """Cache of the immutable JSON-RPC responses of an EVM chain's nodes"""
+
+    def __init__(self, database: 'DBHandler', chain_id: 'ChainID') -> None:
+        self.database = database
+        self.chain_id = chain_id
+        self.latest_block: int | None = None  # the highest block number seen from the nodes
+        self._added_since_eviction = 0
+
+    def update_latest_block(self, block_number: int) -> None:
+        if self.latest_block is None or block_number > self.latest_block:
+            self.latest_block = block_number
+
+    def _key(self, method: str, params: Sequence[Any]) -> bytes:
+        return hashlib.sha256(json.dumps(
+            [self.chain_id.value, method, params],
+            cls=Web3JsonEncoder,
+            sort_keys=True,
+        ).encode()).digest()
+
+    def get_many(self, requests: Sequence[tuple[str, Sequence[Any]]]) -> list[Any]:
+        """Get the cached result of each (method, params) call or None if not cached"""
+        results: list[Any] = [None] * len(requests)
+        keys = {
+            self._key(method, params): idx for idx, (method, params) in enumerate(requests)
+            if is_cacheable_request(method, params)
+        }
+        if len(keys) == 0:
+            return results
+
+        with self.database.conn_transient.read_ctx() as cursor:
+            for chunk in get_chunks(list(keys), n=500):  # stay under the sqlite variables limit
+                cursor.execute(
+                    f'SELECT key, value FROM evm_rpc_cache WHERE key IN ({",".join("?" * len(chunk))})',  # noqa: E501
+                    chunk,
+                )
+                for key, value in cursor:
+                    results[keys[key]] = json.loads(value)
+
+        return results
+
+    def get(self, method: str, params: Sequence[Any]) -> Any:
+        """Get the cached result of the call or None if it is not cached"""
+        return self.get_many([(method, params)])[0]
+
+    def add_many(self, responses: Sequence[tuple[str, Sequence[Any], Any]]) -> None:
+        """Cache the results of the given (method, params, result) calls that can't change"""
+        entries = [
+            (self._key(method, params), self.chain_id.serialize_for_db(), method, json.dumps(result, cls=Web3JsonEncoder))  # noqa: E501
+            for method, params, result in responses
+            if (
+                is_cacheable_request(method, params) and
+                is_cacheable_result(method, params, result, self.latest_block)
+            )
+        ]
+        if len(entries) == 0:
+            return
+
+        with self.database.transient_write() as write_cursor:
+            write_cursor.executemany(
+                'INSERT OR IGNORE INTO evm_rpc_cache(key, chain_id, method, value) '
+                'VALUES(?, ?, ?, ?)',
+                entries,
+            )
+            self._added_since_eviction += len(entries)
+            if self._added_since_eviction >= RPC_CACHE_EVICTION_INTERVAL:
+                self._added_since_eviction = 0
+                write_cursor.execute(
+                    'DELETE FROM evm_rpc_cache WHERE rowid <= '
+                    '(SELECT MAX(rowid) FROM evm_rpc_cache) - ?',
+                    (MAX_RPC_CACHE_ENTRIES,),
+                )
+                if write_cursor.rowcount > 0:
+                    log.debug(f'Evicted {write_cursor.rowcount} EVM RPC cache entries')
+
+    def add(self, method: str, params: Sequence[Any], result: Any) -> None:
+        self.add_many([(method, params, result)])
+
+
+class RpcCacheMiddleware(Web3Middleware):
+    """Answers the calls that are in the rpc cache without querying the node and
+    caches the results of the rest. Needs to be the innermost middleware so that the
+    raw responses of the node are cached. Also keeps the latest block number of the
+    cache up to date from the node's eth_blockNumber responses."""
+    rpc_cache: EvmRpcCache
+
+    @classmethod
+    def for_cache(cls, rpc_cache: EvmRpcCache) -> Callable[['Web3'], 'RpcCacheMiddleware']:
+        """A middleware constructor that web3 can call with the Web3 object"""
+        def build(w3: 'Web3') -> 'RpcCacheMiddleware':
+            middleware = cls(w3)
+            middleware.rpc_cache = rpc_cache
+            return middleware
+
+        return build
+
+    def wrap_make_request(self, make_request: 'MakeRequestFn') -> 'MakeRequestFn':
+        def middleware(method: 'RPCEndpoint', params: Any) -> 'RPCResponse':
+            if (result := self.rpc_cache.get(method, params)) is not None:
+                return {'jsonrpc': '2.0', 'id': 0, 'result': result}
+
+            response = make_request(method, params)
+            if 'error' not in response:
+                if method == 'eth_blockNumber' and isinstance(result := response.get('result'), str):  # noqa: E501
+                    self.rpc_cache.update_latest_block(int(result, 16))
+                self.rpc_cache.add(method, params, response.get('result'))
+            return response
+
+        return middleware
@@ -1,9 +1,11 @@
 import logging
 from abc import ABC, abstractmethod
 from collections import defaultdict
-from collections.abc import Mapping, Sequence
+from collections.abc import Iterator, Mapping, Sequence
 from typing import TYPE_CHECKING, TypeVar
 
+from gevent.pool import Pool
+
 from rotkehlchen.assets.asset import Asset, EvmToken, Nft
 from rotkehlchen.chain.ethereum.utils import (
     token_normalized_value,
@@ -11,13 +13,14 @@ from rotkehlchen.chain.ethereum.utils import (
 )
 from rotkehlchen.chain.evm.types import WeightedNode, asset_id_is_evm_token
 from rotkehlchen.chain.structures import EvmTokenDetectionData
-from rotkehlchen.errors.misc import RemoteError
+from rotkehlchen.constants.timing import HOUR_IN_SECONDS
+from rotkehlchen.errors.misc import CallTooLargeError, RemoteError
 from rotkehlchen.fval import FVal
 from rotkehlchen.globaldb.handler import GlobalDBHandler
 from rotkehlchen.inquirer import Inquirer
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.types import ChecksumEvmAddress, Price, SupportedBlockchain, Timestamp
-from rotkehlchen.utils.misc import combine_dicts, get_chunks
+from rotkehlchen.utils.misc import combine_dicts, get_chunks, ts_now
 
 if TYPE_CHECKING:
     from rotkehlchen.chain.evm.node_inquirer import EvmNodeInquirerWithDSProxy
@@ -65,9 +68,21 @@ DetectedTokensType = dict[
 #
 # With this we have settled on a 460 chunk length since it was the highest round number that
 # didn't hit any issue executing the query in the open nodes.
+#
+# Token detection starts with this chunk length and then adapts it to what the nodes
+# accept. It is halved when the nodes reject a chunk for running out of gas or for being
+# too big, and slowly grows back while the chunks succeed. Other failures, such as the
+# nodes being unreachable, don't change it.
 
 
 OTHER_MAX_TOKEN_CHUNK_LENGTH = 460
+# bounds of the chunk length that token detection adapts to the nodes
+MIN_TOKEN_CHUNK_LENGTH = 20
+MAX_TOKEN_CHUNK_LENGTH = 1000
+# seconds after which the chunk length can grow again past a length that failed
+TOKEN_CHUNK_CEILING_SECONDS = HOUR_IN_SECONDS
+# max number of token chunks queried concurrently
+TOKEN_CHUNKS_CONCURRENCY = 4
 
 # maximum 32-bytes arguments in one call to a contract (either tokensBalance or multicall)
 ETHERSCAN_MAX_ARGUMENTS_TO_CONTRACT = 110
@@ -107,6 +122,36 @@ def generate_multicall_chunks(
     return multicall_chunks
 
 
+class AdaptiveChunkSize:
+    """A chunk length that shrinks when chunks are too large for the nodes and grows back
+    while they succeed, up to just below the smallest length that failed. That ceiling
+    is dropped TOKEN_CHUNK_CEILING_SECONDS after the last failure since the limits of
+    the nodes can change."""
+
+    def __init__(self, initial: int, minimum: int, maximum: int) -> None:
+        self.value = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.ceiling = maximum
+        self.ceiling_ts = Timestamp(0)
+
+    def shrink(self, failed_length: int) -> bool:
+        """Halve the chunk length after a chunk of failed_length was too large. Chunks that
+        were queried concurrently with the same length only shrink it once.
+
+        Returns False if the failed chunk was already at the minimum length."""
+        self.ceiling = max(self.minimum, min(self.ceiling, failed_length - 1))
+        self.ceiling_ts = ts_now()
+        self.value = min(self.value, max(self.minimum, failed_length // 2))
+        return failed_length > self.minimum
+
+    def grow(self) -> None:
+        if self.ceiling != self.maximum and ts_now() - self.ceiling_ts > TOKEN_CHUNK_CEILING_SECONDS:  # noqa: E501
+            self.ceiling = self.maximum
+
+        self.value = min(self.ceiling, self.value + max(1, self.value // 10))
+
+
 def get_chunk_size_call_order(evm_inquirer: 'EvmNodeInquirer') -> tuple[int, list[WeightedNode]]:
     """
     Return the max number of tokens that can be queried in a single call depending on whether we
@@ -124,6 +169,15 @@ def get_chunk_size_call_order(evm_inquirer: 'EvmNodeInquirer') -> tuple[int, lis
     return chunk_size, call_order
 
 
+def get_adaptive_chunks(lst: list[T], chunk_size: AdaptiveChunkSize) -> Iterator[list[T]]:
+    """Yield successive chunks of lst, each with the chunk length at the time it is taken"""
+    idx = 0
+    while idx < len(lst):
+        chunk = lst[idx:idx + chunk_size.value]
+        idx += len(chunk)
+        yield chunk
+
+
 class EvmTokens(ABC):
     def __init__(
             self,
@@ -132,6 +186,21 @@ class EvmTokens(ABC):
     ):
         self.db = database
         self.evm_inquirer = evm_inquirer
+        # chunk length of the token queries to web3 nodes, learned from their failures
+        self.nodes_chunk_size = AdaptiveChunkSize(
+            initial=OTHER_MAX_TOKEN_CHUNK_LENGTH,
+            minimum=MIN_TOKEN_CHUNK_LENGTH,
+            maximum=MAX_TOKEN_CHUNK_LENGTH,
+        )
+
+    def _get_chunk_size_call_order(self) -> tuple[AdaptiveChunkSize, list[WeightedNode]]:
+        """Same as get_chunk_size_call_order but the web3 nodes chunk length adapts to
+        what the nodes accept. Etherscan's is fixed since it is limited by the URI length."""
+        chunk_size, call_order = get_chunk_size_call_order(self.evm_inquirer)
+        if chunk_size == OTHER_MAX_TOKEN_CHUNK_LENGTH:
+            return self.nodes_chunk_size, call_order
+
+        return AdaptiveChunkSize(initial=chunk_size, minimum=chunk_size, maximum=chunk_size), call_order  # noqa: E501
 
     def get_token_balances(
             self,
@@ -149,26 +218,34 @@ class EvmTokens(ABC):
         - BadFunctionCallOutput if a local node is used and the contract for the
           token has no code. That means the chain is not synced
         """
-        log.debug(
-            f'Querying {self.evm_inquirer.chain_name} for multi token address balances',
-            address=address,
-            tokens_num=len(tokens),
-        )
-        balances: dict[Asset, FVal] = defaultdict(FVal)
         try:
-            result = self.evm_inquirer.contract_scan.call(
-                node_inquirer=self.evm_inquirer,
-                method_name='tokens_balance',
-                arguments=[address, [x.address for x in tokens]],
-                call_order=call_order,
-            )
+            return self._query_token_balances(address=address, tokens=tokens, call_order=call_order)  # noqa: E501
         except RemoteError as e:
             log.error(
                 f'{self.evm_inquirer.chain_name} tokensBalance call failed for address {address}.'
                 f' Token addresses: {[x.address for x in tokens]}. Error: {e}',
             )
-            return balances
+            return defaultdict(FVal)
 
+    def _query_token_balances(
+            self,
+            address: ChecksumEvmAddress,
+            tokens: list[EvmTokenDetectionData],
+            call_order: Sequence[WeightedNode] | None,
+    ) -> dict[Asset, FVal]:
+        """Same as get_token_balances but raises RemoteError if the call fails"""
+        log.debug(
+            f'Querying {self.evm_inquirer.chain_name} for multi token address balances',
+            address=address,
+            tokens_num=len(tokens),
+        )
+        balances: dict[Asset, FVal] = defaultdict(FVal)
+        result = self.evm_inquirer.contract_scan.call(
+            node_inquirer=self.evm_inquirer,
+            method_name='tokens_balance',
+            arguments=[address, [x.address for x in tokens]],
+            call_order=call_order,
+        )
         try:
             for token_balance, token in zip(result, tokens, strict=True):
                 if token_balance == 0:
@@ -237,26 +314,83 @@ class EvmTokens(ABC):
                 balances[address][token] += normalized_balance
         return balances
 
-    def _query_chunks(
+    def _query_multicall_chunk(
+            self,
+            chunk: list[tuple[ChecksumEvmAddress, Sequence[EvmToken]]],
+            chunk_size: AdaptiveChunkSize,
+            call_order: Sequence['WeightedNode'],
+    ) -> dict[ChecksumEvmAddress, dict[EvmToken, FVal]]:
+        """Get the token balances of a multicall chunk. If the nodes reject it for its size
+        the chunk length is shrunk and the chunk is queried again in chunks of the new length.
+
+        May raise:
+        - RemoteError if the query fails for another reason or even with the minimum
+        chunk length
+        """
+        try:
+            balances = self._get_multicall_token_balances(chunk=chunk, call_order=call_order)
+        except RemoteError as e:
+            if (
+                not isinstance(e, CallTooLargeError) or
+                chunk_size.shrink(failed_length=sum(PURE_TOKENS_BALANCE_ARGUMENTS + len(tokens) for _, tokens in chunk)) is False  # noqa: E501
+            ):
+                raise
+
+            log.debug(f'{self.evm_inquirer.chain_name} token balances multicall failed. Retrying in chunks of {chunk_size.value}')  # noqa: E501
+            balances = defaultdict(dict)
+            for smaller_chunk in generate_multicall_chunks(
+                    addresses_to_tokens=dict(chunk),
+                    chunk_length=chunk_size.value,
+            ):
+                for address, address_balances in self._query_multicall_chunk(
+                    chunk=smaller_chunk,
+                    chunk_size=chunk_size,
+                    call_order=call_order,
+                ).items():
+                    balances[address].update(address_balances)
+            return balances
+
+        chunk_size.grow()
+        return balances
+
+    def _query_chunk(
             self,
             address: ChecksumEvmAddress,
             tokens: list[EvmTokenDetectionData],
-            chunk_size: int,
+            chunk_size: AdaptiveChunkSize,
             call_order: list[WeightedNode],
     ) -> dict[Asset, FVal]:
-        """Processes token balance queries in batches of chunk_size to avoid hitting gas limits.
+        """Query the balances of a chunk of tokens. If the nodes reject the query for hitting
+        their gas or size limits, the chunk length is shrunk and the tokens are queried
+        again in chunks of the new length. On other failures the chunk is skipped.
         Uses Asset objects directly instead of EvmToken to minimize database queries.
         """
-        total_token_balances: dict[Asset, FVal] = defaultdict(FVal)
-        chunks = get_chunks(tokens, n=chunk_size)
-        for chunk in chunks:
-            new_token_balances = self.get_token_balances(
-                address=address,
-                tokens=chunk,
-                call_order=call_order,
-            )
-            total_token_balances = combine_dicts(total_token_balances, new_token_balances)
-        return total_token_balances
+        try:
+            balances = self._query_token_balances(address=address, tokens=tokens, call_order=call_order)  # noqa: E501
+        except RemoteError as e:
+            if (
+                not isinstance(e, CallTooLargeError) or
+                chunk_size.shrink(failed_length=len(tokens)) is False
+            ):
+                log.error(
+                    f'{self.evm_inquirer.chain_name} tokensBalance call failed for address '
+                    f'{address}. Token addresses: {[x.address for x in tokens]}. Error: {e}',
+                )
+                return {}
+
+            log.debug(f'{self.evm_inquirer.chain_name} tokensBalance call of {len(tokens)} tokens failed. Retrying in chunks of {chunk_size.value}')  # noqa: E501
+            balances = defaultdict(FVal)
+            for chunk in get_chunks(tokens, n=chunk_size.value):
+                balances = combine_dicts(balances, self._query_chunk(
+                    address=address,
+                    tokens=chunk,
+                    chunk_size=chunk_size,
+                    call_order=call_order,
+                ))
+            return balances
+
+        chunk_size.grow()
+        return balances
 
     def _compute_detected_tokens_info(self, addresses: Sequence[ChecksumEvmAddress]) -> DetectedTokensType:  # noqa: E501
         """
@@ -323,21 +457,30 @@ class EvmTokens(ABC):
         - BadFunctionCallOutput if a local node is used and the contract for the
           token has no code. That means the chain is not synced
         """
-        chunk_size, call_order = get_chunk_size_call_order(self.evm_inquirer)
-        for address in addresses:
-            token_balances = self._query_chunks(
+        chunk_size, call_order = self._get_chunk_size_call_order()
+        detected_tokens: dict[ChecksumEvmAddress, set[Asset]] = {address: set() for address in addresses}  # noqa: E501
+
+        def query_chunk(address: ChecksumEvmAddress, chunk: list[EvmTokenDetectionData]) -> None:
+            detected_tokens[address].update(self._query_chunk(
                 address=address,
-                tokens=tokens_to_check,
+                tokens=chunk,
                 chunk_size=chunk_size,
                 call_order=call_order,
-            )
-            detected_tokens = list(token_balances.keys())
-            with self.db.user_write() as write_cursor:
+            ))
+
+        pool = Pool(TOKEN_CHUNKS_CONCURRENCY)
+        for address in addresses:  # spawn waits for a free slot so chunks use the latest length
+            for chunk in get_adaptive_chunks(tokens_to_check, chunk_size):
+                pool.spawn(query_chunk, address, chunk)
+        pool.join(raise_error=True)
+
+        with self.db.user_write() as write_cursor:
+            for address, address_tokens in detected_tokens.items():
                 self.db.save_tokens_for_address(
                     write_cursor=write_cursor,
                     address=address,
                     blockchain=self.evm_inquirer.blockchain,
-                    tokens=detected_tokens,
+                    tokens=list(address_tokens),
                 )
 
     def query_tokens_for_addresses(
@@ -356,7 +499,7 @@ class EvmTokens(ABC):
         addresses_to_balances: dict[ChecksumEvmAddress, dict[EvmToken, FVal]] = defaultdict(dict)
         all_tokens = set()
         addresses_to_tokens: dict[ChecksumEvmAddress, list[EvmToken]] = {}
-        chunk_size, call_order = get_chunk_size_call_order(self.evm_inquirer)
+        chunk_size, call_order = self._get_chunk_size_call_order()
 
         with self.db.conn.read_ctx() as cursor:
             for address in addresses:
@@ -384,13 +527,12 @@ class EvmTokens(ABC):
 
         multicall_chunks = generate_multicall_chunks(
             addresses_to_tokens=addresses_to_tokens,
-            chunk_length=chunk_size,
+            chunk_length=chunk_size.value,
         )
-        for chunk in multicall_chunks:
-            new_balances = self._get_multicall_token_balances(
-                chunk=chunk,
-                call_order=call_order,
-            )
+        for new_balances in Pool(TOKEN_CHUNKS_CONCURRENCY).imap(
+                lambda chunk: self._query_multicall_chunk(chunk=chunk, chunk_size=chunk_size, call_order=call_order),  # noqa: E501
+                multicall_chunks,
+        ):
             for address, balances in new_balances.items():
                 addresses_to_balances[address].update(balances)
 
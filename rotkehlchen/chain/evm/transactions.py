@@ -1,14 +1,19 @@
 import logging
+import time
 from abc import ABC
 from collections import defaultdict
 from collections.abc import Iterator, Sequence
 from contextlib import contextmanager
 from typing import TYPE_CHECKING, Any, Optional
 
+import gevent
 from gevent.lock import Semaphore
+from gevent.pool import Pool
+from gevent.queue import Empty, Queue
 
 from rotkehlchen.api.websockets.typedefs import TransactionStatusStep, WSMessageType
 from rotkehlchen.assets.asset import EvmToken
+from rotkehlchen.chain.constants import DEFAULT_RPC_BATCH_SIZE
 from rotkehlchen.chain.evm.constants import GENESIS_HASH, LAST_SPAM_TXS_CACHE
 from rotkehlchen.chain.evm.decoding.constants import ERC20_OR_ERC721_TRANSFER
 from rotkehlchen.chain.evm.types import EvmAccount
@@ -34,7 +39,7 @@ from rotkehlchen.types import (
     Timestamp,
 )
 from rotkehlchen.utils.hexbytes import hexstring_to_bytes
-from rotkehlchen.utils.misc import ts_now
+from rotkehlchen.utils.misc import get_chunks, ts_now
 
 if TYPE_CHECKING:
     from rotkehlchen.chain.evm.node_inquirer import EvmNodeInquirer
@@ -47,6 +52,18 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+# Max number of addresses whose transactions are queried concurrently. The requests to
+# the indexer are further limited by its own budget of concurrent queries.
+TX_SYNC_CONCURRENCY = 4
+# Number of batches of receipts that are queried concurrently
+RECEIPT_FETCHERS = 4
+# Max number of queried receipts waiting to be written to the DB
+RECEIPTS_QUEUE_SIZE = 2 * RECEIPT_FETCHERS * DEFAULT_RPC_BATCH_SIZE
+# Queried receipts are written to the DB once there are this many of them ...
+RECEIPTS_WRITE_BATCH = 500
+# ... or once this many seconds passed since the last write
+RECEIPTS_WRITE_INTERVAL = 2
+
 
 class EvmTransactions(ABC):  # noqa: B024
 
@@ -105,16 +122,23 @@ class EvmTransactions(ABC):  # noqa: B024
                 },
             )
             self._get_transactions_for_range(address=address, start_ts=start_ts, end_ts=end_ts)
-            self._get_internal_transactions_for_ranges(
-                address=address,
-                start_ts=start_ts,
-                end_ts=end_ts,
-            )
-            self._get_erc20_transfers_for_ranges(
-                address=address,
-                start_ts=start_ts,
-                end_ts=end_ts,
-            )
+            # Most internal and token transactions belong to the transactions queried above,
+            # so they are queried after them to not have to query them one by one. They
+            # don't depend on each other so they are queried concurrently.
+            gevent.joinall([
+                gevent.spawn(
+                    self._get_internal_transactions_for_ranges,
+                    address=address,
+                    start_ts=start_ts,
+                    end_ts=end_ts,
+                ),
+                gevent.spawn(
+                    self._get_erc20_transfers_for_ranges,
+                    address=address,
+                    start_ts=start_ts,
+                    end_ts=end_ts,
+                ),
+            ], raise_error=True)
         self.msg_aggregator.add_message(
             message_type=WSMessageType.EVM_TRANSACTION_STATUS,
             data={
@@ -129,7 +153,7 @@ class EvmTransactions(ABC):  # noqa: B024
         """Queries the chain (or a remote such as etherscan) for all transactions of an evm address
         or of all addresses. Will query only addresses of the filter with same chain_id as this
         class and query only the time requested in the filter and the part of that time that has
-        not yet been queried.
+        not yet been queried. Up to TX_SYNC_CONCURRENCY addresses are queried concurrently.
 
         Saves the results in the database.
 
@@ -152,12 +176,15 @@ class EvmTransactions(ABC):  # noqa: B024
         f_to_ts = filter_query.to_ts
         from_ts = Timestamp(0) if f_from_ts is None else f_from_ts
         to_ts = ts_now() if f_to_ts is None else f_to_ts
+        pool = Pool(TX_SYNC_CONCURRENCY)
         for address in accounts:
-            self.single_address_query_transactions(
+            pool.spawn(
+                self.single_address_query_transactions,
                 address=address,
                 start_ts=from_ts,
                 end_ts=to_ts,
             )
+        pool.join(raise_error=True)
         self.get_chain_specific_multiaddress_data(accounts)
 
     def _query_and_save_transactions_for_range(
@@ -658,6 +685,24 @@ class EvmTransactions(ABC):  # noqa: B024
 
         return evm_tx, evm_tx_receipt
 
+    def get_transactions_and_receipts(
+            self,
+            cursor: 'DBCursor',
+            tx_hashes: Sequence[EVMTxHash],
+    ) -> dict[EVMTxHash, tuple['EvmTransaction', 'EvmTxReceipt']]:
+        """Gets the transactions and receipts that already have all their required data in
+        the database in bulk. Transactions missing from the result need to be pulled with
+        get_or_create_transaction.
+
+        May raise:
+        - DeserializationError if a transaction cannot be deserialized from the DB.
+        """
+        return self.dbevmtx.get_transactions_and_receipts(
+            cursor=cursor,
+            tx_hashes=[x for x in tx_hashes if x != GENESIS_HASH],
+            chain_id=self.evm_inquirer.chain_id,
+        )
+
     def ensure_genesis_tx_data_exists(self) -> tuple['EvmTransaction', 'EvmTxReceipt']:
         """
         For each tracked account, query to see if it had any transactions in the genesis
@@ -769,19 +814,82 @@ class EvmTransactions(ABC):  # noqa: B024
             if len(hash_results) == 0:
                 return  # nothing to do
 
-            for entry in hash_results:
+            self._ingest_receipts(tx_hashes=hash_results)
+
+    def _ingest_receipts(self, tx_hashes: list[EVMTxHash]) -> None:
+        """Query the receipts of the given transactions and save them in the DB.
+
+        Batches of receipts are queried concurrently and put in a bounded queue from which
+        they are written to the DB in bulk, every RECEIPTS_WRITE_BATCH receipts or every
+        RECEIPTS_WRITE_INTERVAL seconds, so that a slow DB slows the queries down instead
+        of piling receipts up in memory.
+
+        May raise:
+        - RemoteError if querying a batch of receipts fails
+        """
+        receipts_queue: Queue[dict[str, Any] | None] = Queue(maxsize=RECEIPTS_QUEUE_SIZE)
+
+        def fetch_chunk(chunk: list[EVMTxHash]) -> RemoteError | None:
+            try:
+                receipts = self.evm_inquirer.get_transaction_receipts(tx_hashes=chunk)
+            except RemoteError as e:
+                return e
+
+            for receipt in receipts.values():
+                receipts_queue.put(receipt)
+            return None
+
+        def produce() -> RemoteError | None:
+            pool, killed = Pool(RECEIPT_FETCHERS), False
+            try:
+                for error in pool.imap_unordered(fetch_chunk, get_chunks(tx_hashes, n=DEFAULT_RPC_BATCH_SIZE)):  # noqa: E501
+                    if error is not None:
+                        return error
+            except gevent.GreenletExit:
+                killed = True  # the writer stopped, so nobody is reading the queue anymore
+                raise
+            else:
+                return None
+            finally:
+                pool.kill(block=False)  # don't query the rest of the receipts if stopped early
+                if killed is False:  # let the writer know there is nothing else coming
+                    receipts_queue.put(None)
+
+        producer = gevent.spawn(produce)
+        start, written, pending = time.monotonic(), 0, []
+        last_write, done = start, False
+        try:
+            while done is False:
                 try:
-                    tx_receipt_data = self.evm_inquirer.get_transaction_receipt(tx_hash=entry)
-                except RemoteError as e:
-                    log.warning(f'Failed to query information for {self.evm_inquirer.chain_name} transaction {entry.hex()} due to {e!s}. Skipping...')  # noqa: E501
-                    continue
+                    if (receipt := receipts_queue.get(timeout=RECEIPTS_WRITE_INTERVAL)) is None:
+                        done = True
+                    else:
+                        pending.append(receipt)
+                except Empty:
+                    pass
+
+                if len(pending) != 0 and (
+                    done or len(pending) >= RECEIPTS_WRITE_BATCH or
+                    time.monotonic() - last_write >= RECEIPTS_WRITE_INTERVAL
+                ):
+                    with self.database.user_write() as write_cursor:
+                        written += self.dbevmtx.add_or_ignore_receipts_data(
+                            write_cursor=write_cursor,
+                            chain_id=self.evm_inquirer.chain_id,
+                            receipts_data=pending,
+                        )
+                    pending, last_write = [], time.monotonic()
+        finally:  # stop querying if writing fails so that the fetchers don't block on the queue
+            producer.kill()
 
-                with self.database.user_write() as write_cursor:
-                    self.dbevmtx.add_or_ignore_receipt_data(
-                        write_cursor=write_cursor,
-                        chain_id=self.evm_inquirer.chain_id,
-                        data=tx_receipt_data,
-                    )
+        if (error := producer.get()) is not None:
+            raise error
+
+        elapsed = time.monotonic() - start
+        log.debug(
+            f'Saved {written} {self.evm_inquirer.chain_name} receipts out of {len(tx_hashes)} '
+            f'transactions in {elapsed:.2f} seconds ({written / max(elapsed, 1e-6):.1f} receipts/sec)',  # noqa: E501
+        )
 
     def add_transaction_by_hash(
             self,
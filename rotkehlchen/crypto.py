@@ -1,4 +1,5 @@
 import os
+from collections.abc import Iterable, Iterator
 
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
@@ -14,47 +15,84 @@ AES_BLOCK_SIZE = 16
 # cryptography library seem to suggest it's the safest options. Problem is the
 # already encrypted and saved database files and how to handle the previous encryption
 # We need to keep a versioning of encryption used for each file.
-def encrypt(key: bytes, source: bytes) -> bytes:
-    assert isinstance(key, bytes), 'key should be given in bytes'
-    assert isinstance(source, bytes), 'source should be given in bytes'
+def _aes_key(key: bytes) -> bytes:
     digest = hashes.Hash(hashes.SHA256())
     digest.update(key)
-    key = digest.finalize()  # use SHA-256 over our key to get a proper-sized AES key
-    iv = os.urandom(AES_BLOCK_SIZE)
-    cipher = Cipher(algorithms.AES(key), modes.CBC(iv))
-    encryptor = cipher.encryptor()
-    padding = AES_BLOCK_SIZE - len(source) % AES_BLOCK_SIZE  # calculate needed padding
-    source += bytes([padding]) * padding  # Python 2.x: source += chr(padding) * padding
-    # store the iv at the beginning and encrypt
-    return iv + (encryptor.update(source) + encryptor.finalize())
+    return digest.finalize()  # use SHA-256 over our key to get a proper-sized AES key
 
 
-def decrypt(key: bytes, source: bytes) -> bytes:
+def encrypt_stream(key: bytes, source: Iterable[bytes]) -> Iterator[bytes]:
+    """Encrypts the given blocks of data with the given key, one block at a time.
+
+    Yields the encrypted data in the same format as encrypt() so that concatenating
+    the yielded blocks gives the encryption of the concatenated source blocks.
     """
-    Decrypts the given source data we with the given key.
+    assert isinstance(key, bytes), 'key should be given in bytes'
+    iv = os.urandom(AES_BLOCK_SIZE)
+    encryptor = Cipher(algorithms.AES(_aes_key(key)), modes.CBC(iv)).encryptor()
+    yield iv  # store the iv at the beginning
+    length = 0
+    for block in source:
+        length += len(block)
+        if (encrypted := encryptor.update(block)):
+            yield encrypted
 
-    Returns the decrypted data.
-    If data can't be decrypted then raises UnableToDecryptRemoteData
+    padding = AES_BLOCK_SIZE - length % AES_BLOCK_SIZE  # calculate needed padding
+    yield encryptor.update(bytes([padding]) * padding) + encryptor.finalize()
+
+
+def decrypt_stream(key: bytes, source: Iterable[bytes]) -> Iterator[bytes]:
+    """Decrypts the given blocks of data encrypted by encrypt() or encrypt_stream()
+    with the given key, one block at a time.
+
+    Yields the decrypted data without the padding.
+    If data can't be decrypted then raises UnableToDecryptRemoteData once all the
+    source blocks have been consumed.
     """
     assert isinstance(key, bytes), 'key should be given in bytes'
-    assert isinstance(source, bytes), 'source should be given in bytes'
-    digest = hashes.Hash(hashes.SHA256())
-    digest.update(key)
-    key = digest.finalize()  # use SHA-256 over our key to get a proper-sized AES key
-    iv = source[:AES_BLOCK_SIZE]  # extract the iv from the beginning
-    cipher = Cipher(algorithms.AES(key), modes.CBC(iv))
-    decryptor = cipher.decryptor()
-
-    data = source[AES_BLOCK_SIZE:]  # decrypt
-    data = decryptor.update(data)
-    padding = data[-1]  # pick the padding value from the end; Python 2.x: ord(data[-1])
-    if data[-padding:] != bytes([padding]) * padding:  # Python 2.x: chr(padding) * padding
+    buffer = b''
+    decryptor = None
+    for block in source:
+        buffer += block
+        if decryptor is None:
+            if len(buffer) < AES_BLOCK_SIZE:
+                continue
+            iv, buffer = buffer[:AES_BLOCK_SIZE], buffer[AES_BLOCK_SIZE:]  # extract the iv from the beginning  # noqa: E501
+            decryptor = Cipher(algorithms.AES(_aes_key(key)), modes.CBC(iv)).decryptor()
+
+        # keep the last cipher block back since it contains the padding
+        ready = (len(buffer) - 1) // AES_BLOCK_SIZE * AES_BLOCK_SIZE
+        if ready > 0:
+            if (decrypted := decryptor.update(buffer[:ready])):
+                yield decrypted
+            buffer = buffer[ready:]
+
+    data = b'' if decryptor is None else decryptor.update(buffer)
+    padding = data[-1] if len(data) == AES_BLOCK_SIZE else 0  # pick the padding value from the end  # noqa: E501
+    if not 0 < padding <= AES_BLOCK_SIZE or data[-padding:] != bytes([padding]) * padding:
         raise UnableToDecryptRemoteData(
             'Invalid padding when decrypting the DB data we received from the server. '
             'Are you using a new user and if yes have you used the same password as before? '
             'If you have then please open a bug report.',
         )
-    return data[:-padding]  # remove the padding
+    if padding != AES_BLOCK_SIZE:
+        yield data[:-padding]  # remove the padding
+
+
+def encrypt(key: bytes, source: bytes) -> bytes:
+    assert isinstance(source, bytes), 'source should be given in bytes'
+    return b''.join(encrypt_stream(key, (source,)))
+
+
+def decrypt(key: bytes, source: bytes) -> bytes:
+    """
+    Decrypts the given source data we with the given key.
+
+    Returns the decrypted data.
+    If data can't be decrypted then raises UnableToDecryptRemoteData
+    """
+    assert isinstance(source, bytes), 'source should be given in bytes'
+    return b''.join(decrypt_stream(key, (source,)))
 
 
 def sha3(data: bytes) -> bytes:
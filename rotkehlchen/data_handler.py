@@ -4,16 +4,17 @@ import logging
 import shutil
 import tempfile
 import zlib
-from collections.abc import Sequence
+from collections.abc import Iterable, Iterator, Sequence
 from pathlib import Path
+from typing import BinaryIO
 
 from rotkehlchen.assets.asset import Asset
 from rotkehlchen.constants.misc import USERDB_NAME, USERSDIR_NAME
-from rotkehlchen.crypto import decrypt, encrypt
+from rotkehlchen.crypto import decrypt_stream, encrypt_stream
 from rotkehlchen.db.dbhandler import DBHandler
 from rotkehlchen.db.settings import ModifiableDBSettings
 from rotkehlchen.errors.api import AuthenticationError
-from rotkehlchen.errors.misc import SystemPermissionError
+from rotkehlchen.errors.misc import SystemPermissionError, UnableToDecryptRemoteData
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.user_messages import MessagesAggregator
 from rotkehlchen.utils.misc import timestamp_to_date, ts_now
@@ -24,6 +25,35 @@ log = RotkehlchenLogsAdapter(logger)
 BUFFERSIZE = 64 * 1024
 
 
+def _compress_blocks(source: BinaryIO, source_hash: 'hashlib._Hash') -> Iterator[bytes]:
+    """Read the source file in blocks, adding them to the hash, and yield them compressed"""
+    compressor = zlib.compressobj(level=9)
+    while (block := source.read(BUFFERSIZE)):
+        source_hash.update(block)
+        if (compressed := compressor.compress(block)):
+            yield compressed
+
+    yield compressor.flush()
+
+
+def _decompress_blocks(source: Iterable[bytes]) -> Iterator[bytes]:
+    """Decompress the source blocks yielding at most BUFFERSIZE bytes at a time
+
+    May raise:
+    - zlib.error if the compressed data is invalid or incomplete
+    """
+    decompressor = zlib.decompressobj()
+    for block in source:
+        data = block
+        while data:
+            yield decompressor.decompress(data, BUFFERSIZE)
+            data = decompressor.unconsumed_tail
+
+    yield decompressor.flush()
+    if decompressor.eof is False:
+        raise zlib.error('Incomplete compressed DB data')
+
+
 class DataHandler:
 
     def __init__(
@@ -189,28 +219,23 @@ class DataHandler:
         """Decrypt the DB, dump in temporary plaintextdb, compress it,
         and then re-encrypt it
 
+        The plaintext DB is hashed, compressed and encrypted one block at a time so that
+        only the encrypted data is kept in memory.
+
         Returns a b64 encoded binary blob"""
-        compressor = zlib.compressobj(level=9)
         with tempfile.NamedTemporaryFile(delete=False, suffix='.db') as tempdbfile:
             tempdbpath = Path(tempdbfile.name)
             log.info(f'Compress and encrypt DB at temporary path: {tempdbpath}')
             tempdbfile.close()  # close the file to allow re-opening by export_unencrypted in windows https://github.com/rotki/rotki/issues/5051  # noqa: E501
             self.db.export_unencrypted(tempdbpath)
-            source_data = bytearray()
-            compressed_data = bytearray()
+            source_hash = hashlib.sha256()
             with open(tempdbpath, 'rb') as src_f:
-                block = src_f.read(BUFFERSIZE)
-                while block:
-                    source_data += block
-                    compressed_data += compressor.compress(block)
-                    block = src_f.read(BUFFERSIZE)
-
-                compressed_data += compressor.flush()
-
-        original_data_hash = base64.b64encode(
-            hashlib.sha256(source_data).digest(),
-        ).decode()
-        encrypted_data = encrypt(self.db.password.encode(), bytes(compressed_data))
+                encrypted_data = b''.join(encrypt_stream(
+                    key=self.db.password.encode(),
+                    source=_compress_blocks(src_f, source_hash),
+                ))
+
+        original_data_hash = base64.b64encode(source_hash.digest()).decode()
         # cleanup temp file to avoid windows problem (https://github.com/rotki/rotki/issues/5051)
         tempdbpath.unlink()
         return encrypted_data, original_data_hash
@@ -218,10 +243,14 @@ class DataHandler:
     def decompress_and_decrypt_db(self, encrypted_data: bytes) -> None:
         """Decrypt and decompress the encrypted data we receive from the server
 
+        The data is decrypted and decompressed one block at a time into a temporary
+        plaintext DB which is then imported.
+
         If successful then replace our local Database
 
         May Raise:
-        - UnableToDecryptRemoteData due to decrypt()
+        - UnableToDecryptRemoteData due to decrypt_stream() or if the decrypted data
+        is not a valid compressed DB, which is what usually happens with a wrong password
         - DBUpgradeError if the rotki DB version is newer than the software or
         there is a DB upgrade and there is an error or if the version is older
         than the one supported.
@@ -236,6 +265,25 @@ class DataHandler:
             users_dir / self.username / f'rotkehlchen_db_{date}.backup',
         )
 
-        decrypted_data = decrypt(self.db.password.encode(), encrypted_data)
-        decompressed_data = zlib.decompress(decrypted_data)
-        self.db.import_unencrypted(decompressed_data)
+        encrypted_view = memoryview(encrypted_data)
+        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmpdirname:  # needed on windows, see https://tinyurl.com/tmp-win-err  # noqa: E501
+            tempdbpath = Path(tmpdirname) / 'temp.db'
+            with open(tempdbpath, 'wb') as dst_f:
+                try:
+                    dst_f.writelines(_decompress_blocks(decrypt_stream(
+                        key=self.db.password.encode(),
+                        source=(
+                            bytes(encrypted_view[idx:idx + BUFFERSIZE])
+                            for idx in range(0, len(encrypted_view), BUFFERSIZE)
+                        ),
+                    )))
+                except zlib.error as e:
+                    # the padding is checked only at the end of the data so a wrong
+                    # password usually shows up first as invalid compressed data
+                    raise UnableToDecryptRemoteData(
+                        f'Could not decompress the DB data we received from the server: {e!s}. '
+                        'Are you using a new user and if yes have you used the same password '
+                        'as before? If you have then please open a bug report.',
+                    ) from e
+
+            self.db.import_unencrypted(tempdbpath)
@@ -9,7 +9,12 @@ from rotkehlchen.accounting.structures.balance import Balance
 from rotkehlchen.assets.converters import asset_from_binance
 from rotkehlchen.constants import ZERO
 from rotkehlchen.constants.assets import A_USD
-from rotkehlchen.data_import.utils import BaseExchangeImporter, UnsupportedCSVEntry, hash_csv_row
+from rotkehlchen.data_import.utils import (
+    BaseExchangeImporter,
+    UnsupportedCSVEntry,
+    get_csv_chunks,
+    hash_csv_row,
+)
 from rotkehlchen.db.drivers.gevent import DBCursor
 from rotkehlchen.errors.asset import UnknownAsset, UnsupportedAsset
 from rotkehlchen.errors.misc import InputError
@@ -672,12 +677,14 @@ class BinanceImporter(BaseExchangeImporter):
     def _group_binance_rows(
             self,
             rows: list[BinanceCsvRow],
+            first_index: int = 1,
             timestamp_format: str = '%Y-%m-%d %H:%M:%S',
     ) -> tuple[int, dict[Timestamp, list[BinanceCsvRow]]]:
-        """Groups Binance rows by timestamp and deletes unused columns"""
+        """Groups Binance rows by timestamp and deletes unused columns.
+        first_index is the index of the first of the rows in the CSV file."""
         multirows: dict[Timestamp, list[BinanceCsvRow]] = defaultdict(list)
         skipped_count = 0
-        for index, csv_row in enumerate(rows, start=1):
+        for index, csv_row in enumerate(rows, start=first_index):
             try:
                 timestamp = deserialize_timestamp_from_date(
                     date=csv_row['UTC_Time'],
@@ -845,12 +852,32 @@ class BinanceImporter(BaseExchangeImporter):
 
     def _import_csv(self, write_cursor: DBCursor, filepath: Path, **kwargs: Any) -> None:
         """
-        Group and process binance CSV entries. May raise:
+        Group and process binance CSV entries. The file is read in chunks of rows. The
+        rows of the last timestamp of a chunk are processed with the next chunk, since
+        entries that span multiple rows may continue in it. May raise:
         - InputError
         """
+        skipped_count = 0
+        carried_rows: dict[Timestamp, list[BinanceCsvRow]] = {}
         with open(filepath, encoding='utf-8-sig') as csvfile:
-            input_rows = list(csv.DictReader(csvfile))
-            self.total_entries = len(input_rows)
-            skipped_count, multirows = self._group_binance_rows(rows=input_rows, **kwargs)
-            skipped_count += self._process_binance_rows(write_cursor=write_cursor, multi=multirows)
-            self.imported_entries = self.total_entries - skipped_count
+            for chunk in get_csv_chunks(csv.DictReader(csvfile)):
+                chunk_skipped, multirows = self._group_binance_rows(
+                    rows=chunk,
+                    first_index=self.total_entries + 1,
+                    **kwargs,
+                )
+                self.total_entries += len(chunk)
+                skipped_count += chunk_skipped
+                for timestamp, rows in carried_rows.items():
+                    multirows[timestamp] = rows + multirows.get(timestamp, [])
+
+                if len(multirows) == 0:
+                    carried_rows = {}
+                    continue
+
+                last_timestamp = max(multirows, key=lambda x: multirows[x][-1][INDEX])
+                carried_rows = {last_timestamp: multirows.pop(last_timestamp)}
+                skipped_count += self._process_binance_rows(write_cursor=write_cursor, multi=multirows)  # noqa: E501
+
+        skipped_count += self._process_binance_rows(write_cursor=write_cursor, multi=carried_rows)
+        self.imported_entries = self.total_entries - skipped_count
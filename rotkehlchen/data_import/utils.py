@@ -1,8 +1,9 @@
 import hashlib
 import logging
 from abc import ABC, abstractmethod
-from collections.abc import Mapping, Sequence
-from typing import TYPE_CHECKING, Any
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from itertools import islice
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from rotkehlchen.api.websockets.typedefs import WSMessageType
 from rotkehlchen.assets.converters import LOCATION_TO_ASSET_MAPPING, asset_from_common_identifier
@@ -27,10 +28,15 @@ if TYPE_CHECKING:
 ITEMS_PER_DB_WRITE = 400
 MAX_ERROR_PERCENT = 0.2  # max percent of messages to total entries
 MIN_ENTRIES = 50  # mininmum number of entries before checking MAX_ERROR_PERCENT
+CSV_ROWS_CHUNK_SIZE = 10_000  # number of rows of a CSV file that are read and processed at once
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+T = TypeVar('T')
+# asset, amount, timestamp, type and subtype of a history event
+EventKey = tuple[str, str, TimestampMS, str, str]
+
 
 class BaseExchangeImporter(ABC):
     def __init__(self, db: 'DBHandler', name: str) -> None:
@@ -48,6 +54,9 @@ class BaseExchangeImporter(ABC):
         self.imported_entries: int = 0
         self.import_msgs: list[dict] = []
         self.max_msgs: bool = False
+        # keys of the events in the DB by event identifier prefix and location. Used to
+        # detect duplicates and only loaded for the ones that an imported event is checked for
+        self.existing_events: dict[tuple[str, Location], set[EventKey]] = {}
 
     def import_csv(self, filepath: 'Path', **kwargs: Any) -> tuple[bool, str]:
         self.reset()
@@ -183,6 +192,14 @@ def process_rotki_generic_import_csv_fields(
     return asset, fee, fee_currency, location, timestamp
 
 
+def get_csv_chunks(rows: Iterable[T], chunk_size: int = CSV_ROWS_CHUNK_SIZE) -> Iterator[list[T]]:
+    """Yield the rows of a CSV file in lists of up to chunk_size rows so that the whole
+    file never needs to be in memory"""
+    iterator = iter(rows)
+    while len(chunk := list(islice(iterator, chunk_size))) != 0:
+        yield chunk
+
+
 def hash_csv_row(csv_row: Mapping[str, Any]) -> str:
     """Convert the row to string and encode it to a hex string to get a unique hash"""
     row_str = str(csv_row).encode()
@@ -200,20 +217,27 @@ def detect_duplicate_event(
         importer: BaseExchangeImporter,
         write_cursor: 'DBCursor',
 ) -> bool:
-    """Detect if an event with these attributes is already in the database.
+    """Detect if an event with these attributes is already in the database or was
+    already checked by the same import, in which case it's assumed to be added by it.
     Returns True if the event is found, and False if not found.
+
+    The events of the DB with the given prefix and location are loaded once per import
+    so that checking each row does not need a query.
     """
-    importer.flush_all(write_cursor)  # flush so that the DB check later can work and not miss unwritten events  # noqa: E501
-    with importer.db.conn.read_ctx() as read_cursor:
-        read_cursor.execute(
-            f"SELECT COUNT(*) FROM history_events WHERE "
-            f"event_identifier LIKE '{event_prefix}%' "
-            "AND asset=? AND amount=? AND timestamp=? AND location=? "
-            "AND type=? AND subtype=?",
-            (asset.identifier, str(amount), timestamp_ms, location.serialize_for_db(),
-             event_type.serialize(), event_subtype.serialize()),
-        )
-        return read_cursor.fetchone()[0] != 0
+    if (existing_events := importer.existing_events.get((event_prefix, location))) is None:
+        importer.flush_all(write_cursor)  # flush so that the DB check can not miss unwritten events  # noqa: E501
+        existing_events = importer.existing_events[event_prefix, location] = set(write_cursor.execute(  # noqa: E501
+            'SELECT asset, amount, timestamp, type, subtype FROM history_events '
+            'WHERE event_identifier LIKE ? AND location=?',
+            (f'{event_prefix}%', location.serialize_for_db()),
+        ))
+
+    event_key = (asset.identifier, str(amount), timestamp_ms, event_type.serialize(), event_subtype.serialize())  # noqa: E501
+    if event_key in existing_events:
+        return True
+
+    existing_events.add(event_key)
+    return False
 
 
 def maybe_set_transaction_extra_data(
@@ -0,0 +1,86 @@
+import logging
+from collections.abc import Iterable
+from itertools import starmap
+from typing import TYPE_CHECKING, NamedTuple
+
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+from rotkehlchen.types import Timestamp
+
+if TYPE_CHECKING:
+    from rotkehlchen.db.dbhandler import DBHandler
+    from rotkehlchen.db.drivers.gevent import DBCursor
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+# Max number of checkpoints kept in the DB. The oldest ones are deleted first.
+MAX_ACCOUNTING_CHECKPOINTS = 24
+
+
+class AccountingCheckpoint(NamedTuple):
+    """What a saved accounting state was computed from. The state itself is big so it
+    is only read for the checkpoint a report resumes from"""
+    timestamp: Timestamp
+    events_num: int
+    events_hash: str
+    settings_hash: str
+    ignored_hash: str
+    rules_hash: str
+
+
+class DBAccountingCheckpoints:
+
+    def __init__(self, database: 'DBHandler') -> None:
+        self.db = database
+
+    def get_checkpoints(self, cursor: 'DBCursor') -> list[AccountingCheckpoint]:
+        """Get all the saved checkpoints in ascending timestamp order"""
+        cursor.execute(
+            'SELECT timestamp, events_num, events_hash, settings_hash, ignored_hash, rules_hash '
+            'FROM accounting_checkpoints ORDER BY timestamp ASC',
+        )
+        return list(starmap(AccountingCheckpoint, cursor))
+
+    def get_checkpoint_state(self, cursor: 'DBCursor', timestamp: Timestamp) -> str | None:
+        """Get the serialized accounting state of a checkpoint or None if it does not exist"""
+        cursor.execute('SELECT state FROM accounting_checkpoints WHERE timestamp=?', (timestamp,))
+        return None if (result := cursor.fetchone()) is None else result[0]
+
+    def add_checkpoints(
+            self,
+            checkpoints: Iterable[AccountingCheckpoint],
+            state: str,
+    ) -> None:
+        """Save checkpoints that share the same accounting state, replacing any existing
+        ones at the same timestamps. Only the newest MAX_ACCOUNTING_CHECKPOINTS are kept."""
+        with self.db.user_write() as write_cursor:
+            write_cursor.executemany(
+                'INSERT OR REPLACE INTO accounting_checkpoints(timestamp, events_num, '
+                'events_hash, settings_hash, ignored_hash, rules_hash, state) '
+                'VALUES(?, ?, ?, ?, ?, ?, ?)',
+                [(*checkpoint, state) for checkpoint in checkpoints],
+            )
+            write_cursor.execute(
+                'DELETE FROM accounting_checkpoints WHERE timestamp NOT IN '
+                '(SELECT timestamp FROM accounting_checkpoints ORDER BY timestamp DESC LIMIT ?)',
+                (MAX_ACCOUNTING_CHECKPOINTS,),
+            )
+
+    def delete_checkpoints(
+            self,
+            write_cursor: 'DBCursor',
+            timestamps: Iterable[Timestamp],
+    ) -> None:
+        write_cursor.executemany(
+            'DELETE FROM accounting_checkpoints WHERE timestamp=?',
+            [(timestamp,) for timestamp in timestamps],
+        )
+
+    def delete_checkpoints_after(self, write_cursor: 'DBCursor', timestamp: Timestamp) -> None:
+        """Delete the checkpoints whose state may depend on data at the given timestamp"""
+        write_cursor.execute(
+            'DELETE FROM accounting_checkpoints WHERE timestamp > ?',
+            (timestamp,),
+        )
+        if write_cursor.rowcount > 0:
+            log.debug(f'Deleted {write_cursor.rowcount} accounting checkpoints after {timestamp}')
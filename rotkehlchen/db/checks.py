@@ -1,5 +1,6 @@
 import logging
 import re
+from collections.abc import Collection, Sequence
 from typing import TYPE_CHECKING, Any
 
 from rotkehlchen.errors.misc import DBSchemaError
@@ -16,6 +17,9 @@ DEFAULT_SANITY_CHECK_MESSAGE = (
     'github or contact us in our discord server.'
 )
 
+# Matches an EXPLAIN QUERY PLAN step that walks a whole table, directly or through an index
+FULL_SCAN_RE = re.compile(r'^SCAN (\w+)\b')
+
 WHITESPACE_RE = re.compile(
     r'//.*?\n|/\*.*?\*/',
     re.DOTALL | re.MULTILINE,
@@ -103,3 +107,22 @@ def sanity_check_impl(
             f'Structure of some tables in your {db_name} database differ from the '
             f'expected. Check the logs for more details. ' + DEFAULT_SANITY_CHECK_MESSAGE,
         )
+
+
+def find_full_table_scans(
+        cursor: 'DBCursor',
+        query: str,
+        bindings: Sequence[Any],
+        tables: Collection[str],
+) -> list[str]:
+    """Runs EXPLAIN QUERY PLAN for the given query and returns the names of the given
+    tables that SQLite would read with a full scan.
+
+    Walking a whole index (SCAN x USING INDEX y) also counts as a full scan since it
+    visits every row of the table. Only SEARCH steps are considered indexed access.
+    """
+    return [
+        match.group(1)
+        for plan_row in cursor.execute(f'EXPLAIN QUERY PLAN {query}', bindings)
+        if (match := FULL_SCAN_RE.match(plan_row[3])) is not None and match.group(1) in tables
+    ]
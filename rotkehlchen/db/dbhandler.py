@@ -3,13 +3,13 @@ import logging
 import os
 import re
 import shutil
-import tempfile
 from collections import defaultdict
 from collections.abc import Iterator, Sequence
 from contextlib import contextmanager, suppress
 from pathlib import Path
 from typing import Any, Literal, Optional, Unpack, cast, overload
 
+import polars as pl
 from gevent.lock import Semaphore
 from pysqlcipher3 import dbapi2 as sqlcipher
 
@@ -39,7 +39,6 @@ from rotkehlchen.constants.limits import (
     FREE_USER_NOTES_LIMIT,
 )
 from rotkehlchen.constants.misc import NFT_DIRECTIVE, USERDB_NAME
-from rotkehlchen.constants.timing import HOUR_IN_SECONDS
 from rotkehlchen.db.cache import (
     AddressArgType,
     DBCacheDynamic,
@@ -62,6 +61,7 @@ from rotkehlchen.db.filtering import (
     TradesFilterQuery,
     UserNotesFilterQuery,
 )
+from rotkehlchen.db.history_events import DBHistoryEvents
 from rotkehlchen.db.loopring import DBLoopring
 from rotkehlchen.db.misc import detect_sqlcipher_version
 from rotkehlchen.db.schema import DB_SCRIPT_CREATE_TABLES
@@ -78,6 +78,11 @@ from rotkehlchen.db.settings import (
     db_settings_from_dict,
     serialize_db_setting,
 )
+from rotkehlchen.db.timed_balances import (
+    deserialize_timed_balances,
+    query_netvalue_data,
+    query_timed_balances,
+)
 from rotkehlchen.db.upgrade_manager import DBUpgradeManager
 from rotkehlchen.db.utils import (
     DBAssetBalance,
@@ -85,7 +90,6 @@ from rotkehlchen.db.utils import (
     LocationData,
     SingleDBAssetBalance,
     Tag,
-    combine_asset_balances,
     db_tuple_to_str,
     deserialize_tags_from_db,
     form_query_to_filter_timestamps,
@@ -344,6 +348,13 @@ class DBHandler:
         # run checks on the database
         self.conn.schema_sanity_check()
         self._check_settings()
+        if __debug__:  # make sure the history events filters are served by an index
+            with self.conn.read_ctx() as cursor:
+                unindexed = DBHistoryEvents(self).get_unindexed_filter_queries(cursor)
+            assert len(unindexed) == 0, 'History events queries do full table scans: ' + ', '.join(
+                f'{filter_description} of {scanned_tables}'
+                for filter_description, scanned_tables in unindexed
+            )
 
         # This logic executes only for the transient db
         self._connect(conn_attribute='conn_transient')
@@ -567,8 +578,8 @@ class DBHandler:
                 "DETACH DATABASE plaintext;",
             )
 
-    def import_unencrypted(self, unencrypted_db_data: bytes) -> None:
-        """Imports an unencrypted DB from raw data
+    def import_unencrypted(self, unencrypted_db_path: Path) -> None:
+        """Imports the unencrypted DB at the given path
 
         May raise:
         - DBUpgradeError if the rotki DB version is newer than the software or
@@ -586,24 +597,19 @@ class DBHandler:
         )
         rdbpath.unlink()
 
-        # dump the unencrypted data into a temporary file
-        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmpdirname:  # needed on windows, see https://tinyurl.com/tmp-win-err  # noqa: E501
-            tempdbpath = Path(tmpdirname) / 'temp.db'
-            tempdbpath.write_bytes(unencrypted_db_data)
-
-            # Now attach to the unencrypted DB and copy it to our DB and encrypt it
-            self.conn = DBConnection(
-                path=tempdbpath,
-                connection_type=DBConnectionType.USER,
-                sql_vm_instructions_cb=self.sql_vm_instructions_cb,
-            )
-            password_for_sqlcipher = protect_password_sqlcipher(self.password)
-            script = f"ATTACH DATABASE '{rdbpath}' AS encrypted KEY '{password_for_sqlcipher}';"
-            if self.sqlcipher_version == 3:
-                script += f'PRAGMA encrypted.kdf_iter={KDF_ITER};'
-            script += "SELECT sqlcipher_export('encrypted');DETACH DATABASE encrypted;"
-            self.conn.executescript(script)
-            self.disconnect()
+        # Now attach to the unencrypted DB and copy it to our DB and encrypt it
+        self.conn = DBConnection(
+            path=unencrypted_db_path,
+            connection_type=DBConnectionType.USER,
+            sql_vm_instructions_cb=self.sql_vm_instructions_cb,
+        )
+        password_for_sqlcipher = protect_password_sqlcipher(self.password)
+        script = f"ATTACH DATABASE '{rdbpath}' AS encrypted KEY '{password_for_sqlcipher}';"
+        if self.sqlcipher_version == 3:
+            script += f'PRAGMA encrypted.kdf_iter={KDF_ITER};'
+        script += "SELECT sqlcipher_export('encrypted');DETACH DATABASE encrypted;"
+        self.conn.executescript(script)
+        self.disconnect()
 
         try:
             self._connect()
@@ -2324,129 +2330,35 @@ class DBHandler:
             self,
             from_ts: Timestamp,
             include_nfts: bool = True,
-    ) -> tuple[list[str], list[str]]:
+    ) -> tuple[list[int], list[str]]:
         """Get all entries of net value data from the DB"""
         with self.conn.read_ctx() as cursor:
-            # Get the total location ("H") entries in ascending time
-            cursor.execute(
-                "SELECT timestamp, usd_value FROM timed_location_data "
-                "WHERE location='H' AND timestamp >= ? ORDER BY timestamp ASC;",
-                (from_ts,),
-            )
-            if not include_nfts:
-                with self.conn.read_ctx() as nft_cursor:
-                    nft_cursor.execute(
-                        'SELECT timestamp, SUM(usd_value) FROM timed_balances WHERE '
-                        'timestamp >= ? AND currency LIKE ? GROUP BY timestamp',
-                        (from_ts, f'{NFT_DIRECTIVE}%'),
-                    )
-                    nft_values = dict(nft_cursor)
+            return query_netvalue_data(cursor=cursor, from_ts=from_ts, include_nfts=include_nfts)
 
-            data = []
-            times_int = []
-            for entry in cursor:
-                times_int.append(entry[0])
-                if include_nfts:
-                    total = entry[1]
-                else:
-                    total = str(FVal(entry[1]) - FVal(nft_values.get(entry[0], 0)))
-                data.append(total)
-        return times_int, data
-
-    @staticmethod
-    def _infer_zero_timed_balances(
+    def query_timed_balances_frame(
+            self,
             cursor: 'DBCursor',
-            balances: list[SingleDBAssetBalance],
+            asset: Asset,
+            balance_type: BalanceType,
             from_ts: Timestamp | None = None,
             to_ts: Timestamp | None = None,
-    ) -> list[SingleDBAssetBalance]:
-        """
-        Given a list of asset specific timed balances, infers the missing zero timed balances
-        for the asset. We add 0 balances on the start and end of a period of 0 balances.
-        It addresses this issue: https://github.com/rotki/rotki/issues/2822
-
-        Example
-        We have the following timed balances for ETH (value, time):
-        (1, 1), (1, 2), (2, 3), (5, 7), (5, 12)
-        The timestamps of all timed balances in the DB are:
-        (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12)
-        So we need to infer the following zero timed balances:
-        (0, 4), (0, 6), (0, 8), (0, 11)
-
-        Keep in mind that in a case like this (1, 1), (1, 2), (5, 4) we will infer (0, 3)
-        despite the fact that it is not strictly needed by the front end.
-        """
-        if len(balances) == 0:
-            return []
-
-        if from_ts is None:
-            from_ts = Timestamp(0)
-        if to_ts is None:
-            to_ts = ts_now()
-
-        cursor.execute(
-            'SELECT COUNT(DISTINCT timestamp) FROM timed_balances WHERE timestamp BETWEEN ? AND ?',
-            (from_ts, to_ts),
-        )
-        num_distinct_timestamps = cursor.fetchone()[0]
-
-        asset_timestamps = [b.time for b in balances if b.amount != ZERO]  # ignore timestamps from 0 balances added by the ssf_graph_multiplier setting  # noqa: E501
-        if len(asset_timestamps) == num_distinct_timestamps:
-            return []
-
-        cursor.execute(
-            'SELECT timestamp, category FROM timed_balances WHERE timestamp BETWEEN ? AND ? '
-            'ORDER BY timestamp ASC',
-            (from_ts, to_ts),
+    ) -> pl.DataFrame:
+        """Query all balance entries for an asset and balance type within a range of timestamps
+        as a frame of their time, category, amount and usd_value, serialized for the DB"""
+        settings = self.get_settings(cursor)
+        currencies = [asset.identifier]
+        if settings.treat_eth2_as_eth and asset == A_ETH:
+            currencies.append('ETH2')
+
+        return query_timed_balances(
+            cursor=cursor,
+            settings=settings,
+            assets_currencies=[currencies],
+            balance_type=balance_type,
+            from_ts=from_ts if from_ts is not None else Timestamp(0),
+            to_ts=to_ts if to_ts is not None else ts_now(),
+            combine=len(currencies) != 1,
         )
-        all_timestamps, all_categories = zip(*cursor, strict=True)
-        # dicts maintain insertion order in python 3.7+
-        timestamps_have_asset_balance = dict.fromkeys(all_timestamps, False)
-        timestamps_with_asset_balance = dict.fromkeys(asset_timestamps, True)
-        timestamps_have_asset_balance.update(timestamps_with_asset_balance)
-        prev_has_asset_balance = timestamps_have_asset_balance[all_timestamps[0]]  # the value of the first timestamp  # noqa: E501
-        prev_timestamp = all_timestamps[0]
-        inferred_balances: list[SingleDBAssetBalance] = []
-        is_zero_period_open = False
-        last_asset_category = all_categories[-1]  # just a placeholder value, no need to calculate the actual value here  # noqa: E501
-        for idx, (timestamp, has_asset_balance) in enumerate(timestamps_have_asset_balance.items()):  # noqa: E501
-            if idx == len(timestamps_have_asset_balance) - 1 and has_asset_balance is False:
-                # If there is no balance for the last timestamp add a zero balance.
-                inferred_balances.append(
-                    SingleDBAssetBalance(
-                        time=timestamp,
-                        amount=ZERO,
-                        usd_value=ZERO,
-                        category=last_asset_category,
-                    ),
-                )
-            elif has_asset_balance is False and prev_has_asset_balance is True:
-                # add the start of a zero balance period
-                inferred_balances.append(
-                    SingleDBAssetBalance(
-                        time=timestamp,
-                        amount=ZERO,
-                        usd_value=ZERO,
-                        category=BalanceType.deserialize_from_db(all_categories[idx - 1]),  # the category of the previous timed_balance of the asset  # noqa: E501
-                    ),
-                )
-                is_zero_period_open = True
-            elif has_asset_balance is True and prev_has_asset_balance is False and is_zero_period_open is True:  # noqa: E501
-                # add the end of a zero balance period
-                inferred_balances.append(
-                    SingleDBAssetBalance(
-                        time=prev_timestamp,
-                        amount=ZERO,
-                        usd_value=ZERO,
-                        category=inferred_balances[-1].category,  # the category of the asset at the start of the zero balance period  # noqa: E501
-                    ),
-                )
-                is_zero_period_open = False
-                last_asset_category = inferred_balances[-1].category
-            elif has_asset_balance is True:
-                last_asset_category = BalanceType.deserialize_from_db(all_categories[idx])
-            prev_has_asset_balance, prev_timestamp = has_asset_balance, timestamp
-        return inferred_balances
 
     def query_timed_balances(
             self,
@@ -2458,97 +2370,59 @@ class DBHandler:
     ) -> list[SingleDBAssetBalance]:
         """Query all balance entries for an asset and balance type within a range of timestamps
         """
-        if from_ts is None:
-            from_ts = Timestamp(0)
-        if to_ts is None:
-            to_ts = ts_now()
-
-        settings = self.get_settings(cursor)
-        querystr = (
-            'SELECT timestamp, amount, usd_value, category FROM timed_balances '
-            'WHERE timestamp BETWEEN ? AND ? AND currency=?'
-        )
-        bindings = [from_ts, to_ts, asset.identifier]
-
-        if settings.treat_eth2_as_eth and asset == A_ETH:
-            querystr = querystr.replace('currency=?', 'currency IN (?,?)')
-            bindings.append('ETH2')
-
-        querystr += ' AND category=?'
-        bindings.append(balance_type.serialize_for_db())
-        querystr += ' ORDER BY timestamp ASC;'
-
-        cursor.execute(querystr, bindings)
-        results = cursor.fetchall()
-        balances = []
-        results_length = len(results)
-        for idx, result in enumerate(results):
-            entry_time = result[0]
-            category = BalanceType.deserialize_from_db(result[3])
-            balances.append(
-                SingleDBAssetBalance(
-                    time=entry_time,
-                    amount=FVal(result[1]),
-                    usd_value=FVal(result[2]),
-                    category=category,
-                ),
-            )
-            if settings.ssf_graph_multiplier == 0 or idx == results_length - 1:
-                continue
-
-            next_result_time = results[idx + 1][0]
-            max_diff = settings.balance_save_frequency * HOUR_IN_SECONDS * settings.ssf_graph_multiplier  # noqa: E501
-            while next_result_time - entry_time > max_diff:
-                entry_time += settings.balance_save_frequency * HOUR_IN_SECONDS
-                if entry_time >= next_result_time:
-                    break
-
-                balances.append(
-                    SingleDBAssetBalance(
-                        time=entry_time,
-                        amount=ZERO,
-                        usd_value=ZERO,
-                        category=category,
-                    ),
-                )
-
-        if settings.infer_zero_timed_balances is True:
-            inferred_balances = self._infer_zero_timed_balances(cursor, balances, from_ts, to_ts)
-            if len(inferred_balances) != 0:
-                balances.extend(inferred_balances)
-                balances.sort(key=lambda x: x.time)
-
-        if settings.treat_eth2_as_eth and asset.identifier == 'ETH':
-            return combine_asset_balances(balances)
-
-        return balances
+        return deserialize_timed_balances(self.query_timed_balances_frame(
+            cursor=cursor,
+            asset=asset,
+            balance_type=balance_type,
+            from_ts=from_ts,
+            to_ts=to_ts,
+        ))
 
-    def query_collection_timed_balances(
+    def query_collection_timed_balances_frame(
             self,
             cursor: 'DBCursor',
             collection_id: int,
             from_ts: Timestamp | None = None,
             to_ts: Timestamp | None = None,
-    ) -> list[SingleDBAssetBalance]:
+    ) -> pl.DataFrame:
         """Query all balance entries for all assets of a collection within a range of timestamps
-        """
+        combined by timestamp, as a frame like query_timed_balances_frame"""
         with GlobalDBHandler().conn.read_ctx() as global_cursor:
             global_cursor.execute(
                 'SELECT asset FROM multiasset_mappings WHERE collection_id=?',
                 (collection_id,),
             )
-            asset_balances: list[SingleDBAssetBalance] = []
-            for x in global_cursor:
-                asset_balances.extend(self.query_timed_balances(
-                    cursor=cursor,
-                    asset=Asset(x[0]),
-                    balance_type=BalanceType.ASSET,
-                    from_ts=from_ts,
-                    to_ts=to_ts,
-                ))
+            assets = [x[0] for x in global_cursor]
+
+        settings = self.get_settings(cursor)
+        return query_timed_balances(
+            cursor=cursor,
+            settings=settings,
+            assets_currencies=[
+                [asset, 'ETH2'] if settings.treat_eth2_as_eth and asset == A_ETH.identifier else [asset]  # noqa: E501
+                for asset in assets
+            ],
+            balance_type=BalanceType.ASSET,
+            from_ts=from_ts if from_ts is not None else Timestamp(0),
+            to_ts=to_ts if to_ts is not None else ts_now(),
+            combine=True,
+        )
 
-        asset_balances.sort(key=lambda x: x.time)
-        return combine_asset_balances(asset_balances)
+    def query_collection_timed_balances(
+            self,
+            cursor: 'DBCursor',
+            collection_id: int,
+            from_ts: Timestamp | None = None,
+            to_ts: Timestamp | None = None,
+    ) -> list[SingleDBAssetBalance]:
+        """Query all balance entries for all assets of a collection within a range of timestamps
+        """
+        return deserialize_timed_balances(self.query_collection_timed_balances_frame(
+            cursor=cursor,
+            collection_id=collection_id,
+            from_ts=from_ts,
+            to_ts=to_ts,
+        ))
 
     def query_owned_assets(self, cursor: 'DBCursor') -> list[Asset]:
         """Query the DB for a list of all assets ever owned
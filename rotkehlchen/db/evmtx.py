@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Sequence
 from typing import TYPE_CHECKING, Any, get_args
 
 from pysqlcipher3 import dbapi2 as sqlcipher
@@ -41,6 +42,7 @@ from rotkehlchen.types import (
     deserialize_evm_tx_hash,
 )
 from rotkehlchen.utils.hexbytes import hexstring_to_bytes
+from rotkehlchen.utils.misc import get_chunks
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
@@ -61,6 +63,24 @@ TRANSACTIONS_MISSING_DECODING_QUERY = (
 )
 
 
+def _deserialize_receipt_fields(
+        data: dict[str, Any],
+) -> tuple[ChecksumEvmAddress | None, int, int]:
+    """The contract address, status and type of raw receipt data as saved in the DB
+
+    May raise:
+    - DeserializationError if there is a problem deserializing a value
+    """
+    # some nodes miss the type field for older non EIP1559 transactions. So assume legacy (0)
+    tx_type = deserialize_int_from_hex_or_int(data.get('type', '0x0'), location='receipt data insertion')  # noqa: E501
+    status = data.get('status', 1)  # status may be missing for older txs. Assume 1.
+    if status is None:
+        status = 1
+
+    contract_address = deserialize_evm_address(data['contractAddress']) if data['contractAddress'] else None  # noqa: E501
+    return contract_address, status, tx_type
+
+
 class DBEvmTx:
 
     def __init__(self, database: 'DBHandler') -> None:
@@ -338,17 +358,10 @@ class DBEvmTx:
         - pysqlcipher3.dbapi2.IntegrityError if the transaction hash is not in the DB:
         """
         tx_hash_b = hexstring_to_bytes(data['transactionHash'])
-        # some nodes miss the type field for older non EIP1559 transactions. So assume legacy (0)
-        tx_type = deserialize_int_from_hex_or_int(data.get('type', '0x0'), location='receipt data insertion')  # noqa: E501
-        status = data.get('status', 1)  # status may be missing for older txs. Assume 1.
-        serialized_chain_id = chain_id.serialize_for_db()
-        if status is None:
-            status = 1
-
-        contract_address = deserialize_evm_address(data['contractAddress']) if data['contractAddress'] else None  # noqa: E501
+        contract_address, status, tx_type = _deserialize_receipt_fields(data)
         tx_id = write_cursor.execute(
             'SELECT identifier from evm_transactions WHERE tx_hash=? AND chain_id=?',
-            (tx_hash_b, serialized_chain_id),
+            (tx_hash_b, chain_id.serialize_for_db()),
         ).fetchone()[0]
 
         try:
@@ -389,6 +402,95 @@ class DBEvmTx:
                     topic_tuples,
                 )
 
+    def add_or_ignore_receipts_data(
+            self,
+            write_cursor: 'DBCursor',
+            chain_id: ChainID,
+            receipts_data: Sequence[dict[str, Any]],
+    ) -> int:
+        """Same as add_or_ignore_receipt_data but for many receipts, which are written
+        with a few executemany calls. Receipts of transactions that are not in the DB
+        are skipped.
+
+        Receipts with missing fields or values that can't be deserialized are logged and
+        skipped so that they don't fail the rest of the batch.
+
+        Returns the number of receipts added.
+
+        May raise:
+        - KeyError if a receipt has no transactionHash
+        - DeserializationError if a transactionHash is not valid hex
+        """
+        tx_hashes = list({hexstring_to_bytes(data['transactionHash']) for data in receipts_data})
+        tx_ids: dict[bytes, int] = {}
+        for chunk in get_chunks(tx_hashes, n=500):  # stay under the sqlite variables limit
+            tx_ids.update(write_cursor.execute(
+                f'SELECT tx_hash, identifier FROM evm_transactions WHERE chain_id=? AND '
+                f'tx_hash IN ({",".join("?" * len(chunk))})',
+                (chain_id.serialize_for_db(), *chunk),
+            ))
+
+        existing_receipts: set[int] = set()
+        for ids_chunk in get_chunks(list(tx_ids.values()), n=500):
+            existing_receipts.update(row[0] for row in write_cursor.execute(
+                f'SELECT tx_id FROM evmtx_receipts WHERE tx_id IN ({",".join("?" * len(ids_chunk))})',  # noqa: E501
+                ids_chunk,
+            ))
+
+        # log identifiers are set here so that topics can refer to them without a query per log
+        log_id = write_cursor.execute('SELECT MAX(identifier) FROM evmtx_receipt_logs').fetchone()[0] or 0  # noqa: E501
+        receipts: list[tuple] = []
+        logs: list[tuple] = []
+        topics: list[tuple[int, bytes, int]] = []
+        for data in receipts_data:
+            if (tx_id := tx_ids.get(hexstring_to_bytes(data['transactionHash']))) is None:
+                log.error(f'Skipping receipt of {data["transactionHash"]} since its {chain_id} transaction is not in the DB')  # noqa: E501
+                continue
+            if tx_id in existing_receipts:
+                continue  # something else added the receipt
+
+            try:  # deserialize everything first so that a bad receipt adds no rows at all
+                receipt_fields = _deserialize_receipt_fields(data)
+                receipt_logs: list[tuple] = []
+                receipt_topics: list[tuple[int, bytes, int]] = []
+                for offset, log_entry in enumerate(data['logs'], start=log_id + 1):
+                    receipt_logs.append((
+                        offset,
+                        tx_id,
+                        log_entry['logIndex'],
+                        hexstring_to_bytes(log_entry['data']),
+                        deserialize_evm_address(log_entry['address']),
+                    ))
+                    receipt_topics.extend(
+                        (offset, hexstring_to_bytes(topic), idx)
+                        for idx, topic in enumerate(log_entry['topics'])
+                    )
+            except (DeserializationError, KeyError) as e:
+                msg = f'missing key {e!s}' if isinstance(e, KeyError) else str(e)
+                log.error(f'Skipping {chain_id} receipt of {data["transactionHash"]} due to {msg}')
+                continue
+
+            existing_receipts.add(tx_id)
+            receipts.append((tx_id, *receipt_fields))
+            logs.extend(receipt_logs)
+            topics.extend(receipt_topics)
+            log_id += len(receipt_logs)
+
+        write_cursor.executemany(
+            'INSERT INTO evmtx_receipts (tx_id, contract_address, status, type) VALUES(?, ?, ?, ?)',  # noqa: E501
+            receipts,
+        )
+        write_cursor.executemany(
+            'INSERT INTO evmtx_receipt_logs (identifier, tx_id, log_index, data, address) '
+            'VALUES(?, ?, ?, ?, ?)',
+            logs,
+        )
+        write_cursor.executemany(
+            'INSERT INTO evmtx_receipt_log_topics (log, topic, topic_index) VALUES(?, ?, ?)',
+            topics,
+        )
+        return len(receipts)
+
     def get_receipt(
             self,
             cursor: 'DBCursor',
@@ -439,6 +541,72 @@ class DBEvmTx:
 
         return tx_receipt
 
+    def get_transactions_and_receipts(
+            self,
+            cursor: 'DBCursor',
+            tx_hashes: Sequence[EVMTxHash],
+            chain_id: ChainID,
+    ) -> dict[EVMTxHash, tuple[EvmTransaction, EvmTxReceipt]]:
+        """Get the given transactions of a chain along with their receipts with a single
+        query per table instead of a few queries per transaction. Transactions that are
+        not in the DB or have no receipt in it are not included in the result.
+
+        May raise:
+        - DeserializationError if a transaction can't be deserialized from the DB
+        """
+        query, bindings = self._form_evm_transaction_dbquery(
+            query=f'WHERE evm_transactions.chain_id=? AND evm_transactions.tx_hash IN ({",".join(["?"] * len(tx_hashes))})',  # noqa: E501
+            bindings=[chain_id.serialize_for_db(), *tx_hashes],
+            has_premium=True,
+        )
+        transactions: dict[int, EvmTransaction] = {}
+        for entry in cursor.execute(query, bindings):
+            transaction = self._build_evm_transaction(entry)
+            transactions[transaction.db_id] = transaction
+
+        tx_ids = list(transactions)
+        placeholders = ','.join(['?'] * len(tx_ids))
+        receipts: dict[int, EvmTxReceipt] = {}
+        cursor.execute(
+            f'SELECT tx_id, contract_address, status, type FROM evmtx_receipts '
+            f'WHERE tx_id IN ({placeholders})',
+            tx_ids,
+        )
+        for tx_id, contract_address, status, tx_type in cursor:
+            receipts[tx_id] = EvmTxReceipt(
+                tx_hash=transactions[tx_id].tx_hash,
+                chain_id=chain_id,
+                contract_address=contract_address,
+                status=bool(status),  # works since value is either 0 or 1
+                tx_type=tx_type,
+            )
+
+        logs: dict[int, EvmTxReceiptLog] = {}
+        cursor.execute(
+            f'SELECT identifier, tx_id, log_index, data, address FROM evmtx_receipt_logs '
+            f'WHERE tx_id IN ({placeholders}) ORDER BY identifier',
+            tx_ids,
+        )
+        for log_id, tx_id, log_index, data, address in cursor:
+            if (receipt := receipts.get(tx_id)) is not None:
+                logs[log_id] = EvmTxReceiptLog(log_index=log_index, data=data, address=address)
+                receipt.logs.append(logs[log_id])
+
+        cursor.execute(
+            f'SELECT topics.log, topics.topic FROM evmtx_receipt_log_topics AS topics '
+            f'INNER JOIN evmtx_receipt_logs AS logs ON topics.log=logs.identifier '
+            f'WHERE logs.tx_id IN ({placeholders}) ORDER BY topics.log, topics.topic_index',
+            tx_ids,
+        )
+        for log_id, topic in cursor:
+            if (receipt_log := logs.get(log_id)) is not None:
+                receipt_log.topics.append(topic)
+
+        return {
+            transaction.tx_hash: (transaction, receipts[tx_id])
+            for tx_id, transaction in transactions.items() if tx_id in receipts
+        }
+
     def delete_transactions(
             self,
             write_cursor: 'DBCursor',
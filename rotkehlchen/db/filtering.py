@@ -1,3 +1,6 @@
+import base64
+import binascii
+import json
 import logging
 from abc import ABC, abstractmethod
 from collections.abc import Collection, Sequence
@@ -51,9 +54,11 @@ logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
 
-ALL_EVENTS_DATA_JOIN = """FROM history_events
-LEFT JOIN evm_events_info ON history_events.identifier=evm_events_info.identifier
-LEFT JOIN eth_staking_events_info ON history_events.identifier=eth_staking_events_info.identifier """  # noqa: E501
+EVM_EVENTS_INFO_JOIN = 'LEFT JOIN evm_events_info ON history_events.identifier=evm_events_info.identifier'  # noqa: E501
+ETH_STAKING_EVENTS_INFO_JOIN = 'LEFT JOIN eth_staking_events_info ON history_events.identifier=eth_staking_events_info.identifier'  # noqa: E501
+ALL_EVENTS_DATA_JOIN = f"""FROM history_events
+{EVM_EVENTS_INFO_JOIN}
+{ETH_STAKING_EVENTS_INFO_JOIN} """
 EVM_EVENT_JOIN = 'FROM history_events INNER JOIN evm_events_info ON history_events.identifier=evm_events_info.identifier '  # noqa: E501
 ETH_STAKING_EVENT_JOIN = 'FROM history_events INNER JOIN eth_staking_events_info ON history_events.identifier=eth_staking_events_info.identifier '  # noqa: E501
 ETH_DEPOSIT_EVENT_JOIN = ALL_EVENTS_DATA_JOIN
@@ -301,6 +306,56 @@ class DBSubStringFilter(DBFilter):
         return [f'{self.field} LIKE ?'], [f'%{self.search_string}%']
 
 
+def serialize_keyset_token(key: Sequence[Any]) -> str:
+    """Opaque token of the key of a row, that is used to query the rows after it"""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode()
+
+
+def deserialize_keyset_token(token: str) -> list[int | str]:
+    """May raise:
+    - DeserializationError if the token was not created by serialize_keyset_token
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (ValueError, binascii.Error) as e:
+        raise DeserializationError(f'Invalid page token {token}') from e
+
+    if not isinstance(key, list) or len(key) == 0 or not all(isinstance(x, int | str) for x in key):  # noqa: E501
+        raise DeserializationError(f'Invalid page token {token}')
+
+    return key
+
+
+@dataclass(init=True, repr=True, eq=True, order=False, unsafe_hash=False, frozen=False)
+class DBKeysetFilter(DBFilter):
+    """Filter of keyset pagination. Only selects the rows that come after the row with the
+    given key in the order of the key columns, which need to be unique together. Contrary
+    to an offset the rows of the previous pages are not read, so all pages cost the same."""
+    columns: list[tuple[str, bool]]  # key columns and if they are in ascending order
+    values: Sequence[Any] | None  # key of the last row of the previous page. None for the first
+
+    def prepare(self) -> tuple[list[str], list[Any]]:
+        """Expands (a, b) > (x, y) to a > x OR (a = x AND b > y) so that the columns can have
+        different orders. The leading a >= x lets sqlite use an index on the first column."""
+        if self.values is None:
+            return [], []
+
+        first_column, first_ascending = self.columns[0]
+        conditions: list[str] = []
+        bindings: list[Any] = []
+        for idx, (column, ascending) in enumerate(self.columns):
+            conditions.append(' AND '.join(
+                [f'{x} = ?' for x, _ in self.columns[:idx]] +
+                [f'{column} {">" if ascending else "<"} ?'],
+            ))
+            bindings.extend(self.values[:idx + 1])
+
+        return (
+            [f'{first_column} {">=" if first_ascending else "<="} ? AND ({" OR ".join(f"({x})" for x in conditions)})'],  # noqa: E501
+            [self.values[0], *bindings],
+        )
+
+
 @dataclass(init=True, repr=True, eq=True, order=False, unsafe_hash=False, frozen=False)
 class DBFilterQuery(ABC):
     and_op: bool
@@ -309,6 +364,7 @@ class DBFilterQuery(ABC):
     group_by: DBFilterGroupBy | None = None
     order_by: DBFilterOrder | None = None
     pagination: DBFilterPagination | None = None
+    keyset_filter: DBKeysetFilter | None = None  # applied with the pagination
 
     def prepare(
             self,
@@ -320,7 +376,7 @@ class DBFilterQuery(ABC):
         """Prepares a filter by converting the filters to a query string
 
         Can be configured to:
-        - with_pagination: Use or not the pagination filters
+        - with_pagination: Use or not the pagination filters, including the keyset filter
         - with_order: Use or not the order by filters
         - with_group_by: Use or not the group by filters
         - without_ignored_asset_filter: This is only for history events query and since we have
@@ -350,6 +406,12 @@ class DBFilterQuery(ABC):
             filterstrings.append(f'({operator.join(filters)})')
             bindings.extend(single_bindings)
 
+        if with_pagination and self.keyset_filter is not None:
+            keyset_filters, keyset_bindings = self.keyset_filter.prepare()
+            if len(keyset_filters) != 0:
+                filterstrings.append(f'({keyset_filters[0]})')
+                bindings.extend(keyset_bindings)
+
         if len(filterstrings) != 0:
             operator = ' AND ' if self.and_op else ' OR '
             filter_query = f'{"WHERE " if self.join_clause is None else "AND ("}{operator.join(filterstrings)}{"" if self.join_clause is None else ")"}'  # noqa: E501
@@ -369,6 +431,33 @@ class DBFilterQuery(ABC):
 
         return ' '.join(query_parts), bindings
 
+    def paginate_by_keyset(
+            self,
+            columns: list[tuple[str, bool]],
+            limit: int,
+            after: Sequence[Any] | None,
+    ) -> None:
+        """Use keyset pagination instead of an offset. The results are ordered by the given
+        key columns, which need to be unique together, and only the ones after the given
+        key of the last row of the previous page are selected. If after is None the first
+        page is selected."""
+        assert self.and_op is True, 'keyset pagination needs all filters to apply'
+        self.order_by = DBFilterOrder(rules=columns, case_sensitive=True)
+        self.pagination = DBFilterPagination(limit=limit, offset=None)
+        self.keyset_filter = DBKeysetFilter(and_op=True, columns=columns, values=after)
+
+    def next_page_token(self, rows_num: int, last_key: Sequence[Any] | None) -> str | None:
+        """The token to query the page after the one that returned rows_num rows, the last
+        of which has the given key. None if this is not keyset pagination or the page
+        was the last one."""
+        if (
+                self.keyset_filter is None or self.pagination is None or
+                last_key is None or rows_num < (self.pagination.limit or 0)
+        ):
+            return None
+
+        return serialize_keyset_token(last_key)
+
     @classmethod
     def create(
             cls: type[T_FilterQ],
@@ -650,6 +739,11 @@ class DBOptionalChainAddressesFilter(DBFilter):
 
 class TradesFilterQuery(DBFilterQuery, FilterWithTimestamp, FilterWithLocation):
 
+    @staticmethod
+    def keyset_columns(ascending: bool) -> list[tuple[str, bool]]:
+        """The columns that identify a trade in timestamp order, for keyset pagination"""
+        return [('timestamp', ascending), ('id', True)]
+
     @classmethod
     def make(
             cls: type['TradesFilterQuery'],
@@ -861,6 +955,7 @@ class HistoryEventCustomizedOnlyJoinsFilter(DBFilter):
 
 
 class HistoryBaseEntryFilterQuery(DBFilterQuery, FilterWithTimestamp, FilterWithLocation, ABC):
+    entry_types_filter: DBMultiIntegerFilter | None = None
 
     @classmethod
     def make(
@@ -918,12 +1013,13 @@ class HistoryBaseEntryFilterQuery(DBFilterQuery, FilterWithTimestamp, FilterWith
                     ),
                 )
         if entry_types is not None:
-            filters.append(DBMultiIntegerFilter(
+            filter_query.entry_types_filter = DBMultiIntegerFilter(
                 and_op=True,
                 column='entry_type',
                 values=[x.value for x in entry_types.values],
                 operator=entry_types.operator,
-            ))
+            )
+            filters.append(filter_query.entry_types_filter)
         if event_types is not None:
             filters.append(DBMultiStringFilter(
                 and_op=True,
@@ -1010,6 +1106,20 @@ class HistoryBaseEntryFilterQuery(DBFilterQuery, FilterWithTimestamp, FilterWith
         filter_query.filters = filters
         return filter_query
 
+    @property
+    def entry_types(self) -> set[HistoryBaseEntryType]:
+        """The entry types of the events that the filter can select"""
+        if self.entry_types_filter is None:
+            return set(HistoryBaseEntryType)
+
+        values = {HistoryBaseEntryType(x) for x in self.entry_types_filter.values}
+        return values if self.entry_types_filter.operator == 'IN' else set(HistoryBaseEntryType) - values  # noqa: E501
+
+    @staticmethod
+    def keyset_columns(ascending: bool) -> list[tuple[str, bool]]:
+        """The columns that identify an event in timestamp order, for keyset pagination"""
+        return [('timestamp', ascending), ('sequence_index', True), ('history_events_identifier', True)]  # noqa: E501
+
     @staticmethod
     @abstractmethod
     def get_join_query() -> str:
@@ -1793,6 +1903,8 @@ class LevenshteinFilterQuery(MultiTableFilterQuery):
     """
     substring_search: str | None
     ignored_assets_handling: IgnoredAssetsHandling = IgnoredAssetsHandling.NONE
+    chain_id: ChainID | None = None
+    address: ChecksumEvmAddress | None = None
 
     @classmethod
     def make(
@@ -1810,6 +1922,7 @@ class LevenshteinFilterQuery(MultiTableFilterQuery):
             substring_search=substring_search,
         )
         filter_query.ignored_assets_handling = ignored_assets_handling
+        filter_query.chain_id, filter_query.address = chain_id, address
         filters: list[tuple[DBFilter, str]] = []  # filter + table name for which to use it.
         if substring_search is not None:
             name_filter = DBSubStringFilter(
@@ -1,14 +1,20 @@
 import copy
+import inspect
 import json
 import logging
+import re
+from abc import ABC
 from collections.abc import Mapping, Sequence
 from typing import TYPE_CHECKING, Any, Literal, Optional, overload
 
 from pysqlcipher3 import dbapi2 as sqlcipher
 
 from rotkehlchen.assets.asset import Asset
+from rotkehlchen.chain.evm.constants import ZERO_ADDRESS
 from rotkehlchen.constants import ZERO
+from rotkehlchen.constants.assets import A_ETH
 from rotkehlchen.constants.limits import FREE_HISTORY_EVENTS_LIMIT
+from rotkehlchen.db.checks import find_full_table_scans
 from rotkehlchen.db.constants import (
     ETH_STAKING_EVENT_FIELDS,
     ETH_STAKING_FIELD_LENGTH,
@@ -21,8 +27,9 @@ from rotkehlchen.db.constants import (
     HISTORY_MAPPING_STATE_CUSTOMIZED,
 )
 from rotkehlchen.db.filtering import (
-    ALL_EVENTS_DATA_JOIN,
+    ETH_STAKING_EVENTS_INFO_JOIN,
     EVM_EVENT_JOIN,
+    EVM_EVENTS_INFO_JOIN,
     DBEqualsFilter,
     DBIgnoredAssetsFilter,
     DBIgnoreValuesFilter,
@@ -49,7 +56,7 @@ from rotkehlchen.history.events.structures.eth2 import (
     EthWithdrawalEvent,
 )
 from rotkehlchen.history.events.structures.evm_event import EvmEvent
-from rotkehlchen.history.events.structures.types import HistoryEventType
+from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.serialization.deserialize import deserialize_fval
 from rotkehlchen.types import (
@@ -59,6 +66,7 @@ from rotkehlchen.types import (
     Location,
     Timestamp,
     TimestampMS,
+    deserialize_evm_tx_hash,
 )
 from rotkehlchen.utils.misc import ts_ms_to_sec, ts_sec_to_ms
 
@@ -93,6 +101,144 @@ def maybe_filter_ignore_asset(
     return ''
 
 
+# The tables with the data specific to some entry types. Their join, their columns and the
+# entry types that have data in them
+HISTORY_EVENTS_INFO_TABLES: tuple[tuple[str, list[str], set[HistoryBaseEntryType]], ...] = (
+    (
+        EVM_EVENTS_INFO_JOIN,
+        EVM_EVENT_FIELDS.split(', '),
+        {HistoryBaseEntryType.EVM_EVENT, HistoryBaseEntryType.ETH_DEPOSIT_EVENT},
+    ), (
+        ETH_STAKING_EVENTS_INFO_JOIN,
+        ETH_STAKING_EVENT_FIELDS.split(', '),
+        {
+            HistoryBaseEntryType.ETH_WITHDRAWAL_EVENT,
+            HistoryBaseEntryType.ETH_BLOCK_EVENT,
+            HistoryBaseEntryType.ETH_DEPOSIT_EVENT,
+        },
+    ),
+)
+
+
+def history_events_projection(
+        filter_query: HistoryBaseEntryFilterQuery,
+        filters: str,
+        summary: bool,
+) -> tuple[str, str]:
+    """Returns the columns and the FROM clause to select the history events of the filter.
+
+    An info table is only joined if the filters use its columns or, unless this is a summary,
+    if the filter can select events of an entry type that has data in it. Otherwise its
+    columns are selected as NULL so that the rows always have the same layout. A summary
+    only has the columns the filters need and is meant for counting.
+    """
+    columns, joins = [HISTORY_BASE_ENTRY_FIELDS.strip()], ['FROM history_events']
+    entry_types = set() if summary else filter_query.entry_types
+    for join, info_columns, info_entry_types in HISTORY_EVENTS_INFO_TABLES:
+        if (
+            len(entry_types & info_entry_types) != 0 or
+            re.search(rf'\b({"|".join(info_columns)})\b', filters) is not None
+        ):
+            columns.extend(info_columns)
+            joins.append(join)
+        elif summary is False:
+            columns.extend(f'NULL AS {x}' for x in info_columns)
+
+    return ', '.join(columns), ' '.join(joins) + ' '
+
+
+# Tables that can get big enough for a full scan of them to be noticeable in the UI
+HISTORY_EVENTS_LARGE_TABLES = ('history_events', 'evm_events_info', 'eth_staking_events_info')
+# Sample values of the history events filter query arguments that should be served by
+# an index. Used to generate the filter shapes whose query plans are audited.
+INDEXED_FILTER_ARGS_SAMPLES: dict[str, Any] = {
+    'from_ts': Timestamp(1),
+    'to_ts': Timestamp(2),
+    'assets': (A_ETH,),
+    'event_types': [HistoryEventType.SPEND],
+    'event_subtypes': [HistoryEventSubType.FEE],
+    'location': Location.KRAKEN,
+    'location_labels': ['label'],
+    'identifiers': [1],
+    'event_identifiers': ['id'],
+    'tx_hashes': [deserialize_evm_tx_hash(b'\x00' * 32)],
+    'counterparties': ['gas'],
+    'addresses': [ZERO_ADDRESS],
+    'validator_indices': [1],
+}
+# History events filter query arguments that are not audited. Either they don't select
+# rows, can't use an index by nature such as NOT IN, IS NULL or columns with only a few
+# values, or they are always set by the filter query class.
+UNINDEXED_FILTER_ARGS = frozenset({
+    'and_op',
+    'order_by_rules',
+    'limit',
+    'offset',
+    'entry_types',
+    'exclude_subtypes',
+    'excluded_locations',
+    'ignored_ids',
+    'null_columns',
+    'exclude_ignored_assets',
+    'customized_events_only',
+    'withdrawal_types_filter',
+    'products',
+})
+# Arguments that are only audited along with others since alone they match most of the
+# events, like an open ended time range or a subtype of any event type
+DEPENDENT_FILTER_ARGS = {
+    'from_ts': ('to_ts',),
+    'to_ts': ('from_ts',),
+    'event_subtypes': ('event_types',),
+}
+# Arguments that are commonly combined with the rest of the filters
+COMMON_FILTER_ARGS_COMBINATIONS = (('from_ts', 'to_ts'), ('location',))
+
+
+def _history_events_filter_classes(cls: type) -> list[type[HistoryBaseEntryFilterQuery]]:
+    """The filter query classes that derive from cls and are not declared abstract"""
+    subclasses: list[type[HistoryBaseEntryFilterQuery]] = []
+    for subclass in cls.__subclasses__():
+        if ABC not in subclass.__bases__ and subclass not in subclasses:
+            subclasses.append(subclass)
+        subclasses.extend(x for x in _history_events_filter_classes(subclass) if x not in subclasses)  # noqa: E501
+
+    return subclasses
+
+
+def indexed_history_events_filters() -> list[tuple[type[HistoryBaseEntryFilterQuery], dict[str, Any]]]:  # noqa: E501
+    """The filter shapes that should be served by an index. They are generated from the
+    make() arguments of every history events filter query class. Each argument in
+    INDEXED_FILTER_ARGS_SAMPLES is used alone, or with the ones it depends on, and
+    with the common combinations.
+
+    Every make() argument needs to be in INDEXED_FILTER_ARGS_SAMPLES or in
+    UNINDEXED_FILTER_ARGS so that new filters are not left out of the audit.
+    """
+    shapes: list[tuple[type[HistoryBaseEntryFilterQuery], dict[str, Any]]] = []
+    for filter_query_class in _history_events_filter_classes(HistoryBaseEntryFilterQuery):
+        args = set(inspect.signature(filter_query_class.make).parameters)
+        assert len(unknown := args - INDEXED_FILTER_ARGS_SAMPLES.keys() - UNINDEXED_FILTER_ARGS) == 0, (  # noqa: E501
+            f'{filter_query_class.__name__} filter arguments {sorted(unknown)} need to be in '
+            f'INDEXED_FILTER_ARGS_SAMPLES or UNINDEXED_FILTER_ARGS'
+        )
+        indexed_args = sorted(args & INDEXED_FILTER_ARGS_SAMPLES.keys())
+        combinations = set()
+        for arg in indexed_args:
+            combinations.add(base := tuple(sorted({arg, *DEPENDENT_FILTER_ARGS.get(arg, ())})))
+            combinations.update(
+                tuple(sorted({*base, *combination})) for combination in COMMON_FILTER_ARGS_COMBINATIONS  # noqa: E501
+                if args.issuperset(combination)
+            )
+
+        shapes.extend(
+            (filter_query_class, {arg: INDEXED_FILTER_ARGS_SAMPLES[arg] for arg in combination})
+            for combination in sorted(combinations)
+        )
+
+    return shapes
+
+
 class DBHistoryEvents:
 
     def __init__(self, database: 'DBHandler') -> None:
@@ -331,9 +477,30 @@ class DBHistoryEvents:
             entries_limit: int,
             has_premium: bool,
             group_by_event_ids: bool = False,
+            summary: bool = False,
     ) -> tuple[str, list]:
-        """Returns the sql queries and bindings for the history events without pagination."""
-        base_suffix = f'{HISTORY_BASE_ENTRY_FIELDS}, {EVM_EVENT_FIELDS}, {ETH_STAKING_EVENT_FIELDS} {ALL_EVENTS_DATA_JOIN}'  # noqa: E501
+        """Returns the sql queries and bindings for the history events without pagination.
+
+        If summary is True the events are only counted, so only the columns needed
+        by the filters are selected. See history_events_projection.
+        """
+        if group_by_event_ids:
+            filters, query_bindings = filter_query.prepare(
+                with_group_by=True,
+                with_pagination=False,
+                without_ignored_asset_filter=True,
+            )
+            prefix = 'SELECT COUNT(*), *'
+        else:
+            filters, query_bindings = filter_query.prepare(with_pagination=False)
+            prefix = 'SELECT *'
+
+        columns, from_clause = history_events_projection(
+            filter_query=filter_query,
+            filters=filters,
+            summary=summary,
+        )
+        base_suffix = f'{columns} {from_clause}'
         if (ignore_asset_filter := maybe_filter_ignore_asset(filter_query, include_ignored_assets=True)) != '':  # noqa: E501
             ignore_asset_filter = (
                 f' WHERE event_identifier NOT IN '
@@ -352,17 +519,6 @@ class DBHistoryEvents:
         else:
             suffix, limit = free_base_suffix, [entries_limit]
 
-        if group_by_event_ids:
-            filters, query_bindings = filter_query.prepare(
-                with_group_by=True,
-                with_pagination=False,
-                without_ignored_asset_filter=True,
-            )
-            prefix = 'SELECT COUNT(*), *'
-        else:
-            filters, query_bindings = filter_query.prepare(with_pagination=False)
-            prefix = 'SELECT *'
-
         return f'{prefix} FROM (SELECT {suffix}) {filters}', limit + query_bindings
 
     @overload
@@ -449,8 +605,7 @@ class DBHistoryEvents:
     ):
         """Get all events from the DB, deserialized depending on the event type
 
-        TODO: To not query all columns with all joins for all cases, we perhaps can
-        peek on the entry type of the filter and adjust the SELECT fields accordingly?
+        Only the tables with data of the entry types the filter can select are joined.
         """
         base_query, filters_bindings = self._create_history_events_query(
             has_premium=has_premium,
@@ -460,7 +615,13 @@ class DBHistoryEvents:
         )
 
         if filter_query.pagination is not None:
-            base_query = f'SELECT * FROM ({base_query}) {filter_query.pagination.prepare()}'
+            keyset_filter = ''
+            if filter_query.keyset_filter is not None:
+                keyset_filters, keyset_bindings = filter_query.keyset_filter.prepare()
+                if len(keyset_filters) != 0:  # sqlite pushes it down to the timestamp index
+                    keyset_filter = f'WHERE {keyset_filters[0]} '
+                    filters_bindings += keyset_bindings
+            base_query = f'SELECT * FROM ({base_query}) {keyset_filter}{filter_query.pagination.prepare()}'  # noqa: E501
 
         cursor.execute(base_query, filters_bindings)
         output: list[HistoryBaseEntry] | list[tuple[int, HistoryBaseEntry]] = []
@@ -630,7 +791,8 @@ class DBHistoryEvents:
         Get missing prices for history base entries based on filter query
         """
         query, bindings = filter_query.prepare()
-        query = f'SELECT history_events.identifier, amount, asset, timestamp {ALL_EVENTS_DATA_JOIN}' + query  # noqa: E501
+        _, from_clause = history_events_projection(filter_query=filter_query, filters=query, summary=True)  # noqa: E501
+        query = f'SELECT history_events.identifier, amount, asset, timestamp {from_clause}' + query
         result = []
         cursor = self.db.conn.cursor()
         cursor.execute(query, bindings)
@@ -700,6 +862,7 @@ class DBHistoryEvents:
             filter_query=query_filter,
             group_by_event_ids=group_by_event_ids,
             entries_limit=free_limit,
+            summary=True,
         )
         count_without_limit = cursor.execute(
             f'SELECT COUNT(*) FROM ({premium_query})',
@@ -714,6 +877,7 @@ class DBHistoryEvents:
             filter_query=query_filter,
             group_by_event_ids=group_by_event_ids,
             entries_limit=free_limit,
+            summary=True,
         )
         count_with_limit = cursor.execute(
             f'SELECT COUNT(*) FROM ({free_query})',
@@ -721,6 +885,42 @@ class DBHistoryEvents:
         ).fetchone()[0]
         return count_without_limit, count_with_limit
 
+    def get_unindexed_filter_queries(
+            self,
+            cursor: 'DBCursor',
+    ) -> list[tuple[str, list[str]]]:
+        """Audits the query plans of the history events queries that are created from the
+        filter shapes of indexed_history_events_filters(), with and without grouping.
+
+        Only the premium query is checked since the free one always needs to walk the
+        timestamp index to find the last allowed event groups.
+
+        Returns a list of the filters whose query falls back to a full scan of any of the
+        large tables along with the tables that get scanned. Should be empty.
+        """
+        unindexed = []
+        for filter_query_class, filter_args in indexed_history_events_filters():
+            filter_query = filter_query_class.make(**filter_args)
+            for group_by_event_ids in (True, False):
+                query, bindings = self._create_history_events_query(
+                    filter_query=filter_query,
+                    entries_limit=FREE_HISTORY_EVENTS_LIMIT,
+                    has_premium=True,
+                    group_by_event_ids=group_by_event_ids,
+                )
+                if len(scanned_tables := find_full_table_scans(
+                    cursor=cursor,
+                    query=query,
+                    bindings=bindings,
+                    tables=HISTORY_EVENTS_LARGE_TABLES,
+                )) != 0:
+                    unindexed.append((
+                        f'{filter_query_class.__name__}({filter_args}) with {group_by_event_ids=}',
+                        scanned_tables,
+                    ))
+
+        return unindexed
+
     def get_value_stats(
             self,
             cursor: 'DBCursor',
@@ -55,4 +55,5 @@ MINIMIZED_USER_DB_SCHEMA = {
     "calendar_reminders": "identifierintegerprimarykeynotnull,event_idintegernotnull,secs_beforeintegernotnull,foreignkey(event_id)referencescalendar(identifier)ondeletecascade",
     "cowswap_orders": "identifiertextnotnullprimarykey,order_typetextnotnull,raw_fee_amounttextnotnull",
     "gnosispay_data": "identifierintegerprimarykeynotnull,tx_hashblobnotnullunique,timestampintegernotnull,merchant_nametextnotnull,merchant_citytext,countrytextnotnull,mccintegernotnull,transaction_symboltextnotnull,transaction_amounttextnotnull,billing_symboltext,billing_amounttext,reversal_symboltext,reversal_amounttext,reversal_tx_hashblobunique",
+    "accounting_checkpoints": "timestampintegernotnullprimarykey,events_numintegernotnull,events_hashtextnotnull,settings_hashtextnotnull,ignored_hashtextnotnull,rules_hashtextnotnull,statetextnotnull",
 }
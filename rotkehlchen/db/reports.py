@@ -1,5 +1,5 @@
 import logging
-from collections.abc import Callable
+from collections.abc import Iterator, Sequence
 from copy import deepcopy
 from typing import TYPE_CHECKING, Any, Literal, overload
 
@@ -20,6 +20,7 @@ log = RotkehlchenLogsAdapter(logger)
 
 if TYPE_CHECKING:
     from rotkehlchen.db.dbhandler import DBHandler
+    from rotkehlchen.db.drivers.gevent import DBCursor
     from rotkehlchen.db.filtering import ReportDataFilterQuery
 
 
@@ -216,42 +217,29 @@ class DBAccountingReports:
     def add_report_data(
             self,
             report_id: int,
-            time: Timestamp,
-            ts_converter: Callable[[Timestamp], str],
-            event: ProcessedAccountingEvent,
+            events_data: Sequence[tuple[Timestamp, str]],
     ) -> None:
-        """Adds a new entry to a transient report for the PnL history in a given time range
+        """Adds new entries to a transient report for the PnL history in a given time range.
+        Each entry is the timestamp of a processed event and its data serialized for the DB.
         May raise:
-        - DeserializationError if there is a conflict at serialization of the event
-        - InputError if the event can not be written to the DB. Probably report id does not exist.
+        - InputError if the events can not be written to the DB. Probably report id does not exist.
         """
-        data = event.serialize_for_db(ts_converter)
-        query = """
-        INSERT INTO pnl_events(
-            report_id, timestamp, data
-        )
-        VALUES(?, ?, ?);"""
         with self.db.transient_write() as cursor:
             try:
-                cursor.execute(query, (report_id, time, data))
+                cursor.executemany(
+                    'INSERT INTO pnl_events(report_id, timestamp, data) VALUES(?, ?, ?)',
+                    [(report_id, time, data) for time, data in events_data],
+                )
             except sqlcipher.IntegrityError as e:  # pylint: disable=no-member
                 raise InputError(
-                    f'Could not write {event} data to the DB due to {e!s}. '
+                    f'Could not write {len(events_data)} PnL events to the DB due to {e!s}. '
                     f'Probably report {report_id} does not exist?',
                 ) from e
 
-    def get_report_data(
-            self,
-            filter_: 'ReportDataFilterQuery',
-            with_limit: bool,
-    ) -> tuple[list[ProcessedAccountingEvent], int]:
-        """Retrieve the event data of a PnL report depending on the given filter
-
-        May raise:
+    def _check_report_exists(self, cursor: 'DBCursor', report_id: str | int | None) -> None:
+        """May raise:
         - InputError if the report ID does not exist in the DB
         """
-        cursor = self.db.conn_transient.cursor()
-        report_id = filter_.report_id
         query_result = cursor.execute(
             'SELECT COUNT(*) FROM pnl_reports WHERE identifier=?',
             (report_id,),
@@ -261,30 +249,57 @@ class DBAccountingReports:
                 f'Tried to get PnL events from non existing report with id {report_id}',
             )
 
-        query, bindings = filter_.prepare()
-        query = f'SELECT timestamp, data FROM pnl_events {query}'
-        cursor.execute(query, bindings)
+    def iterate_report_data(
+            self,
+            filter_: 'ReportDataFilterQuery',
+    ) -> Iterator[ProcessedAccountingEvent]:
+        """Yield the event data of a PnL report depending on the given filter as they are
+        read from the DB. Events that can't be deserialized are skipped.
 
-        records = []
-        for result in cursor:
-            try:
-                record = ProcessedAccountingEvent.deserialize_from_db(result[0], result[1])
-            except DeserializationError as e:
-                self.db.msg_aggregator.add_error(
-                    f'Error deserializing AccountingEvent from the DB. Skipping it.'
-                    f'Error was: {e!s}',
-                )
-                continue
+        May raise:
+        - InputError if the report ID does not exist in the DB. This is raised at call
+        time and not when the events start being consumed.
+        """
+        cursor = self.db.conn_transient.cursor()
+        self._check_report_exists(cursor, filter_.report_id)
+        query, bindings = filter_.prepare()
+        cursor.execute(f'SELECT timestamp, data FROM pnl_events {query}', bindings)
+        return self._deserialize_report_data(cursor)
+
+    def _deserialize_report_data(self, cursor: 'DBCursor') -> Iterator[ProcessedAccountingEvent]:
+        try:
+            for result in cursor:
+                try:
+                    yield ProcessedAccountingEvent.deserialize_from_db(result[0], result[1])
+                except DeserializationError as e:
+                    self.db.msg_aggregator.add_error(
+                        f'Error deserializing AccountingEvent from the DB. Skipping it.'
+                        f'Error was: {e!s}',
+                    )
+        finally:
+            cursor.close()
+
+    def count_report_data(self, filter_: 'ReportDataFilterQuery') -> int:
+        """Count the events of a PnL report that match the filter, ignoring pagination"""
+        no_pagination_filter = deepcopy(filter_)
+        no_pagination_filter.pagination = None
+        query, bindings = no_pagination_filter.prepare()
+        with self.db.conn_transient.read_ctx() as cursor:
+            return cursor.execute(f'SELECT COUNT(*) FROM pnl_events {query}', bindings).fetchone()[0]  # noqa: E501
 
-            records.append(record)
+    def get_report_data(
+            self,
+            filter_: 'ReportDataFilterQuery',
+            with_limit: bool,
+    ) -> tuple[list[ProcessedAccountingEvent], int]:
+        """Retrieve the event data of a PnL report depending on the given filter
 
+        May raise:
+        - InputError if the report ID does not exist in the DB
+        """
+        records = list(self.iterate_report_data(filter_))
         if filter_.pagination is not None:
-            no_pagination_filter = deepcopy(filter_)
-            no_pagination_filter.pagination = None
-            query, bindings = no_pagination_filter.prepare()
-            query = f'SELECT COUNT(*) FROM pnl_events {query}'
-            results = cursor.execute(query, bindings).fetchone()
-            total_filter_count = results[0]
+            total_filter_count = self.count_report_data(filter_)
         else:
             total_filter_count = len(records)
 
@@ -763,6 +763,38 @@ CREATE TABLE IF NOT EXISTS gnosispay_data (
 );
 """
 
+# The state of PnL report processing at period boundaries so that later reports can resume
+# from there. The hashes are of what the state depends on and make it invalid if changed.
+DB_CREATE_ACCOUNTING_CHECKPOINTS = """
+CREATE TABLE IF NOT EXISTS accounting_checkpoints (
+    timestamp INTEGER NOT NULL PRIMARY KEY,
+    events_num INTEGER NOT NULL,
+    events_hash TEXT NOT NULL,
+    settings_hash TEXT NOT NULL,
+    ignored_hash TEXT NOT NULL,
+    rules_hash TEXT NOT NULL,
+    state TEXT NOT NULL
+);
+"""
+
+# Secondary indices. They back the filters that HistoryBaseEntryFilterQuery and the
+# other user DB queries can produce, so that those don't end up doing a full table scan.
+# If you add or change one here remember to also add it in the DB upgrade and to check
+# the query plan audit of the history events filters in the DBHistoryEvents class.
+DB_CREATE_INDICES = """
+CREATE INDEX IF NOT EXISTS idx_history_events_timestamp ON history_events(timestamp, sequence_index);
+CREATE INDEX IF NOT EXISTS idx_history_events_location ON history_events(location);
+CREATE INDEX IF NOT EXISTS idx_history_events_location_label ON history_events(location_label);
+CREATE INDEX IF NOT EXISTS idx_history_events_asset ON history_events(asset);
+CREATE INDEX IF NOT EXISTS idx_history_events_type ON history_events(type, subtype);
+CREATE INDEX IF NOT EXISTS idx_evm_events_info_tx_hash ON evm_events_info(tx_hash);
+CREATE INDEX IF NOT EXISTS idx_evm_events_info_counterparty ON evm_events_info(counterparty);
+CREATE INDEX IF NOT EXISTS idx_evm_events_info_address ON evm_events_info(address);
+CREATE INDEX IF NOT EXISTS idx_eth_staking_events_info_validator_index ON eth_staking_events_info(validator_index);
+CREATE INDEX IF NOT EXISTS idx_timed_balances_currency ON timed_balances(currency, timestamp);
+CREATE INDEX IF NOT EXISTS idx_evmtx_address_mappings_address ON evmtx_address_mappings(address);
+"""  # noqa: E501
+
 
 DB_SCRIPT_CREATE_TABLES = f"""
 PRAGMA foreign_keys=off;
@@ -821,6 +853,8 @@ BEGIN TRANSACTION;
 {DB_CREATE_CALENDAR_REMINDERS}
 {DB_CREATE_COWSWAP_ORDERS}
 {DB_CREATE_GNOSISPAY_DATA}
+{DB_CREATE_ACCOUNTING_CHECKPOINTS}
+{DB_CREATE_INDICES}
 COMMIT;
 PRAGMA foreign_keys=on;
 """
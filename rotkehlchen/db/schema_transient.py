@@ -54,6 +54,16 @@ CREATE TABLE IF NOT EXISTS settings (
 );
 """
 
+# Raw results of the EVM JSON-RPC calls that can't change. Key is a hash of chain, method, params
+DB_CREATE_EVM_RPC_CACHE = """
+CREATE TABLE IF NOT EXISTS evm_rpc_cache (
+    key BLOB NOT NULL PRIMARY KEY,
+    chain_id INTEGER NOT NULL,
+    method TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+"""
+
 DB_SCRIPT_CREATE_TRANSIENT_TABLES = f"""
 PRAGMA foreign_keys=off;
 BEGIN TRANSACTION;
@@ -62,6 +72,7 @@ BEGIN TRANSACTION;
 {DB_CREATE_REPORT_TOTALS}
 {DB_CREATE_PNL_EVENTS}
 {DB_CREATE_SETTINGS}
+{DB_CREATE_EVM_RPC_CACHE}
 COMMIT;
 PRAGMA foreign_keys=on;
 """
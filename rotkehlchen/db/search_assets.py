@@ -1,3 +1,4 @@
+import heapq
 import operator
 from typing import TYPE_CHECKING, Any
 
@@ -102,22 +103,79 @@ def _search_only_assets_levenstein(
     return search_result
 
 
+def _search_only_assets_in_index(
+        userdb_cursor: 'DBCursor',
+        userdb: 'DBHandler',
+        filter_query: 'LevenshteinFilterQuery',
+        substring_search: str,
+        limit: int | None,
+) -> list[tuple[int, dict[str, Any]]]:
+    """Same as _search_only_assets_levenstein but uses the asset search index of the global DB
+    to only return the best limit assets. Can't filter by address."""
+    should_skip = filter_query.ignored_assets_handling.get_should_skip_handler()
+    treat_eth2_as_eth = userdb.get_settings(userdb_cursor).treat_eth2_as_eth
+    ignored_assets = userdb.get_ignored_asset_ids(userdb_cursor)
+    globaldb = GlobalDBHandler()
+    with globaldb.conn.read_ctx() as cursor:
+        indexed_result = globaldb.asset_search_index.search(
+            cursor=cursor,
+            substring=substring_search,
+            # one more since ETH and ETH2 may be merged into one
+            limit=limit + 1 if limit is not None and treat_eth2_as_eth else limit,
+            chain_id=filter_query.chain_id,
+            should_skip=lambda identifier: should_skip(identifier, ignored_assets),
+        )
+
+    search_result: list[tuple[int, dict[str, Any]]] = []
+    found_eth = False
+    for lev_dist_min, asset in indexed_result:
+        if treat_eth2_as_eth is True and asset.identifier in (A_ETH.identifier, A_ETH2.identifier):
+            if found_eth is False:
+                search_result.append((lev_dist_min, {
+                    'identifier': 'ETH',
+                    'name': 'Ethereum',
+                    'symbol': 'ETH',
+                    'asset_type': AssetType.OWN_CHAIN.serialize(),
+                }))
+                found_eth = True
+            continue
+
+        search_result.append((lev_dist_min, asset.serialize()))
+
+    return search_result
+
+
 def search_assets_levenshtein(
         db: 'DBHandler',
         filter_query: 'LevenshteinFilterQuery',
         limit: int | None,
         search_nfts: bool,
 ) -> list[dict[str, Any]]:
-    """Returns a list of asset details that match the search keyword using the Levenshtein distance approach."""  # noqa: E501
+    """Returns a list of asset details that match the search keyword using the Levenshtein distance approach.
+
+    Searches by name or symbol use the in-memory asset search index and searches by
+    address the global DB.
+    """  # noqa: E501
     search_result = []
     with db.conn.read_ctx() as cursor:
-        search_result = _search_only_assets_levenstein(
-            userdb_cursor=cursor,
-            userdb=db,
-            filter_query=filter_query,
-        )
+        if filter_query.substring_search is not None and filter_query.address is None:
+            search_result = _search_only_assets_in_index(
+                userdb_cursor=cursor,
+                userdb=db,
+                filter_query=filter_query,
+                substring_search=filter_query.substring_search,
+                limit=limit,
+            )
+        else:
+            search_result = _search_only_assets_levenstein(
+                userdb_cursor=cursor,
+                userdb=db,
+                filter_query=filter_query,
+            )
         if search_nfts is True:
             search_result += _search_only_nfts_levenstein(cursor=cursor, filter_query=filter_query)
 
-    sorted_search_result = [result for _, result in sorted(search_result, key=operator.itemgetter(0))]  # noqa: E501
-    return sorted_search_result[:limit] if limit is not None else sorted_search_result
+    if limit is not None:  # stable like sorting and slicing
+        return [result for _, result in heapq.nsmallest(limit, search_result, key=operator.itemgetter(0))]  # noqa: E501
+
+    return [result for _, result in sorted(search_result, key=operator.itemgetter(0))]
@@ -64,6 +64,7 @@ DEFAULT_AUTO_CREATE_CALENDAR_REMINDERS = True
 DEFAULT_ASK_USER_UPON_SIZE_DISCREPANCY = True
 DEFAULT_AUTO_DETECT_TOKENS = True
 DEFAULT_CSV_EXPORT_DELIMITER = ','
+DEFAULT_HEDGE_SLOW_RPC_QUERIES = False  # If True, slow EVM RPC queries are also sent to the next node  # noqa: E501
 
 JSON_KEYS = (
     'current_price_oracles',
@@ -89,6 +90,7 @@ BOOLEAN_KEYS = (
     'auto_create_calendar_reminders',
     'ask_user_upon_size_discrepancy',
     'auto_detect_tokens',
+    'hedge_slow_rpc_queries',
 )
 INTEGER_KEYS = (
     'version',
@@ -156,6 +158,7 @@ CachedDBSettingsFieldNames = Literal[
     'auto_delete_calendar_entries',
     'auto_create_calendar_reminders',
     'ask_user_upon_size_discrepancy',
+    'hedge_slow_rpc_queries',
 ]
 
 DBSettingsFieldTypes = (
@@ -218,6 +221,7 @@ class DBSettings:
     ask_user_upon_size_discrepancy: bool = DEFAULT_ASK_USER_UPON_SIZE_DISCREPANCY
     auto_detect_tokens: bool = DEFAULT_AUTO_DETECT_TOKENS
     csv_export_delimiter: str = DEFAULT_CSV_EXPORT_DELIMITER
+    hedge_slow_rpc_queries: bool = DEFAULT_HEDGE_SLOW_RPC_QUERIES
 
     def serialize(self) -> dict[str, Any]:
         settings_dict = {}
@@ -278,6 +282,7 @@ class ModifiableDBSettings(NamedTuple):
     ask_user_upon_size_discrepancy: bool | None = None
     auto_detect_tokens: bool | None = None
     csv_export_delimiter: str | None = None
+    hedge_slow_rpc_queries: bool | None = None
 
     def serialize(self) -> dict[str, Any]:
         settings_dict = {}
@@ -0,0 +1,265 @@
+"""Statistics of the balance snapshots computed with polars
+
+The timed balances of the graphs are read from the DB into polars frames once and the
+zero balances that the graphs need are added to them with vectorized expressions,
+instead of processing the snapshots one by one. Amounts and values are kept as the
+strings of the DB since adding them up needs the exact decimals of FVal.
+"""
+import operator
+from collections.abc import Sequence
+from decimal import Decimal
+from functools import reduce
+from typing import TYPE_CHECKING, Any
+
+import polars as pl
+
+from rotkehlchen.accounting.structures.balance import BalanceType
+from rotkehlchen.constants.misc import NFT_DIRECTIVE
+from rotkehlchen.constants.timing import HOUR_IN_SECONDS
+from rotkehlchen.db.utils import SingleDBAssetBalance
+from rotkehlchen.fval import FVal
+from rotkehlchen.types import Timestamp
+
+if TYPE_CHECKING:
+    from rotkehlchen.db.drivers.gevent import DBCursor
+    from rotkehlchen.db.settings import DBSettings
+
+TIMED_BALANCES_SCHEMA = {
+    'time': pl.Int64,
+    'currency': pl.String,
+    'amount': pl.String,
+    'usd_value': pl.String,
+    'category': pl.String,
+}
+BALANCE_TYPES = {x.serialize_for_db(): x for x in BalanceType}
+
+
+def _read_frame(
+        cursor: 'DBCursor',
+        query: str,
+        bindings: Sequence,
+        schema: dict[str, type[pl.DataType]],
+) -> pl.LazyFrame:
+    return pl.DataFrame(
+        cursor.execute(query, bindings).fetchall(),
+        schema=schema,
+        orient='row',
+    ).lazy()
+
+
+def _multiplier_zero_balances(balances: pl.LazyFrame, settings: 'DBSettings') -> pl.LazyFrame:
+    """Zero balances every balance_save_frequency hours in the gaps between the balances
+    of an asset that are longer than ssf_graph_multiplier times that"""
+    step = settings.balance_save_frequency * HOUR_IN_SECONDS
+    max_gap = step * settings.ssf_graph_multiplier
+    return balances.with_columns(
+        # the zero balances are added while they are more than max_gap before the next balance
+        zeros=(pl.col('time').shift(-1).over('asset_idx') - pl.col('time') - max_gap + step - 1) // step,  # noqa: E501
+    ).filter(pl.col('zeros') > 0).with_columns(
+        sub=pl.int_ranges(1, pl.col('zeros') + 1, dtype=pl.Int64),
+    ).explode('sub').select(
+        'asset_idx',
+        time=pl.col('time') + pl.col('sub') * step,
+        amount=pl.lit('0'),
+        usd_value=pl.lit('0'),
+        category='category',
+        seq='seq',
+        sub='sub',
+    )
+
+
+def _inferred_zero_balances(
+        balances: pl.LazyFrame,
+        timestamps: pl.LazyFrame,
+        balance_type: BalanceType,
+        seq_offset: int,
+) -> pl.LazyFrame:
+    """Zero balances at the start and end of each period where an asset has no balance in
+    the snapshots. It addresses this issue: https://github.com/rotki/rotki/issues/2822
+
+    Example
+    We have the following timed balances for ETH (value, time):
+    (1, 1), (1, 2), (2, 3), (5, 7), (5, 12)
+    The timestamps of all timed balances in the DB are:
+    (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12)
+    So we need to infer the following zero timed balances:
+    (0, 4), (0, 6), (0, 8), (0, 11)
+
+    Keep in mind that in a case like this (1, 1), (1, 2), (5, 4) we will infer (0, 3)
+    despite the fact that it is not strictly needed by the front end. A zero balance is
+    also added at the last snapshot if the asset has no balance in it.
+    """
+    with_balance = balances.filter(
+        pl.col('amount').cast(pl.Float64) != 0,
+    ).select('asset_idx', 'time').unique().with_columns(has_balance=pl.lit(True))
+    has_balance, previous_has_balance = pl.col('has_balance'), pl.col('previous_has_balance')
+    return balances.select('asset_idx').unique().join(
+        timestamps,
+        how='cross',
+    ).join(
+        with_balance,
+        on=['asset_idx', 'time'],
+        how='left',
+    ).with_columns(
+        has_balance=has_balance.fill_null(False),
+    ).sort('asset_idx', 'time').with_columns(
+        previous_time=pl.col('time').shift(1).over('asset_idx'),
+        previous_has_balance=has_balance.shift(1).over('asset_idx').fill_null(has_balance),
+        had_balance=has_balance.cum_max().shift(1).over('asset_idx').fill_null(False),
+        is_last=pl.col('time') == pl.col('time').max().over('asset_idx'),
+        seq=pl.int_range(pl.len(), dtype=pl.Int64) + seq_offset,
+    ).select(
+        'asset_idx',
+        time=pl.when(~has_balance & (previous_has_balance | pl.col('is_last'))).then(
+            pl.col('time'),  # the start of a zero balance period or the last snapshot
+        ).when(has_balance & ~previous_has_balance & pl.col('had_balance')).then(
+            pl.col('previous_time'),  # the end of a zero balance period
+        ),
+        amount=pl.lit('0'),
+        usd_value=pl.lit('0'),
+        category=pl.lit(balance_type.serialize_for_db()),
+        seq='seq',
+        sub=pl.lit(0, dtype=pl.Int64),
+    ).drop_nulls('time')
+
+
+def _add_decimals(values: list[str]) -> str:
+    """Add up decimal strings exactly like FVal does"""
+    return f'{reduce(operator.add, map(Decimal, values)):f}'
+
+
+def _combine_balances(balances: pl.DataFrame) -> pl.DataFrame:
+    """Combine the balances of the same timestamp into one with the category of the first
+    of them. Only the timestamps with many balances are added up in python."""
+    is_combined = pl.len().over('time') > 1
+    combined = balances.filter(is_combined).group_by('time', maintain_order=True).agg(
+        pl.col('category').first(),
+        pl.col('amount'),
+        pl.col('usd_value'),
+    )
+    return pl.concat([
+        balances.filter(~is_combined),
+        combined.with_columns(
+            amount=pl.Series([_add_decimals(x) for x in combined['amount'].to_list()], dtype=pl.String),  # noqa: E501
+            usd_value=pl.Series([_add_decimals(x) for x in combined['usd_value'].to_list()], dtype=pl.String),  # noqa: E501
+        ).select(balances.columns),
+    ]).sort('time', maintain_order=True)
+
+
+def query_timed_balances(
+        cursor: 'DBCursor',
+        settings: 'DBSettings',
+        assets_currencies: Sequence[Sequence[str]],
+        balance_type: BalanceType,
+        from_ts: Timestamp,
+        to_ts: Timestamp,
+        combine: bool,
+) -> pl.DataFrame:
+    """Query the timed balances of the given assets, each one given by the list of the
+    currencies of the DB that are counted as it, within a range of timestamps.
+
+    The zero balances that the settings ask for are added to the balances of each asset.
+    Returns the time, amount, usd_value and category of the DB of the balances sorted by
+    time and then by the order of the assets. If combine is True, the balances of the
+    same timestamp are added up.
+    """
+    currencies = list(dict.fromkeys(x for currencies in assets_currencies for x in currencies))
+    balances = _read_frame(
+        cursor=cursor,
+        query=(
+            'SELECT timestamp, currency, amount, usd_value, category FROM timed_balances '
+            f'WHERE timestamp BETWEEN ? AND ? AND currency IN ({",".join("?" * len(currencies))}) '
+            'AND category=?'
+        ),
+        bindings=(from_ts, to_ts, *currencies, balance_type.serialize_for_db()),
+        schema=TIMED_BALANCES_SCHEMA,
+    ).join(
+        pl.LazyFrame(  # a currency can be part of many of the assets
+            [(idx, currency) for idx, asset_currencies in enumerate(assets_currencies) for currency in asset_currencies],  # noqa: E501
+            schema={'asset_idx': pl.Int64, 'currency': pl.String},
+            orient='row',
+        ),
+        on='currency',
+    ).drop('currency').sort('asset_idx', 'time', maintain_order=True).with_columns(
+        seq=pl.int_range(pl.len(), dtype=pl.Int64),
+        sub=pl.lit(0, dtype=pl.Int64),
+    ).collect().lazy()  # used by all the following queries
+    frames = [balances]
+    if settings.ssf_graph_multiplier != 0:
+        frames.append(_multiplier_zero_balances(balances=balances, settings=settings))
+    if settings.infer_zero_timed_balances is True:
+        frames.append(_inferred_zero_balances(
+            balances=balances,
+            timestamps=_read_frame(
+                cursor=cursor,
+                query='SELECT DISTINCT timestamp FROM timed_balances WHERE timestamp BETWEEN ? AND ?',  # noqa: E501
+                bindings=(from_ts, to_ts),
+                schema={'time': pl.Int64},
+            ),
+            balance_type=balance_type,
+            seq_offset=balances.select(pl.len()).collect().item(),
+        ))
+
+    result = pl.concat(frames).sort('time', 'asset_idx', 'seq', 'sub').select(
+        'time', 'category', 'amount', 'usd_value',
+    ).collect()
+    return _combine_balances(result) if combine else result
+
+
+def deserialize_timed_balances(balances: pl.DataFrame) -> list[SingleDBAssetBalance]:
+    return [
+        SingleDBAssetBalance(
+            time=Timestamp(time),
+            category=BALANCE_TYPES[category],
+            amount=FVal(amount),
+            usd_value=FVal(usd_value),
+        ) for time, category, amount, usd_value in balances.iter_rows()
+    ]
+
+
+def serialize_timed_balances(balances: pl.DataFrame) -> list[dict[str, Any]]:
+    """Serialize the balances for the API like SingleDBAssetBalance, without creating them"""
+    return balances.with_columns(pl.col('category').replace_strict(
+        {db_value: str(balance_type) for db_value, balance_type in BALANCE_TYPES.items()},
+    )).to_dicts()
+
+
+def query_netvalue_data(
+        cursor: 'DBCursor',
+        from_ts: Timestamp,
+        include_nfts: bool,
+) -> tuple[list[int], list[str]]:
+    """The timestamps and the total usd values of the snapshots since from_ts, without
+    the value of the NFTs if include_nfts is False"""
+    totals = _read_frame(
+        cursor=cursor,
+        query=(
+            "SELECT timestamp, usd_value FROM timed_location_data "
+            "WHERE location='H' AND timestamp >= ? ORDER BY timestamp ASC"
+        ),
+        bindings=(from_ts,),
+        schema={'time': pl.Int64, 'usd_value': pl.String},
+    )
+    if include_nfts is False:
+        totals = totals.join(
+            _read_frame(
+                cursor=cursor,
+                query=(
+                    'SELECT timestamp, SUM(usd_value) FROM timed_balances WHERE '
+                    'timestamp >= ? AND currency GLOB ? GROUP BY timestamp'
+                ),
+                bindings=(from_ts, f'{NFT_DIRECTIVE}*'),  # unlike LIKE, GLOB uses the index
+                schema={'time': pl.Int64, 'nfts_usd_value': pl.Float64},
+            ),
+            on='time',
+            how='left',  # keeps the order of the totals
+        )
+    else:
+        totals = totals.with_columns(nfts_usd_value=pl.lit(None, dtype=pl.Float64))
+
+    times, values, nfts_values = totals.collect().get_columns()
+    return times.to_list(), [
+        # same as subtracting their FVals but without creating them
+        value if nfts_value is None else f'{Decimal(value) - Decimal(str(nfts_value)):f}'
+        for value, nfts_value in zip(values, nfts_values, strict=True)
+    ]
@@ -35,6 +35,10 @@ def upgrade_v45_to_v46(db: 'DBHandler', progress_handler: 'DBUpgradeProgressHand
 
     - Remove balancer module from settings
     - Refresh icons
+    - Move evm event extra data to history_events
+    - Convert asset movements to history events
+    - Add indices for the history events and other big tables
+    - Add the accounting checkpoints table
     """
     @progress_step(description='Removing balancer module from user settings.')
     def _remove_balancer_module(write_cursor: 'DBCursor') -> None:
@@ -130,4 +134,33 @@ def upgrade_v45_to_v46(db: 'DBHandler', progress_handler: 'DBUpgradeProgressHand
         write_cursor.execute('DROP TABLE asset_movement_category')
         write_cursor.execute("DELETE FROM settings WHERE name='account_for_assets_movements'")
 
+    @progress_step(description='Adding indices to the history events tables.')
+    def _add_indices(write_cursor: 'DBCursor') -> None:
+        for index_query in (
+            'CREATE INDEX IF NOT EXISTS idx_history_events_timestamp ON history_events(timestamp, sequence_index);',  # noqa: E501
+            'CREATE INDEX IF NOT EXISTS idx_history_events_location ON history_events(location);',
+            'CREATE INDEX IF NOT EXISTS idx_history_events_location_label ON history_events(location_label);',  # noqa: E501
+            'CREATE INDEX IF NOT EXISTS idx_history_events_asset ON history_events(asset);',
+            'CREATE INDEX IF NOT EXISTS idx_history_events_type ON history_events(type, subtype);',
+            'CREATE INDEX IF NOT EXISTS idx_evm_events_info_tx_hash ON evm_events_info(tx_hash);',
+            'CREATE INDEX IF NOT EXISTS idx_evm_events_info_counterparty ON evm_events_info(counterparty);',  # noqa: E501
+            'CREATE INDEX IF NOT EXISTS idx_evm_events_info_address ON evm_events_info(address);',
+            'CREATE INDEX IF NOT EXISTS idx_eth_staking_events_info_validator_index ON eth_staking_events_info(validator_index);',  # noqa: E501
+            'CREATE INDEX IF NOT EXISTS idx_timed_balances_currency ON timed_balances(currency, timestamp);',  # noqa: E501
+            'CREATE INDEX IF NOT EXISTS idx_evmtx_address_mappings_address ON evmtx_address_mappings(address);',  # noqa: E501
+        ):
+            write_cursor.execute(index_query)
+
+    @progress_step(description='Adding the accounting checkpoints table.')
+    def _add_accounting_checkpoints(write_cursor: 'DBCursor') -> None:
+        write_cursor.execute("""CREATE TABLE IF NOT EXISTS accounting_checkpoints (
+            timestamp INTEGER NOT NULL PRIMARY KEY,
+            events_num INTEGER NOT NULL,
+            events_hash TEXT NOT NULL,
+            settings_hash TEXT NOT NULL,
+            ignored_hash TEXT NOT NULL,
+            rules_hash TEXT NOT NULL,
+            state TEXT NOT NULL
+        );""")
+
     perform_userdb_upgrade_steps(db=db, progress_handler=progress_handler, should_vacuum=True)
@@ -39,6 +39,11 @@ class RemoteError(Exception):
         super().__init__(message)
 
 
+class CallTooLargeError(RemoteError):
+    """Thrown when the nodes reject a call for needing too much gas or for returning a
+    too big response. Splitting it in smaller calls is the way to query it then."""
+
+
 class XPUBError(Exception):
     """Error XPUB Parsing and address derivation"""
 
@@ -521,6 +521,7 @@ class Coingecko(
         HistoricalPriceOracleWithCoinListInterface,
         PenalizablePriceOracleMixin,
 ):
+    cached_price_max_seconds_distance = DAY_IN_SECONDS
 
     def __init__(self, database: 'DBHandler | None') -> None:
         ExternalServiceWithApiKeyOptionalDB.__init__(self, database=database, service_name=ExternalService.COINGECKO)  # noqa: E501
@@ -799,7 +800,7 @@ class Coingecko(
             from_asset=from_asset,
             to_asset=to_asset,
             timestamp=timestamp,
-            max_seconds_distance=DAY_IN_SECONDS,
+            max_seconds_distance=self.cached_price_max_seconds_distance,
             source=HistoricalPriceOracle.COINGECKO,
         )
         if price_cache_entry:
@@ -196,6 +196,8 @@ class Cryptocompare(
         HistoricalPriceOracleWithCoinListInterface,
         PenalizablePriceOracleMixin,
 ):
+    cached_price_max_seconds_distance = HOUR_IN_SECONDS
+
     def __init__(self, database: Optional['DBHandler']) -> None:
         HistoricalPriceOracleWithCoinListInterface.__init__(self, oracle_name='cryptocompare')
         ExternalServiceWithApiKeyOptionalDB.__init__(
@@ -787,7 +789,7 @@ class Cryptocompare(
             from_asset=from_asset,
             to_asset=to_asset,
             timestamp=timestamp,
-            max_seconds_distance=3600,
+            max_seconds_distance=self.cached_price_max_seconds_distance,
             source=HistoricalPriceOracle.CRYPTOCOMPARE,
         )
         if price_cache_entry and price_cache_entry.price != ZERO_PRICE:
@@ -41,6 +41,7 @@ class Defillama(
         HistoricalPriceOracleInterface,
         PenalizablePriceOracleMixin,
 ):
+    cached_price_max_seconds_distance = DAY_IN_SECONDS
 
     def __init__(self, database: 'DBHandler | None') -> None:
         ExternalServiceWithApiKeyOptionalDB.__init__(
@@ -251,7 +252,7 @@ class Defillama(
             from_asset=from_asset,
             to_asset=to_asset,
             timestamp=timestamp,
-            max_seconds_distance=DAY_IN_SECONDS,
+            max_seconds_distance=self.cached_price_max_seconds_distance,
             source=HistoricalPriceOracle.DEFILLAMA,
         )
         if price_cache_entry:
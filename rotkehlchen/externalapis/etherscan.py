@@ -10,6 +10,7 @@ from typing import TYPE_CHECKING, Any, Final, Literal, overload
 
 import gevent
 import requests
+from gevent.lock import BoundedSemaphore
 
 from rotkehlchen.api.websockets.typedefs import WSMessageType
 from rotkehlchen.chain.evm.constants import GENESIS_HASH, ZERO_ADDRESS
@@ -77,6 +78,10 @@ def _hashes_tuple_to_list(hashes: set[tuple[EVMTxHash, Timestamp]]) -> list[EVMT
     return [x[0] for x in sorted(hashes, key=operator.itemgetter(1))]
 
 
+# Max number of requests sent concurrently to an etherscan instance, so that concurrent
+# queries such as syncing many addresses stay within its rate limit of 5 calls per second
+MAX_CONCURRENT_ETHERSCAN_QUERIES: Final = 3
+
 ROTKI_INCLUDED_KEYS: Final = {
     SupportedBlockchain.ETHEREUM: 'W9CEV6QB9NIPUEHD6KNEYM4PDX6KBPRVVR',
     SupportedBlockchain.OPTIMISM: 'KQ54A7R984F1SU3HP1K7CE4JW5WVGCPCSM',
@@ -119,6 +124,7 @@ class Etherscan(ExternalServiceWithApiKey, ABC):
         ) else 'api-'
         self.base_url = base_url
         self.session = requests.session()
+        self.queries_budget = BoundedSemaphore(MAX_CONCURRENT_ETHERSCAN_QUERIES)
         self.warning_given = False
         set_user_agent(self.session)
         self.timestamp_to_block_cache: LRUCacheWithRemove[Timestamp, int] = LRUCacheWithRemove(maxsize=32)  # noqa: E501
@@ -267,7 +273,8 @@ class Etherscan(ExternalServiceWithApiKey, ABC):
             response = None
             log.debug(f'Querying {self.chain} etherscan: {query_str}')
             try:
-                response = self.session.get(query_str, timeout=timeout)
+                with self.queries_budget:
+                    response = self.session.get(query_str, timeout=timeout)
             except requests.exceptions.RequestException as e:
                 raise RemoteError(f'{self.chain} Etherscan API request failed due to {e!s}') from e
 
@@ -1,4 +1,5 @@
 from decimal import Decimal, DefaultContext, InvalidOperation, setcontext
+from functools import lru_cache
 from math import ceil, log10
 from typing import Any, Union
 
@@ -10,6 +11,7 @@ AcceptableFValOtherInput = Union[int, 'FVal']
 
 DefaultContext.prec = ceil(log10(2 ** 256))  # support up to uint256 max value
 setcontext(DefaultContext)
+_new_object = object.__new__
 
 
 class FVal:
@@ -23,23 +25,29 @@ class FVal:
     """
 
     __slots__ = ('num',)
+    num: Decimal
 
     def __init__(self, data: AcceptableFValInitInput = 0):
 
         try:
-            if isinstance(data, float):
-                self.num = Decimal(str(data))
-            elif isinstance(data, bytes):
-                # assume it's an ascii string and try to decode the bytes to one
-                self.num = Decimal(data.decode())
+            # the most common inputs are checked first since this is in every hot loop
+            if isinstance(data, FVal):
+                self.num = data.num
+            elif type(data) is Decimal:  # immutable so no need to copy it
+                self.num = data
+            elif isinstance(data, str | Decimal):
+                self.num = Decimal(data)
             elif isinstance(data, bool):
                 # This elif has to come before the isinstance(int) check due to
                 # https://stackoverflow.com/questions/37888620/comparing-boolean-and-int-using-isinstance
                 raise ValueError('Invalid type bool for data given to FVal constructor')
-            elif isinstance(data, Decimal | int | str):
+            elif isinstance(data, int):
                 self.num = Decimal(data)
-            elif isinstance(data, FVal):
-                self.num = data.num
+            elif isinstance(data, float):
+                self.num = Decimal(str(data))
+            elif isinstance(data, bytes):
+                # assume it's an ascii string and try to decode the bytes to one
+                self.num = Decimal(data.decode())
             else:
                 raise ValueError(f'Invalid type {type(data)} of data given to FVal constructor')
 
@@ -58,87 +66,69 @@ class FVal:
     def __hash__(self) -> int:
         return hash(self.num)
 
+    # Comparisons use the Decimal operators directly instead of compare_signal() since
+    # they also raise InvalidOperation for NaN but don't allocate a Decimal result
     def __gt__(self, other: AcceptableFValOtherInput) -> bool:
-        evaluated_other = _evaluate_input(other)
-        return self.num.compare_signal(evaluated_other) == Decimal(1)
+        return self.num > (other.num if type(other) is FVal else _evaluate_input(other))
 
     def __lt__(self, other: AcceptableFValOtherInput) -> bool:
-        evaluated_other = _evaluate_input(other)
-        return self.num.compare_signal(evaluated_other) == Decimal(-1)
+        return self.num < (other.num if type(other) is FVal else _evaluate_input(other))
 
     def __le__(self, other: AcceptableFValOtherInput) -> bool:
-        evaluated_other = _evaluate_input(other)
-        return self.num.compare_signal(evaluated_other) in (Decimal(-1), Decimal(0))
+        return self.num <= (other.num if type(other) is FVal else _evaluate_input(other))
 
     def __ge__(self, other: AcceptableFValOtherInput) -> bool:
-        evaluated_other = _evaluate_input(other)
-        return self.num.compare_signal(evaluated_other) in (Decimal(1), Decimal(0))
+        return self.num >= (other.num if type(other) is FVal else _evaluate_input(other))
 
     def __eq__(self, other: object) -> bool:
-        evaluated_other: Decimal | int
         if isinstance(other, FVal):
-            evaluated_other = other.num
-        elif not isinstance(other, int):
-            return False
-        else:
-            evaluated_other = other
+            return self.num == other.num
+        if isinstance(other, int):
+            return self.num == other
 
-        return self.num.compare_signal(evaluated_other) == Decimal(0)
+        return False
 
     def __add__(self, other: AcceptableFValOtherInput) -> 'FVal':
-        evaluated_other = _evaluate_input(other)
-        return FVal(self.num.__add__(evaluated_other))
+        return _fval_from_decimal(self.num.__add__(other.num if type(other) is FVal else _evaluate_input(other)))  # noqa: E501
 
     def __sub__(self, other: AcceptableFValOtherInput) -> 'FVal':
-        evaluated_other = _evaluate_input(other)
-        return FVal(self.num.__sub__(evaluated_other))
+        return _fval_from_decimal(self.num.__sub__(other.num if type(other) is FVal else _evaluate_input(other)))  # noqa: E501
 
     def __mul__(self, other: AcceptableFValOtherInput) -> 'FVal':
-        evaluated_other = _evaluate_input(other)
-        return FVal(self.num.__mul__(evaluated_other))
+        return _fval_from_decimal(self.num.__mul__(other.num if type(other) is FVal else _evaluate_input(other)))  # noqa: E501
 
     def __truediv__(self, other: AcceptableFValOtherInput) -> 'FVal':
-        evaluated_other = _evaluate_input(other)
-        return FVal(self.num.__truediv__(evaluated_other))
+        return _fval_from_decimal(self.num.__truediv__(other.num if type(other) is FVal else _evaluate_input(other)))  # noqa: E501
 
     def __floordiv__(self, other: AcceptableFValOtherInput) -> 'FVal':
-        evaluated_other = _evaluate_input(other)
-        return FVal(self.num.__floordiv__(evaluated_other))
+        return _fval_from_decimal(self.num.__floordiv__(other.num if type(other) is FVal else _evaluate_input(other)))  # noqa: E501
 
     def __pow__(self, other: AcceptableFValOtherInput) -> 'FVal':
-        evaluated_other = _evaluate_input(other)
-        return FVal(self.num.__pow__(evaluated_other))
+        return _fval_from_decimal(self.num.__pow__(other.num if type(other) is FVal else _evaluate_input(other)))  # noqa: E501
 
     def __radd__(self, other: AcceptableFValOtherInput) -> 'FVal':
-        evaluated_other = _evaluate_input(other)
-        return FVal(self.num.__radd__(evaluated_other))
+        return _fval_from_decimal(self.num.__radd__(other.num if type(other) is FVal else _evaluate_input(other)))  # noqa: E501
 
     def __rsub__(self, other: AcceptableFValOtherInput) -> 'FVal':
-        evaluated_other = _evaluate_input(other)
-        return FVal(self.num.__rsub__(evaluated_other))
+        return _fval_from_decimal(self.num.__rsub__(other.num if type(other) is FVal else _evaluate_input(other)))  # noqa: E501
 
     def __rmul__(self, other: AcceptableFValOtherInput) -> 'FVal':
-        evaluated_other = _evaluate_input(other)
-        return FVal(self.num.__rmul__(evaluated_other))
+        return _fval_from_decimal(self.num.__rmul__(other.num if type(other) is FVal else _evaluate_input(other)))  # noqa: E501
 
     def __rtruediv__(self, other: AcceptableFValOtherInput) -> 'FVal':
-        evaluated_other = _evaluate_input(other)
-        return FVal(self.num.__rtruediv__(evaluated_other))
+        return _fval_from_decimal(self.num.__rtruediv__(other.num if type(other) is FVal else _evaluate_input(other)))  # noqa: E501
 
     def __rfloordiv__(self, other: AcceptableFValOtherInput) -> 'FVal':
-        evaluated_other = _evaluate_input(other)
-        return FVal(self.num.__rfloordiv__(evaluated_other))
+        return _fval_from_decimal(self.num.__rfloordiv__(other.num if type(other) is FVal else _evaluate_input(other)))  # noqa: E501
 
     def __mod__(self, other: AcceptableFValOtherInput) -> 'FVal':
-        evaluated_other = _evaluate_input(other)
-        return FVal(self.num.__mod__(evaluated_other))
+        return _fval_from_decimal(self.num.__mod__(other.num if type(other) is FVal else _evaluate_input(other)))  # noqa: E501
 
     def __rmod__(self, other: AcceptableFValOtherInput) -> 'FVal':
-        evaluated_other = _evaluate_input(other)
-        return FVal(self.num.__rmod__(evaluated_other))
+        return _fval_from_decimal(self.num.__rmod__(other.num if type(other) is FVal else _evaluate_input(other)))  # noqa: E501
 
     def __round__(self, ndigits: int) -> 'FVal':
-        return FVal(round(self.num, ndigits))
+        return _fval_from_decimal(round(self.num, ndigits))
 
     def __float__(self) -> float:
         return float(self.num)
@@ -146,10 +136,10 @@ class FVal:
     # --- Unary operands
 
     def __neg__(self) -> 'FVal':
-        return FVal(self.num.__neg__())
+        return _fval_from_decimal(self.num.__neg__())
 
     def __abs__(self) -> 'FVal':
-        return FVal(self.num.copy_abs())
+        return _fval_from_decimal(self.num.copy_abs())
 
     # --- Other operations
 
@@ -160,7 +150,7 @@ class FVal:
         """
         evaluated_other = _evaluate_input(other)
         evaluated_third = _evaluate_input(third)
-        return FVal(self.num.fma(evaluated_other, evaluated_third))
+        return _fval_from_decimal(self.num.fma(evaluated_other, evaluated_third))
 
     def to_percentage(self, precision: int = 4, with_perc_sign: bool = True) -> str:
         return f'{self.num * 100:.{precision}f}{"%" if with_perc_sign else ""}'
@@ -178,13 +168,24 @@ class FVal:
         return int(self.num)
 
     def is_close(self, other: AcceptableFValInitInput, max_diff: str = '1e-6') -> bool:
-        evaluated_max_diff = FVal(max_diff)
-
         if not isinstance(other, FVal):
             other = FVal(other)
 
         diff_num = abs(self.num - other.num)
-        return diff_num <= evaluated_max_diff.num
+        return diff_num <= _max_diff_to_decimal(max_diff)
+
+
+def _fval_from_decimal(num: Decimal) -> FVal:
+    """Wrap the Decimal result of an operation skipping the input checks of __init__"""
+    result = _new_object(FVal)
+    result.num = num
+    return result
+
+
+@lru_cache(maxsize=16)
+def _max_diff_to_decimal(max_diff: str) -> Decimal:
+    """The max_diff of is_close is almost always one of very few constants"""
+    return Decimal(max_diff)
 
 
 def _evaluate_input(other: Any) -> Decimal | int:
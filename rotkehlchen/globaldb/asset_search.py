@@ -0,0 +1,300 @@
+import heapq
+import logging
+from array import array
+from bisect import bisect_right
+from collections.abc import Callable, Iterable, Iterator
+from itertools import accumulate, count
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from polyleven import levenshtein
+
+from rotkehlchen.assets.types import AssetType
+from rotkehlchen.constants.resolver import ChainID
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+from rotkehlchen.utils.misc import get_chunks
+
+if TYPE_CHECKING:
+    from rotkehlchen.db.drivers.gevent import DBCursor
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+# Distance given to assets whose name and symbol are both missing, same as the DB search
+NO_NAME_DISTANCE = 100
+# Separates the fields and the assets in the texts of the index so that a search can't
+# match across two of them
+FIELD_SEPARATOR = '\x00'
+# Number of assets that can be modified after loading the index before it is loaded again
+MAX_MODIFIED_ASSETS = 1000
+# Up to this many assets that contain the searched substring are all ranked. If more of
+# them do, they are checked by the length of their name and symbol until the best are found.
+MAX_RANKED_ASSETS = 2000
+
+
+class IndexedAsset(NamedTuple):
+    """An asset as read by ALL_ASSETS_TABLES_QUERY along with its casefolded name and symbol,
+    the ones of them that are not missing"""
+    identifier: str
+    name: str | None
+    symbol: str | None
+    chain: int | None
+    asset_type: str
+    custom_asset_type: str | None
+    fields: tuple[str, ...]
+
+    @property
+    def text(self) -> str:
+        return ''.join(f'{value}{FIELD_SEPARATOR}' for value in self.fields)
+
+    @property
+    def lengths(self) -> set[int]:
+        return {len(value) for value in self.fields}
+
+    def contains(self, substring: str) -> bool:
+        return any(substring in value for value in self.fields)
+
+    def distance(self, substring: str, max_distance: int) -> int:
+        """Levenshtein distance of the substring to the closest of the name and symbol or
+        any value greater than max_distance if it's greater than that.
+
+        If a field contains the substring the distance is exactly the difference of their
+        lengths so the levenshtein computation is only needed for the other field.
+        """
+        result = min(NO_NAME_DISTANCE, max_distance + 1)
+        for value in self.fields:
+            if abs(len(value) - len(substring)) >= result:
+                continue  # the levenshtein distance is at least the difference of the lengths
+
+            if substring in value:
+                result = len(value) - len(substring)
+            else:
+                result = min(result, levenshtein(substring, value, result))
+
+        return result
+
+    def serialize(self) -> dict[str, Any]:
+        result = {
+            'identifier': self.identifier,
+            'name': self.name,
+            'symbol': self.symbol,
+            'asset_type': AssetType.deserialize_from_db(self.asset_type).serialize(),
+        }
+        if self.chain is not None:
+            result['evm_chain'] = ChainID.deserialize_from_db(self.chain).to_name()
+        if self.custom_asset_type is not None:
+            result['custom_asset_type'] = self.custom_asset_type
+
+        return result
+
+
+def _indexed_asset(entry: tuple) -> IndexedAsset | None:
+    """An asset read by ALL_ASSETS_TABLES_QUERY or None if it has no name and symbol,
+    in which case it can't match any search"""
+    identifier, name, symbol, chain, asset_type, custom_asset_type = entry
+    if name is None and symbol is None:
+        return None
+
+    return IndexedAsset(
+        identifier=identifier,
+        name=name,
+        symbol=symbol,
+        chain=chain,
+        asset_type=asset_type,
+        custom_asset_type=custom_asset_type,
+        fields=tuple(value.casefold() for value in (name, symbol) if value is not None),
+    )
+
+
+class AssetsText(NamedTuple):
+    """The texts of some assets joined in a single string, so that the assets that contain
+    a substring are found by str.find instead of checking them one by one"""
+    text: str
+    offsets: array  # where the text of each asset starts, followed by the length of text
+    slots: array
+
+    @classmethod
+    def make(cls, assets: list[IndexedAsset], slots: list[int]) -> 'AssetsText':
+        texts = [assets[slot].text for slot in slots]
+        return cls(
+            text=''.join(texts),
+            offsets=array('I', accumulate((len(x) for x in texts), initial=0)),
+            slots=array('I', slots),
+        )
+
+    def find(self, substring: str, max_slots: int | None = None) -> list[int] | None:
+        """The slots of the assets whose name or symbol contains the substring or None if
+        there are more than max_slots of them"""
+        result: list[int] = []
+        position = self.text.find(substring)
+        while position != -1:
+            if len(result) == max_slots:
+                return None
+
+            idx = bisect_right(self.offsets, position) - 1
+            result.append(self.slots[idx])
+            position = self.text.find(substring, self.offsets[idx + 1])
+
+        return result
+
+
+class AssetSearchIndex:
+    """An in-memory index of the names and symbols of all the global DB assets that is
+    used for the levenshtein asset search instead of reading the whole assets tables.
+
+    The casefolded names and symbols of the assets are kept in texts by their length.
+    Since the levenshtein distance of two strings is at least the difference of their
+    lengths, a search looks for the substring in the texts of the lengths closest to
+    it first and stops as soon as none of the remaining assets can get in the top results.
+
+    The index is loaded from the DB the first time it is used. Anything writing to the
+    assets of the global DB needs to invalidate the affected assets, which are read again
+    in the next search, or clear the index if it modifies many of them.
+    """
+
+    def __init__(self) -> None:
+        self.assets: list[IndexedAsset] = []
+        self.slots: dict[str, int] = {}  # slot of the current version of each asset
+        self.texts_by_length: dict[int, AssetsText] = {}
+        self.all_texts = AssetsText.make([], [])
+        self.modified_slots: list[int] = []  # slots of the assets read after the load
+        self.stale: set[str] = set()
+        self.loaded = False
+        # increased on every clear so that an index loaded concurrently is loaded again
+        self.generation = 0
+
+    def _load(self, cursor: 'DBCursor') -> None:
+        from rotkehlchen.globaldb.handler import ALL_ASSETS_TABLES_QUERY  # circular import
+        generation = self.generation
+        self.stale.clear()  # any asset modified from now on is read again after the load
+        assets = [
+            asset for entry in cursor.execute(ALL_ASSETS_TABLES_QUERY)
+            if (asset := _indexed_asset(entry)) is not None
+        ]
+        slots_by_length: dict[int, list[int]] = {}
+        for slot, asset in enumerate(assets):
+            for length in asset.lengths:
+                slots_by_length.setdefault(length, []).append(slot)
+
+        self.assets = assets
+        self.slots = {asset.identifier: slot for slot, asset in enumerate(assets)}
+        self.texts_by_length = {
+            length: AssetsText.make(assets, slots) for length, slots in slots_by_length.items()
+        }
+        self.all_texts = AssetsText.make(assets, list(range(len(assets))))
+        self.modified_slots = []
+        self.loaded = generation == self.generation
+        log.debug(f'Loaded {len(assets)} assets in the asset search index')
+
+    def refresh(self, cursor: 'DBCursor') -> None:
+        """Load the index if needed and read again the assets modified since last time.
+
+        Modified assets are put in new slots that are checked one by one, until there are
+        too many of them and the whole index is loaded again.
+        """
+        from rotkehlchen.globaldb.handler import ALL_ASSETS_TABLES_QUERY  # circular import
+        if self.loaded is False or len(self.modified_slots) + len(self.stale) > MAX_MODIFIED_ASSETS:  # noqa: E501
+            self._load(cursor)
+
+        if len(self.stale) == 0:
+            return
+
+        stale, self.stale = self.stale, set()
+        for identifier in stale:
+            self.slots.pop(identifier, None)
+        for chunk in get_chunks(list(stale), n=500):  # stay under the sqlite variables limit
+            for entry in cursor.execute(
+                f'{ALL_ASSETS_TABLES_QUERY} WHERE assets.identifier IN ({",".join("?" * len(chunk))})',  # noqa: E501
+                chunk,
+            ):
+                if (asset := _indexed_asset(entry)) is not None:
+                    self.slots[asset.identifier] = len(self.assets)
+                    self.modified_slots.append(len(self.assets))
+                    self.assets.append(asset)
+
+    def _candidate_slots(self, substring: str, limit: int | None) -> Iterator[tuple[list[int], int]]:  # noqa: E501
+        """Yields the slots of assets that contain the substring along with a lower bound
+        of the distance of all the assets that are not yielded yet.
+
+        If too many assets contain the substring, they are yielded by the length of their
+        name or symbol, closest to the length of the substring first.
+        """
+        yield [slot for slot in self.modified_slots if self.assets[slot].contains(substring)], 0
+        if (slots := self.all_texts.find(
+            substring=substring,
+            max_slots=None if limit is None else MAX_RANKED_ASSETS,
+        )) is not None:
+            yield slots, 0
+            return
+
+        max_length = max(self.texts_by_length, default=0)
+        for distance in count():
+            if distance > len(substring) and len(substring) + distance > max_length:
+                return
+
+            for length in {len(substring) - distance, len(substring) + distance}:
+                if (texts := self.texts_by_length.get(length)) is not None:
+                    yield texts.find(substring), distance  # type: ignore[misc]  # is a list without max_slots
+
+    def search(
+            self,
+            cursor: 'DBCursor',
+            substring: str,
+            limit: int | None,
+            chain_id: ChainID | None,
+            should_skip: Callable[[str], bool],
+    ) -> list[tuple[int, IndexedAsset]]:
+        """Find the assets whose casefolded name or symbol contains the casefolded substring
+        and are on the given chain or have no chain. Returns up to limit of them, sorted by
+        their levenshtein distance to the substring and then by slot, along with the distance.
+        """
+        if limit is not None and limit <= 0:
+            return []
+
+        self.refresh(cursor)
+        substring = substring.casefold()
+        chain = chain_id.serialize_for_db() if chain_id is not None else None
+        heap: list[tuple[int, int]] = []  # (-distance, -slot) of the best limit assets
+        visited = set()  # an asset is in the texts of the lengths of both its name and symbol
+        for slots, min_distance in self._candidate_slots(substring, limit):
+            if limit is not None and len(heap) == limit and min_distance > -heap[0][0]:
+                break  # all the remaining assets are further than the ones found
+
+            for slot in slots:
+                if slot in visited:
+                    continue
+
+                visited.add(slot)
+                asset = self.assets[slot]
+                if is_full := limit is not None and len(heap) == limit:
+                    # check the distance first since most assets are too far
+                    if (item := (-asset.distance(substring, -heap[0][0]), -slot)) < heap[0]:
+                        continue
+                else:
+                    item = (-asset.distance(substring, NO_NAME_DISTANCE), -slot)
+
+                if (
+                        self.slots.get(asset.identifier) != slot or  # an older version of it
+                        (chain is not None and asset.chain not in (chain, None)) or
+                        should_skip(asset.identifier)
+                ):
+                    continue
+
+                if is_full:
+                    heapq.heapreplace(heap, item)
+                else:
+                    heapq.heappush(heap, item)
+
+        return [(-distance, self.assets[-slot]) for distance, slot in sorted(heap, reverse=True)]
+
+    def invalidate(self, identifiers: Iterable[str]) -> None:
+        """Mark assets that were added, modified or deleted in the DB to be read again"""
+        self.stale.update(identifiers)
+
+    def clear(self) -> None:
+        """Drop the whole index so that it is loaded again in the next search"""
+        self.generation += 1
+        self.loaded = False
+        self.assets, self.slots, self.texts_by_length = [], {}, {}
+        self.all_texts = AssetsText.make([], [])
+        self.modified_slots = []
+        self.stale.clear()
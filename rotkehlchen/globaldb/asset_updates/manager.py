@@ -548,6 +548,7 @@ class AssetsUpdater:
                 # now move the data to the actual global DB
                 log.info('Finishing assets update. Replacing users globaldb with the updated information')  # noqa: E501
                 _replace_assets_from_db(self.globaldb.conn, tmpdir / temp_db_name)
+                self.globaldb.asset_search_index.clear()
 
         return None
 
@@ -54,6 +54,8 @@ from rotkehlchen.utils.serialization import (
     deserialize_generic_asset_from_db,
 )
 
+from .asset_search import AssetSearchIndex
+from .price_cache import HistoricalPriceCache, PairSeries, load_pair_series
 from .upgrades.manager import configure_globaldb
 from .utils import GLOBAL_DB_VERSION, globaldb_get_setting_value, initialize_globaldb
 
@@ -93,6 +95,8 @@ class GlobalDBHandler:
     used_backup: bool  # specifies if the global DB was restored from a backup
     packaged_db_lock: Semaphore
     msg_aggregator: 'MessagesAggregator | None' = None
+    historical_price_cache: HistoricalPriceCache
+    asset_search_index: AssetSearchIndex
 
     def __new__(
             cls,
@@ -138,6 +142,8 @@ class GlobalDBHandler:
             sql_vm_instructions_cb=sql_vm_instructions_cb,
         )
         GlobalDBHandler.__instance.packaged_db_lock = Semaphore()
+        GlobalDBHandler.__instance.historical_price_cache = HistoricalPriceCache()
+        GlobalDBHandler.__instance.asset_search_index = AssetSearchIndex()
 
         # initialise the asset resolver here since asset updater class might require it.
         AssetResolver(globaldb=GlobalDBHandler.__instance, constant_assets=CONSTANT_ASSETS)
@@ -251,6 +257,14 @@ class GlobalDBHandler:
             raise InputError(
                 f'Failed to add asset {asset.identifier} into the assets table due to {e!s}',
             ) from e
+        finally:  # the added underlying tokens have no name or symbol so they can't be searched
+            GlobalDBHandler().asset_search_index.invalidate([asset.identifier])
+
+    @staticmethod
+    def load_asset_search_index() -> None:
+        """Load the asset search index so that the first asset search doesn't wait for it"""
+        with GlobalDBHandler().conn.read_ctx() as cursor:
+            GlobalDBHandler().asset_search_index.refresh(cursor)
 
     @staticmethod
     def retrieve_assets(userdb: 'DBHandler', filter_query: 'AssetsFilterQuery') -> tuple[list[dict[str, Any]], int]:  # noqa: E501
@@ -1018,6 +1032,7 @@ class GlobalDBHandler:
             ) from e
 
         AssetResolver.clean_memory_cache(entry.identifier)
+        GlobalDBHandler().asset_search_index.invalidate([entry.identifier])
         return rotki_id
 
     @staticmethod
@@ -1093,6 +1108,8 @@ class GlobalDBHandler:
                     f'due to a constraint being hit. Make sure the new values are valid.',
                 ) from e
 
+        GlobalDBHandler().asset_search_index.invalidate([asset.identifier])
+
     @staticmethod
     def add_user_owned_assets(assets: list['Asset']) -> None:
         """Make sure all assets in the list are included in the user owned assets
@@ -1125,6 +1142,10 @@ class GlobalDBHandler:
                     f'but it was not found in the DB',
                 )
 
+        # its prices were deleted too by the foreign keys
+        GlobalDBHandler().historical_price_cache.invalidate_asset(identifier)
+        GlobalDBHandler().asset_search_index.invalidate([identifier])
+
     @staticmethod
     def get_assets_with_symbol(
             symbol: str,
@@ -1188,6 +1209,56 @@ class GlobalDBHandler:
 
         return assets
 
+    @staticmethod
+    def _get_historical_price(
+            cursor: DBCursor,
+            from_asset: 'Asset',
+            to_asset: 'Asset',
+            timestamp: Timestamp,
+            max_seconds_distance: int,
+            source: HistoricalPriceOracle | None,
+    ) -> Optional['HistoricalPrice']:
+        """Gets the price around a particular timestamp from the in-memory price cache.
+        Goes to the DB only if the cache is disabled."""
+        if (pair_series := GlobalDBHandler().historical_price_cache.get(
+            cursor=cursor,
+            from_asset=from_asset.identifier,
+            to_asset=to_asset.identifier,
+            from_ts=Timestamp(timestamp - max_seconds_distance),
+            to_ts=Timestamp(timestamp + max_seconds_distance),
+        )) is None:
+            querystr = (
+                'SELECT from_asset, to_asset, source_type, timestamp, '
+                'price, MIN(ABS(timestamp - ?)) FROM price_history '
+                'WHERE from_asset=? AND to_asset=? '
+                'AND timestamp between ? AND ?'
+            )
+            querylist = [timestamp, from_asset.identifier, to_asset.identifier, timestamp - max_seconds_distance, timestamp + max_seconds_distance]  # noqa: E501
+            if source is not None:
+                querystr += ' AND source_type=? '
+                querylist.append(source.serialize_for_db())
+
+            result = cursor.execute(querystr, tuple(querylist)).fetchone()
+            # The result tuple last entry MIN(ABS()) is disregarded in deserialize_from_db
+            return None if result[0] is None else HistoricalPrice.deserialize_from_db(result)
+
+        price: HistoricalPrice | None = None
+        for series_source, series in pair_series.items():
+            if (
+                (source is None or series_source == source) and
+                (idx := series.nearest(timestamp, max_seconds_distance)) is not None and
+                (price is None or abs(series.timestamps[idx] - timestamp) < abs(price.timestamp - timestamp))  # noqa: E501
+            ):
+                price = HistoricalPrice(
+                    from_asset=from_asset,
+                    to_asset=to_asset,
+                    source=series_source,
+                    timestamp=Timestamp(series.timestamps[idx]),
+                    price=series.prices[idx],
+                )
+
+        return price
+
     @staticmethod
     def get_historical_price(
             from_asset: 'Asset',
@@ -1200,24 +1271,15 @@ class GlobalDBHandler:
 
         If no price can be found returns None
         """
-        querystr = (
-            'SELECT from_asset, to_asset, source_type, timestamp, '
-            'price, MIN(ABS(timestamp - ?)) FROM price_history '
-            'WHERE from_asset=? AND to_asset=? '
-            'AND timestamp between ? AND ?'
-        )
-        querylist = [timestamp, from_asset.identifier, to_asset.identifier, timestamp - max_seconds_distance, timestamp + max_seconds_distance]  # noqa: E501
-        if source is not None:
-            querystr += ' AND source_type=? '
-            querylist.append(source.serialize_for_db())
-
         with GlobalDBHandler().conn.read_ctx() as cursor:
-            result = cursor.execute(querystr, tuple(querylist)).fetchone()
-            if result[0] is None:
-                return None
-
-        # The result tuple last entry MIN(ABS()) is disregarded in deserialize_from_db
-        return HistoricalPrice.deserialize_from_db(result)
+            return GlobalDBHandler._get_historical_price(
+                cursor=cursor,
+                from_asset=from_asset,
+                to_asset=to_asset,
+                timestamp=timestamp,
+                max_seconds_distance=max_seconds_distance,
+                source=source,
+            )
 
     @staticmethod
     def get_historical_prices(
@@ -1228,28 +1290,45 @@ class GlobalDBHandler:
         """Given a list of from/to/timestamp data to query returns all values
         that could be found in the DB and None for those that could not be found.
         """
-        querystr = (
-            'SELECT from_asset, to_asset, source_type, timestamp, price, MIN(ABS(timestamp - ?)) '
-            'FROM price_history WHERE from_asset=? AND to_asset=? AND timestamp BETWEEN ? AND ?'
-        )
-        querylist: list[tuple] = []
-        if source is not None:
-            querystr += ' AND source_type=? '
-            serialized_source = source.serialize_for_db()
-            for from_asset, to_asset, timestamp in query_data:
-                querylist.append((timestamp, from_asset.identifier, to_asset.identifier, timestamp - max_seconds_distance, timestamp + max_seconds_distance, serialized_source))  # noqa: E501
-
-        else:
-            for from_asset, to_asset, timestamp in query_data:
-                querylist.append((timestamp, from_asset.identifier, to_asset.identifier, timestamp - max_seconds_distance, timestamp + max_seconds_distance))  # noqa: E501
+        with GlobalDBHandler().conn.read_ctx() as cursor:
+            return [GlobalDBHandler._get_historical_price(
+                cursor=cursor,
+                from_asset=from_asset,
+                to_asset=to_asset,
+                timestamp=timestamp,
+                max_seconds_distance=max_seconds_distance,
+                source=source,
+            ) for from_asset, to_asset, timestamp in query_data]
 
-        prices_results = []
+    @staticmethod
+    def get_historical_price_series(
+            from_asset: 'Asset',
+            to_asset: 'Asset',
+            from_timestamp: Timestamp,
+            to_timestamp: Timestamp,
+    ) -> PairSeries:
+        """Gets all the cached prices of a pair in the given time range per source,
+        in ascending timestamp order so that callers can bisect into them."""
         with GlobalDBHandler().conn.read_ctx() as cursor:
-            for entry in querylist:
-                result = cursor.execute(querystr, entry).fetchone()  # below last index of the result tuple is ignored in deserialize  # noqa: E501
-                prices_results.append(None if result[0] is None else HistoricalPrice.deserialize_from_db(result))  # noqa: E501
+            if (pair_series := GlobalDBHandler().historical_price_cache.get(
+                cursor=cursor,
+                from_asset=from_asset.identifier,
+                to_asset=to_asset.identifier,
+                from_ts=from_timestamp,
+                to_ts=to_timestamp,
+            )) is None:
+                return load_pair_series(
+                    cursor=cursor,
+                    from_asset=from_asset.identifier,
+                    to_asset=to_asset.identifier,
+                    from_ts=from_timestamp,
+                    to_ts=to_timestamp,
+                )[0]
 
-        return prices_results
+        return {
+            source: series.range(from_timestamp, to_timestamp)
+            for source, series in pair_series.items()
+        }
 
     @staticmethod
     def add_historical_prices(entries: list['HistoricalPrice']) -> None:
@@ -1286,6 +1365,9 @@ class GlobalDBHandler:
                             f'Failed to add {entry!s} due to {entry_error!s}. Skipping entry addition',  # noqa: E501
                         )
 
+        for from_asset, to_asset in {(x.from_asset.identifier, x.to_asset.identifier) for x in entries}:  # noqa: E501
+            GlobalDBHandler().historical_price_cache.invalidate(from_asset, to_asset)
+
     @staticmethod
     def add_single_historical_price(entry: HistoricalPrice) -> bool:
         """
@@ -1310,6 +1392,7 @@ class GlobalDBHandler:
             )
             return False
 
+        GlobalDBHandler().historical_price_cache.invalidate(entry.from_asset.identifier, entry.to_asset.identifier)  # noqa: E501
         return True
 
     @staticmethod
@@ -1371,7 +1454,11 @@ class GlobalDBHandler:
                 'SELECT from_asset, to_asset FROM price_history WHERE source_type=? AND (from_asset=? OR to_asset=?)',  # noqa: E501
                 (HistoricalPriceOracle.MANUAL_CURRENT.serialize_for_db(), from_asset.identifier, from_asset.identifier),  # noqa: E501
             )
-            return {Asset(asset) for entry in write_cursor for asset in entry}
+            assets_to_invalidate = {Asset(asset) for entry in write_cursor for asset in entry}
+
+        # the previous manual current prices of the asset are now historical ones
+        GlobalDBHandler().historical_price_cache.invalidate_asset(from_asset.identifier)
+        return assets_to_invalidate
 
     @staticmethod
     def get_manual_current_price(asset: Asset) -> tuple[Asset, Price] | None:
@@ -1432,7 +1519,8 @@ class GlobalDBHandler:
                     f'Not found manual current price to delete for asset {asset!s}',
                 )
 
-            return assets_to_invalidate
+        GlobalDBHandler().historical_price_cache.invalidate_asset(asset.identifier)
+        return assets_to_invalidate
 
     @staticmethod
     def get_manual_prices(
@@ -1492,6 +1580,7 @@ class GlobalDBHandler:
             )
             return False
 
+        GlobalDBHandler().historical_price_cache.invalidate(entry.from_asset.identifier, entry.to_asset.identifier)  # noqa: E501
         return True
 
     @staticmethod
@@ -1523,6 +1612,7 @@ class GlobalDBHandler:
                 )
                 return False
 
+        GlobalDBHandler().historical_price_cache.invalidate(from_asset.identifier, to_asset.identifier)  # noqa: E501
         return True
 
     @staticmethod
@@ -1546,6 +1636,8 @@ class GlobalDBHandler:
                 f'and source: {source!s} due to {e!s}',
             )
 
+        GlobalDBHandler().historical_price_cache.invalidate(from_asset.identifier, to_asset.identifier)  # noqa: E501
+
     @staticmethod
     def get_historical_price_range(
             from_asset: 'Asset',
@@ -1650,6 +1742,9 @@ class GlobalDBHandler:
                             user_db_cursor.execute(f'INSERT INTO assets(identifier) VALUES {ids_processed};')  # noqa: E501
                             user_db_cursor.switch_foreign_keys('ON')
 
+                    # deleting the assets also deleted their prices
+                    self.historical_price_cache.clear()
+                    self.asset_search_index.clear()
                     with user_db.conn.read_ctx() as cursor:
                         # Update the owned assets table
                         user_db.update_owned_assets_in_globaldb(cursor)
@@ -1711,6 +1806,8 @@ class GlobalDBHandler:
                     write_cursor.execute('INSERT INTO multiasset_mappings SELECT * FROM clean_db.multiasset_mappings')  # noqa: E501
                     # TODO: think about how to implement multiassets insertion
                     write_cursor.switch_foreign_keys('ON')
+
+                self.asset_search_index.clear()
             except sqlite3.Error as e:
                 log.error(f'Failed to restore assets in globaldb due to {e!s}')
                 return False, 'Failed to restore assets. Read logs to get more information.'
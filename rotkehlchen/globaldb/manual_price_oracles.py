@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING
 
 from rotkehlchen.assets.asset import Asset
 from rotkehlchen.constants.prices import ZERO_PRICE
+from rotkehlchen.constants.timing import HOUR_IN_SECONDS
 from rotkehlchen.errors.price import NoPriceForGivenTimestamp
 from rotkehlchen.globaldb.handler import GlobalDBHandler
 from rotkehlchen.history.types import HistoricalPriceOracle
@@ -21,6 +22,8 @@ log = RotkehlchenLogsAdapter(logger)
 
 
 class ManualPriceOracle:
+    # How far from the requested timestamp a manual price is used
+    cached_price_max_seconds_distance = HOUR_IN_SECONDS
 
     def can_query_history(
             self,
@@ -42,7 +45,7 @@ class ManualPriceOracle:
             from_asset=from_asset,
             to_asset=to_asset,
             timestamp=timestamp,
-            max_seconds_distance=3600,
+            max_seconds_distance=cls.cached_price_max_seconds_distance,
             source=HistoricalPriceOracle.MANUAL,
         )
         if price_entry is not None:
@@ -0,0 +1,223 @@
+import logging
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import TYPE_CHECKING, NamedTuple
+
+from rotkehlchen.constants.timing import DAY_IN_SECONDS
+from rotkehlchen.errors.serialization import DeserializationError
+from rotkehlchen.history.deserialization import deserialize_price
+from rotkehlchen.history.types import HistoricalPriceOracle
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+from rotkehlchen.types import Price, Timestamp
+
+if TYPE_CHECKING:
+    from rotkehlchen.db.drivers.gevent import DBCursor
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+# Approximate memory in bytes taken by each cached price. The timestamp is 8 bytes in
+# the array and the price is a pointer in the tuple to an FVal wrapping a Decimal.
+PRICE_ENTRY_SIZE = 8 + 8 + 40 + 104
+DEFAULT_PRICE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+# pairs taking more than 1/LARGE_PAIR_SHARE of the cache are cached in time windows
+LARGE_PAIR_SHARE = 8
+PRICE_WINDOW_SECONDS = 30 * DAY_IN_SECONDS
+
+
+class PriceSeries(NamedTuple):
+    """The cached prices of a pair from a single source in ascending timestamp order"""
+    timestamps: array  # array of signed 64 bit ints
+    prices: tuple[Price, ...]
+
+    def nearest(self, timestamp: Timestamp, max_seconds_distance: int) -> int | None:
+        """Find the index of the price closest to the timestamp and at most
+        max_seconds_distance away from it or None if there is no such price.
+
+        On a tie the earlier price is picked, same as the DB query would do.
+        """
+        result, result_distance = None, max_seconds_distance + 1
+        idx = bisect_left(self.timestamps, timestamp)
+        # the closest entry is either the last one before or the first one after the timestamp
+        for candidate_idx in (idx - 1, idx):
+            if (
+                    0 <= candidate_idx < len(self.timestamps) and
+                    (distance := abs(self.timestamps[candidate_idx] - timestamp)) < result_distance
+            ):
+                result, result_distance = candidate_idx, distance
+
+        return result
+
+    def range(self, from_ts: Timestamp, to_ts: Timestamp) -> 'PriceSeries':
+        """Get the part of the series that is within the given time range (inclusive)"""
+        start = bisect_left(self.timestamps, from_ts)
+        end = bisect_left(self.timestamps, to_ts + 1)
+        return PriceSeries(timestamps=self.timestamps[start:end], prices=self.prices[start:end])
+
+
+# all the cached series of a pair by source, ordered like the source in the DB
+PairSeries = dict[HistoricalPriceOracle, PriceSeries]
+
+
+def load_pair_series(
+        cursor: 'DBCursor',
+        from_asset: str,
+        to_asset: str,
+        from_ts: Timestamp | None = None,
+        to_ts: Timestamp | None = None,
+) -> tuple[PairSeries, int]:
+    """Read the prices of a pair, optionally within a time range, with a single scan
+    of the price_history primary key. Also returns their approximate size in bytes."""
+    querystr = 'SELECT source_type, timestamp, price FROM price_history WHERE from_asset=? AND to_asset=?'  # noqa: E501
+    bindings: tuple = (from_asset, to_asset)
+    if from_ts is not None and to_ts is not None:
+        # listing the sources lets the time range use the primary key for each of them
+        sources = [x.serialize_for_db() for x in HistoricalPriceOracle]
+        querystr += f' AND source_type IN ({",".join("?" * len(sources))}) AND timestamp BETWEEN ? AND ?'  # noqa: E501
+        bindings += (*sources, from_ts, to_ts)
+
+    raw_series: dict[str, tuple[array, list[Price]]] = {}
+    for source_type, timestamp, price in cursor.execute(f'{querystr} ORDER BY source_type, timestamp', bindings):  # noqa: E501
+        try:
+            deserialized_price = deserialize_price(price)
+        except DeserializationError as e:
+            log.error(f'Skipping cached price of {from_asset} -> {to_asset} at {timestamp} due to {e!s}')  # noqa: E501
+            continue
+
+        timestamps, prices = raw_series.setdefault(source_type, (array('q'), []))
+        timestamps.append(timestamp)
+        prices.append(deserialized_price)
+
+    pair_series, entries = {}, 0
+    for source_type, (timestamps, prices) in raw_series.items():
+        try:
+            source = HistoricalPriceOracle.deserialize_from_db(source_type)
+        except DeserializationError as e:
+            log.error(f'Skipping cached prices of {from_asset} -> {to_asset} due to {e!s}')
+            continue
+
+        pair_series[source] = PriceSeries(timestamps=timestamps, prices=tuple(prices))
+        entries += len(timestamps)
+
+    return pair_series, entries * PRICE_ENTRY_SIZE
+
+
+class CachedPair(NamedTuple):
+    """The cached prices of a pair, either all of them or the ones of a time window"""
+    series: PairSeries
+    size: int
+    from_ts: Timestamp | None = None  # None if all the prices of the pair are cached
+    to_ts: Timestamp | None = None
+
+    def covers(self, from_ts: Timestamp, to_ts: Timestamp) -> bool:
+        if self.from_ts is None or self.to_ts is None:
+            return True
+
+        return self.from_ts <= from_ts and to_ts <= self.to_ts
+
+
+class HistoricalPriceCache:
+    """An in-memory LRU cache of the global DB price_history table.
+
+    Pairs are loaded at once into sorted arrays so that nearest timestamp lookups are a
+    binary search instead of a DB query. Pairs that take more than a share of max_bytes,
+    like years of hourly prices, are remembered as large and only a window of
+    PRICE_WINDOW_SECONDS around the requested timestamps is loaded for them. Since the
+    PnL reports go through the events in time order, the window is reloaded only once
+    it's passed. Entries are evicted, least recently used first, once the estimated
+    size of the cache goes over max_bytes. Anything writing to price_history needs to
+    invalidate the affected pairs.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_PRICE_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.pairs: OrderedDict[tuple[str, str], CachedPair] = OrderedDict()
+        self.large_pairs: set[tuple[str, str]] = set()
+        # increased on every invalidation so that a pair read from the DB concurrently
+        # with a write to it is not cached with stale prices
+        self.generation = 0
+
+    def _is_large(self, cursor: 'DBCursor', key: tuple[str, str]) -> bool:
+        """Check if the pair takes too much of the cache to be cached whole. Counting the
+        rows only scans the primary key so it's much cheaper than loading them."""
+        if key in self.large_pairs:
+            return True
+
+        count = cursor.execute(
+            'SELECT COUNT(*) FROM price_history WHERE from_asset=? AND to_asset=?', key,
+        ).fetchone()[0]
+        if count * PRICE_ENTRY_SIZE > self.max_bytes // LARGE_PAIR_SHARE:
+            log.debug(f'Caching prices of {key[0]} -> {key[1]} in windows since they are too many')
+            self.large_pairs.add(key)
+            return True
+
+        return False
+
+    def get(
+            self,
+            cursor: 'DBCursor',
+            from_asset: str,
+            to_asset: str,
+            from_ts: Timestamp,
+            to_ts: Timestamp,
+    ) -> PairSeries | None:
+        """Get the cached prices of a pair that contain at least the given time range,
+        loading them from the DB if needed.
+
+        Returns None if the cache is disabled.
+        """
+        key = (from_asset, to_asset)
+        if (entry := self.pairs.get(key)) is not None and entry.covers(from_ts, to_ts):
+            self.pairs.move_to_end(key)
+            return entry.series
+
+        if self.max_bytes <= 0:
+            return None
+
+        generation = self.generation
+        window_from_ts, window_to_ts = None, None
+        if self._is_large(cursor, key):
+            window_from_ts = Timestamp(from_ts - PRICE_WINDOW_SECONDS)
+            window_to_ts = Timestamp(to_ts + PRICE_WINDOW_SECONDS)
+
+        pair_series, size = load_pair_series(cursor, from_asset, to_asset, window_from_ts, window_to_ts)  # noqa: E501
+        if size > self.max_bytes // LARGE_PAIR_SHARE or generation != self.generation:
+            return pair_series  # a range too big to cache or prices changed while loading
+
+        # another greenlet may have cached the pair while this one was loading it
+        if (previous_entry := self.pairs.pop(key, None)) is not None:
+            self.size -= previous_entry.size
+        self.pairs[key] = CachedPair(
+            series=pair_series,
+            size=size,
+            from_ts=window_from_ts,
+            to_ts=window_to_ts,
+        )
+        self.size += size
+        while self.size > self.max_bytes:
+            _, evicted_entry = self.pairs.popitem(last=False)
+            self.size -= evicted_entry.size
+
+        return pair_series
+
+    def invalidate(self, from_asset: str, to_asset: str) -> None:
+        """Drop the cached prices of a pair after it was modified in the DB"""
+        self.generation += 1
+        self.large_pairs.discard((from_asset, to_asset))
+        if (entry := self.pairs.pop((from_asset, to_asset), None)) is not None:
+            self.size -= entry.size
+
+    def invalidate_asset(self, asset: str) -> None:
+        """Drop the cached prices of all the pairs an asset is part of"""
+        self.generation += 1
+        self.large_pairs = {key for key in self.large_pairs if asset not in key}
+        for key in [key for key in self.pairs if asset in key]:
+            self.size -= self.pairs.pop(key).size
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.pairs.clear()
+        self.large_pairs.clear()
+        self.size = 0
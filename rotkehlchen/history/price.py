@@ -1,5 +1,7 @@
 import logging
-from collections.abc import Sequence
+from array import array
+from collections import defaultdict
+from collections.abc import Collection, Sequence
 from contextlib import suppress
 from http import HTTPStatus
 from pathlib import Path
@@ -17,12 +19,14 @@ from rotkehlchen.constants.assets import (
     A_USD,
 )
 from rotkehlchen.constants.prices import ZERO_PRICE
-from rotkehlchen.errors.asset import UnknownAsset, WrongAssetType
+from rotkehlchen.errors.asset import UnknownAsset, UnsupportedAsset, WrongAssetType
 from rotkehlchen.errors.misc import RemoteError
 from rotkehlchen.errors.price import NoPriceForGivenTimestamp, PriceQueryUnsupportedAsset
+from rotkehlchen.externalapis.coingecko import Coingecko
 from rotkehlchen.fval import FVal
 from rotkehlchen.globaldb.handler import GlobalDBHandler
 from rotkehlchen.globaldb.manual_price_oracles import ManualPriceOracle
+from rotkehlchen.globaldb.price_cache import PriceSeries
 from rotkehlchen.inquirer import Inquirer
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.types import Price, Timestamp
@@ -31,9 +35,9 @@ from .types import HistoricalPriceOracle, HistoricalPriceOracleInstance
 
 if TYPE_CHECKING:
     from rotkehlchen.chain.ethereum.oracles.uniswap import UniswapV2Oracle, UniswapV3Oracle
-    from rotkehlchen.externalapis.coingecko import Coingecko
     from rotkehlchen.externalapis.cryptocompare import Cryptocompare
     from rotkehlchen.externalapis.defillama import Defillama
+    from rotkehlchen.globaldb.price_cache import PairSeries
     from rotkehlchen.user_messages import MessagesAggregator
 
 logger = logging.getLogger(__name__)
@@ -297,3 +301,143 @@ class PriceHistorian:
             time=timestamp,
             rate_limited=rate_limited,
         )
+
+    @staticmethod
+    def _has_special_price_handling(asset: Asset) -> bool:
+        """Whether the asset's historical price is not queried directly from the
+        oracles. Needs to be kept in sync with get_price_for_special_asset."""
+        return (
+            asset in (A_ETH2, A_KFEE, A_POLYGON_POS_MATIC) or
+            GlobalDBHandler.asset_in_collection(collection_id=240, asset_id=asset.identifier)
+        )
+
+    @staticmethod
+    def _oracles_using_cache(from_asset: Asset, to_asset: Asset) -> set[HistoricalPriceOracle]:
+        """Returns the oracles with a price cache in the global DB that would look at
+        their cached prices for the given pair. Needs to be kept in sync with the checks
+        that each oracle's query_historical_price does before reading its cache."""
+        oracles = {HistoricalPriceOracle.MANUAL}
+        try:
+            from_asset_with_oracles = from_asset.resolve_to_asset_with_oracles()
+            to_asset_with_oracles = to_asset.resolve_to_asset_with_oracles()
+        except (UnknownAsset, WrongAssetType):
+            return oracles
+
+        oracles |= {HistoricalPriceOracle.CRYPTOCOMPARE, HistoricalPriceOracle.DEFILLAMA}
+        if Coingecko.check_vs_currencies(
+            from_asset=from_asset_with_oracles,
+            to_asset=to_asset_with_oracles,
+            location='historical price',
+        ) is not None:
+            with suppress(UnsupportedAsset):
+                from_asset_with_oracles.to_coingecko()
+                oracles.add(HistoricalPriceOracle.COINGECKO)
+
+        return oracles
+
+    @staticmethod
+    def _find_cached_price(
+            pair_series: 'PairSeries',
+            from_asset: Asset,
+            to_asset: Asset,
+            timestamp: Timestamp,
+            oracles_using_cache: set[HistoricalPriceOracle],
+    ) -> Price | None:
+        """Walk the oracles in the same way as query_historical_price does but only
+        look at the given cached price series. Returns None as soon as an oracle
+        would need to be queried remotely since then we can't know its answer.
+
+        Oracles not in `oracles_using_cache` are skipped, since for this pair they
+        would fail before reading their cache."""
+        instance = PriceHistorian()
+        for oracle, oracle_instance in zip(instance._oracles, instance._oracle_instances, strict=True):  # type: ignore  # checked by the caller  # noqa: E501
+            if (max_seconds_distance := oracle_instance.cached_price_max_seconds_distance) is None:
+                return None  # the oracle has no cache in the global DB
+
+            if oracle not in oracles_using_cache:
+                continue
+
+            if (series := pair_series.get(oracle)) is None:
+                series = PriceSeries(timestamps=array('q'), prices=())
+            if oracle == HistoricalPriceOracle.CRYPTOCOMPARE and len(series.timestamps) != 0 and series.timestamps[0] <= timestamp <= series.timestamps[-1]:  # noqa: E501
+                can_query_history = True  # cryptocompare's own check of the cached data range
+            else:
+                can_query_history = oracle_instance.can_query_history(
+                    from_asset=from_asset,
+                    to_asset=to_asset,
+                    timestamp=timestamp,
+                )
+            if can_query_history is False:
+                continue
+
+            price = None
+            if (idx := series.nearest(timestamp, max_seconds_distance)) is not None:
+                price = series.prices[idx]
+
+            if price is not None and (oracle != HistoricalPriceOracle.CRYPTOCOMPARE or price != ZERO_PRICE):  # noqa: E501
+                return price
+
+            if oracle != HistoricalPriceOracle.MANUAL:
+                return None  # the oracle would now query its remote service
+
+        return None
+
+    @staticmethod
+    def query_cached_historical_prices(
+            queries: Collection[tuple[Asset, Timestamp]],
+            to_asset: Asset,
+    ) -> dict[tuple[Asset, Timestamp], Price]:
+        """Resolve in bulk the historical prices in `to_asset` of the given
+        (asset, timestamp) pairs that can be answered from the global DB price cache.
+
+        The cache of each asset pair is read with a single range scan and the oracles
+        are walked in the user's order, so the returned prices are the same ones
+        query_historical_price would return. Pairs that would need a remote query are
+        left out and should still be queried through query_historical_price.
+        """
+        instance = PriceHistorian()
+        if instance._oracles is None or instance._oracle_instances is None:
+            return {}
+
+        timestamps_per_asset: defaultdict[Asset, set[Timestamp]] = defaultdict(set)
+        for asset, timestamp in queries:
+            timestamps_per_asset[asset].add(timestamp)
+
+        if len(distances := [
+            x.cached_price_max_seconds_distance for x in instance._oracle_instances
+            if x.cached_price_max_seconds_distance is not None
+        ]) == 0:
+            return {}
+
+        max_seconds_distance = max(distances)
+        cached_prices = {}
+        for from_asset, timestamps in timestamps_per_asset.items():
+            try:
+                if (
+                    from_asset == to_asset or
+                    (from_asset.is_fiat() and to_asset.is_fiat()) or
+                    PriceHistorian._has_special_price_handling(from_asset)
+                ):
+                    continue
+            except UnknownAsset:
+                continue
+
+            pair_series = GlobalDBHandler.get_historical_price_series(
+                from_asset=from_asset,
+                to_asset=to_asset,
+                from_timestamp=Timestamp(min(timestamps) - max_seconds_distance),
+                to_timestamp=Timestamp(max(timestamps) + max_seconds_distance),
+            )
+            oracles_using_cache = PriceHistorian._oracles_using_cache(from_asset, to_asset)
+            for timestamp in timestamps:
+                if (price := PriceHistorian._find_cached_price(
+                    pair_series=pair_series,
+                    from_asset=from_asset,
+                    to_asset=to_asset,
+                    timestamp=timestamp,
+                    oracles_using_cache=oracles_using_cache,
+                )) is not None:
+                    cached_prices[from_asset, timestamp] = price
+
+        log.debug(f'Found {len(cached_prices)} historical prices in {to_asset} in the DB cache')
+        return cached_prices
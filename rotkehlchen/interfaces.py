@@ -54,6 +54,9 @@ class CurrentPriceOracleInterface(abc.ABC):
 
 class HistoricalPriceOracleInterface(CurrentPriceOracleInterface, abc.ABC):
     """Query prices for certain timestamps. Oracle could be rate limited"""
+    # How far from the requested timestamp a price of the oracle's cache in the global DB
+    # is used. None if the oracle does not keep its prices there.
+    cached_price_max_seconds_distance: int | None = None
 
     @abc.abstractmethod
     def can_query_history(
@@ -311,6 +311,12 @@ class Rotkehlchen:
             exception_is_error=False,
             method=self.data.db.ensure_data_integrity,
         )
+        self.greenlet_manager.spawn_and_track(
+            after_seconds=None,
+            task_name='load asset search index',
+            exception_is_error=False,
+            method=GlobalDBHandler.load_asset_search_index,
+        )
         if create_new:
             self._perform_new_db_actions()
 
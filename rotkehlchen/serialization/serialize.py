@@ -1,3 +1,5 @@
+from collections.abc import Callable
+from itertools import islice
 from typing import Any
 
 from hexbytes import HexBytes
@@ -71,128 +73,185 @@ from rotkehlchen.types import (
 )
 from rotkehlchen.utils.version_check import VersionCheckResult
 
+# A serializer gets the entry and whether leaves that json_default can encode are kept
+Serializer = Callable[[Any, bool], Any]
+
+
+def _keep(entry: Any, json_leaves: bool) -> Any:  # pylint: disable=unused-argument
+    return entry
+
+
+def _leaf(encode: Callable[[Any], Any]) -> Serializer:
+    """A serializer of entries that json_default can encode directly"""
+    def serializer(entry: Any, json_leaves: bool) -> Any:
+        return entry if json_leaves else encode(entry)
+
+    return serializer
+
+
+def _serialize_list(entry: list[Any], json_leaves: bool) -> list[Any]:
+    if json_leaves is False or type(entry) is not list:
+        return [_process_entry(x, json_leaves) for x in entry]
+
+    # Reuse the list if nothing in it changes. The result is encoded right away.
+    for idx, value in enumerate(entry):
+        if (new_value := _process_entry(value, json_leaves)) is not value:
+            return entry[:idx] + [new_value] + [_process_entry(x, json_leaves) for x in islice(entry, idx + 1, None)]  # noqa: E501
+
+    return entry
+
+
+def _serialize_key(key: Any) -> Any:
+    if isinstance(key, Asset) is True:
+        return key.identifier
+    if isinstance(key, HistoryEventType | HistoryEventSubType | EventCategory | Location | AccountingEventType) is True:  # noqa: E501
+        return _process_entry(key)
+    return key
+
+
+def _serialize_items(items: Any, json_leaves: bool) -> dict[Any, Any]:
+    return {
+        (key if type(key) is str else _serialize_key(key)): _process_entry(value, json_leaves)
+        for key, value in items
+    }
+
+
+def _serialize_dict(entry: dict[Any, Any] | AttributeDict, json_leaves: bool) -> dict[Any, Any]:
+    if json_leaves is False or type(entry) is not dict:
+        return _serialize_items(entry.items(), json_leaves)
+
+    # Reuse the dict if nothing in it changes. The result is encoded right away.
+    for idx, (key, value) in enumerate(entry.items()):
+        new_key = key if type(key) is str else _serialize_key(key)
+        if (new_value := _process_entry(value, json_leaves)) is not value or new_key is not key:
+            result = dict(islice(entry.items(), idx))
+            result[new_key] = new_value
+            result.update(_serialize_items(islice(entry.items(), idx + 1, None), json_leaves))
+            return result
 
-def _process_entry(entry: Any) -> str | (list[Any] | (dict[str, Any] | Any)):
-    if isinstance(entry, FVal):
-        return str(entry)
-    if isinstance(entry, list):
-        return [_process_entry(x) for x in entry]
-
-    if isinstance(entry, dict | AttributeDict):
-        new_dict = {}
-        for k, v in entry.items():
-            if isinstance(k, Asset) is True:
-                k = k.identifier  # noqa: PLW2901
-            elif isinstance(k, HistoryEventType | HistoryEventSubType | EventCategory | Location | AccountingEventType) is True:  # noqa: E501
-                k = _process_entry(k)  # noqa: PLW2901
-            new_dict[k] = _process_entry(v)
-        return new_dict
-    if isinstance(entry, HexBytes):
-        return entry.to_0x_hex()
-    if isinstance(entry, LocationData):
-        return {
-            'time': entry.time,
-            'location': str(Location.deserialize_from_db(entry.location)),
-            'usd_value': entry.usd_value,
-        }
-    if isinstance(entry, SingleDBAssetBalance):
-        return {
-            'time': entry.time,
-            'category': str(entry.category),
-            'amount': str(entry.amount),
-            'usd_value': str(entry.usd_value),
-        }
-    if isinstance(entry, DBAssetBalance):
-        return {
-            'time': entry.time,
-            'category': str(entry.category),
-            'asset': entry.asset.identifier,
-            'amount': str(entry.amount),
-            'usd_value': str(entry.usd_value),
-        }
-    if isinstance(entry, (
-            AddressbookEntry |
-            AssetBalance |
-            DefiProtocol |
-            MakerdaoVault |
-            XpubData |
-            NodeName |
-            NodeName |
-            SingleBlockchainAccountData |
-            SupportedBlockchain |
-            HistoryEventType |
-            HistoryEventSubType |
-            EventDirection |
-            EvmProduct |
-            DBSettings |
-            TxAccountingTreatment |
-            EventCategoryDetails |
-            CalendarEntry |
-            ReminderEntry |
-            CounterpartyDetails
-    )):
-        return entry.serialize()
-    if isinstance(entry, (
-            Trade |
-            MakerdaoVault |
-            DSRAccountReport |
-            Balance |
-            AaveLendingBalance |
-            AaveBorrowingBalance |
-            CompoundBalance |
-            YearnVaultBalance |
-            LiquidityPool |
-            LiquidityPoolAsset |
-            LiquidityPoolEventsBalance |
-            ManuallyTrackedBalanceWithValue |
-            Trove |
-            DillBalance |
-            NFTResult |
-            ExchangeLocationID |
-            WeightedNode
-    )):
-        return process_result(entry.serialize())
-    if isinstance(entry, (
-            VersionCheckResult |
-            DSRCurrentBalances |
-            VaultEvent |
-            MakerdaoVaultDetails |
-            AaveBalances |
-            DefiBalance |
-            DefiProtocolBalances |
-            BlockchainAccountData |
-            AaveStats
-    )):
-        return process_result(entry._asdict())
-    if isinstance(entry, tuple):
-        return list(entry)
-    if isinstance(entry, Asset):
-        return entry.identifier
-    if isinstance(entry, (
-            TradeType |
-            Location |
-            KrakenAccountType |
-            Location |
-            VaultEventType |
-            CurrentPriceOracle |
-            HistoricalPriceOracle |
-            BalanceType |
-            CostBasisMethod |
-            EvmTokenKind |
-            HistoryBaseEntryType |
-            EventCategory |
-            AccountingEventType |
-            Version |
-            WSMessageType
-    )):
-        return str(entry)
-    if isinstance(entry, ChainID):
-        return entry.to_name()
-
-    # else
     return entry
 
 
+# The serializers of the types that can be in API results. An entry uses the first
+# serializer whose types it is an instance of. Anything else is returned as is.
+SERIALIZATION_RULES: list[tuple[Any, Serializer]] = [
+    (FVal, _leaf(str)),
+    (list, _serialize_list),
+    (dict | AttributeDict, _serialize_dict),
+    (HexBytes, _leaf(HexBytes.to_0x_hex)),
+    (LocationData, lambda entry, json_leaves: {
+        'time': entry.time,
+        'location': str(Location.deserialize_from_db(entry.location)),
+        'usd_value': entry.usd_value,
+    }),
+    (SingleDBAssetBalance, lambda entry, json_leaves: {
+        'time': entry.time,
+        'category': str(entry.category),
+        'amount': str(entry.amount),
+        'usd_value': str(entry.usd_value),
+    }),
+    (DBAssetBalance, lambda entry, json_leaves: {
+        'time': entry.time,
+        'category': str(entry.category),
+        'asset': entry.asset.identifier,
+        'amount': str(entry.amount),
+        'usd_value': str(entry.usd_value),
+    }),
+    ((
+        AddressbookEntry |
+        AssetBalance |
+        DefiProtocol |
+        MakerdaoVault |
+        XpubData |
+        NodeName |
+        SingleBlockchainAccountData |
+        SupportedBlockchain |
+        HistoryEventType |
+        HistoryEventSubType |
+        EventDirection |
+        EvmProduct |
+        DBSettings |
+        TxAccountingTreatment |
+        EventCategoryDetails |
+        CalendarEntry |
+        ReminderEntry |
+        CounterpartyDetails
+    ), lambda entry, json_leaves: entry.serialize()),
+    ((
+        Trade |
+        DSRAccountReport |
+        Balance |
+        AaveLendingBalance |
+        AaveBorrowingBalance |
+        CompoundBalance |
+        YearnVaultBalance |
+        LiquidityPool |
+        LiquidityPoolAsset |
+        LiquidityPoolEventsBalance |
+        ManuallyTrackedBalanceWithValue |
+        Trove |
+        DillBalance |
+        NFTResult |
+        ExchangeLocationID |
+        WeightedNode
+    ), lambda entry, json_leaves: _process_entry(entry.serialize(), json_leaves)),
+    ((
+        VersionCheckResult |
+        DSRCurrentBalances |
+        VaultEvent |
+        MakerdaoVaultDetails |
+        AaveBalances |
+        DefiBalance |
+        DefiProtocolBalances |
+        BlockchainAccountData |
+        AaveStats
+    ), lambda entry, json_leaves: _process_entry(entry._asdict(), json_leaves)),
+    (tuple, lambda entry, json_leaves: list(entry)),
+    (Asset, _leaf(lambda entry: entry.identifier)),
+    ((
+        TradeType |
+        Location |
+        KrakenAccountType |
+        VaultEventType |
+        CurrentPriceOracle |
+        HistoricalPriceOracle |
+        BalanceType |
+        CostBasisMethod |
+        EvmTokenKind |
+        HistoryBaseEntryType |
+        EventCategory |
+        AccountingEventType |
+        Version |
+        WSMessageType
+    ), _leaf(str)),
+    (ChainID, _leaf(ChainID.to_name)),
+]
+
+
+def _resolve_serializer(entry_type: type) -> Serializer:
+    """Find the serializer of a type from the rules and remember it for the exact type"""
+    serializer = next(
+        (rule_serializer for types, rule_serializer in SERIALIZATION_RULES if issubclass(entry_type, types)),  # noqa: E501
+        _keep,
+    )
+    SERIALIZERS[entry_type] = serializer
+    return serializer
+
+
+# The serializer of each exact type. Filled at import with the primitives and the
+# types of the rules and then with every other type the first time it is serialized.
+SERIALIZERS: dict[type, Serializer] = dict.fromkeys((str, int, float, bool, type(None)), _keep)
+for _types, _ in SERIALIZATION_RULES:
+    for _type in getattr(_types, '__args__', (_types,)):
+        _resolve_serializer(_type)
+
+
+def _process_entry(entry: Any, json_leaves: bool = False) -> Any:
+    if (serializer := SERIALIZERS.get(type(entry))) is None:
+        serializer = _resolve_serializer(type(entry))
+    return serializer(entry, json_leaves)
+
+
 def process_result(result: Any) -> dict[Any, Any]:
     """Before sending out a result dictionary via the server we are serializing it.
     Turning:
@@ -213,3 +272,17 @@ def process_result_list(result: list[Any]) -> list[Any]:
     processed_result = _process_entry(result)
     assert isinstance(processed_result, list)  # pylint: disable=isinstance-second-argument-not-valid-type
     return processed_result
+
+
+def process_result_for_json(result: Any) -> Any:
+    """Like process_result but for results that are encoded to JSON right away with
+    json_default. Values such as FVals, assets and enums are left in place for the
+    encoder, and lists and dicts where nothing changes are reused instead of copied."""
+    return _process_entry(result, json_leaves=True)
+
+
+def json_default(entry: Any) -> Any:
+    """The default of json.dumps for the values that process_result_for_json leaves"""
+    if (processed := _process_entry(entry)) is entry:
+        raise TypeError(f'Object of type {type(entry).__name__} is not JSON serializable')
+    return processed
@@ -1,13 +1,16 @@
 import os
 import shutil
+from functools import partial
 from http import HTTPStatus
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 import pytest
 import requests
 
+from rotkehlchen.data_import.utils import CSV_ROWS_CHUNK_SIZE, get_csv_chunks
 from rotkehlchen.db.filtering import HistoryEventFilterQuery, TradesFilterQuery
 from rotkehlchen.db.history_events import DBHistoryEvents
 from rotkehlchen.fval import FVal
@@ -494,22 +497,29 @@ def test_data_import_custom_format(rotkehlchen_api_server: 'APIServer', file_upl
 
 
 @pytest.mark.parametrize('legacy_messages_via_websockets', [True])
+@pytest.mark.parametrize('csv_chunk_size', [CSV_ROWS_CHUNK_SIZE, 4])
 def test_data_import_binance_history(
         rotkehlchen_api_server: 'APIServer',
         websocket_connection: 'WebsocketReader',
+        csv_chunk_size: int,
 ) -> None:
-    """Test that the data import endpoint works successfully for binance data"""
+    """Test that the data import endpoint works successfully for binance data, also
+    when the entries that span multiple rows are split between chunks of the file"""
     rotki = rotkehlchen_api_server.rest_api.rotkehlchen
     dir_path = Path(__file__).resolve().parent.parent
     filepath = dir_path / 'data' / 'binance_history.csv'
 
     json_data = {'source': 'binance', 'file': str(filepath)}
-    response = requests.put(
-        api_url_for(
-            rotkehlchen_api_server,
-            'dataimportresource',
-        ), json=json_data,
-    )
+    with patch(
+        'rotkehlchen.data_import.importers.binance.get_csv_chunks',
+        new=partial(get_csv_chunks, chunk_size=csv_chunk_size),
+    ):
+        response = requests.put(
+            api_url_for(
+                rotkehlchen_api_server,
+                'dataimportresource',
+            ), json=json_data,
+        )
     result = assert_proper_sync_response_with_result(response)
     assert result is True
     assert_binance_import_results(rotki, websocket_connection)
@@ -8,6 +8,8 @@ import requests
 from rotkehlchen.api.server import APIServer
 from rotkehlchen.constants import ZERO
 from rotkehlchen.constants.assets import A_CRV, A_USD
+from rotkehlchen.constants.timing import HOUR_IN_SECONDS
+from rotkehlchen.db.accounting_checkpoints import AccountingCheckpoint, DBAccountingCheckpoints
 from rotkehlchen.fval import FVal
 from rotkehlchen.globaldb.handler import GlobalDBHandler
 from rotkehlchen.tests.utils.api import (
@@ -341,3 +343,44 @@ def test_manual_historical_price(
         status_code=HTTPStatus.CONFLICT,
         result_exists=True,
     )
+
+
+def test_manual_price_drops_accounting_checkpoints(
+        rotkehlchen_api_server: APIServer,
+) -> None:
+    """Test that adding, editing or deleting a manual price drops the accounting
+    checkpoints whose state may have used it"""
+    dbcheckpoints = DBAccountingCheckpoints(rotkehlchen_api_server.rest_api.rotkehlchen.data.db)
+    checkpoint_timestamps = [1611000000, 1611166335 - HOUR_IN_SECONDS, 1611166335, 1612000000]
+
+    def reset_checkpoints() -> None:
+        dbcheckpoints.add_checkpoints(
+            [AccountingCheckpoint(
+                timestamp=Timestamp(timestamp),
+                events_num=1,
+                events_hash='events',
+                settings_hash='settings',
+                ignored_hash='ignored',
+                rules_hash='rules',
+            ) for timestamp in checkpoint_timestamps],
+            state='{}',
+        )
+
+    def remaining_checkpoints() -> list[Timestamp]:
+        with dbcheckpoints.db.conn.read_ctx() as cursor:
+            return [x.timestamp for x in dbcheckpoints.get_checkpoints(cursor)]
+
+    price_entry = {'from_asset': A_CRV.identifier, 'to_asset': 'USD', 'timestamp': 1611166335}
+    for method, json_data in (
+            (requests.put, price_entry | {'price': '1.20'}),
+            (requests.patch, price_entry | {'price': '1.30'}),
+            (requests.delete, price_entry),
+    ):
+        reset_checkpoints()
+        response = method(
+            api_url_for(rotkehlchen_api_server, 'historicalassetspriceresource'),
+            json=json_data,
+        )
+        assert_simple_ok_response(response)
+        # the price can be used by events up to an hour away from it
+        assert remaining_checkpoints() == checkpoint_timestamps[:2]
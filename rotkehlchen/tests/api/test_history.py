@@ -352,6 +352,15 @@ def test_query_pnl_report_events_pagination_filtering(
     )
     events_result = assert_proper_sync_response_with_result(response)
     master_events = events_result['entries']
+    response = requests.post(
+        api_url_for(
+            rotkehlchen_api_server_with_exchanges,
+            'per_report_data_resource',
+            report_id=report_id,
+        ),
+        json={'stream': True},
+    )
+    assert assert_proper_sync_response_with_result(response) == events_result
 
     events = []
     for offset in (0, 10, 20, 30, 40):
@@ -371,6 +380,21 @@ def test_query_pnl_report_events_pagination_filtering(
         events_result = assert_proper_sync_response_with_result(response)
         assert len(events_result['entries']) <= 10
         events.extend(events_result['entries'])
+        response = requests.post(
+            api_url_for(
+                rotkehlchen_api_server_with_exchanges,
+                'per_report_data_resource',
+                report_id=report_id,
+            ),
+            json={
+                'offset': offset,
+                'limit': 10,
+                'order_by_attributes': ['timestamp'],
+                'ascending': [ascending_timestamp],
+                'stream': True,
+            },
+        )
+        assert assert_proper_sync_response_with_result(response) == events_result
 
     if ascending_timestamp is False:
         assert master_events == events
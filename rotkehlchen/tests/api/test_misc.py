@@ -160,6 +160,38 @@ def test_query_version_when_update_required(rotkehlchen_api_server: 'APIServer')
     )
 
 
+def test_nodes_health(rotkehlchen_api_server: 'APIServer') -> None:
+    """Test that the live health statistics of the nodes of an EVM chain can be queried"""
+    inquirer = rotkehlchen_api_server.rest_api.rotkehlchen.chains_aggregator.ethereum.node_inquirer
+    for latency in (0.1, 0.2, 0.3, 0.4, 5.0):
+        inquirer.nodes_health.record('mynode', latency=latency, failed=latency > 1)
+
+    response = requests.get(
+        api_url_for(rotkehlchen_api_server, 'rpcnodeshealthresource', blockchain='eth'),
+    )
+    result = assert_proper_sync_response_with_result(response)
+    assert [x for x in result if x['name'] == 'mynode'] == [{
+        'name': 'mynode',
+        'connected': False,
+        'is_pruned': None,
+        'is_archive': None,
+        'samples': 5,
+        'error_rate': 0.2,
+        'latency_p50': 0.3,
+        'latency_p95': 5.0,
+        'score': 0.6154,
+    }]
+
+    response = requests.get(
+        api_url_for(rotkehlchen_api_server, 'rpcnodeshealthresource', blockchain='btc'),
+    )
+    assert_error_response(
+        response=response,
+        contained_in_msg='is not allowed in this endpoint',
+        status_code=HTTPStatus.BAD_REQUEST,
+    )
+
+
 @pytest.mark.parametrize('ethereum_manager_connect_at_start', ['DEFAULT'])
 def test_manage_nodes(rotkehlchen_api_server: 'APIServer') -> None:
     """Test that list of nodes can be correctly updated and queried"""
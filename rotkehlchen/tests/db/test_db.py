@@ -1,5 +1,6 @@
 import dataclasses
 import logging
+import secrets
 import time
 from contextlib import suppress
 from copy import deepcopy
@@ -49,6 +50,7 @@ from rotkehlchen.db.settings import (
     DEFAULT_DATE_DISPLAY_FORMAT,
     DEFAULT_DISPLAY_DATE_IN_LOCALTIME,
     DEFAULT_ETH_STAKING_TAXABLE_AFTER_WITHDRAWAL_ENABLED,
+    DEFAULT_HEDGE_SLOW_RPC_QUERIES,
     DEFAULT_HISTORICAL_PRICE_ORACLES,
     DEFAULT_INCLUDE_CRYPTO2CRYPTO,
     DEFAULT_INCLUDE_FEES_IN_COST_BASIS,
@@ -69,12 +71,14 @@ from rotkehlchen.db.settings import (
     DBSettings,
     ModifiableDBSettings,
 )
+from rotkehlchen.db.timed_balances import serialize_timed_balances
 from rotkehlchen.db.utils import DBAssetBalance, LocationData, SingleDBAssetBalance
 from rotkehlchen.errors.api import AuthenticationError
-from rotkehlchen.errors.misc import DBSchemaError, InputError
+from rotkehlchen.errors.misc import DBSchemaError, InputError, UnableToDecryptRemoteData
 from rotkehlchen.exchanges.data_structures import MarginPosition, Trade
 from rotkehlchen.fval import FVal
 from rotkehlchen.premium.premium import PremiumCredentials
+from rotkehlchen.serialization.serialize import process_result_list
 from rotkehlchen.tests.utils.constants import (
     A_DAO,
     A_DOGE,
@@ -163,6 +167,7 @@ TABLES_AT_INIT = [
     'calendar_reminders',
     'cowswap_orders',
     'gnosispay_data',
+    'accounting_checkpoints',
 ]
 
 
@@ -325,6 +330,34 @@ def test_export_import_db(data_dir: Path, username: str, sql_vm_instructions_cb:
     data.logout()
 
 
+def test_import_db_wrong_password(
+        data_dir: Path,
+        username: str,
+        sql_vm_instructions_cb: int,
+) -> None:
+    """Test that importing a DB exported with another password raises the error that
+    premium sync turns into a wrong password error, without touching the local DB"""
+    msg_aggregator = MessagesAggregator()
+    data = DataHandler(data_dir, msg_aggregator, sql_vm_instructions_cb)
+    data.unlock(username, '123', create_new=True, resume_from_backup=False)
+    with data.db.user_write() as write_cursor:  # make the DB span many blocks
+        write_cursor.executemany(
+            'INSERT INTO user_notes(title, content, location, last_update_timestamp, is_pinned) '
+            "VALUES(?, ?, 'ledger', 1, 0)",
+            [(f'note {idx}', secrets.token_hex(64)) for idx in range(2000)],
+        )
+    encoded_data, _ = data.compress_and_encrypt_db()
+    data.logout()
+
+    data = DataHandler(data_dir, msg_aggregator, sql_vm_instructions_cb)
+    data.unlock('other_user', '456', create_new=True, resume_from_backup=False)
+    with pytest.raises(UnableToDecryptRemoteData):
+        data.decompress_and_decrypt_db(encoded_data)
+    with data.db.conn.read_ctx() as cursor:
+        assert cursor.execute('SELECT COUNT(*) FROM user_notes').fetchone()[0] == 0
+    data.logout()
+
+
 def test_writing_fetching_data(data_dir, username, sql_vm_instructions_cb):
     msg_aggregator = MessagesAggregator()
     data = DataHandler(data_dir, msg_aggregator, sql_vm_instructions_cb)
@@ -527,6 +560,7 @@ def test_writing_fetching_data(data_dir, username, sql_vm_instructions_cb):
         'ask_user_upon_size_discrepancy': DEFAULT_ASK_USER_UPON_SIZE_DISCREPANCY,
         'auto_detect_tokens': DEFAULT_AUTO_DETECT_TOKENS,
         'csv_export_delimiter': DEFAULT_CSV_EXPORT_DELIMITER,
+        'hedge_slow_rpc_queries': DEFAULT_HEDGE_SLOW_RPC_QUERIES,
     }
     assert len(expected_dict) == len(dataclasses.fields(DBSettings)), 'One or more settings are missing'  # noqa: E501
 
@@ -948,6 +982,49 @@ def test_timed_balances_inferred_zero_balances(data_dir, username, sql_vm_instru
     data.logout()
 
 
+def test_timed_balances_serialization(database):
+    """Test that the timed balances are serialized for the API straight from their frame
+    like the balance objects and that the inferred zero balances get the queried category"""
+    liability = BalanceType.LIABILITY.serialize_for_db()
+    with database.user_write() as write_cursor:
+        database.set_settings(write_cursor, settings=ModifiableDBSettings(
+            infer_zero_timed_balances=True,
+            treat_eth2_as_eth=True,
+        ))
+        write_cursor.executemany(
+            'INSERT INTO timed_balances(timestamp, currency, amount, usd_value, category) '
+            'VALUES (?,?,?,?,?)',
+            [
+                (1514841100, 'ETH', '1.5', '150', liability),
+                (1514841100, 'ETH2', '2.25', '225', liability),
+                (1514842100, 'BTC', '1', '10000', BalanceType.ASSET.serialize_for_db()),
+                (1514843100, 'ETH', '1', '100', liability),
+            ],
+        )
+
+    with database.conn.read_ctx() as cursor:
+        balances = database.query_timed_balances(cursor, A_ETH, balance_type=BalanceType.LIABILITY)
+        frame = database.query_timed_balances_frame(cursor, A_ETH, balance_type=BalanceType.LIABILITY)  # noqa: E501
+
+    assert balances == [SingleDBAssetBalance(
+        category=BalanceType.LIABILITY,
+        time=Timestamp(1514841100),
+        amount=FVal('3.75'),
+        usd_value=FVal('375'),
+    ), SingleDBAssetBalance(
+        category=BalanceType.LIABILITY,
+        time=Timestamp(1514842100),
+        amount=ZERO,
+        usd_value=ZERO,
+    ), SingleDBAssetBalance(
+        category=BalanceType.LIABILITY,
+        time=Timestamp(1514843100),
+        amount=ONE,
+        usd_value=FVal('100'),
+    )]
+    assert serialize_timed_balances(frame) == process_result_list(balances)
+
+
 def test_query_owned_assets(data_dir, username, sql_vm_instructions_cb):
     """Test the get_owned_assets with also an unknown asset in the DB"""
     msg_aggregator = MessagesAggregator()
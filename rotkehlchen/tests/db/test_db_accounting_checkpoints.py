@@ -0,0 +1,66 @@
+from rotkehlchen.db.accounting_checkpoints import (
+    MAX_ACCOUNTING_CHECKPOINTS,
+    AccountingCheckpoint,
+    DBAccountingCheckpoints,
+)
+from rotkehlchen.db.dbhandler import DBHandler
+from rotkehlchen.types import Timestamp
+
+
+def _make_checkpoint(timestamp: int, events_num: int = 1) -> AccountingCheckpoint:
+    return AccountingCheckpoint(
+        timestamp=Timestamp(timestamp),
+        events_num=events_num,
+        events_hash=f'events_{events_num}',
+        settings_hash='settings',
+        ignored_hash='ignored',
+        rules_hash='rules',
+    )
+
+
+def test_accounting_checkpoints(database: DBHandler) -> None:
+    """Test adding, querying and deleting accounting checkpoints"""
+    dbcheckpoints = DBAccountingCheckpoints(database)
+    with database.conn.read_ctx() as cursor:
+        assert dbcheckpoints.get_checkpoints(cursor) == []
+        assert dbcheckpoints.get_checkpoint_state(cursor, Timestamp(1)) is None
+
+    # checkpoints added together share the state
+    dbcheckpoints.add_checkpoints([_make_checkpoint(3), _make_checkpoint(1)], state='{"a": 1}')
+    dbcheckpoints.add_checkpoints([_make_checkpoint(2)], state='{"b": 2}')
+    with database.conn.read_ctx() as cursor:
+        assert dbcheckpoints.get_checkpoints(cursor) == [
+            _make_checkpoint(1), _make_checkpoint(2), _make_checkpoint(3),
+        ]
+        assert dbcheckpoints.get_checkpoint_state(cursor, Timestamp(1)) == '{"a": 1}'
+        assert dbcheckpoints.get_checkpoint_state(cursor, Timestamp(2)) == '{"b": 2}'
+
+    # a checkpoint at the same timestamp replaces the existing one
+    dbcheckpoints.add_checkpoints([_make_checkpoint(2, events_num=5)], state='{"c": 3}')
+    with database.conn.read_ctx() as cursor:
+        assert dbcheckpoints.get_checkpoints(cursor)[1] == _make_checkpoint(2, events_num=5)
+        assert dbcheckpoints.get_checkpoint_state(cursor, Timestamp(2)) == '{"c": 3}'
+
+    with database.user_write() as write_cursor:
+        dbcheckpoints.delete_checkpoints(write_cursor, [Timestamp(1), Timestamp(4)])
+    with database.conn.read_ctx() as cursor:
+        assert [x.timestamp for x in dbcheckpoints.get_checkpoints(cursor)] == [2, 3]
+
+    with database.user_write() as write_cursor:
+        dbcheckpoints.delete_checkpoints_after(write_cursor, Timestamp(2))
+    with database.conn.read_ctx() as cursor:
+        assert [x.timestamp for x in dbcheckpoints.get_checkpoints(cursor)] == [2]
+
+
+def test_accounting_checkpoints_limit(database: DBHandler) -> None:
+    """Test that only the newest checkpoints are kept"""
+    dbcheckpoints = DBAccountingCheckpoints(database)
+    dbcheckpoints.add_checkpoints(
+        [_make_checkpoint(timestamp) for timestamp in range(MAX_ACCOUNTING_CHECKPOINTS, 0, -1)],
+        state='{}',
+    )
+    dbcheckpoints.add_checkpoints([_make_checkpoint(100), _make_checkpoint(101)], state='{}')
+    with database.conn.read_ctx() as cursor:
+        assert [x.timestamp for x in dbcheckpoints.get_checkpoints(cursor)] == [
+            *range(3, MAX_ACCOUNTING_CHECKPOINTS + 1), 100, 101,
+        ]
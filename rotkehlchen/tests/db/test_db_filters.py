@@ -11,7 +11,11 @@ from rotkehlchen.db.filtering import (
     DBLocationFilter,
     DBTimestampFilter,
     EvmTransactionsFilterQuery,
+    TradesFilterQuery,
+    deserialize_keyset_token,
+    serialize_keyset_token,
 )
+from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.tests.utils.database import clean_ignored_assets
 from rotkehlchen.tests.utils.factories import make_evm_address
 from rotkehlchen.types import Location, Timestamp
@@ -115,3 +119,36 @@ def test_ignored_assets(database):
         # Test IN without ignored assets
         result = cursor.execute('SELECT COUNT(*) FROM assets WHERE ' + querystr[0], bindings).fetchone()[0]  # noqa: E501
         assert result == 0
+
+
+def test_keyset_pagination_filter():
+    """Test that keyset pagination orders by the key and only selects the rows after the
+    given key, and that the keyset filter is left out along with the rest of the pagination"""
+    filter_query = TradesFilterQuery.make(location=Location.KRAKEN)
+    filter_query.paginate_by_keyset(
+        columns=TradesFilterQuery.keyset_columns(ascending=False),
+        limit=10,
+        after=deserialize_keyset_token(serialize_keyset_token([5, 'abc'])),
+    )
+    assert filter_query.prepare() == (
+        'WHERE (location=?) AND (timestamp <= ? AND ((timestamp < ?) OR (timestamp = ? AND id > ?))) ORDER BY timestamp DESC,id ASC LIMIT 10',  # noqa: E501
+        ['B', 5, 5, 5, 'abc'],
+    )
+    assert filter_query.prepare(with_pagination=False) == (
+        'WHERE (location=?) ORDER BY timestamp DESC,id ASC',
+        ['B'],
+    )
+    filter_query.paginate_by_keyset(
+        columns=TradesFilterQuery.keyset_columns(ascending=True),
+        limit=10,
+        after=None,  # first page
+    )
+    assert filter_query.prepare() == (
+        'WHERE (location=?) ORDER BY timestamp ASC,id ASC LIMIT 10',
+        ['B'],
+    )
+    assert filter_query.next_page_token(rows_num=9, last_key=[7, 'def']) is None
+    assert deserialize_keyset_token(filter_query.next_page_token(rows_num=10, last_key=[7, 'def'])) == [7, 'def']  # noqa: E501
+    for invalid_token in ('xyz', serialize_keyset_token([]), 'e30='):
+        with pytest.raises(DeserializationError):
+            deserialize_keyset_token(invalid_token)
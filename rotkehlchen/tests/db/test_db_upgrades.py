@@ -2634,6 +2634,10 @@ def test_upgrade_db_45_to_46(user_data_dir: 'Path', messages_aggregator):
         existing_evm_event_extra_data = cursor.execute('SELECT extra_data FROM evm_events_info WHERE identifier = "35"').fetchone()[0]  # noqa: E501
         assert existing_evm_event_extra_data == '{"airdrop_identifier": "elfi"}'
         assert cursor.execute('SELECT COUNT(*) FROM asset_movements').fetchone()[0] == 2
+        assert cursor.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type='index' AND name LIKE 'idx_%'",
+        ).fetchone()[0] == 0
+        assert table_exists(cursor, 'accounting_checkpoints') is False
 
     # Add a plain history event to the db to be checked after upgrade that it wasn't modified
     # Note that it has to be manually inserted here since the functions for creating
@@ -2703,6 +2707,23 @@ def test_upgrade_db_45_to_46(user_data_dir: 'Path', messages_aggregator):
             "SELECT COUNT(*) FROM settings WHERE name='account_for_assets_movements'",
         ).fetchone()[0] == 0
 
+        assert {row[0] for row in cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type='index' AND name LIKE 'idx_%'",
+        )} == {
+            'idx_history_events_timestamp',
+            'idx_history_events_location',
+            'idx_history_events_location_label',
+            'idx_history_events_asset',
+            'idx_history_events_type',
+            'idx_evm_events_info_tx_hash',
+            'idx_evm_events_info_counterparty',
+            'idx_evm_events_info_address',
+            'idx_eth_staking_events_info_validator_index',
+            'idx_timed_balances_currency',
+            'idx_evmtx_address_mappings_address',
+        }
+        assert table_exists(cursor, 'accounting_checkpoints') is True
+
     db.logout()
 
 
@@ -1,4 +1,7 @@
+from dataclasses import replace
+
 from rotkehlchen.chain.accounts import BlockchainAccountData
+from rotkehlchen.chain.evm.structures import EvmTxReceipt, EvmTxReceiptLog
 from rotkehlchen.chain.evm.types import EvmAccount
 from rotkehlchen.data_handler import DataHandler
 from rotkehlchen.db.evmtx import DBEvmTx
@@ -10,6 +13,7 @@ from rotkehlchen.tests.utils.constants import (
     ETH_ADDRESS3,
     MOCK_INPUT_DATA,
 )
+from rotkehlchen.tests.utils.ethereum import txreceipt_to_data
 from rotkehlchen.tests.utils.factories import make_evm_address, make_evm_tx_hash
 from rotkehlchen.types import (
     ChainID,
@@ -307,3 +311,119 @@ def test_query_also_internal_evm_transactions(data_dir, username, sql_vm_instruc
         )
         assert result == [tx1, tx3, tx4]
     data.logout()
+
+
+def test_get_transactions_and_receipts(database):
+    """Test that the transactions and receipts read in bulk are the same as the ones read
+    one by one and that transactions without a receipt are left out"""
+    dbevmtx = DBEvmTx(database)
+    transactions = [EvmTransaction(
+        tx_hash=make_evm_tx_hash(),
+        chain_id=ChainID.ETHEREUM,
+        timestamp=Timestamp(1451606400 + idx),
+        block_number=idx,
+        from_address=ETH_ADDRESS1,
+        to_address=ETH_ADDRESS2,
+        value=0,
+        gas=21000,
+        gas_price=1,
+        gas_used=21000,
+        input_data=MOCK_INPUT_DATA,
+        nonce=idx,
+    ) for idx in range(3)]
+    receipts = [EvmTxReceipt(
+        tx_hash=tx.tx_hash,
+        chain_id=ChainID.ETHEREUM,
+        contract_address=None,
+        status=idx == 0,
+        tx_type=2,
+        logs=[EvmTxReceiptLog(
+            log_index=log_index,
+            data=bytes([idx, log_index]),
+            address=make_evm_address(),
+            topics=[bytes(make_evm_tx_hash()) for _ in range(log_index + 1)],
+        ) for log_index in range(idx + 2)],
+    ) for idx, tx in enumerate(transactions[:2])]
+    with database.user_write() as write_cursor:
+        dbevmtx.add_evm_transactions(write_cursor, evm_transactions=transactions, relevant_address=None)  # noqa: E501
+        for receipt in receipts:
+            dbevmtx.add_or_ignore_receipt_data(write_cursor, ChainID.ETHEREUM, txreceipt_to_data(receipt))  # noqa: E501
+
+    with database.conn.read_ctx() as cursor:
+        result = dbevmtx.get_transactions_and_receipts(
+            cursor=cursor,
+            tx_hashes=[tx.tx_hash for tx in transactions],
+            chain_id=ChainID.ETHEREUM,
+        )
+        assert set(result) == {tx.tx_hash for tx in transactions[:2]}
+        for expected_tx, expected_receipt in zip(transactions, receipts, strict=False):
+            tx, receipt = result[expected_tx.tx_hash]
+            assert tx.db_id != -1
+            assert tx.block_number == expected_tx.block_number
+            assert receipt == expected_receipt == dbevmtx.get_receipt(cursor, tx.tx_hash, ChainID.ETHEREUM)  # noqa: E501
+
+        assert dbevmtx.get_transactions_and_receipts(cursor, [transactions[0].tx_hash], ChainID.OPTIMISM) == {}  # noqa: E501
+
+
+def test_add_receipts_in_bulk(database):
+    """Test that receipts added in bulk are the same as the ones added one by one and that
+    existing receipts, duplicates and receipts of unknown transactions are skipped"""
+    dbevmtx = DBEvmTx(database)
+    transactions = [EvmTransaction(
+        tx_hash=make_evm_tx_hash(),
+        chain_id=ChainID.ETHEREUM,
+        timestamp=Timestamp(1451606400 + idx),
+        block_number=idx,
+        from_address=ETH_ADDRESS1,
+        to_address=ETH_ADDRESS2,
+        value=0,
+        gas=21000,
+        gas_price=1,
+        gas_used=21000,
+        input_data=MOCK_INPUT_DATA,
+        nonce=idx,
+    ) for idx in range(3)]
+    receipts = [EvmTxReceipt(
+        tx_hash=tx_hash,
+        chain_id=ChainID.ETHEREUM,
+        contract_address=make_evm_address() if idx == 1 else None,
+        status=idx != 2,
+        tx_type=idx,
+        logs=[EvmTxReceiptLog(
+            log_index=log_index,
+            data=bytes([idx, log_index]),
+            address=make_evm_address(),
+            topics=[bytes(make_evm_tx_hash()) for _ in range(log_index + 1)],
+        ) for log_index in range(idx + 1)],
+    ) for idx, tx_hash in enumerate([tx.tx_hash for tx in transactions] + [make_evm_tx_hash()])]
+    with database.user_write() as write_cursor:
+        dbevmtx.add_evm_transactions(write_cursor, evm_transactions=transactions, relevant_address=None)  # noqa: E501
+        dbevmtx.add_or_ignore_receipt_data(write_cursor, ChainID.ETHEREUM, txreceipt_to_data(receipts[0]))  # noqa: E501
+        assert dbevmtx.add_or_ignore_receipts_data(
+            write_cursor=write_cursor,
+            chain_id=ChainID.ETHEREUM,
+            receipts_data=[txreceipt_to_data(x) for x in [*receipts, receipts[1]]],
+        ) == 2
+
+    with database.conn.read_ctx() as cursor:
+        for receipt in receipts[:3]:
+            assert dbevmtx.get_receipt(cursor, receipt.tx_hash, ChainID.ETHEREUM) == receipt
+        assert cursor.execute('SELECT COUNT(*) FROM evmtx_receipts').fetchone()[0] == 3
+        assert cursor.execute('SELECT COUNT(*) FROM evmtx_receipt_logs').fetchone()[0] == 6
+
+    # a receipt that can't be deserialized is skipped without failing the rest of the batch
+    new_transactions = [replace(transactions[0], tx_hash=make_evm_tx_hash(), nonce=3 + idx) for idx in range(2)]  # noqa: E501
+    bad_data, good_data = (txreceipt_to_data(replace(receipts[1], tx_hash=x.tx_hash)) for x in new_transactions)  # noqa: E501
+    del bad_data['logs'][0]['address']
+    with database.user_write() as write_cursor:
+        dbevmtx.add_evm_transactions(write_cursor, evm_transactions=new_transactions, relevant_address=None)  # noqa: E501
+        assert dbevmtx.add_or_ignore_receipts_data(
+            write_cursor=write_cursor,
+            chain_id=ChainID.ETHEREUM,
+            receipts_data=[bad_data, good_data],
+        ) == 1
+
+    with database.conn.read_ctx() as cursor:
+        assert dbevmtx.get_receipt(cursor, new_transactions[0].tx_hash, ChainID.ETHEREUM) is None
+        assert dbevmtx.get_receipt(cursor, new_transactions[1].tx_hash, ChainID.ETHEREUM) == replace(receipts[1], tx_hash=new_transactions[1].tx_hash)  # noqa: E501
+        assert cursor.execute('SELECT COUNT(*) FROM evmtx_receipt_logs').fetchone()[0] == 8
@@ -9,17 +9,31 @@ from rotkehlchen.chain.evm.types import string_to_evm_address
 from rotkehlchen.constants import ONE
 from rotkehlchen.constants.assets import A_BTC, A_ETH, A_USDC, A_USDT
 from rotkehlchen.constants.limits import FREE_HISTORY_EVENTS_LIMIT
+from rotkehlchen.db.checks import find_full_table_scans
 from rotkehlchen.db.constants import HISTORY_MAPPING_KEY_STATE, HISTORY_MAPPING_STATE_CUSTOMIZED
 from rotkehlchen.db.dbhandler import DBHandler
 from rotkehlchen.db.filtering import (
     EthDepositEventFilterQuery,
+    EthWithdrawalFilterQuery,
     EvmEventFilterQuery,
     HistoryEventFilterQuery,
+    deserialize_keyset_token,
+)
+from rotkehlchen.db.history_events import (
+    HISTORY_EVENTS_LARGE_TABLES,
+    INDEXED_FILTER_ARGS_SAMPLES,
+    UNINDEXED_FILTER_ARGS,
+    DBHistoryEvents,
+    history_events_projection,
+    indexed_history_events_filters,
 )
-from rotkehlchen.db.history_events import DBHistoryEvents
 from rotkehlchen.fval import FVal
 from rotkehlchen.history.events.structures.asset_movement import AssetMovement
-from rotkehlchen.history.events.structures.base import HistoryBaseEntryType, HistoryEvent
+from rotkehlchen.history.events.structures.base import (
+    HistoryBaseEntry,
+    HistoryBaseEntryType,
+    HistoryEvent,
+)
 from rotkehlchen.history.events.structures.eth2 import EthDepositEvent, EthWithdrawalEvent
 from rotkehlchen.history.events.structures.evm_event import EvmEvent, EvmProduct
 from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
@@ -502,3 +516,128 @@ def test_get_history_events_free_filter(database: 'DBHandler'):
                 for free_event in free_result:
                     assert free_event.identifier is not None
                     assert free_event.identifier > 3, 'Free sub-events should be from the latest 3 event groups'  # noqa: E501
+
+
+def test_history_events_filters_use_indices(database: 'DBHandler') -> None:
+    """Make sure that none of the selective history events filters makes SQLite fall back
+    to a full scan of the history events tables"""
+    with database.conn.read_ctx() as cursor:
+        assert DBHistoryEvents(database).get_unindexed_filter_queries(cursor) == []
+        # the filter shapes are generated from every filter query class and argument
+        shapes = indexed_history_events_filters()
+        assert (EvmEventFilterQuery, {'addresses': INDEXED_FILTER_ARGS_SAMPLES['addresses']}) in shapes  # noqa: E501
+        assert (EthWithdrawalFilterQuery, {
+            'from_ts': INDEXED_FILTER_ARGS_SAMPLES['from_ts'],
+            'to_ts': INDEXED_FILTER_ARGS_SAMPLES['to_ts'],
+            'validator_indices': INDEXED_FILTER_ARGS_SAMPLES['validator_indices'],
+        }) in shapes
+        with (  # and a new filter argument can't be left out of the audit
+            patch('rotkehlchen.db.history_events.UNINDEXED_FILTER_ARGS', UNINDEXED_FILTER_ARGS - {'products'}),  # noqa: E501
+            pytest.raises(AssertionError, match='products'),
+        ):
+            indexed_history_events_filters()
+
+        # also check that a filter on a column without an index is detected
+        assert find_full_table_scans(
+            cursor=cursor,
+            query='SELECT * FROM history_events WHERE notes=? ORDER BY sequence_index',
+            bindings=['a note'],
+            tables=HISTORY_EVENTS_LARGE_TABLES,
+        ) == ['history_events']
+
+
+@pytest.mark.parametrize('ascending', [False, True])
+def test_keyset_pagination(database: 'DBHandler', ascending: bool) -> None:
+    """Test that paginating history events by keyset returns the same events as by offset,
+    including events that share a timestamp, and that the counts ignore the keyset"""
+    db = DBHistoryEvents(database)
+    with database.user_write() as write_cursor:
+        db.add_history_events(write_cursor, history=[
+            HistoryEvent(
+                event_identifier=f'id{idx}',
+                sequence_index=idx % 3,
+                timestamp=TimestampMS(1000 * (idx // 4)),
+                location=Location.KRAKEN,
+                event_type=HistoryEventType.STAKING,
+                event_subtype=HistoryEventSubType.REWARD,
+                asset=A_ETH,
+                balance=Balance(amount=ONE),
+            ) for idx in range(23)
+        ])
+
+    columns = HistoryEventFilterQuery.keyset_columns(ascending=ascending)
+    with database.conn.read_ctx() as cursor:
+        offset_events: list[HistoryBaseEntry] = []
+        for offset in range(0, 23, 5):
+            offset_events.extend(db.get_history_events(
+                cursor=cursor,
+                filter_query=HistoryEventFilterQuery.make(order_by_rules=columns, limit=5, offset=offset),  # noqa: E501
+                has_premium=True,
+            ))
+
+        keyset_events: list[HistoryBaseEntry] = []
+        after = None
+        while True:
+            filter_query = HistoryEventFilterQuery.make()
+            filter_query.paginate_by_keyset(columns=columns, limit=5, after=after)
+            events = db.get_history_events(cursor, filter_query=filter_query, has_premium=True)
+            assert db.get_history_events_count(cursor, query_filter=filter_query) == (23, 23)
+            keyset_events.extend(events)
+            if (token := filter_query.next_page_token(
+                rows_num=len(events),
+                last_key=(events[-1].timestamp, events[-1].sequence_index, events[-1].identifier) if len(events) != 0 else None,  # noqa: E501
+            )) is None:
+                break
+            after = deserialize_keyset_token(token)
+
+    assert len(keyset_events) == 23
+    assert keyset_events == offset_events
+
+
+def test_history_events_projection(database: 'DBHandler') -> None:
+    """Test that only the info tables of the entry types that a filter can select are
+    joined and that the events and counts are the same as with all the joins"""
+    db = DBHistoryEvents(database)
+    with database.user_write() as write_cursor:
+        db.add_history_events(write_cursor, history=[
+            HistoryEvent(
+                event_identifier='kraken1',
+                sequence_index=0,
+                timestamp=TimestampMS(1),
+                location=Location.KRAKEN,
+                event_type=HistoryEventType.STAKING,
+                event_subtype=HistoryEventSubType.REWARD,
+                asset=A_ETH,
+                balance=Balance(amount=ONE),
+            ),
+            make_ethereum_event(index=1, counterparty='aave', timestamp=TimestampMS(2)),
+            make_ethereum_event(index=2, counterparty='compound', timestamp=TimestampMS(3)),
+            EthWithdrawalEvent(
+                validator_index=1000,
+                timestamp=TimestampMS(4),
+                balance=Balance(amount=ONE),
+                withdrawal_address=make_evm_address(),
+                is_exit=True,
+            ),
+        ])
+
+    with database.conn.read_ctx() as cursor:
+        all_events = db.get_history_events(cursor, HistoryEventFilterQuery.make(), True)
+        assert len(all_events) == 4
+        for filter_query, expected_joins, expected_identifiers in (
+            (HistoryEventFilterQuery.make(entry_types=IncludeExcludeFilterData(values=[HistoryBaseEntryType.HISTORY_EVENT])), [], {1}),  # noqa: E501
+            (EvmEventFilterQuery.make(counterparties=['aave']), ['evm_events_info'], {2}),
+            (HistoryEventFilterQuery.make(entry_types=IncludeExcludeFilterData(values=[HistoryBaseEntryType.EVM_EVENT, HistoryBaseEntryType.ETH_DEPOSIT_EVENT], operator='NOT IN')), ['eth_staking_events_info'], {1, 4}),  # noqa: E501
+        ):
+            filters, _ = filter_query.prepare(with_pagination=False)
+            _, from_clause = history_events_projection(filter_query=filter_query, filters=filters, summary=False)  # noqa: E501
+            assert [table for table in ('evm_events_info', 'eth_staking_events_info') if table in from_clause] == expected_joins  # noqa: E501
+            events = db.get_history_events(cursor, filter_query, True)
+            assert events == [x for x in all_events if x.identifier in expected_identifiers]
+            assert db.get_history_events_count(cursor, filter_query) == (len(events), len(events))
+
+        # counting only joins the info tables that the filters need
+        filter_query = HistoryEventFilterQuery.make()
+        filters, _ = filter_query.prepare(with_pagination=False)
+        assert history_events_projection(filter_query, filters, summary=True)[1].strip() == 'FROM history_events'  # noqa: E501
+        assert db.get_history_events_count(cursor, filter_query, group_by_event_ids=True) == (4, 4)
@@ -0,0 +1,187 @@
+import csv
+import json
+import tempfile
+from copy import deepcopy
+from dataclasses import replace
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from rotkehlchen.accounting.checkpoints import accounting_settings_hash
+from rotkehlchen.accounting.export.csv import CSV_INDEX_OFFSET, FILENAME_ALL_CSV
+from rotkehlchen.accounting.structures.types import ActionType
+from rotkehlchen.chain.evm.accounting.structures import TxAccountingTreatment, TxEventSettings
+from rotkehlchen.constants.assets import A_DAI, A_ETH, A_USDC
+from rotkehlchen.constants.resolver import ChainID
+from rotkehlchen.db.accounting_checkpoints import DBAccountingCheckpoints
+from rotkehlchen.db.accounting_rules import DBAccountingRules
+from rotkehlchen.db.settings import ModifiableDBSettings
+from rotkehlchen.errors.misc import RemoteError
+from rotkehlchen.errors.serialization import DeserializationError
+from rotkehlchen.fval import FVal
+from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
+from rotkehlchen.history.price import PriceHistorian
+from rotkehlchen.tests.utils.accounting import (
+    accounting_history_process,
+    assert_pnl_totals_close,
+    history1,
+)
+from rotkehlchen.tests.utils.factories import make_evm_address
+from rotkehlchen.tests.utils.history import prices
+from rotkehlchen.types import AssetAmount, Price, Timestamp
+
+if TYPE_CHECKING:
+    from rotkehlchen.accounting.accountant import Accountant
+    from rotkehlchen.assets.asset import Asset
+
+# history1 has two trades in 2015 and two in September 2016, so with this end the
+# checkpoints are at every month start from June 2016 to May 2017
+START_TS, END_TS = Timestamp(1475020800), Timestamp(1495751688)  # 2016-09-28, 2017-05-25
+SEPTEMBER_CHECKPOINT_TS = Timestamp(1472688000)  # 2016-09-01
+
+
+@pytest.mark.parametrize('mocked_price_queries', [prices])
+def test_resume_from_checkpoint(accountant: 'Accountant') -> None:
+    """Test that a report resumed from a checkpoint gives the same PnL and events as
+    processing all the events, with the CSV export formulas pointing at the right rows"""
+    accounting_history_process(accountant, START_TS, END_TS, history1)
+    pot = accountant.pots[0]
+    assert pot.first_event_index == 0  # there were no checkpoints to resume from
+    full_pnls, full_events = deepcopy(pot.pnls), pot.processed_events
+    with accountant.db.conn.read_ctx() as cursor:
+        checkpoints = DBAccountingCheckpoints(accountant.db).get_checkpoints(cursor)
+    assert len(checkpoints) == 12
+    september_checkpoint = next(x for x in checkpoints if x.timestamp == SEPTEMBER_CHECKPOINT_TS)
+    assert september_checkpoint.events_num == 2  # the 2015 trades
+
+    accounting_history_process(accountant, START_TS, END_TS, history1)
+    assert pot.first_event_index == len([x for x in full_events if x.timestamp < SEPTEMBER_CHECKPOINT_TS]) > 0  # noqa: E501
+    assert pot.processed_events == full_events[pot.first_event_index:]
+    assert_pnl_totals_close(expected=full_pnls, got=deepcopy(pot.pnls))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        accountant.csvexporter.export(
+            events=pot.processed_events,
+            pnls=pot.pnls,
+            directory=Path(tmpdir),
+        )
+        with open(Path(tmpdir) / FILENAME_ALL_CSV, encoding='utf8') as f:
+            rows = list(csv.DictReader(f))
+
+    sell_idx, sell_event = next(
+        (idx, x) for idx, x in enumerate(pot.processed_events)
+        if x.timestamp == history1[3].timestamp and x.asset == A_ETH and x.pnl.taxable != 0
+    )
+    # the formulas of an event use the row of the event in the exported file
+    assert f'H{sell_idx + CSV_INDEX_OFFSET}' in rows[sell_idx]['pnl_taxable']
+    # the ETH sold was bought before the checkpoint, so its price is not in the file
+    acquisition = sell_event.cost_basis.matched_acquisitions[0]  # type: ignore[union-attr]  # the sell has a cost basis
+    assert acquisition.event.index < pot.first_event_index
+    assert rows[sell_idx]['cost_basis_taxable'].startswith(f'={acquisition.amount!s}*{acquisition.event.rate!s}')  # noqa: E501
+
+
+@pytest.mark.parametrize('mocked_price_queries', [prices])
+@pytest.mark.parametrize('modification', ['event', 'setting', 'ignored', 'rule'])
+def test_checkpoints_invalidation(accountant: 'Accountant', modification: str) -> None:
+    """Test that editing anything a checkpoint was computed from drops the checkpoint"""
+    accounting_history_process(accountant, START_TS, END_TS, history1)
+    with accountant.db.conn.read_ctx() as cursor:
+        old_checkpoints = DBAccountingCheckpoints(accountant.db).get_checkpoints(cursor)
+
+    events = history1
+    if modification == 'event':  # edit an event before all the checkpoints
+        events = [replace(history1[0], amount=AssetAmount(FVal(81))), *history1[1:]]
+    elif modification == 'setting':
+        with accountant.db.user_write() as write_cursor:
+            accountant.db.set_settings(write_cursor, ModifiableDBSettings(include_crypto2crypto=False))  # noqa: E501
+    elif modification == 'ignored':
+        with accountant.db.user_write() as write_cursor:
+            accountant.db.add_to_ignored_action_ids(
+                write_cursor=write_cursor,
+                action_type=ActionType.HISTORY_EVENT,
+                identifiers=['some_event_id'],
+            )
+    else:
+        DBAccountingRules(accountant.db).add_accounting_rule(
+            event_type=HistoryEventType.TRADE,
+            event_subtype=HistoryEventSubType.RECEIVE,
+            counterparty='checkpoints-test',
+            rule=TxEventSettings(
+                taxable=True,
+                count_entire_amount_spend=False,
+                count_cost_basis_pnl=True,
+                accounting_treatment=TxAccountingTreatment.SWAP,
+            ),
+            links={},
+        )
+
+    accounting_history_process(accountant, START_TS, END_TS, events)
+    assert accountant.pots[0].first_event_index == 0  # nothing to resume from
+    with accountant.db.conn.read_ctx() as cursor:
+        new_checkpoints = DBAccountingCheckpoints(accountant.db).get_checkpoints(cursor)
+        settings_hash = accounting_settings_hash(accountant.db.get_settings(cursor))
+
+    # the stale checkpoints got replaced by the ones of the last report
+    assert [x.timestamp for x in new_checkpoints] == [x.timestamp for x in old_checkpoints]
+    assert all(x not in old_checkpoints for x in new_checkpoints)
+    assert all(x.settings_hash == settings_hash for x in new_checkpoints)
+
+
+@pytest.mark.parametrize('mocked_price_queries', [prices])
+def test_no_checkpoints_after_missing_price(accountant: 'Accountant') -> None:
+    """Test that no checkpoint is saved after a price lookup failed, since the state
+    then depends on the fallback price used instead"""
+    historian = PriceHistorian()
+    original_query = historian.query_historical_price
+
+    def query_price(from_asset: 'Asset', to_asset: 'Asset', timestamp: Timestamp) -> Price:
+        if from_asset == A_ETH and timestamp == history1[2].timestamp:
+            raise RemoteError('Price oracle is down')
+        return original_query(from_asset=from_asset, to_asset=to_asset, timestamp=timestamp)
+
+    with patch.object(historian, 'query_historical_price', side_effect=query_price):
+        accounting_history_process(accountant, START_TS, END_TS, history1)
+
+    assert accountant.pots[0].missing_price_found is True
+    with accountant.db.conn.read_ctx() as cursor:
+        checkpoints = DBAccountingCheckpoints(accountant.db).get_checkpoints(cursor)
+    # only the ones before the trade whose price lookup failed
+    assert [x.timestamp for x in checkpoints][-1] == SEPTEMBER_CHECKPOINT_TS < history1[2].timestamp  # noqa: E501
+    assert len(checkpoints) == 4
+
+
+@pytest.mark.parametrize('accounting_initialize_parameters', [True])
+def test_evm_accountants_state_restore(accountant: 'Accountant') -> None:
+    """Test that the state of the evm accountants is the same after being restored"""
+    aggregators = accountant.pots[0].events_accountant.evm_accounting_aggregators
+    ethereum_accountants = next(
+        x for x in aggregators.aggregators if x.node_inquirer.chain_id == ChainID.ETHEREUM
+    ).accountants
+    aave = ethereum_accountants['aavev2']
+    makerdao = ethereum_accountants['makerdao']
+    thegraph = ethereum_accountants['thegraph']
+    address1, address2 = make_evm_address(), make_evm_address()
+    aave.assets_borrowed[address1, A_DAI] = FVal('10.5')  # type: ignore[attr-defined]
+    aave.assets_supplied[address2, A_USDC] = FVal(3)  # type: ignore[attr-defined]
+    makerdao.vault_balances['ETH-A 123'] = FVal('1000.1')  # type: ignore[attr-defined]
+    makerdao.dsr_balances[address1] = FVal(5)  # type: ignore[attr-defined]
+    thegraph.assets_supplied[address2] = FVal('0.000001')  # type: ignore[attr-defined]
+
+    state = json.loads(json.dumps(aggregators.serialize_state()))
+    aggregators.reset()
+    assert len(thegraph.assets_supplied) == 0  # type: ignore[attr-defined]
+    aggregators.restore_state(state)
+    assert aave.assets_borrowed == {(address1, A_DAI): FVal('10.5')}  # type: ignore[attr-defined]
+    assert aave.assets_supplied == {(address2, A_USDC): FVal(3)}  # type: ignore[attr-defined]
+    assert makerdao.vault_balances == {'ETH-A 123': FVal('1000.1')}  # type: ignore[attr-defined]
+    assert makerdao.dsr_balances == {address1: FVal(5)}  # type: ignore[attr-defined]
+    assert thegraph.assets_supplied == {address2: FVal('0.000001')}  # type: ignore[attr-defined]
+
+    aggregators.reset()
+    state['ethereum']['makerdao']['dsr_balances'] = [[address1, 'not a number']]
+    with pytest.raises(DeserializationError):
+        aggregators.restore_state(state)
+    with pytest.raises(DeserializationError):
+        aggregators.restore_state({'ethereum': {'unknown_module': {}}})
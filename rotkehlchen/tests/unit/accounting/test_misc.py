@@ -1,4 +1,5 @@
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 import pytest
 
@@ -7,6 +8,8 @@ from rotkehlchen.accounting.pnl import PNL, PnlTotals
 from rotkehlchen.accounting.structures.balance import Balance
 from rotkehlchen.constants import ONE, ZERO
 from rotkehlchen.constants.assets import A_ETH, A_ETH2, A_EUR, A_KFEE, A_USD, A_USDT
+from rotkehlchen.db.reports import DBAccountingReports
+from rotkehlchen.errors.misc import InputError
 from rotkehlchen.exchanges.data_structures import Trade
 from rotkehlchen.fval import FVal
 from rotkehlchen.history.events.structures.base import HistoryEvent
@@ -15,6 +18,7 @@ from rotkehlchen.tests.utils.accounting import (
     accounting_history_process,
     check_pnls_and_csv,
     get_calculated_asset_amount,
+    history1,
 )
 from rotkehlchen.tests.utils.constants import A_GBP
 from rotkehlchen.tests.utils.history import prices
@@ -230,3 +234,63 @@ def test_main_currency_is_respected(
     assert len(warnings) == len(errors) == 0
     # Check that the price is correctly computed in GBP
     assert accountant.pots[0].processed_events[0].price == trade_rate * mocked_price_queries['USD']['GBP'][1609537953]  # noqa: E501
+
+
+@pytest.mark.parametrize('mocked_price_queries', [prices])
+def test_report_data_written_in_batches(accountant):
+    """Test that the processed events are written to the report in batches and that
+    all of them end up in the report, including the last partial batch"""
+    add_report_data = DBAccountingReports.add_report_data
+    batch_lengths = []
+
+    def mock_add_report_data(self, report_id, events_data):
+        batch_lengths.append(len(events_data))
+        add_report_data(self, report_id=report_id, events_data=events_data)
+
+    with (
+        patch('rotkehlchen.accounting.pot.PNL_EVENTS_WRITE_BATCH', 3),
+        patch.object(DBAccountingReports, 'add_report_data', new=mock_add_report_data),
+    ):
+        _, events = accounting_history_process(accountant, 1436979735, 1495751688, history1)
+
+    processed_events = accountant.pots[0].processed_events
+    assert len(processed_events) > 3
+    assert set(batch_lengths[:-1]) == {3}
+    assert 0 < batch_lengths[-1] <= 3
+    assert sum(batch_lengths) == len(events) == len(processed_events)
+
+
+@pytest.mark.parametrize('mocked_price_queries', [prices])
+def test_report_data_kept_on_errors(accountant):
+    """Test that a batch of events that can't be written is written one by one so that
+    only the bad event is lost and that the processed events are written when processing
+    stops due to an unexpected error"""
+    add_report_data, process_event = DBAccountingReports.add_report_data, accountant._process_event
+    written, bad_event, processed_calls = [], [], 0
+
+    def mock_add_report_data(self, report_id, events_data):
+        if len(bad_event) == 0:
+            bad_event.append(events_data[1])
+        if bad_event[0] in events_data:
+            raise InputError('Could not write the PnL events')
+        written.extend(events_data)
+        add_report_data(self, report_id=report_id, events_data=events_data)
+
+    def mock_process_event(**kwargs):
+        nonlocal processed_calls
+        if (processed_calls := processed_calls + 1) == 6:
+            raise ValueError('Unexpected error')
+        return process_event(**kwargs)
+
+    with (
+        patch('rotkehlchen.accounting.pot.PNL_EVENTS_WRITE_BATCH', 3),
+        patch.object(DBAccountingReports, 'add_report_data', new=mock_add_report_data),
+        patch.object(accountant, '_process_event', side_effect=mock_process_event),
+        pytest.raises(ValueError, match='Unexpected error'),
+    ):
+        accounting_history_process(accountant, 1436979735, 1495751688, history1)
+
+    processed_events = accountant.pots[0].processed_events
+    assert len(processed_events) > 3
+    assert len(written) == len(processed_events) - 1
+    assert bad_event[0] not in written
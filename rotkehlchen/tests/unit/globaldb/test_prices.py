@@ -1,17 +1,25 @@
 
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
 import pytest
 
 from rotkehlchen.assets.asset import Asset
 from rotkehlchen.chain.polygon_pos.constants import POLYGON_POS_POL_HARDFORK
 from rotkehlchen.constants.assets import A_BAL, A_BTC, A_ETH, A_POLYGON_POS_MATIC, A_USD
 from rotkehlchen.constants.misc import ONE, ZERO
+from rotkehlchen.constants.timing import DAY_IN_SECONDS
 from rotkehlchen.fval import FVal
 from rotkehlchen.globaldb.handler import GlobalDBHandler
+from rotkehlchen.globaldb.price_cache import PRICE_WINDOW_SECONDS, load_pair_series
 from rotkehlchen.history.price import PriceHistorian
 from rotkehlchen.history.types import HistoricalPrice, HistoricalPriceOracle
 from rotkehlchen.tests.utils.constants import A_EUR
 from rotkehlchen.types import Price, Timestamp
 
+if TYPE_CHECKING:
+    from rotkehlchen.globaldb.price_cache import PairSeries
+
 
 def test_get_historical_price_range(globaldb, historical_price_test_data):  # pylint: disable=unused-argument
     assert globaldb.get_historical_price_range(
@@ -141,6 +149,122 @@ def test_get_historical_price(globaldb, historical_price_test_data):  # pylint:
     assert price_entry is None
 
 
+def test_historical_price_cache(globaldb, historical_price_test_data):  # pylint: disable=unused-argument
+    """Test that historical prices are served from the in-memory cache, which gets
+    invalidated when the prices change and evicts pairs when over its size budget"""
+    cache = globaldb.historical_price_cache
+    cache.clear()
+    price_entry = globaldb.get_historical_price(
+        from_asset=A_ETH,
+        to_asset=A_EUR,
+        timestamp=1511627623,
+        max_seconds_distance=3600,
+    )
+    assert price_entry.price == Price(FVal(396.56))
+    assert list(cache.pairs) == [('ETH', 'EUR')]
+
+    closer_entry = HistoricalPrice(
+        from_asset=A_ETH,
+        to_asset=A_EUR,
+        source=HistoricalPriceOracle.MANUAL,
+        timestamp=Timestamp(1511627600),
+        price=Price(FVal(400)),
+    )
+    globaldb.add_historical_prices([closer_entry])
+    assert ('ETH', 'EUR') not in cache.pairs
+    assert globaldb.get_historical_price(
+        from_asset=A_ETH,
+        to_asset=A_EUR,
+        timestamp=1511627623,
+        max_seconds_distance=3600,
+    ) == closer_entry
+
+    globaldb.delete_historical_prices(
+        from_asset=A_ETH,
+        to_asset=A_EUR,
+        source=HistoricalPriceOracle.MANUAL,
+    )
+    assert globaldb.get_historical_price(
+        from_asset=A_ETH,
+        to_asset=A_EUR,
+        timestamp=1511627623,
+        max_seconds_distance=3600,
+    ) == price_entry
+
+    # make the budget only fit the ETH pair and see that it's evicted for the BTC pair
+    eth_pair_size = cache.size
+    cache.max_bytes = eth_pair_size
+    btc_entry = globaldb.get_historical_price(
+        from_asset=A_BTC,
+        to_asset=A_EUR,
+        timestamp=1428994442,
+        max_seconds_distance=3600,
+    )
+    assert btc_entry is not None
+    assert list(cache.pairs) == [('BTC', 'EUR')]
+    assert cache.size <= eth_pair_size
+
+    # the BTC pair is too big for the budget so only a window of it is cached and the
+    # pair is remembered as large without counting or loading all its prices again
+    assert cache.large_pairs == {('BTC', 'EUR')}
+    assert cache.pairs['BTC', 'EUR'].from_ts == 1428994442 - 3600 - PRICE_WINDOW_SECONDS
+    with patch(
+        'rotkehlchen.globaldb.price_cache.load_pair_series',
+        wraps=load_pair_series,
+    ) as patched_load:
+        assert globaldb.get_historical_price(  # within the cached window
+            from_asset=A_BTC,
+            to_asset=A_EUR,
+            timestamp=1428994442 + DAY_IN_SECONDS,
+            max_seconds_distance=DAY_IN_SECONDS,
+        ) == btc_entry
+        assert patched_load.call_count == 0
+        assert globaldb.get_historical_price(  # outside of it, so the window moves
+            from_asset=A_BTC,
+            to_asset=A_EUR,
+            timestamp=1618481102,
+            max_seconds_distance=3600,
+        ).timestamp == 1618481102
+        assert patched_load.call_count == 1
+        assert patched_load.call_args.args[3:] == (
+            1618481102 - 3600 - PRICE_WINDOW_SECONDS,
+            1618481102 + 3600 + PRICE_WINDOW_SECONDS,
+        )
+
+    # with the cache disabled the prices still come from the DB
+    cache.clear()
+    cache.max_bytes = 0
+    assert globaldb.get_historical_prices(
+        query_data=[(A_ETH, A_EUR, Timestamp(1511627623)), (A_BTC, A_EUR, Timestamp(1428994442))],
+        max_seconds_distance=3600,
+    ) == [price_entry, btc_entry]
+    assert len(cache.pairs) == 0
+
+
+def test_historical_price_cache_concurrent_load(globaldb, historical_price_test_data):  # pylint: disable=unused-argument
+    """Test that a pair loaded by two greenlets at the same time is cached and counted once"""
+    cache = globaldb.historical_price_cache
+    cache.clear()
+
+    def load_while_other_greenlet_caches(*args: Any) -> tuple['PairSeries', int]:
+        if patched_load.call_count == 1:  # the other greenlet runs while this one loads
+            with globaldb.conn.read_ctx() as other_cursor:
+                cache.get(other_cursor, 'ETH', 'EUR', Timestamp(0), Timestamp(0))
+        return load_pair_series(*args)
+
+    with (
+        globaldb.conn.read_ctx() as cursor,
+        patch(
+            'rotkehlchen.globaldb.price_cache.load_pair_series',
+            side_effect=load_while_other_greenlet_caches,
+        ) as patched_load,
+    ):
+        cache.get(cursor, 'ETH', 'EUR', Timestamp(0), Timestamp(0))
+
+    assert list(cache.pairs) == [('ETH', 'EUR')]
+    assert cache.size == cache.pairs['ETH', 'EUR'].size > 0
+
+
 @pytest.mark.parametrize('should_mock_price_queries', [False])
 def test_matic_pol_hardforked_price(price_historian: PriceHistorian):
     """Test that we return price of POL for MATIC after hardfork"""
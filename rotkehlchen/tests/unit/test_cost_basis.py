@@ -1,4 +1,5 @@
 import csv
+import json
 import tempfile
 from itertools import zip_longest
 from pathlib import Path
@@ -8,6 +9,13 @@ import pytest
 
 from rotkehlchen.accounting.accountant import Accountant
 from rotkehlchen.accounting.cost_basis import AssetAcquisitionEvent
+from rotkehlchen.accounting.cost_basis.base import (
+    CONSUMED_ACQUISITIONS_TO_DROP,
+    AverageCostBasisMethod,
+    FIFOCostBasisMethod,
+    HIFOCostBasisMethod,
+    LIFOCostBasisMethod,
+)
 from rotkehlchen.accounting.export.csv import FILENAME_ALL_CSV, CSVExporter
 from rotkehlchen.accounting.mixins.event import AccountingEventType
 from rotkehlchen.accounting.pnl import PNL, PnlTotals
@@ -39,7 +47,6 @@ from rotkehlchen.types import (
 )
 
 if TYPE_CHECKING:
-    from rotkehlchen.accounting.cost_basis.base import AverageCostBasisMethod
     from rotkehlchen.db.dbhandler import DBHandler
 
 
@@ -546,6 +553,71 @@ def test_reduce_asset_amount_more_than_bought(accountant: Accountant):
     assert acquisitions_num == 0, 'all buys should be used'
 
 
+def test_fifo_drops_consumed_acquisitions():
+    """Test that the FIFO acquisitions keep their order after the consumed ones are dropped"""
+    acquisitions_manager = FIFOCostBasisMethod()
+    for idx in range(CONSUMED_ACQUISITIONS_TO_DROP + 10):
+        acquisitions_manager.add_in_event(AssetAcquisitionEvent(
+            amount=ONE,
+            timestamp=Timestamp(idx),
+            rate=Price(FVal(idx)),
+            index=idx,
+        ))
+
+    for _ in range(CONSUMED_ACQUISITIONS_TO_DROP):
+        acquisitions_manager.consume_whole_result(asset=A_ETH)
+    acquisitions_manager.consume_result(used_amount=FVal('0.5'), asset=A_ETH)
+    acquisitions_manager.add_in_event(AssetAcquisitionEvent(
+        amount=ONE,
+        timestamp=Timestamp(CONSUMED_ACQUISITIONS_TO_DROP + 10),
+        rate=Price(ONE),
+        index=CONSUMED_ACQUISITIONS_TO_DROP + 10,
+    ))
+
+    acquisitions = acquisitions_manager.get_acquisitions()
+    assert len(acquisitions_manager) == len(acquisitions) == 11
+    assert [x.index for x in acquisitions] == list(range(CONSUMED_ACQUISITIONS_TO_DROP, CONSUMED_ACQUISITIONS_TO_DROP + 11))  # noqa: E501
+    assert acquisitions[0].remaining_amount == FVal('0.5')
+    assert next(acquisitions_manager.processing_iterator()) == acquisitions[0]
+
+
+@pytest.mark.parametrize('method_class', [
+    FIFOCostBasisMethod,
+    LIFOCostBasisMethod,
+    HIFOCostBasisMethod,
+    AverageCostBasisMethod,
+])
+def test_acquisitions_state_restore(method_class):
+    """Test that acquisitions restored from a checkpoint state are consumed in the same
+    order and with the same remaining amounts as the ones they were saved from"""
+    acquisitions_manager = method_class()
+    for idx, rate in enumerate((5, 1, 3, 4, 2)):
+        acquisitions_manager.add_in_event(AssetAcquisitionEvent(
+            amount=FVal(idx + 1),
+            timestamp=Timestamp(idx),
+            rate=Price(FVal(rate)),
+            index=idx,
+        ))
+    acquisitions_manager.consume_whole_result(asset=A_ETH)
+    acquisitions_manager.consume_result(used_amount=FVal('0.5'), asset=A_ETH)
+
+    restored_manager = method_class()
+    restored_manager.restore_state(json.loads(json.dumps(acquisitions_manager.serialize_state())))
+    assert restored_manager.get_acquisitions() == acquisitions_manager.get_acquisitions()
+    assert [x.remaining_amount for x in restored_manager.get_acquisitions()] == [
+        x.remaining_amount for x in acquisitions_manager.get_acquisitions()
+    ]
+    if method_class == AverageCostBasisMethod:
+        assert restored_manager.current_amount == acquisitions_manager.current_amount
+        assert restored_manager.current_total_acb == acquisitions_manager.current_total_acb
+
+    while len(acquisitions_manager) != 0:
+        assert next(restored_manager.processing_iterator()) == next(acquisitions_manager.processing_iterator())  # noqa: E501
+        restored_manager.consume_whole_result(asset=A_ETH)
+        acquisitions_manager.consume_whole_result(asset=A_ETH)
+    assert len(restored_manager) == 0
+
+
 def test_accounting_lifo_order(accountant: Accountant):
     asset = A_ETH
     cost_basis = accountant.pots[0].cost_basis
@@ -0,0 +1,27 @@
+import os
+
+import pytest
+
+from rotkehlchen.crypto import decrypt, decrypt_stream, encrypt, encrypt_stream
+from rotkehlchen.errors.misc import UnableToDecryptRemoteData
+
+
+def _split(data: bytes, size: int) -> list[bytes]:
+    return [data[idx:idx + size] for idx in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('length', [0, 1, 15, 16, 17, 1000, 4096])
+def test_encrypt_decrypt_stream(length: int) -> None:
+    """Test that the streaming encryption is compatible with encrypting all the data at once
+    no matter how the data is split in blocks"""
+    source = os.urandom(length)
+    assert decrypt(b'123', b''.join(encrypt_stream(b'123', _split(source, 7)))) == source
+    encrypted = encrypt(b'123', source)
+    for block_size in (1, 5, 16, 33, 5000):
+        assert b''.join(decrypt_stream(b'123', _split(encrypted, block_size))) == source
+
+
+@pytest.mark.parametrize('encrypted', [b'', b'a' * 16, b'a' * 20])
+def test_decrypt_stream_invalid_data(encrypted: bytes) -> None:
+    with pytest.raises(UnableToDecryptRemoteData):
+        b''.join(decrypt_stream(b'123', [encrypted]))
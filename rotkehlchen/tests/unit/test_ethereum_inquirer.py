@@ -1,7 +1,10 @@
-from typing import TYPE_CHECKING
+import json
+from typing import TYPE_CHECKING, Any
 from unittest.mock import patch
 
 import pytest
+from gevent.pywsgi import WSGIServer
+from web3 import HTTPProvider, Web3
 
 from rotkehlchen.chain.accounts import BlockchainAccountData
 from rotkehlchen.chain.ethereum.constants import ETHEREUM_ETHERSCAN_NODE_NAME
@@ -614,3 +617,54 @@ def test_contract_call_raises_on_non_checksum_token_address(ethereum_inquirer):
             method_name='tokens_balance',
             arguments=['0xBCaBdc5eBd28dC9d1629210f92D27171852eBa53', [token_address]],
         )
+
+
+def test_query_rpc_batch(ethereum_inquirer: 'EthereumInquirer') -> None:
+    """Test that JSON-RPC calls are sent in batches to a stand-in node, that the results
+    keep the order of the calls and that only a node rejecting batches gets them one by one"""
+    received: list[Any] = []
+    node_state = {'accepts_batches': True, 'unavailable': False}
+
+    def node(environ, start_response):
+        received.append(body := json.loads(environ['wsgi.input'].read()))
+        if isinstance(body, list) and node_state['unavailable'] is True:
+            node_state['unavailable'] = False  # a transient failure of a single batch
+            start_response('503 Service Unavailable', [('Content-Type', 'text/plain')])
+            return [b'temporarily unavailable']
+        if isinstance(body, list) and node_state['accepts_batches'] is False:
+            response: Any = {'jsonrpc': '2.0', 'id': None, 'error': {'code': -32600, 'message': 'batch requests are not supported'}}  # noqa: E501
+        else:
+            response = [{
+                'jsonrpc': '2.0',
+                'id': call['id'],
+                **({'error': {'code': -32601, 'message': 'not found'}} if call['method'] == 'eth_unknown' else {'result': f'{call["method"]}:{call["params"][0]}'}),  # noqa: E501
+            } for call in (body if isinstance(body, list) else [body])]
+            response = response if isinstance(body, list) else response[0]
+
+        start_response('200 OK', [('Content-Type', 'application/json')])
+        return [json.dumps(response).encode()]
+
+    server = WSGIServer(('127.0.0.1', 0), node, log=None)
+    server.start()
+    try:
+        web3 = Web3(HTTPProvider(endpoint := f'http://127.0.0.1:{server.server_port}'))
+        calls = [('eth_getCode', [f'0x{idx:040x}']) for idx in range(5)] + [('eth_unknown', ['0x1'])]  # noqa: E501
+        expected = [f'eth_getCode:0x{idx:040x}' for idx in range(5)] + [None]
+        assert ethereum_inquirer._query_rpc_batch(web3=web3, calls=calls, batch_size=4) == expected
+        assert [len(x) for x in received] == [4, 2]
+        assert endpoint not in ethereum_inquirer.nodes_without_rpc_batches
+
+        node_state['unavailable'] = True
+        received.clear()
+        assert ethereum_inquirer._query_rpc_batch(web3=web3, calls=calls, batch_size=4) == expected
+        # the failed batch is sent one by one but the next one is still a batch
+        assert [isinstance(x, list) for x in received] == [True] + [False] * 4 + [True]
+        assert endpoint not in ethereum_inquirer.nodes_without_rpc_batches
+
+        node_state['accepts_batches'] = False
+        received.clear()
+        assert ethereum_inquirer._query_rpc_batch(web3=web3, calls=calls, batch_size=4) == expected
+        assert [isinstance(x, list) for x in received] == [True] + [False] * 6  # rejected once
+        assert endpoint in ethereum_inquirer.nodes_without_rpc_batches
+    finally:
+        server.stop()
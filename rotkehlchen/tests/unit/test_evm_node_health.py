@@ -0,0 +1,82 @@
+import gevent
+
+from rotkehlchen.chain.evm.node_health import MIN_NODE_HEALTH_SAMPLES, NodesHealth
+from rotkehlchen.chain.evm.types import NodeName, WeightedNode
+from rotkehlchen.constants import ONE
+from rotkehlchen.tests.utils.factories import make_evm_address
+from rotkehlchen.types import SupportedBlockchain
+
+
+def _make_node(name: str) -> WeightedNode:
+    return WeightedNode(
+        node_info=NodeName(name=name, endpoint=f'https://{name}', owned=False, blockchain=SupportedBlockchain.ETHEREUM),  # noqa: E501
+        weight=ONE,
+        active=True,
+    )
+
+
+def test_nodes_health_order():
+    """Test that measured nodes are ordered by their health around the unmeasured ones"""
+    health = NodesHealth()
+    nodes = [_make_node(name) for name in ('unmeasured', 'failing', 'slow', 'fast', 'few')]
+    for _ in range(MIN_NODE_HEALTH_SAMPLES):
+        health.record('failing', latency=0.1, failed=True)
+        health.record('slow', latency=2.0, failed=False)
+        health.record('fast', latency=0.2, failed=False)
+
+    health.record('few', latency=0.01, failed=False)  # not enough samples to be used
+    assert [x.node_info.name for x in health.order(nodes)] == ['fast', 'slow', 'unmeasured', 'few', 'failing']  # noqa: E501
+    assert health.hedge_after('slow') == 2.0
+    assert health.hedge_after('few') is None
+
+    for _ in range(95):  # only the latest queries are used
+        health.record('slow', latency=0.1, failed=False)
+    assert [x.node_info.name for x in health.order(nodes)][:2] == ['slow', 'fast']
+
+
+def test_hedged_query(ethereum_inquirer):
+    """Test that a query slower than the 95th percentile latency of a node is also sent to
+    the next node and that the first result is used"""
+    for _ in range(MIN_NODE_HEALTH_SAMPLES):
+        ethereum_inquirer.nodes_health.record('slow', latency=0.05, failed=False)
+
+    def query(web3, delay):
+        gevent.sleep(delay[web3])
+        return web3
+
+    slow, fast = make_evm_address(), make_evm_address()  # stand-ins for the web3 objects
+    result = ethereum_inquirer._call_node(
+        method=query,
+        node_name='slow',
+        web3=slow,
+        kwargs={'delay': {slow: 5, fast: 0}},
+        hedge_node=('fast', fast),
+    )
+    assert result == fast
+    assert ethereum_inquirer.nodes_health.nodes['fast'].samples == 1
+    assert ethereum_inquirer.nodes_health.nodes['slow'].samples == MIN_NODE_HEALTH_SAMPLES  # cancelled  # noqa: E501
+
+    result = ethereum_inquirer._call_node(  # a fast enough first node is not hedged
+        method=query,
+        node_name='slow',
+        web3=slow,
+        kwargs={'delay': {slow: 0, fast: 0}},
+        hedge_node=('fast', fast),
+    )
+    assert result == slow
+    assert ethereum_inquirer.nodes_health.nodes['fast'].samples == 1
+
+
+def test_batch_query_not_recorded(ethereum_inquirer):
+    """Test that the latency of JSON-RPC batches, which depends on their size, is not
+    recorded together with the one of the single queries"""
+    def _query_rpc_batch(web3, calls):  # pylint: disable=unused-argument
+        return [None] * len(calls)
+
+    assert ethereum_inquirer._call_node(
+        method=_query_rpc_batch,
+        node_name='batching',
+        web3=None,
+        kwargs={'calls': [('eth_blockNumber', [])] * 3},
+    ) == [None] * 3
+    assert 'batching' not in ethereum_inquirer.nodes_health.nodes
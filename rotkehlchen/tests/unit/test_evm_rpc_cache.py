@@ -0,0 +1,73 @@
+from unittest.mock import patch
+
+from rotkehlchen.chain.evm.rpc_cache import (
+    RPC_CACHE_MIN_CONFIRMATIONS,
+    EvmRpcCache,
+    is_cacheable_request,
+    is_cacheable_result,
+)
+from rotkehlchen.types import ChainID
+
+TX_HASH = '0x' + 'ab' * 32
+RECEIPT = {'blockNumber': '0x10', 'status': '0x1', 'logs': []}
+
+
+def test_cacheable_requests():
+    """Test that only the calls pinned to a block or to a mined transaction are cached"""
+    call = {'to': '0x' + '11' * 20, 'data': '0x1234'}
+    assert is_cacheable_request('eth_call', [call, '0x10']) is True
+    assert is_cacheable_request('eth_call', [call, {'blockHash': '0x' + 'cd' * 32}]) is True
+    assert is_cacheable_request('eth_call', [call, 'latest']) is False
+    assert is_cacheable_request('eth_getCode', ['0x' + '11' * 20, 'pending']) is False
+    assert is_cacheable_request('eth_getBlockByNumber', ['0x10', False]) is True
+    assert is_cacheable_request('eth_getBlockByNumber', ['finalized', False]) is False
+    assert is_cacheable_request('eth_getTransactionReceipt', [TX_HASH]) is True
+    assert is_cacheable_request('eth_blockNumber', []) is False
+
+
+def test_cacheable_results():
+    """Test that only the results of blocks that can't be reorged anymore are cached"""
+    call, latest = {'to': '0x' + '11' * 20, 'data': '0x1234'}, 0x10 + RPC_CACHE_MIN_CONFIRMATIONS
+    assert is_cacheable_result('eth_getTransactionReceipt', [TX_HASH], RECEIPT, latest) is True
+    assert is_cacheable_result('eth_getTransactionReceipt', [TX_HASH], RECEIPT, latest - 1) is False  # noqa: E501
+    assert is_cacheable_result('eth_getTransactionReceipt', [TX_HASH], RECEIPT, None) is False
+    assert is_cacheable_result('eth_call', [call, '0x10'], '0x01', latest) is True
+    assert is_cacheable_result('eth_call', [call, {'blockNumber': '0x11'}], '0x01', latest) is False  # noqa: E501
+    assert is_cacheable_result('eth_call', [call, {'blockHash': '0x' + 'cd' * 32}], '0x01', None) is True  # noqa: E501
+    assert is_cacheable_result('eth_getBlockByNumber', ['0x11', False], {'number': '0x11'}, latest) is False  # noqa: E501
+    assert is_cacheable_result('eth_getBlockByHash', ['0x' + 'cd' * 32, False], {'number': '0x11'}, latest) is True  # noqa: E501
+
+
+def test_rpc_cache(database):
+    """Test that the results are cached per chain, that pending transactions and results
+    close to the latest block are not cached and that the oldest entries get evicted"""
+    cache = EvmRpcCache(database=database, chain_id=ChainID.ETHEREUM)
+    other_chain_cache = EvmRpcCache(database=database, chain_id=ChainID.OPTIMISM)
+    pending_hash, recent_hash = '0x' + 'cd' * 32, '0x' + 'ef' * 32
+    cache.add('eth_getTransactionReceipt', [TX_HASH], RECEIPT)  # no latest block known yet
+    assert cache.get('eth_getTransactionReceipt', [TX_HASH]) is None
+
+    cache.update_latest_block(0x10 + RPC_CACHE_MIN_CONFIRMATIONS)
+    cache.update_latest_block(0x10)  # an older block number from a lagging node is ignored
+    cache.add_many([
+        ('eth_getTransactionReceipt', [TX_HASH], RECEIPT),
+        ('eth_getTransactionReceipt', [recent_hash], {**RECEIPT, 'blockNumber': '0x11'}),
+        ('eth_getTransactionByHash', [pending_hash], {'hash': pending_hash, 'blockNumber': None}),
+        ('eth_call', [{'to': '0x' + '11' * 20}, 'latest'], '0x01'),
+    ])
+    assert cache.get_many([
+        ('eth_getTransactionReceipt', [TX_HASH]),
+        ('eth_getTransactionReceipt', [recent_hash]),
+        ('eth_getTransactionByHash', [pending_hash]),
+        ('eth_call', [{'to': '0x' + '11' * 20}, 'latest']),
+    ]) == [RECEIPT, None, None, None]
+    assert other_chain_cache.get('eth_getTransactionReceipt', [TX_HASH]) is None
+
+    with (
+        patch('rotkehlchen.chain.evm.rpc_cache.MAX_RPC_CACHE_ENTRIES', 2),
+        patch('rotkehlchen.chain.evm.rpc_cache.RPC_CACHE_EVICTION_INTERVAL', 2),
+    ):
+        cache.add_many([('eth_getBlockByNumber', [hex(x), False], {'number': hex(x)}) for x in range(2)])  # noqa: E501
+
+    assert cache.get('eth_getTransactionReceipt', [TX_HASH]) is None
+    assert cache.get('eth_getBlockByNumber', ['0x1', False]) == {'number': '0x1'}
@@ -1,18 +1,34 @@
-from typing import TYPE_CHECKING
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any
 from unittest.mock import patch
 
+import gevent
 import pytest
 
+from rotkehlchen.chain.evm.l2_with_l1_fees.types import L2WithL1FeesTransaction
+from rotkehlchen.chain.evm.structures import EvmTxReceipt
+from rotkehlchen.chain.evm.transactions import TX_SYNC_CONCURRENCY
 from rotkehlchen.chain.evm.types import EvmAccount, string_to_evm_address
 from rotkehlchen.db.evmtx import DBEvmTx
 from rotkehlchen.db.filtering import EvmEventFilterQuery, EvmTransactionsFilterQuery
 from rotkehlchen.db.history_events import DBHistoryEvents
-from rotkehlchen.tests.utils.ethereum import get_decoded_events_of_transaction
-from rotkehlchen.tests.utils.factories import make_evm_address
-from rotkehlchen.types import ChainID, Location, SupportedBlockchain, deserialize_evm_tx_hash
+from rotkehlchen.db.l2withl1feestx import DBL2WithL1FeesTx
+from rotkehlchen.errors.misc import InputError, RemoteError
+from rotkehlchen.tests.utils.ethereum import get_decoded_events_of_transaction, txreceipt_to_data
+from rotkehlchen.tests.utils.factories import make_evm_address, make_evm_tx_hash
+from rotkehlchen.types import (
+    ChainID,
+    ChecksumEvmAddress,
+    EVMTxHash,
+    Location,
+    SupportedBlockchain,
+    Timestamp,
+    deserialize_evm_tx_hash,
+)
 
 if TYPE_CHECKING:
     from rotkehlchen.chain.ethereum.transactions import EthereumTransactions
+    from rotkehlchen.chain.optimism.transactions import OptimismTransactions
     from rotkehlchen.db.dbhandler import DBHandler
 
 
@@ -49,6 +65,138 @@ def test_query_transactions_single_chain(eth_transactions: 'EthereumTransactions
     assert queried_addresses == [ADDR_2, ADDR_3]
 
 
+def test_query_chain_concurrently(eth_transactions: 'EthereumTransactions') -> None:
+    """Test that the transactions of many addresses are queried concurrently, up to a limit,
+    and that the internal and token transactions of an address are queried concurrently
+    after its normal transactions"""
+    addresses = [make_evm_address() for _ in range(TX_SYNC_CONCURRENCY * 2)]
+    steps: list[tuple[str, str, ChecksumEvmAddress]] = []
+    running_addresses: set[ChecksumEvmAddress] = set()
+    max_running = 0
+
+    def mock_query(stream: str, address: ChecksumEvmAddress, **kwargs: Any) -> None:  # pylint: disable=unused-argument
+        nonlocal max_running
+        running_addresses.add(address)
+        max_running = max(max_running, len(running_addresses))
+        steps.append(('start', stream, address))
+        gevent.sleep(0.01)
+        steps.append(('end', stream, address))
+        if stream != 'txlist':
+            running_addresses.discard(address)
+
+    with (
+        patch.object(eth_transactions, '_get_transactions_for_range', side_effect=lambda **kwargs: mock_query('txlist', **kwargs)),  # noqa: E501
+        patch.object(eth_transactions, '_get_internal_transactions_for_ranges', side_effect=lambda **kwargs: mock_query('internal', **kwargs)),  # noqa: E501
+        patch.object(eth_transactions, '_get_erc20_transfers_for_ranges', side_effect=lambda **kwargs: mock_query('tokentx', **kwargs)),  # noqa: E501
+    ):
+        eth_transactions.query_chain(filter_query=EvmTransactionsFilterQuery.make(
+            accounts=[EvmAccount(address=x, chain_id=ChainID.ETHEREUM) for x in addresses],
+        ))
+
+    assert max_running == TX_SYNC_CONCURRENCY
+    for address in addresses:
+        txlist_end = steps.index(('end', 'txlist', address))
+        other_starts = [steps.index(('start', x, address)) for x in ('internal', 'tokentx')]
+        other_ends = [steps.index(('end', x, address)) for x in ('internal', 'tokentx')]
+        assert txlist_end < min(other_starts)
+        assert max(other_starts) < min(other_ends)  # they ran at the same time
+
+
+def test_ingest_receipts(eth_transactions: 'EthereumTransactions') -> None:
+    """Test that queried receipts are written in bulk batches and that the receipts
+    queried before a failing batch are still written"""
+    tx_hashes = [make_evm_tx_hash() for _ in range(95)]
+    written: list[int] = []
+
+    def mock_get_receipts(tx_hashes: Sequence[EVMTxHash]) -> dict[EVMTxHash, dict[str, Any]]:
+        gevent.sleep(0.05 if tx_hashes[-1] == failing_hash else 0.01)
+        if failing_hash in tx_hashes:
+            raise RemoteError('Node went down')
+        return {x: {'transactionHash': x.hex()} for x in tx_hashes}
+
+    def mock_add_receipts(receipts_data: Sequence[dict[str, Any]], **kwargs: Any) -> int:  # pylint: disable=unused-argument
+        written.append(len(receipts_data))
+        return len(receipts_data)
+
+    failing_hash: EVMTxHash | None = None
+    with (
+        patch('rotkehlchen.chain.evm.transactions.DEFAULT_RPC_BATCH_SIZE', 10),
+        patch('rotkehlchen.chain.evm.transactions.RECEIPTS_WRITE_BATCH', 30),
+        patch.object(eth_transactions.evm_inquirer, 'get_transaction_receipts', side_effect=mock_get_receipts),  # noqa: E501
+        patch.object(eth_transactions.dbevmtx, 'add_or_ignore_receipts_data', side_effect=mock_add_receipts),  # noqa: E501
+    ):
+        eth_transactions._ingest_receipts(tx_hashes=tx_hashes)
+        assert written == [30, 30, 30, 5]
+
+        written, failing_hash = [], tx_hashes[24]
+        with pytest.raises(RemoteError):
+            eth_transactions._ingest_receipts(tx_hashes=tx_hashes[:25])
+        assert written == [20]
+
+    # a failing write stops the queries instead of leaving the fetchers blocked on the queue
+    failing_hash = None
+    with (
+        patch('rotkehlchen.chain.evm.transactions.DEFAULT_RPC_BATCH_SIZE', 1),
+        patch('rotkehlchen.chain.evm.transactions.RECEIPTS_WRITE_BATCH', 1),
+        patch('rotkehlchen.chain.evm.transactions.RECEIPTS_QUEUE_SIZE', 2),
+        patch.object(eth_transactions.evm_inquirer, 'get_transaction_receipts', side_effect=mock_get_receipts) as get_receipts,  # noqa: E501
+        patch.object(eth_transactions.dbevmtx, 'add_or_ignore_receipts_data', side_effect=InputError('DB is full')),  # noqa: E501
+        pytest.raises(InputError),
+    ):
+        eth_transactions._ingest_receipts(tx_hashes=tx_hashes)
+
+    gevent.sleep(0.1)  # the killed fetchers would have queried more receipts by now
+    assert get_receipts.call_count < len(tx_hashes)
+
+
+def test_l2_transactions_and_receipts_need_l1_fee(
+        database: 'DBHandler',
+        optimism_transactions: 'OptimismTransactions',
+) -> None:
+    """Test that the L2 transactions read in bulk leave out the ones without an l1 fee,
+    even if a transaction of another L2 with the same hash has one"""
+    tx_hash, dbevmtx = make_evm_tx_hash(), DBL2WithL1FeesTx(database)
+    transactions = [L2WithL1FeesTransaction(
+        tx_hash=tx_hash,
+        chain_id=chain_id,
+        timestamp=Timestamp(1451606400),
+        block_number=1,
+        from_address=ADDR_1,
+        to_address=ADDR_2,
+        value=0,
+        gas=21000,
+        gas_price=1,
+        gas_used=21000,
+        input_data=b'',
+        nonce=0,
+        l1_fee=10,
+    ) for chain_id in (ChainID.BASE, ChainID.OPTIMISM)]
+    with database.user_write() as write_cursor:
+        dbevmtx.add_evm_transactions(write_cursor, evm_transactions=transactions, relevant_address=None)  # noqa: E501
+        write_cursor.execute(  # the optimism transaction's l1 fee is still to be pulled
+            'DELETE FROM optimism_transactions WHERE tx_id IN '
+            '(SELECT identifier FROM evm_transactions WHERE chain_id=?)',
+            (ChainID.OPTIMISM.serialize_for_db(),),
+        )
+        for transaction in transactions:
+            dbevmtx.add_or_ignore_receipt_data(write_cursor, transaction.chain_id, txreceipt_to_data(EvmTxReceipt(  # noqa: E501
+                tx_hash=tx_hash,
+                chain_id=transaction.chain_id,
+                contract_address=None,
+                status=True,
+                tx_type=2,
+                logs=[],
+            )))
+
+    with database.conn.read_ctx() as cursor:
+        assert optimism_transactions.get_transactions_and_receipts(cursor, [tx_hash]) == {}
+
+    with database.user_write() as write_cursor:
+        dbevmtx.add_evm_transactions(write_cursor, evm_transactions=transactions[1:], relevant_address=None)  # noqa: E501
+    with database.conn.read_ctx() as cursor:
+        assert list(optimism_transactions.get_transactions_and_receipts(cursor, [tx_hash])) == [tx_hash]  # noqa: E501
+
+
 @pytest.mark.vcr(filter_query_parameters=['apikey'])
 @pytest.mark.parametrize('ethereum_accounts', [[YAB_ADDRESS]])
 @pytest.mark.parametrize('gnosis_accounts', [[YAB_ADDRESS]])
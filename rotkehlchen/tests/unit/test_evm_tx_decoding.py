@@ -1,3 +1,4 @@
+from contextlib import suppress
 from typing import TYPE_CHECKING
 from unittest.mock import patch
 
@@ -5,10 +6,13 @@ import pytest
 
 from rotkehlchen.accounting.structures.balance import Balance
 from rotkehlchen.assets.asset import Asset
+from rotkehlchen.chain.ethereum.decoding.constants import GTC_CLAIM
 from rotkehlchen.chain.ethereum.modules.gitcoin.constants import GITCOIN_GRANTS_OLD1
+from rotkehlchen.chain.ethereum.modules.uniswap.v1.decoder import TOKEN_PURCHASE
 from rotkehlchen.chain.evm.constants import GENESIS_HASH
-from rotkehlchen.chain.evm.decoding.constants import CPT_GAS
+from rotkehlchen.chain.evm.decoding.constants import CPT_GAS, ERC20_OR_ERC721_TRANSFER
 from rotkehlchen.chain.evm.l2_with_l1_fees.types import L2WithL1FeesTransaction
+from rotkehlchen.chain.evm.structures import EvmTxReceipt, EvmTxReceiptLog
 from rotkehlchen.chain.evm.types import EvmAccount, string_to_evm_address
 from rotkehlchen.constants.assets import A_ETH, A_SAI
 from rotkehlchen.db.constants import EVMTX_DECODED, EVMTX_SPAM
@@ -16,6 +20,7 @@ from rotkehlchen.db.evmtx import DBEvmTx
 from rotkehlchen.db.filtering import EvmEventFilterQuery, EvmTransactionsFilterQuery
 from rotkehlchen.db.history_events import DBHistoryEvents
 from rotkehlchen.db.l2withl1feestx import DBL2WithL1FeesTx
+from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.fval import FVal
 from rotkehlchen.history.events.structures.base import (
     HistoryBaseEntry,
@@ -23,7 +28,12 @@ from rotkehlchen.history.events.structures.base import (
     HistoryEventType,
 )
 from rotkehlchen.history.events.structures.evm_event import EvmEvent
-from rotkehlchen.tests.utils.ethereum import INFURA_ETH_NODE, get_decoded_events_of_transaction
+from rotkehlchen.tests.utils.ethereum import (
+    INFURA_ETH_NODE,
+    get_decoded_events_of_transaction,
+    txreceipt_to_data,
+)
+from rotkehlchen.tests.utils.factories import make_ethereum_transaction, make_evm_address
 from rotkehlchen.types import (
     ChainID,
     ChecksumEvmAddress,
@@ -35,6 +45,7 @@ from rotkehlchen.types import (
     deserialize_evm_tx_hash,
 )
 from rotkehlchen.utils.hexbytes import hexstring_to_bytes
+from rotkehlchen.utils.misc import ts_sec_to_ms
 
 if TYPE_CHECKING:
     from rotkehlchen.chain.ethereum.decoding.decoder import EthereumTransactionDecoder
@@ -328,3 +339,93 @@ def test_token_detection_after_decoding(
         assert save_tokens_mock.call_args_list[0].kwargs['address'] == ethereum_accounts[0]
         assert save_tokens_mock.call_args_list[0].kwargs['blockchain'] == SupportedBlockchain.ETHEREUM  # noqa: E501
         assert save_tokens_mock.call_args_list[0].kwargs['tokens'] == [Asset('eip155:1/erc20:0x98C23E9d8f34FEFb1B7BD6a91B7FF122F4e16F5c')]  # noqa: E501
+
+
+def test_event_rules_dispatch(ethereum_transaction_decoder: 'EthereumTransactionDecoder') -> None:
+    """Test that each log is only given to the event rules that can decode it, in the
+    order the rules were loaded in"""
+    decoder = ethereum_transaction_decoder
+    all_rules = decoder.rules.event_rules
+
+    def log(topic: bytes, address: ChecksumEvmAddress | None = None) -> EvmTxReceiptLog:
+        return EvmTxReceiptLog(log_index=0, data=b'', address=address or make_evm_address(), topics=[topic])  # noqa: E501
+
+    transfer_rules = decoder.event_rules_for(log(ERC20_OR_ERC721_TRANSFER))
+    assert decoder._maybe_decode_erc20_721_transfer in transfer_rules
+    assert decoder._maybe_decode_erc20_approve not in transfer_rules
+    assert transfer_rules == [x for x in all_rules if x in transfer_rules]  # order is kept
+    assert decoder.event_rules_for(log(b'\x01' * 32)) == decoder.generic_event_rules
+    assert decoder.event_rules_for(EvmTxReceiptLog(log_index=0, data=b'', address=make_evm_address())) == []  # anonymous  # noqa: E501
+
+    # rules declared for an address are only tried for logs of that address
+    gtc_distributor = string_to_evm_address('0xDE3e5a990bCE7fC60a6f017e7c4a95fc4939299E')
+    assert decoder._maybe_enrich_transfers in decoder.event_rules_for(log(GTC_CLAIM, gtc_distributor))  # noqa: E501
+    assert decoder._maybe_enrich_transfers not in decoder.event_rules_for(log(GTC_CLAIM))
+
+    # a log of a uniswap v1 purchase that is not decoded since no spend is found
+    purchase_log = EvmTxReceiptLog(log_index=0, data=b'', address=make_evm_address(), topics=[TOKEN_PURCHASE, b'\x00' * 32])  # noqa: E501
+    assert decoder.try_all_rules(
+        token=None,
+        tx_log=purchase_log,
+        transaction=make_ethereum_transaction(),
+        decoded_events=[],
+        action_items=[],
+        all_logs=[purchase_log],
+    ) is None
+    assert decoder.get_event_rules_stats()['Uniswapv1Decoder._maybe_decode_swap'] == (0, 1)
+
+
+def test_redecoding_failure_keeps_events(
+        database: 'DBHandler',
+        ethereum_transaction_decoder: 'EthereumTransactionDecoder',
+) -> None:
+    """Test that the old events of redecoded transactions are only deleted along with
+    saving their new ones, so that a decoding failure in the middle of a chunk keeps them"""
+    transactions = [make_ethereum_transaction(timestamp=Timestamp(idx)) for idx in range(3)]
+    with database.user_write() as write_cursor:
+        DBEvmTx(database).add_evm_transactions(write_cursor, evm_transactions=transactions, relevant_address=None)  # noqa: E501
+        for transaction in transactions:
+            DBEvmTx(database).add_or_ignore_receipt_data(write_cursor, ChainID.ETHEREUM, txreceipt_to_data(EvmTxReceipt(  # noqa: E501
+                tx_hash=transaction.tx_hash,
+                chain_id=ChainID.ETHEREUM,
+                contract_address=None,
+                status=True,
+                tx_type=2,
+                logs=[],
+            )))
+
+    def decode_transaction(transaction: EvmTransaction, notes: str) -> list[EvmEvent]:
+        if notes == 'new' and transaction == transactions[1]:
+            raise DeserializationError('Decoder failed')
+        return [EvmEvent(
+            tx_hash=transaction.tx_hash,
+            sequence_index=0,
+            timestamp=ts_sec_to_ms(transaction.timestamp),
+            location=Location.ETHEREUM,
+            event_type=HistoryEventType.INFORMATIONAL,
+            event_subtype=HistoryEventSubType.NONE,
+            asset=A_ETH,
+            balance=Balance(),
+            notes=notes,
+        )]
+
+    def get_notes() -> list[str | None]:
+        with database.conn.read_ctx() as cursor:
+            return [x.notes for x in DBHistoryEvents(database).get_history_events(
+                cursor=cursor,
+                filter_query=EvmEventFilterQuery.make(tx_hashes=[x.tx_hash for x in transactions]),
+                has_premium=True,
+            )]
+
+    for notes in ('old', 'new'):
+        with patch.object(
+            ethereum_transaction_decoder,
+            '_decode_transaction_events',
+            side_effect=lambda transaction, tx_receipt, notes=notes: (decode_transaction(transaction, notes), False, None),  # noqa: E501
+        ), suppress(DeserializationError):
+            ethereum_transaction_decoder.decode_transaction_hashes(
+                ignore_cache=notes == 'new',
+                tx_hashes=[x.tx_hash for x in transactions],
+            )
+
+    assert get_notes() == ['old', 'old', 'old']
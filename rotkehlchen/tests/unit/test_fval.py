@@ -1,4 +1,6 @@
 import math
+import operator
+from decimal import Decimal, InvalidOperation
 
 import pytest
 
@@ -175,3 +177,24 @@ def test_calculations_with_large_values():
     assert FVal(
         115792089237316195423570985008687907853269984665640564039457584007913129639936,
     ) + 1 == FVal(115792089237316195423570985008687907853269984665640564039457584007913129639937)
+
+
+def test_fast_paths_keep_semantics():
+    """Test that the operations skipping the constructor checks behave as before"""
+    a, b = FVal('1.5'), FVal(Decimal('0.25'))
+    for result in (a + b, a - 1, 2 * a, a / b, -a, abs(-a), round(a, 0), a.fma(b, 1)):
+        assert isinstance(result, FVal)
+        assert isinstance(result.num, Decimal)
+
+    assert (a + b, a - b, a * b, a / b) == (FVal('1.75'), FVal('1.25'), FVal('0.375'), FVal(6))
+    assert a != '1.5'  # comparison with anything other than FVal or int is never equal
+    assert a.is_close(FVal('1.5000001'))
+    assert not a.is_close(FVal('1.5001'))
+    assert a.is_close(FVal('1.5001'), max_diff='1e-3')
+
+    nan = FVal('NaN')
+    for comparison in (operator.gt, operator.lt, operator.ge, operator.le):
+        with pytest.raises(InvalidOperation):
+            comparison(nan, a)
+    with pytest.raises(NotImplementedError):
+        _ = a < 1.5
@@ -4,9 +4,11 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from rotkehlchen.assets.asset import AssetWithOracles
 from rotkehlchen.chain.ethereum.oracles.uniswap import UniswapV2Oracle, UniswapV3Oracle
-from rotkehlchen.constants.assets import A_BTC, A_USD
+from rotkehlchen.constants.assets import A_BTC, A_DAI, A_ETH, A_USD
 from rotkehlchen.constants.timing import DAY_IN_SECONDS
+from rotkehlchen.errors.asset import UnsupportedAsset
 from rotkehlchen.errors.price import NoPriceForGivenTimestamp, PriceQueryUnsupportedAsset
 from rotkehlchen.externalapis.coingecko import Coingecko
 from rotkehlchen.externalapis.cryptocompare import Cryptocompare
@@ -273,3 +275,37 @@ def test_get_historical_prices(globaldb):
         max_seconds_distance=DAY_IN_SECONDS,
     )
     assert [price1, price2, price3, None, price4] == [x.price if x is not None else None for x in result]  # noqa: E501
+
+
+def test_query_cached_historical_prices(globaldb, fake_price_historian):
+    """Test that bulk resolving prices from the global DB cache follows the oracles order
+    and only returns prices that query_historical_price would return without remote queries"""
+    ts1, ts2 = Timestamp(1611595470), Timestamp(1611795470)
+    globaldb.add_historical_prices([
+        HistoricalPrice(from_asset=A_BTC, to_asset=A_USD, price=Price(FVal(30000)), timestamp=ts1, source=HistoricalPriceOracle.MANUAL),  # noqa: E501
+        HistoricalPrice(from_asset=A_BTC, to_asset=A_USD, price=Price(FVal(31000)), timestamp=ts2, source=HistoricalPriceOracle.COINGECKO),  # noqa: E501
+        HistoricalPrice(from_asset=A_ETH, to_asset=A_USD, price=Price(FVal(1300)), timestamp=Timestamp(ts1 - 100), source=HistoricalPriceOracle.CRYPTOCOMPARE),  # noqa: E501
+        HistoricalPrice(from_asset=A_ETH, to_asset=A_USD, price=Price(FVal(1310)), timestamp=Timestamp(ts1 + 50), source=HistoricalPriceOracle.CRYPTOCOMPARE),  # noqa: E501
+        HistoricalPrice(from_asset=A_ETH, to_asset=A_USD, price=Price(FVal(1250)), timestamp=ts1, source=HistoricalPriceOracle.COINGECKO),  # noqa: E501
+    ])
+    queries = [(A_BTC, Timestamp(ts1 + 60)), (A_BTC, ts2), (A_ETH, ts1), (A_USD, ts1)]
+    # cryptocompare has nothing cached for BTC at ts2 and would be queried remotely
+    assert fake_price_historian.query_cached_historical_prices(queries=queries, to_asset=A_USD) == {  # noqa: E501
+        (A_BTC, Timestamp(ts1 + 60)): Price(FVal(30000)),
+        (A_ETH, ts1): Price(FVal(1310)),
+    }
+
+    # if cryptocompare can't be queried the coingecko cached price is the one to be used
+    fake_price_historian._cryptocompare.can_query_history.return_value = False
+    assert fake_price_historian.query_cached_historical_prices(queries=queries, to_asset=A_USD) == {  # noqa: E501
+        (A_BTC, Timestamp(ts1 + 60)): Price(FVal(30000)),
+        (A_BTC, ts2): Price(FVal(31000)),
+        (A_ETH, ts1): Price(FVal(1310)),
+    }
+
+    # coingecko cached prices are not used for pairs its query_historical_price rejects
+    with patch.object(AssetWithOracles, 'to_coingecko', side_effect=UnsupportedAsset('BTC')):
+        assert fake_price_historian.query_cached_historical_prices(queries=[(A_BTC, ts2)], to_asset=A_USD) == {}  # noqa: E501
+
+    globaldb.add_historical_prices([HistoricalPrice(from_asset=A_BTC, to_asset=A_DAI, price=Price(FVal(31000)), timestamp=ts2, source=HistoricalPriceOracle.COINGECKO)])  # noqa: E501
+    assert fake_price_historian.query_cached_historical_prices(queries=[(A_BTC, ts2)], to_asset=A_DAI) == {}  # DAI is not a coingecko vs currency  # noqa: E501
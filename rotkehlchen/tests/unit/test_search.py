@@ -3,15 +3,19 @@ import subprocess  # noqa: S404  # is only used to execute rotki code here
 
 import gevent
 
-from rotkehlchen.assets.asset import Asset
+from rotkehlchen.assets.asset import Asset, CustomAsset
 from rotkehlchen.config import default_data_directory
 from rotkehlchen.constants.assets import A_USD
+from rotkehlchen.db.custom_assets import DBCustomAssets
 from rotkehlchen.db.filtering import LevenshteinFilterQuery
-from rotkehlchen.db.search_assets import search_assets_levenshtein
+from rotkehlchen.db.search_assets import (
+    _search_only_assets_levenstein,
+    search_assets_levenshtein,
+)
 from rotkehlchen.fval import FVal
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.tests.fixtures.globaldb import create_globaldb
-from rotkehlchen.types import Price
+from rotkehlchen.types import ChainID, Price
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
@@ -39,6 +43,47 @@ def test_search_assets_levensthein_multiple(globaldb, database):  # pylint: disa
     assert all(x.exception is None for x in greenlets)
 
 
+def test_asset_search_index(globaldb, database):
+    """Test that searching the asset search index finds the same assets as searching the
+    global DB and that the index follows the changes of the assets"""
+    for substring, chain_id in (('eth', None), ('usd', ChainID.OPTIMISM), ('wrapped b', None)):
+        filter_query = LevenshteinFilterQuery.make(substring_search=substring, chain_id=chain_id)
+        with database.conn.read_ctx() as cursor:
+            expected = sorted(
+                _search_only_assets_levenstein(cursor, database, filter_query),
+                key=lambda x: (x[0], x[1]['identifier']),
+            )
+            indexed = sorted(
+                globaldb.asset_search_index.search(
+                    cursor=globaldb.conn.cursor(),
+                    substring=substring,
+                    limit=None,
+                    chain_id=chain_id,
+                    should_skip=lambda _: False,
+                ),
+                key=lambda x: (x[0], x[1].identifier),
+            )
+        assert len(expected) != 0
+        assert [(distance, asset.serialize()) for distance, asset in indexed] == expected
+
+    def search(substring: str) -> list[str]:
+        return [x['identifier'] for x in search_assets_levenshtein(
+            db=database,
+            filter_query=LevenshteinFilterQuery.make(substring_search=substring),
+            limit=3,
+            search_nfts=False,
+        )]
+
+    db_custom_assets = DBCustomAssets(database)
+    db_custom_assets.add_custom_asset(CustomAsset.initialize(identifier='xyz', name='Zqxv house', custom_asset_type='house'))  # noqa: E501
+    assert search('zqxv') == ['xyz']
+    db_custom_assets.edit_custom_asset(CustomAsset.initialize(identifier='xyz', name='Qwzk house', custom_asset_type='house'))  # noqa: E501
+    assert search('zqxv') == []
+    assert search('qwzk') == ['xyz']
+    globaldb.delete_asset_by_identifier('xyz')
+    assert search('qwzk') == []
+
+
 def get_identifier_from_stdout(stdout: str) -> str | None:
     """Utility function to extract the identifier from the stdout of a subprocess."""
     for line in stdout.splitlines():
@@ -1,6 +1,10 @@
+import json
+from unittest.mock import patch
+
 import pytest
 
 from rotkehlchen.accounting.structures.balance import BalanceType
+from rotkehlchen.api.rest import api_streaming_response
 from rotkehlchen.balances.manual import ManuallyTrackedBalance, add_manually_tracked_balances
 from rotkehlchen.constants import ONE
 from rotkehlchen.constants.assets import A_BTC, A_ETH
@@ -141,3 +145,28 @@ def test_deserialize_deployment_ethereum_transaction():
         nonce=data['nonce'],
     )
     assert tx == expected
+
+
+def test_api_streaming_response():
+    """Test that streamed responses are valid JSON, also when getting the entries fails
+    after the response started, and that errors in the first chunk raise before it"""
+    def entries(fail_at: int | None):
+        for idx in range(5):
+            if idx == fail_at:
+                raise DeserializationError('bad entry')
+            yield {'idx': idx, 'amount': FVal(idx)}
+
+    with patch('rotkehlchen.api.rest.STREAMED_RESPONSE_CHUNK_SIZE', 30):
+        response = api_streaming_response(entries(None), extra_fields=lambda: {'entries_found': 5})
+        assert json.loads(''.join(response.response)) == {
+            'result': {'entries': [{'idx': x, 'amount': str(x)} for x in range(5)], 'entries_found': 5},  # noqa: E501
+            'message': '',
+        }
+
+        response = api_streaming_response(entries(3), extra_fields=lambda: {'entries_found': 5})
+        result = json.loads(''.join(response.response))
+        assert result['result'] == {'entries': [{'idx': x, 'amount': str(x)} for x in range(3)]}
+        assert result['error'] == result['message'] == 'Failed to send all the entries due to bad entry'  # noqa: E501
+
+        with pytest.raises(DeserializationError):
+            api_streaming_response(entries(0), extra_fields=dict)
@@ -8,14 +8,18 @@ import pytest
 
 from rotkehlchen.assets.utils import _query_or_get_given_token_info, get_or_create_evm_token
 from rotkehlchen.chain.ethereum.tokens import EthereumTokens
-from rotkehlchen.chain.evm.tokens import generate_multicall_chunks
+from rotkehlchen.chain.evm.tokens import (
+    MIN_TOKEN_CHUNK_LENGTH,
+    TOKEN_CHUNK_CEILING_SECONDS,
+    generate_multicall_chunks,
+)
 from rotkehlchen.chain.evm.types import string_to_evm_address
 from rotkehlchen.chain.structures import EvmTokenDetectionData
 from rotkehlchen.constants import ONE
 from rotkehlchen.constants.assets import A_DAI, A_OMG, A_WETH
 from rotkehlchen.constants.resolver import evm_address_to_identifier
 from rotkehlchen.db.constants import EVM_ACCOUNTS_DETAILS_TOKENS
-from rotkehlchen.errors.misc import InputError
+from rotkehlchen.errors.misc import CallTooLargeError, InputError, RemoteError
 from rotkehlchen.fval import FVal
 from rotkehlchen.globaldb.handler import GlobalDBHandler
 from rotkehlchen.inquirer import Inquirer
@@ -146,6 +150,53 @@ def test_generate_chunks():
     assert generated_chunks == expected_chunks
 
 
+def test_adaptive_chunk_size(tokens, freezer):
+    """Test that token queries rejected for their size are retried with a shrunk chunk
+    length until they succeed and that it grows back on success, but not up to a length
+    that failed until some time passed. Other failures don't change the chunk length."""
+    queried_lengths = []
+
+    def mock_query_token_balances(**kwargs):
+        queried_lengths.append(len(kwargs['tokens']))
+        if len(kwargs['tokens']) > 100:  # like a call that runs out of gas
+            raise CallTooLargeError('out of gas')
+        return {x.identifier: ONE for x in kwargs['tokens'] if int(x.identifier) % 50 == 0}
+
+    chunk_size = tokens.nodes_chunk_size
+    detection_data = [
+        EvmTokenDetectionData(identifier=str(idx), address=make_evm_address(), decimals=18)
+        for idx in range(500)
+    ]
+    with patch.object(tokens, '_query_token_balances', side_effect=mock_query_token_balances):
+        balances = tokens._query_chunk(
+            address=make_evm_address(),
+            tokens=detection_data[:460],
+            chunk_size=chunk_size,
+            call_order=[],
+        )
+        assert set(balances) == {str(idx) for idx in range(0, 460, 50)}
+        assert queried_lengths[:4] == [460, 230, 115, 57]  # shrunk until a chunk succeeded
+        assert 57 < chunk_size.value < 115  # grew back with each success but below 115
+        for _ in range(20):
+            chunk_size.grow()
+        assert chunk_size.value == 114
+
+    freezer.tick(datetime.timedelta(seconds=TOKEN_CHUNK_CEILING_SECONDS + 1))
+    chunk_size.grow()
+    assert chunk_size.value > 114  # the ceiling expired
+
+    value = chunk_size.value
+    with patch.object(tokens, '_query_token_balances', side_effect=RemoteError('Please check your network')):  # noqa: E501
+        assert tokens._query_chunk(
+            address=make_evm_address(),
+            tokens=detection_data[:value],
+            chunk_size=chunk_size,
+            call_order=[],
+        ) == {}
+    assert chunk_size.value == value  # not retried in smaller chunks and not shrunk
+    assert chunk_size.shrink(failed_length=MIN_TOKEN_CHUNK_LENGTH) is False
+
+
 def test_last_queried_ts(tokens, freezer):
     """
     Checks that after detecting evm tokens last_queried_timestamp is updated and there
@@ -11,12 +11,19 @@ from hexbytes import HexBytes
 from packaging.version import Version
 
 from rotkehlchen.chain.ethereum.utils import generate_address_via_create2
+from rotkehlchen.constants.assets import A_ETH
 from rotkehlchen.errors.serialization import ConversionError
 from rotkehlchen.externalapis.github import Github
 from rotkehlchen.fval import FVal
 from rotkehlchen.serialization.deserialize import deserialize_timestamp_from_date
-from rotkehlchen.serialization.serialize import process_result
+from rotkehlchen.serialization.serialize import (
+    json_default,
+    process_result,
+    process_result_for_json,
+    process_result_list,
+)
 from rotkehlchen.tests.utils.mock import MockResponse
+from rotkehlchen.types import ChainID, Location
 from rotkehlchen.utils.misc import (
     combine_dicts,
     convert_to_int,
@@ -58,6 +65,27 @@ def test_hexbytes_in_process_result():
     assert json.dumps(process_result(d)) == expected_str
 
 
+def test_process_result_for_json():
+    """Test that results encoded with the JSON path are the same as with process_result,
+    that unchanged lists and dicts are reused and that subclasses of the known types
+    are serialized like them"""
+    class CustomFVal(FVal):
+        pass
+
+    d = {
+        'entries': [{'identifier': 1, 'notes': 'a'}, {'identifier': 2, 'notes': None}],
+        'total': FVal('1.5'),
+        A_ETH: {'amount': CustomFVal(2), 'location': Location.KRAKEN, 'chain': ChainID.OPTIMISM},
+        Location.BINANCE: [HexBytes(b'\x01'), (1, 'a')],
+    }
+    assert json.dumps(process_result_for_json(d), default=json_default) == json.dumps(process_result(d))  # noqa: E501
+    assert process_result_for_json(d['entries']) is d['entries']
+    assert process_result_list(d['entries']) is not d['entries']
+    assert process_result({'x': CustomFVal('0.1')}) == {'x': '0.1'}
+    with pytest.raises(TypeError):
+        json.dumps(process_result_for_json({'x': object()}), default=json_default)
+
+
 def test_iso8601ts_to_timestamp():
     assert iso8601ts_to_timestamp('2018-09-09T12:00:00.000Z') == 1536494400
     assert iso8601ts_to_timestamp('2011-01-01T04:13:22.220Z') == 1293855202
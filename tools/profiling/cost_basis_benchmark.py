@@ -0,0 +1,62 @@
+"""
+Benchmark acquiring and spending lots with each cost basis method.
+
+Usage:
+python -m tools.profiling.cost_basis_benchmark
+"""
+import timeit
+
+from rotkehlchen.accounting.cost_basis.base import (
+    AssetAcquisitionEvent,
+    AverageCostBasisMethod,
+    BaseCostBasisMethod,
+    FIFOCostBasisMethod,
+    HIFOCostBasisMethod,
+    LIFOCostBasisMethod,
+)
+from rotkehlchen.constants.assets import A_ETH
+from rotkehlchen.db.settings import DBSettings
+from rotkehlchen.fval import FVal
+from rotkehlchen.types import Price, Timestamp
+
+LOTS_NUMBER = 20_000
+LOTS_PER_SPEND = 50
+
+
+def _run_report(manager: BaseCostBasisMethod) -> None:
+    """Acquire all the lots and then spend them all, each spend spanning many lots"""
+    for idx in range(LOTS_NUMBER):
+        manager.add_in_event(AssetAcquisitionEvent(
+            amount=FVal('0.5'),
+            timestamp=Timestamp(idx),
+            rate=Price(FVal(1000 + idx % 97)),
+            index=idx,
+        ))
+
+    spend_amount, settings = FVal('0.5') * LOTS_PER_SPEND - FVal('0.25'), DBSettings()
+    while len(manager) != 0:
+        manager.calculate_spend_cost_basis(
+            spending_amount=spend_amount,
+            spending_asset=A_ETH,
+            timestamp=Timestamp(LOTS_NUMBER),
+            missing_acquisitions=[],
+            used_acquisitions=[],
+            settings=settings,
+            timestamp_to_date=str,
+        )
+
+
+def main() -> None:
+    """Print the duration of a whole report with each cost basis method"""
+    for manager_class in (
+            FIFOCostBasisMethod,
+            LIFOCostBasisMethod,
+            HIFOCostBasisMethod,
+            AverageCostBasisMethod,
+    ):
+        duration = min(timeit.repeat(lambda: _run_report(manager_class()), number=1, repeat=3))  # noqa: B023
+        print(f'{manager_class.__name__}: {duration:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark the FVal operations in the patterns they are used in the accounting hot loops.
+
+Usage:
+python -m tools.profiling.fval_benchmark
+"""
+import timeit
+from collections.abc import Callable
+
+from rotkehlchen.constants import ONE, ZERO
+from rotkehlchen.fval import FVal
+
+OPERATIONS_NUMBER = 200_000
+
+
+def _ops_per_second(operation: Callable[[], object], number: int = OPERATIONS_NUMBER) -> float:
+    """Best of 3 runs of the operation, as operations per second"""
+    return number / min(timeit.repeat(operation, number=number, repeat=3))
+
+
+def main() -> None:
+    """Print the ops/sec of each FVal operation and accounting pattern.
+
+    The cost basis patterns follow BaseAcquisitionsCalculator.calculate_spend_cost_basis
+    and the pot ones AccountingPot.add_in_event/add_out_event.
+    """
+    remaining_sold, lot_remaining, lot_rate = FVal('1.5'), FVal('0.7564'), FVal('1834.21')
+    amount, price, taxable = FVal('12.345678'), FVal('0.99842'), FVal('12345.6789')
+
+    def spend_lot() -> None:  # consume a whole acquisition lot for a spend
+        remaining = remaining_sold
+        if remaining < lot_remaining:
+            return
+        remaining -= lot_remaining
+        _ = lot_rate * lot_remaining
+        _ = taxable + lot_remaining
+        _ = remaining == ZERO
+
+    def pot_event() -> None:  # value an event in the profit currency and add its PnL
+        value = amount * price
+        if value > ZERO:
+            _ = taxable + (value - ONE)
+
+    results = {
+        'FVal > FVal': _ops_per_second(lambda: lot_remaining > remaining_sold),
+        'FVal <= int': _ops_per_second(lambda: lot_remaining <= 0),
+        'FVal == ZERO': _ops_per_second(lambda: lot_remaining == ZERO),
+        'FVal + FVal': _ops_per_second(lambda: lot_remaining + remaining_sold),
+        'FVal * FVal': _ops_per_second(lambda: lot_rate * lot_remaining),
+        'FVal / FVal': _ops_per_second(lambda: lot_rate / lot_remaining),
+        'FVal(str)': _ops_per_second(lambda: FVal('1834.21')),
+        'is_close': _ops_per_second(lambda: lot_rate.is_close(lot_remaining)),
+        'cost basis lot spend': _ops_per_second(spend_lot),
+        'pot event': _ops_per_second(pot_event),
+    }
+    for name, ops in results.items():
+        print(f'{name:>22}: {ops:>12,.0f} ops/sec')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark writing the processed events of a PnL report in batches against writing
+each one in its own transaction, in a temporary user DB.
+
+Usage:
+python -m tools.profiling.pnl_events_benchmark
+"""
+from gevent import monkey
+
+monkey.patch_all()  # isort:skip
+
+import json
+import timeit
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from rotkehlchen.accounting.pot import PNL_EVENTS_WRITE_BATCH
+from rotkehlchen.db.dbhandler import DBHandler
+from rotkehlchen.db.reports import DBAccountingReports
+from rotkehlchen.db.settings import DBSettings
+from rotkehlchen.globaldb.handler import GlobalDBHandler
+from rotkehlchen.logging import TRACE, add_logging_level
+from rotkehlchen.types import Timestamp
+from rotkehlchen.user_messages import MessagesAggregator
+from rotkehlchen.utils.misc import get_chunks
+
+add_logging_level('TRACE', TRACE)
+
+EVENTS_NUMBER = 50_000
+EVENT_DATA = json.dumps({'notes': 'x' * 300, 'pnl_taxable': '1.5', 'pnl_free': '0'})
+
+
+def _write_one_by_one(dbpnl: DBAccountingReports, report_id: int) -> None:
+    """How every processed event used to be written, in its own transaction"""
+    for idx in range(EVENTS_NUMBER):
+        with dbpnl.db.transient_write() as cursor:
+            cursor.execute(
+                'INSERT INTO pnl_events(report_id, timestamp, data) VALUES(?, ?, ?)',
+                (report_id, idx, EVENT_DATA),
+            )
+
+
+def _write_in_batches(dbpnl: DBAccountingReports, report_id: int) -> None:
+    events_data = [(Timestamp(idx), EVENT_DATA) for idx in range(EVENTS_NUMBER)]
+    for chunk in get_chunks(events_data, n=PNL_EVENTS_WRITE_BATCH):
+        dbpnl.add_report_data(report_id=report_id, events_data=chunk)
+
+
+def _benchmark(database: DBHandler) -> None:
+    dbpnl = DBAccountingReports(database)
+
+    def run(write_events) -> float:
+        report_id = dbpnl.add_report(
+            first_processed_timestamp=Timestamp(0),
+            start_ts=Timestamp(0),
+            end_ts=Timestamp(EVENTS_NUMBER),
+            settings=DBSettings(),
+        )
+        duration = timeit.timeit(lambda: write_events(dbpnl, report_id), number=1)
+        dbpnl.purge_report_data(report_id)
+        return duration
+
+    batched = min(run(_write_in_batches) for _ in range(3))
+    one_by_one = min(run(_write_one_by_one) for _ in range(3))
+    print(f'{EVENTS_NUMBER} events: {batched:.3f}s in batches vs {one_by_one:.3f}s one by one ({one_by_one / batched:.2f}x)')  # noqa: E501
+
+
+def main() -> None:
+    msg_aggregator = MessagesAggregator()
+    with TemporaryDirectory() as tmp_dir:
+        GlobalDBHandler(  # needed to resolve the assets of the user DB settings
+            data_dir=Path(tmp_dir),
+            sql_vm_instructions_cb=0,
+            msg_aggregator=msg_aggregator,
+            perform_assets_updates=False,
+        )
+        (user_data_dir := Path(tmp_dir) / 'benchmark').mkdir()
+        database = DBHandler(
+            user_data_dir=user_data_dir,
+            password='123',
+            msg_aggregator=msg_aggregator,
+            initial_settings=None,
+            sql_vm_instructions_cb=0,
+            resume_from_backup=False,
+        )
+        _benchmark(database)
+        database.logout()
+        GlobalDBHandler().cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark encoding representative API results with the serializer registry against
+the isinstance chain results were serialized with before.
+
+Usage:
+python -m tools.profiling.serialization_benchmark
+"""
+import json
+import timeit
+from typing import Any
+
+from web3.datastructures import AttributeDict
+
+from rotkehlchen.accounting.structures.balance import Balance
+from rotkehlchen.assets.asset import Asset
+from rotkehlchen.fval import FVal
+from rotkehlchen.serialization.serialize import (
+    SERIALIZATION_RULES,
+    json_default,
+    process_result_for_json,
+)
+from rotkehlchen.types import Location
+
+EVENTS_NUMBER = 10_000
+ASSETS_NUMBER = 2_000
+
+
+def _legacy_process_entry(entry: Any) -> Any:
+    """How results used to be serialized. Every entry is checked against the types in
+    order and every list and dict is copied, then json.dumps walks the copy again."""
+    if isinstance(entry, FVal):
+        return str(entry)
+    if isinstance(entry, list):
+        return [_legacy_process_entry(x) for x in entry]
+    if isinstance(entry, dict | AttributeDict):
+        return {
+            (k.identifier if isinstance(k, Asset) else str(k) if isinstance(k, Location) else k): _legacy_process_entry(v)  # noqa: E501
+            for k, v in entry.items()
+        }
+    for types, serializer in SERIALIZATION_RULES[3:]:
+        if isinstance(entry, types):
+            return serializer(entry, False)
+    return entry
+
+
+def _history_events_payload() -> dict[str, Any]:
+    """Like the result of /history/events"""
+    return {'result': {
+        'entries': [{
+            'entry': {
+                'identifier': idx,
+                'entry_type': 'evm event',
+                'event_identifier': f'10x{idx:064x}',
+                'sequence_index': idx % 5,
+                'timestamp': 1700000000000 + idx,
+                'location': 'ethereum',
+                'asset': 'eip155:1/erc20:0x6B175474E89094C44Da98b954EedeAC495271d0F',
+                'balance': {'amount': '1.5', 'usd_value': '1.5'},
+                'event_type': 'spend',
+                'event_subtype': 'fee',
+                'location_label': '0x9531C059098e3d194fF87FebB587aB07B30B1306',
+                'notes': f'Burn 0.0{idx} ETH for gas',
+                'extra_data': None,
+                'tx_hash': f'0x{idx:064x}',
+                'counterparty': 'gas',
+                'product': None,
+                'address': None,
+            },
+            'event_accounting_rule_status': 'has rule',
+            'customized': idx % 7 == 0,
+        } for idx in range(EVENTS_NUMBER)],
+        'entries_found': EVENTS_NUMBER,
+        'entries_limit': -1,
+        'entries_total': EVENTS_NUMBER,
+    }, 'message': ''}
+
+
+def _balances_payload() -> dict[str, Any]:
+    """Like the result of /balances, with FVal, asset and enum leaves"""
+    assets = [Asset(f'eip155:1/erc20:0x{idx:040x}') for idx in range(ASSETS_NUMBER)]
+    return {'result': {
+        'assets': {
+            asset: {'amount': FVal(idx) / 3, 'usd_value': FVal(idx) * FVal('1.1'), 'percentage_of_net_value': f'{idx / 100}%'}  # noqa: E501
+            for idx, asset in enumerate(assets)
+        },
+        'location': {
+            location: Balance(amount=FVal(idx), usd_value=FVal(idx) * 2)
+            for idx, location in enumerate(Location)
+        },
+        'net_usd': FVal('123456.789'),
+    }, 'message': ''}
+
+
+def main() -> None:
+    """Print the encoding duration of each payload with both serializations"""
+    for name, payload in (('/history/events', _history_events_payload()), ('/balances', _balances_payload())):  # noqa: E501
+        assert json.dumps(process_result_for_json(payload), default=json_default) == json.dumps(_legacy_process_entry(payload))  # noqa: E501
+        current = min(timeit.repeat(lambda: json.dumps(process_result_for_json(payload), default=json_default), number=5, repeat=3))  # noqa: B023, E501
+        legacy = min(timeit.repeat(lambda: json.dumps(_legacy_process_entry(payload)), number=5, repeat=3))  # noqa: B023, E501
+        print(f'{name}: {current:.3f}s vs {legacy:.3f}s with the isinstance chain ({legacy / current:.2f}x)')  # noqa: E501
+
+
+if __name__ == '__main__':
+    main()